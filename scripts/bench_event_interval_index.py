@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# bench_event_interval_index.py
+# Benchmarks EventIntervalIndex (used to find the events within an event track's exposed rect) against a linear scan over the events, on synthetic events spread over 90 days.
+# Range queries must return the same events as the scan, and the pixel extents must match PhoDurationEvent.compute_parent_offset_rect(...)'s arithmetic, or the script fails.
+#
+# Usage (from the repository root):
+#     python scripts/bench_event_interval_index.py
+#     python scripts/bench_event_interval_index.py --num-events 1000000
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+
+from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
+
+base_date = datetime(2019, 8, 1)
+total_duration = timedelta(days=90)
+# The default duration PhoDurationEvent.computeDuration() gives instantaneous events
+instantaneous_event_duration = timedelta(seconds=2)
+
+
+class SyntheticEvent(object):
+    """SyntheticEvent: the parts of PhoDurationEvent that EventIntervalIndex reads, without its Qt dependencies."""
+
+    def __init__(self, startTime, endTime):
+        self.startTime = startTime
+        self.endTime = endTime
+
+    def computeDuration(self):
+        if self.endTime is None:
+            return instantaneous_event_duration
+        return self.endTime - self.startTime
+
+
+def make_synthetic_events(num_events, rng):
+    events = []
+    for _ in range(num_events):
+        startTime = base_date + timedelta(seconds=rng.uniform(0, total_duration.total_seconds()))
+        # Half the events are instantaneous, the rest last about 10 minutes on average
+        if rng.random() < 0.5:
+            endTime = None
+        else:
+            endTime = startTime + timedelta(seconds=rng.expovariate(1.0 / 600.0))
+        events.append(SyntheticEvent(startTime, endTime))
+    return events
+
+
+def find_overlapping_by_scan(events, range_start, range_end):
+    return [
+        anIndex
+        for (anIndex, anEvent) in enumerate(events)
+        if (anEvent.startTime <= range_end) and (anEvent.startTime + anEvent.computeDuration() >= range_start)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks EventIntervalIndex range queries against a linear scan.")
+    parser.add_argument("--num-events", type=int, default=100000, help="the number of synthetic events")
+    parser.add_argument("--num-checks", type=int, default=200, help="the number of random range queries checked against the scan")
+    parser.add_argument("--width", type=int, default=80000, help="the timeline width in pixels used for the extents")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    events = make_synthetic_events(args.num_events, rng)
+
+    start_time = time.perf_counter()
+    index = EventIntervalIndex(events)
+    build_seconds = time.perf_counter() - start_time
+
+    for _ in range(args.num_checks):
+        range_start = base_date + timedelta(seconds=rng.uniform(-1000, total_duration.total_seconds()))
+        range_end = range_start + timedelta(seconds=rng.choice([10, 600, 86400]))
+        found = sorted(index.find_overlapping_indicies(range_start, range_end).tolist())
+        assert found == find_overlapping_by_scan(events, range_start, range_end), "range query differs from the scan"
+
+    # A 5-minute window, about what an 800 px exposed rect covers at a typical zoom
+    range_start = base_date + timedelta(days=30)
+    range_end = range_start + timedelta(minutes=5)
+    num_queries = 1000
+    start_time = time.perf_counter()
+    for _ in range(num_queries):
+        found = index.find_overlapping_indicies(range_start, range_end)
+    query_seconds = (time.perf_counter() - start_time) / num_queries
+
+    start_time = time.perf_counter()
+    find_overlapping_by_scan(events, range_start, range_end)
+    scan_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    extents = index.compute_pixel_extents(base_date, total_duration, args.width)
+    extents_seconds = time.perf_counter() - start_time
+    expected_x = [int(((anEvent.startTime - base_date) / total_duration) * args.width) for anEvent in events[:2000]]
+    assert extents.x[:2000].tolist() == expected_x, "pixel extents differ"
+
+    print("{} events: building the index {:.3f} s, pixel extents {:.1f} ms".format(args.num_events, build_seconds, extents_seconds * 1000.0))
+    print(
+        "5-minute window ({} events): index query {:.1f} us, linear scan {:.1f} ms".format(
+            len(found), query_seconds * 1e6, scan_seconds * 1000.0
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# bench_event_table.py
+# Benchmarks the memory and startup cost of a data-file track's events: the columnar EventTable (plus its lazily built EventTableViewList) the track uses now, against the previous one PhoDurationEvent view per record.
+# Also times a full zoomed-out repaint straight from the table and hit tests against it. Runs offscreen.
+#
+# Building a view per record is slow (several minutes and gigabytes of RSS at 500k events), so the old path is measured at --num-view-events instead; pass --num-view-events 0 to skip it.
+#
+# Usage (from the repository root):
+#     python scripts/bench_event_table.py
+#     python scripts/bench_event_table.py --num-events 100000 --num-view-events 10000
+
+import argparse
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+sys.path.insert(0, str(repo_root.joinpath("src", "phopyqttimelineplotter")))
+
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QApplication
+
+from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import (
+    FilesystemLabjackEvent_Record,
+)
+from phopyqttimelineplotter.GUI.Model.Events.EventTable import EventTable, EventTableViewList
+from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent import PhoDurationEvent
+from phopyqttimelineplotter.GUI.TimelineTrackWidgets.TimelineTrackDrawingWidget_SelectionBase import (
+    TimelineTrackDrawingWidget_SelectionBase,
+)
+
+base_date = datetime(2019, 8, 1)
+variable_names = ["Water1_BeamBreak", "Water2_BeamBreak", "Food1_BeamBreak", "Food2_BeamBreak", "Water1_Dispense", "Water2_Dispense", "Food1_Dispense", "Food2_Dispense"]
+variable_colors = [QColor(aColorName) for aColorName in ["aqua", "aquamarine", "coral", "magenta", "blue", "darkblue", "crimson", "maroon"]]
+track_width = 1600
+track_height = 50
+
+
+# get_peak_rss_bytes(): the process's peak resident set size so far (ru_maxrss is in kilobytes on Linux)
+def get_peak_rss_bytes():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# make_records(num_events): instantaneous Labjack events one second apart, like the loaders produce
+def make_records(num_events):
+    records = []
+    for index in range(num_events):
+        variable_index = index % len(variable_names)
+        records.append(
+            FilesystemLabjackEvent_Record(
+                base_date + timedelta(seconds=index),
+                None,
+                variable_names[variable_index],
+                variable_colors[variable_index],
+                {"event_type": "synthetic"},
+            )
+        )
+    return records
+
+
+def build_event_views(records):
+    views = []
+    for (index, aRecord) in enumerate(records):
+        newAnnotationView = aRecord.get_gui_view(aRecord, parent=None)
+        newAnnotationView.setAccessibleName(str(index))
+        views.append(newAnnotationView)
+    return views
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks a data-file track's EventTable against building a view per event.")
+    parser.add_argument("--num-events", type=int, default=500000, help="the number of events in the table")
+    parser.add_argument("--num-view-events", type=int, default=50000, help="the number of events to build views for (the previous approach)")
+    parser.add_argument("--num-hit-tests", type=int, default=150)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    records = make_records(args.num_events)
+
+    rss_before = get_peak_rss_bytes()
+    start_time = time.perf_counter()
+    eventTable = EventTable.from_records(records, PhoDurationEvent.InstantaneousEventDuration)
+    eventViews = EventTableViewList(eventTable, lambda index: records[index].get_gui_view(records[index], parent=None))
+    eventTable.get_interval_index()
+    table_seconds = time.perf_counter() - start_time
+    table_rss_bytes = get_peak_rss_bytes() - rss_before
+    print(
+        "{} events: EventTable built in {:.2f} s, {:.1f} MB of columns, +{:.0f} MB peak RSS".format(
+            args.num_events, table_seconds, eventTable.get_size_bytes() / 1e6, table_rss_bytes / 1e6
+        )
+    )
+
+    totalEndTime = records[-1].start_date + PhoDurationEvent.InstantaneousEventDuration
+    track = TimelineTrackDrawingWidget_SelectionBase(0, base_date, totalEndTime, [], None)
+    track.eventTable = eventTable
+    track.durationObjects = eventViews
+    track.rebuild_event_index()
+    track.resize(track_width, track_height)
+
+    image = QImage(track_width, track_height, QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    start_time = time.perf_counter()
+    num_visible_events = track.paint_visible_table_events(painter, eventTable, eventViews, track.rect(), track.rect())
+    repaint_seconds = time.perf_counter() - start_time
+    painter.end()
+
+    start_time = time.perf_counter()
+    for index in range(args.num_hit_tests):
+        track.find_child_object((index * 7) % track_width, track_height // 2)
+    hit_test_seconds = time.perf_counter() - start_time
+    print(
+        "Full zoomed-out repaint ({} events visible): {:.2f} s; {} hit tests: {:.1f} ms; views built: {}".format(
+            num_visible_events, repaint_seconds, args.num_hit_tests, hit_test_seconds * 1000.0, len(eventViews.get_built_views())
+        )
+    )
+
+    if args.num_view_events > 0:
+        view_records = records[: args.num_view_events]
+        rss_before = get_peak_rss_bytes()
+        start_time = time.perf_counter()
+        views = build_event_views(view_records)
+        views_seconds = time.perf_counter() - start_time
+        views_rss_bytes = get_peak_rss_bytes() - rss_before
+        print(
+            "{} events: one view per event (previous approach) built in {:.2f} s, +{:.0f} MB peak RSS".format(
+                len(views), views_seconds, views_rss_bytes / 1e6
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# bench_find_invalid_events.py
+# Benchmarks LabjackEventsLoader.find_invalid_events_columnar against the per-event loop kept as find_invalid_events_iterative, on synthetic Labjack events with many tied timestamps.
+# Both must produce identical masks and invalid-event timestamps, or the script fails.
+#
+# Usage (from the repository root):
+#     python scripts/bench_find_invalid_events.py
+#     python scripts/bench_find_invalid_events.py --num-events 1000000
+
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+sys.path.insert(0, str(repo_root.joinpath("src", "phopyqttimelineplotter")))
+
+from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import (
+    FilesystemLabjackEvent_Record,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
+    LabjackEventsLoader,
+    LabjackEventType,
+)
+
+
+def make_synthetic_events(num_events, seed=0):
+    rng = np.random.default_rng(seed)
+    base_date = dt.datetime(2020, 1, 1)
+    # Few distinct seconds, so that tied timestamps are common
+    seconds = np.sort(rng.integers(0, num_events // 3 + 2, num_events))
+    variable_indicies = rng.integers(0, len(LabjackEventsLoader.labjack_variable_event_type), num_events)
+    records = []
+    for (aSecond, aVariableIndex) in zip(seconds, variable_indicies):
+        records.append(
+            FilesystemLabjackEvent_Record(
+                base_date + dt.timedelta(seconds=int(aSecond)),
+                None,
+                "synthetic",
+                None,
+                {
+                    "event_type": LabjackEventsLoader.labjack_variable_event_type[aVariableIndex],
+                    "port": LabjackEventsLoader.labjack_variable_port_location[aVariableIndex],
+                },
+            )
+        )
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the columnar invalid-dispense detection against the previous loop.")
+    parser.add_argument("--num-events", type=int, default=200000, help="the number of synthetic events")
+    args = parser.parse_args()
+
+    eventType = LabjackEventType.filesystemLabjackEvent_Record
+    records = make_synthetic_events(args.num_events)
+
+    start_time = time.perf_counter()
+    (loopTimestamps, loopMask) = LabjackEventsLoader.find_invalid_events_iterative(records, eventType)
+    loop_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    (portCodes, eventTypeCodes, startDates) = LabjackEventsLoader.build_event_columns(records, eventType)
+    columns_seconds = time.perf_counter() - start_time
+    startDates = np.array(list(startDates), dtype="datetime64[us]")
+
+    start_time = time.perf_counter()
+    columnarMask = LabjackEventsLoader.find_invalid_events_columnar(portCodes, eventTypeCodes, startDates)
+    columnar_seconds = time.perf_counter() - start_time
+
+    (columnarTimestamps, wrapperMask) = LabjackEventsLoader.find_invalid_events(records, eventType)
+    assert np.array_equal(loopMask, columnarMask), "masks differ"
+    assert np.array_equal(loopMask, wrapperMask), "masks differ"
+    assert loopTimestamps == columnarTimestamps, "invalid event timestamps differ"
+
+    print(
+        "{} events ({} invalid): loop {:.3f} s, columnar core {:.3f} s ({:.1f}x), building the columns from records {:.3f} s".format(
+            args.num_events,
+            int(np.count_nonzero(~loopMask)),
+            loop_seconds,
+            columnar_seconds,
+            loop_seconds / columnar_seconds,
+            columns_seconds,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
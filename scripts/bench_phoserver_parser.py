@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# bench_phoserver_parser.py
+# Benchmarks PhoServerFormatBulkParser against the per-line readline()/regex/fromtimestamp loop that LabjackEventsLoader.loadLabjackDataFromPhoServerFormat used before it, on a synthetic PhoServer log.
+# Both parsers must produce identical timestamps, data arrays and event lines, or the script fails.
+#
+# Usage (from the repository root):
+#     python scripts/bench_phoserver_parser.py
+#     python scripts/bench_phoserver_parser.py --num-lines 200000 --format csv
+
+import argparse
+import datetime as dt
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
+    LabjackEventsLoader,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
+
+first_milliseconds_since_epoch = 1562601911545
+# A malformed line is written every this many data lines, which both parsers must skip
+garbage_line_interval = 1000
+
+
+def write_synthetic_log(filePath, num_lines, shouldUseStdOutFormat, seed=0):
+    rng = np.random.default_rng(seed)
+    bits = (rng.random((num_lines, PhoServerFormatBulkParser.num_variables)) < 0.3).astype(int)
+    with open(filePath, "w") as outFile:
+        outFile.write("PhoServer synthetic log\n")
+        for lineIndex in range(num_lines):
+            values = [str(aBit) for aBit in bits[lineIndex]]
+            if shouldUseStdOutFormat:
+                outFile.write("{}: {},\n".format(first_milliseconds_since_epoch + lineIndex, ", ".join(values)))
+            else:
+                outFile.write("{},{}\n".format(first_milliseconds_since_epoch + lineIndex, ",".join(values)))
+            if lineIndex % garbage_line_interval == 0:
+                outFile.write("garbage 12x\n")
+
+
+# parse_with_regex(filePath, shouldUseStdOutFormat): the previous implementation, kept here as the baseline. Returns (dateTimes, dataArray, lines)
+def parse_with_regex(filePath, shouldUseStdOutFormat):
+    if shouldUseStdOutFormat:
+        rx = LabjackEventsLoader.rx_stdout_data_line
+    else:
+        rx = LabjackEventsLoader.rx_csv_data_line
+    variable_names = LabjackEventsLoader.labjack_csv_variable_names[1:]
+    dateTimes = []
+    dataArray = []
+    lines = []
+    with open(filePath, "r") as inFile:
+        line = inFile.readline()
+        while line:
+            match = rx.search(line)
+            if match:
+                dateTimes.append(
+                    dt.datetime.fromtimestamp(float(match.group("milliseconds_since_epoch")) / 1000.0)
+                )
+                dataArray.append([int(match.group(aName)) for aName in variable_names])
+                lines.append(line)
+            line = inFile.readline()
+    return (np.array(dateTimes), np.array(dataArray), lines)
+
+
+def parse_with_bulk_parser(filePath, shouldUseStdOutFormat):
+    (millisecondsSinceEpoch, dataArray, lineOffsets) = PhoServerFormatBulkParser.parse_file(
+        filePath, shouldUseStdOutFormat=shouldUseStdOutFormat
+    )
+    dateTimes = PhoServerFormatBulkParser.datetime64_to_datetimes(
+        PhoServerFormatBulkParser.milliseconds_to_local_datetime64(millisecondsSinceEpoch)
+    )
+    return (dateTimes, dataArray, lineOffsets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the bulk PhoServer log parser against the previous regex loop.")
+    parser.add_argument("--num-lines", type=int, default=2000000, help="the number of data lines in the synthetic log")
+    parser.add_argument("--format", choices=["csv", "stdout", "both"], default="both")
+    args = parser.parse_args()
+
+    formats = {"csv": [False], "stdout": [True], "both": [False, True]}[args.format]
+    with tempfile.TemporaryDirectory() as temp_directory:
+        for shouldUseStdOutFormat in formats:
+            format_name = "stdout" if shouldUseStdOutFormat else "csv"
+            filePath = Path(temp_directory).joinpath("synthetic_{}.txt".format(format_name))
+            write_synthetic_log(filePath, args.num_lines, shouldUseStdOutFormat)
+
+            start_time = time.perf_counter()
+            (regexDateTimes, regexDataArray, regexLines) = parse_with_regex(filePath, shouldUseStdOutFormat)
+            regex_seconds = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            (bulkDateTimes, bulkDataArray, bulkLineOffsets) = parse_with_bulk_parser(filePath, shouldUseStdOutFormat)
+            bulk_seconds = time.perf_counter() - start_time
+
+            assert np.array_equal(regexDataArray, bulkDataArray), "data arrays differ"
+            assert np.array_equal(regexDateTimes, bulkDateTimes), "timestamps differ"
+            sampled_line_indicies = np.arange(0, len(regexLines), 997)
+            assert np.array_equal(
+                np.array(regexLines)[sampled_line_indicies],
+                PhoServerFormatBulkParser.read_lines(filePath, bulkLineOffsets[sampled_line_indicies]),
+            ), "event lines differ"
+
+            print(
+                "{} lines ({}): regex loop {:.2f} s, bulk parser {:.2f} s ({:.1f}x)".format(
+                    args.num_lines, format_name, regex_seconds, bulk_seconds, regex_seconds / bulk_seconds
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
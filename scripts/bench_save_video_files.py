@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# bench_save_video_files.py
+# Benchmarks VideoFilesystemLoader.saveVideoFilesToDatabase() on a new SQLite file with one search path folder holding N found (already probed) video files:
+#   - the first save, which inserts all N files
+#   - a second save with nothing new
+#   - a save after --num-added more files are found (as a watch mode rescan would), which only loads the added records into the cache
+# For comparison it also times reloadModelFromDatabase(), the full reload that saves used to finish with. After each save the cache must match what a full reload gives, or the script fails.
+#
+# Usage (from the repository root):
+#     python scripts/bench_save_video_files.py
+#     python scripts/bench_save_video_files.py --num-files 10000 100000 --num-added 100
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+sys.path.insert(0, str(repo_root.joinpath("src", "phopyqttimelineplotter")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from phopyqttimelineplotter.app.database.DatabaseConnectionRef import DatabaseConnectionRef
+from phopyqttimelineplotter.app.filesystem.VideoFilesystemLoadingMixin import VideoFilesystemLoader
+from phopyqttimelineplotter.app.filesystem.VideoUtils import FoundVideoFileResult, VideoParsedResults
+
+base_date = datetime(2019, 8, 1)
+video_duration_seconds = 1800.0
+
+
+# make_found_video_files(search_path, start_index, num_files): found and probed video files, one every 31 minutes
+def make_found_video_files(search_path, start_index, num_files):
+    found_video_files = []
+    for fileIndex in range(start_index, start_index + num_files):
+        base_name = "BB01_video_{0:07d}".format(fileIndex)
+        aFoundVideoFile = FoundVideoFileResult(
+            str(Path(search_path).joinpath(base_name + ".mp4")),
+            search_path,
+            base_name,
+            base_name + ".mp4",
+            ".mp4",
+            base_date + timedelta(minutes=(31 * fileIndex)),
+            0,
+            False,
+        )
+        aFoundVideoFile.video_parsed_results = VideoParsedResults(video_duration_seconds)
+        found_video_files.append(aFoundVideoFile)
+    return found_video_files
+
+
+# get_cached_database_video_files(loader): the (folder, name, end date) of every database video file in the loader's cache, to compare against a full reload
+def get_cached_database_video_files(loader):
+    return sorted(
+        (aVideoFile.file_video_folder, aVideoFile.file_fullname, aVideoFile.end_date)
+        for aCacheValue in loader.get_cache().values()
+        for aVideoFile in aCacheValue.get_database_video_files()
+    )
+
+
+def check_cache_matches_full_reload(loader):
+    cached_video_files = get_cached_database_video_files(loader)
+    start_time = time.perf_counter()
+    loader.reloadModelFromDatabase()
+    reload_seconds = time.perf_counter() - start_time
+    assert cached_video_files == get_cached_database_video_files(loader), "the cache doesn't match the database"
+    return reload_seconds
+
+
+def time_seconds(fn):
+    start_time = time.perf_counter()
+    fn()
+    return time.perf_counter() - start_time
+
+
+def run(num_files, num_added, temp_directory):
+    search_path = Path(temp_directory).joinpath("videos_{0}".format(num_files))
+    search_path.mkdir()
+    database_connection = DatabaseConnectionRef(str(Path(temp_directory).joinpath("bench_{0}.db".format(num_files))))
+    database_connection.enable_debug_printing = False
+    loader = VideoFilesystemLoader(database_connection, [])
+    loader.threadpool.waitForDone()
+    loader.searchPaths = [str(search_path)]
+    loader.rebuildDatabaseRecordParentFolders()
+    cache_value = loader.get_cache()[str(search_path.resolve())]
+
+    found_video_files = make_found_video_files(str(search_path), 0, num_files)
+    cache_value.set_found_filesystem_video_files(found_video_files)
+    first_save_seconds = time_seconds(loader.saveVideoFilesToDatabase)
+    reload_seconds = check_cache_matches_full_reload(loader)
+    assert len(cache_value.get_database_video_files()) == num_files
+
+    second_save_seconds = time_seconds(loader.saveVideoFilesToDatabase)
+
+    cache_value.set_found_filesystem_video_files(found_video_files + make_found_video_files(str(search_path), num_files, num_added))
+    added_save_seconds = time_seconds(loader.saveVideoFilesToDatabase)
+    check_cache_matches_full_reload(loader)
+    assert len(cache_value.get_database_video_files()) == num_files + num_added
+
+    database_connection.engine.dispose()
+    return (first_save_seconds, second_save_seconds, added_save_seconds, reload_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-files", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--num-added", type=int, default=100, help="files found by the rescan after the first saves")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    results = []
+    with tempfile.TemporaryDirectory() as temp_directory:
+        for num_files in args.num_files:
+            results.append((num_files, run(num_files, args.num_added, temp_directory)))
+
+    print("seconds per save (one folder), and the full cache reload saves used to finish with:")
+    print("{0:>8} {1:>11} {2:>12} {3:>14} {4:>12}".format("files", "first save", "second save", "+{0} files save".format(args.num_added), "full reload"))
+    for (num_files, (first_save_seconds, second_save_seconds, added_save_seconds, reload_seconds)) in results:
+        print(
+            "{0:>8} {1:>11.2f} {2:>12.2f} {3:>14.2f} {4:>12.2f}".format(
+                num_files, first_save_seconds, second_save_seconds, added_save_seconds, reload_seconds
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
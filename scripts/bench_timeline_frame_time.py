@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# bench_timeline_frame_time.py
+# Benchmarks the per-frame cost of moving the hover and video playback lines over a tracks container full of event tracks (offscreen), and of forwarding a mouse move to the tracks.
+#   - hover/video line: the container invalidates only the columns the line moved from and to (update_indicator_columns(...)), against the full update() it used to do.
+#   - mouse move forwarding: only the track under the cursor gets the move (as TimelineDrawingWindow.mouseMoveEvent does), against forwarding it to every track.
+# Each frame includes processing the resulting paint events. TimelineDrawingWindow itself needs pyqtgraph, so its forwarding loop is mirrored here on a lightweight host window.
+#
+# Usage (from the repository root):
+#     python scripts/bench_timeline_frame_time.py
+#     python scripts/bench_timeline_frame_time.py --num-tracks 50 --num-events 240 --width 1200 --num-frames 300
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+sys.path.insert(0, str(repo_root.joinpath("src", "phopyqttimelineplotter")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QPoint, QPointF, QRectF, Qt
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent_Video import (
+    PhoDurationEvent_Video,
+)
+from phopyqttimelineplotter.GUI.Model.ReferenceLines.ReferenceLineManager import (
+    ReferenceMarkerManager,
+)
+from phopyqttimelineplotter.GUI.TimelineTrackWidgets.TimelineTrackDrawingWidget_EventsBase import (
+    TimelineTrackDrawingWidget_EventsBase,
+)
+from phopyqttimelineplotter.GUI.UI.ExtendedTracksContainerWidget import (
+    ExtendedTracksContainerWidget,
+)
+
+base_date = datetime(2019, 8, 1)
+track_height = 20
+
+
+class BenchmarkDurationEvent(PhoDurationEvent_Video):
+    """BenchmarkDurationEvent: rounds the event's rect to whole pixels, since newer PyQt5 builds no longer truncate the float coordinates passed to QRect."""
+
+    def compute_parent_offset_rect(self, totalStartTime, totalEndTime, totalDuration, totalParentWidth, totalParentHeight):
+        x = ((self.startTime - totalStartTime) / totalDuration) * totalParentWidth
+        width = (self.computeDuration() / totalDuration) * totalParentWidth
+        return QRectF(x, 0.0, width, totalParentHeight).toRect()
+
+
+class BenchmarkHostWindow(QWidget):
+    """BenchmarkHostWindow: stands in for TimelineDrawingWindow, providing the reference manager and the track callbacks the widgets expect."""
+
+    def __init__(self, totalStartTime, totalEndTime, width):
+        super(BenchmarkHostWindow, self).__init__()
+        self.totalDuration = totalEndTime - totalStartTime
+        self.fixedWidth = width
+        self.referenceManager = ReferenceMarkerManager(totalStartTime, totalEndTime, width, 10, parent=self)
+        self.eventTrackWidgets = []
+
+    def get_reference_manager(self):
+        return self.referenceManager
+
+    def getScale(self):
+        return float(self.totalDuration.total_seconds()) / float(self.fixedWidth)
+
+    def on_track_child_get_info(self, trackID, childObject):
+        pass
+
+    def on_track_child_create_comment(self, trackID, childObject):
+        pass
+
+    # find_hovered_timeline_track(event_x, event_y): mirrors TimelineDrawingWindow.find_hovered_timeline_track(...)
+    def find_hovered_timeline_track(self, event_x, event_y):
+        for aTimelineTrack in self.eventTrackWidgets:
+            aTrackPoint = aTimelineTrack.mapFrom(self, QPoint(event_x, event_y))
+            if aTimelineTrack.rect().contains(aTrackPoint):
+                return aTimelineTrack
+        return None
+
+    # forward_mouse_move_to_hovered_track(event): mirrors TimelineDrawingWindow.mouseMoveEvent(...)'s forwarding
+    def forward_mouse_move_to_hovered_track(self, event):
+        hoveredTrack = self.find_hovered_timeline_track(event.x(), event.y())
+        if (hoveredTrack is not None) and hoveredTrack.wantsMouseEvents:
+            hoveredTrack.on_mouse_moved(
+                QMouseEvent(
+                    event.type(),
+                    QPointF(hoveredTrack.mapFrom(self, event.pos())),
+                    event.windowPos(),
+                    event.screenPos(),
+                    event.button(),
+                    event.buttons(),
+                    event.modifiers(),
+                )
+            )
+
+    # forward_mouse_move_to_all_tracks(event): the previous forwarding, kept here as the baseline
+    def forward_mouse_move_to_all_tracks(self, event):
+        for aTimelineTrack in self.eventTrackWidgets:
+            if aTimelineTrack.wantsMouseEvents:
+                aTimelineTrack.on_mouse_moved(event)
+
+
+# update_hover_with_full_repaint(container, x) and update_video_line_with_full_repaint(container, x): the previous slots, kept here as the baseline
+def update_hover_with_full_repaint(container, x):
+    container.is_driven_externally = True
+    container.pos = QPoint(x, 0)
+    container.update()
+
+
+def update_video_line_with_full_repaint(container, x):
+    container.video_pos = QPoint(x, 0)
+    container.update()
+
+
+def build_window(num_tracks, num_events, width):
+    totalStartTime = base_date
+    totalEndTime = base_date + timedelta(minutes=num_events)
+    window = BenchmarkHostWindow(totalStartTime, totalEndTime, width)
+    container = ExtendedTracksContainerWidget(
+        totalStartTime, totalEndTime, (totalEndTime - totalStartTime), (totalEndTime - totalStartTime).total_seconds(), parent=window
+    )
+    # As the window's minimumTimelineTrackWidthChanged signal does
+    container.set_fixed_width(width)
+    containerLayout = QVBoxLayout(container)
+    containerLayout.setContentsMargins(0, 0, 0, 0)
+    containerLayout.setSpacing(0)
+    for trackIndex in range(num_tracks):
+        # One 30 second event per minute, so every event is visible across the track's width
+        durationObjects = [
+            BenchmarkDurationEvent(
+                base_date + timedelta(minutes=eventIndex),
+                base_date + timedelta(minutes=eventIndex, seconds=30),
+                name="{0}-{1}".format(trackIndex, eventIndex),
+            )
+            for eventIndex in range(num_events)
+        ]
+        aTrack = TimelineTrackDrawingWidget_EventsBase(
+            trackIndex, durationObjects, [], totalStartTime, totalEndTime, None, parent=window
+        )
+        aTrack.set_fixed_width(width)
+        aTrack.setFixedHeight(track_height)
+        containerLayout.addWidget(aTrack)
+        window.eventTrackWidgets.append(aTrack)
+
+    windowLayout = QVBoxLayout(window)
+    windowLayout.setContentsMargins(0, 0, 0, 0)
+    windowLayout.addWidget(container)
+    window.resize(width, num_tracks * track_height)
+    window.show()
+    return (window, container)
+
+
+# time_frames(app, num_frames, apply_frame): average seconds per frame, including processing the paint events each frame causes
+def time_frames(app, num_frames, apply_frame):
+    app.processEvents()
+    start_time = time.perf_counter()
+    for frameIndex in range(num_frames):
+        apply_frame(frameIndex)
+        app.processEvents()
+    return (time.perf_counter() - start_time) / num_frames
+
+
+def make_mouse_move_event(x, y):
+    return QMouseEvent(QEvent.MouseMove, QPointF(x, y), Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-tracks", type=int, default=50)
+    parser.add_argument("--num-events", type=int, default=240, help="events per track, all visible")
+    parser.add_argument("--width", type=int, default=1200, help="container width in pixels")
+    parser.add_argument("--num-frames", type=int, default=300)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    (window, container) = build_window(args.num_tracks, args.num_events, args.width)
+    app.processEvents()
+
+    # The line sweeps across the container a few pixels per frame, as it does when hovering or during playback
+    def x_for_frame(frameIndex):
+        return (7 * frameIndex) % args.width
+
+    # Both versions must leave the lines in the same place
+    update_hover_with_full_repaint(container, x_for_frame(5))
+    full_hover_pos = QPoint(container.pos)
+    container.on_update_hover(x_for_frame(5))
+    assert container.pos == full_hover_pos
+    update_video_line_with_full_repaint(container, x_for_frame(5))
+    full_video_pos = QPoint(container.video_pos)
+    container.on_update_video_line(x_for_frame(5))
+    assert container.video_pos == full_video_pos
+
+    # Both forwardings must reach the hovered track with the same track-relative position
+    hover_y = (args.num_tracks // 2) * track_height + (track_height // 2)
+    hoveredTrack = window.find_hovered_timeline_track(args.width // 2, hover_y)
+    assert hoveredTrack is window.eventTrackWidgets[args.num_tracks // 2]
+    assert hoveredTrack.mapFrom(window, QPoint(args.width // 2, hover_y)) == QPoint(args.width // 2, track_height // 2)
+
+    print(
+        "{0} event tracks x {1} events, {2} x {3} px, {4} frames (ms per frame, before -> after):".format(
+            args.num_tracks, args.num_events, args.width, args.num_tracks * track_height, args.num_frames
+        )
+    )
+    results = [
+        (
+            "hover line move",
+            time_frames(app, args.num_frames, lambda i: update_hover_with_full_repaint(container, x_for_frame(i))),
+            time_frames(app, args.num_frames, lambda i: container.on_update_hover(x_for_frame(i))),
+        ),
+        (
+            "video playback line",
+            time_frames(app, args.num_frames, lambda i: update_video_line_with_full_repaint(container, x_for_frame(i))),
+            time_frames(app, args.num_frames, lambda i: container.on_update_video_line(x_for_frame(i))),
+        ),
+        (
+            "mouse move forwarding",
+            time_frames(
+                app, args.num_frames, lambda i: window.forward_mouse_move_to_all_tracks(make_mouse_move_event(x_for_frame(i), hover_y))
+            ),
+            time_frames(
+                app, args.num_frames, lambda i: window.forward_mouse_move_to_hovered_track(make_mouse_move_event(x_for_frame(i), hover_y))
+            ),
+        ),
+    ]
+    for (name, before_seconds, after_seconds) in results:
+        print("  {0:<22} {1:7.2f} -> {2:7.2f}".format(name + ":", before_seconds * 1000.0, after_seconds * 1000.0))
+
+    window.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# bench_video_interval_index.py
+# Benchmarks VideoIntervalIndex.assign_videos(...) against the per-timestamp loop over every video that the data file loaders used before it, on synthetic events and back-to-back (non-overlapping) videos.
+# Both must assign every event the same video and video-relative offset, or the script fails.
+#
+# Usage (from the repository root):
+#     python scripts/bench_video_interval_index.py
+#     python scripts/bench_video_interval_index.py --num-events 100000 --num-videos 10 100 1000 10000
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root.joinpath("src")))
+
+from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
+
+base_date = datetime(2019, 8, 1)
+video_duration = timedelta(minutes=30)
+
+
+# assign_videos_with_loop(timestamps, videoDates, videoEndDates): the previous implementation, kept here as the baseline. Returns (activeVideoIndicies, videoRelativeOffsets)
+def assign_videos_with_loop(timestamps, videoDates, videoEndDates):
+    earliestVideoTime = videoDates.min()
+    latestVideoTime = videoEndDates.max()
+    activeVideoIndicies = np.empty((len(timestamps),), dtype=object)
+    videoRelativeOffsets = np.empty((len(timestamps),), dtype=object)
+    for (index, anActiveTimestamp) in enumerate(timestamps):
+        if earliestVideoTime <= anActiveTimestamp <= latestVideoTime:
+            for (videoIndex, videoStartDate) in enumerate(videoDates):
+                videoEndDate = videoEndDates[videoIndex]
+                if videoStartDate <= anActiveTimestamp <= videoEndDate:
+                    activeVideoIndicies[index] = videoIndex
+                    videoRelativeOffsets[index] = anActiveTimestamp - videoStartDate
+                    break
+    return (activeVideoIndicies, videoRelativeOffsets)
+
+
+# make_videos(num_videos): back-to-back videos with a one minute gap between them
+def make_videos(num_videos):
+    videoDates = np.array([base_date + index * (video_duration + timedelta(minutes=1)) for index in range(num_videos)])
+    videoEndDates = np.array([aVideoDate + video_duration for aVideoDate in videoDates])
+    return (videoDates, videoEndDates)
+
+
+# make_timestamps(num_events, videoDates, videoEndDates, rng): sorted timestamps spread over (and slightly beyond) the videos
+def make_timestamps(num_events, videoDates, videoEndDates, rng):
+    span_seconds = (videoEndDates.max() - videoDates.min()).total_seconds()
+    offsets = np.sort(rng.uniform(-60.0, span_seconds + 60.0, num_events))
+    return np.array([videoDates.min() + timedelta(seconds=float(anOffset)) for anOffset in offsets])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks VideoIntervalIndex against the previous loop over every video.")
+    parser.add_argument("--num-events", type=int, default=20000, help="the number of synthetic events")
+    parser.add_argument("--num-videos", type=int, nargs="+", default=[10, 100, 1000], help="the numbers of videos to benchmark")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for num_videos in args.num_videos:
+        (videoDates, videoEndDates) = make_videos(num_videos)
+        timestamps = make_timestamps(args.num_events, videoDates, videoEndDates, rng)
+
+        start_time = time.perf_counter()
+        (loopVideoIndicies, loopRelativeOffsets) = assign_videos_with_loop(timestamps, videoDates, videoEndDates)
+        loop_seconds = time.perf_counter() - start_time
+
+        # Building the index is included, since the loaders build one per file
+        start_time = time.perf_counter()
+        (indexVideoIndicies, indexRelativeOffsets, isWithinVideoSpan) = VideoIntervalIndex(videoDates, videoEndDates).assign_videos(timestamps)
+        index_seconds = time.perf_counter() - start_time
+
+        assert np.array_equal(loopVideoIndicies, indexVideoIndicies), "video indicies differ"
+        assert np.array_equal(loopRelativeOffsets, indexRelativeOffsets), "video relative offsets differ"
+
+        print(
+            "{} events, {} videos: loop {:.3f} s, VideoIntervalIndex {:.3f} s ({:.1f}x)".format(
+                args.num_events, num_videos, loop_seconds, index_seconds, loop_seconds / index_seconds
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# check_import_time.py
+# Checks that importing the main window doesn't import any of the heavy optional modules that are meant to be loaded lazily (see app/LazyModule.py), and that it stays within a time budget (default_max_ms).
+# Runs the import in a fresh interpreter with `python -X importtime`, so every run measures a cold (but byte-compiled) import.
+# With --stub-missing, the optional modules that aren't installed (stubbable_modules) are replaced by empty stand-ins, so the check can run without the full GUI environment. A deferred module is still reported if it's imported, stub or not.
+#
+# Usage (from the repository root):
+#     python scripts/check_import_time.py
+#     python scripts/check_import_time.py --stub-missing --max-ms 1500 --repeat 5
+#     python scripts/check_import_time.py --module phopyqttimelineplotter.app.filesystem.VideoFrameExtractor
+# Exits with status 1 if the check fails.
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+src_path = repo_root.joinpath("src")
+# The app imports its bundled 'lib' package relative to the package directory, so the imports run from there
+package_path = src_path.joinpath("phopyqttimelineplotter")
+
+default_module = "phopyqttimelineplotter.GUI.MainWindow.TimelineDrawingWindow"
+
+# Top-level modules that must only be imported on first use, never just by importing the main window
+deferred_modules = [
+    "matplotlib",
+    "pyqtgraph",
+    "cv2",
+    "pandas",
+    "h5py",
+    "scipy",
+    "silx",
+    "lib.vlc",
+]
+
+# The import budget of the main window: about 3x its fastest import on the development machine (~200 ms with --stub-missing), to leave room for slower machines and the real qtawesome and orangecanvas.
+# Lower it whenever startup gets faster, so that regressions are caught.
+default_max_ms = 600.0
+
+# Optional modules that --stub-missing replaces when they aren't installed: the deferred modules, and the GUI modules that are only used once a window is shown
+stubbable_modules = sorted(set([aName.split(".")[0] for aName in deferred_modules if not aName.startswith("lib.")])) + [
+    "orangecanvas",
+    "qtawesome",
+]
+
+# Run before the import by --stub-missing. The finder is last in sys.meta_path, so it's only asked for modules that no other finder found.
+#   A stub is a package whose attributes are classes (so they can also be called, subclassed or used as decorators) with stub attributes of their own.
+stub_missing_modules_code = """
+import importlib.abc, importlib.machinery, sys, types
+
+class StubMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return make_stub_class(name)
+
+def make_stub_class(name):
+    return StubMeta(name, (object,), {{"__init__": lambda self, *args, **kwargs: None, "__call__": lambda self, *args, **kwargs: self}})
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return make_stub_class(name)
+
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split(".")[0] not in {stubbable_modules!r}:
+            return None
+        return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+
+    def create_module(self, spec):
+        module = StubModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module):
+        sys.stderr.write("stubbed missing module: " + module.__name__ + "\\n")
+
+sys.meta_path.append(StubFinder())
+""".format(stubbable_modules=stubbable_modules)
+
+
+# run_importtime(module_name, stub_missing=False): imports module_name in a new interpreter and returns (import_lines, stubbed_module_names), where import_lines are the parsed -X importtime lines as a list of (module_name, self_us, cumulative_us)
+def run_importtime(module_name, stub_missing=False):
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [str(src_path)] + ([environment["PYTHONPATH"]] if environment.get("PYTHONPATH") else [])
+    )
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            (stub_missing_modules_code if stub_missing else "") + "import {}".format(module_name),
+        ],
+        cwd=str(package_path),
+        env=environment,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr)
+        raise RuntimeError("Importing {} failed".format(module_name))
+
+    import_lines = []
+    stubbed_module_names = []
+    for aLine in completed.stderr.splitlines():
+        if aLine.startswith("stubbed missing module: "):
+            stubbed_module_names.append(aLine[len("stubbed missing module: "):])
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        if not aLine.startswith("import time:"):
+            continue
+        fields = aLine[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us = int(fields[0])
+            cumulative_us = int(fields[1])
+        except ValueError:
+            continue  # the header line
+        import_lines.append((fields[2].strip(), self_us, cumulative_us))
+    return (import_lines, stubbed_module_names)
+
+
+def find_deferred_imports(import_lines):
+    found_modules = []
+    for (aModuleName, _, _) in import_lines:
+        for aDeferredModule in deferred_modules:
+            if (aModuleName == aDeferredModule) or aModuleName.startswith(aDeferredModule + "."):
+                found_modules.append(aModuleName)
+                break
+    return found_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Checks that importing a module imports none of the lazily loaded heavy modules, and that it stays within a time budget."
+    )
+    parser.add_argument("--module", default=default_module, help="the module to import (default: the main window)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of fresh interpreters to import in; the fastest is reported")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=default_max_ms,
+        help="fail if the fastest import of the module takes longer than this (default: {} ms, 0 for no budget)".format(default_max_ms),
+    )
+    parser.add_argument(
+        "--stub-missing",
+        action="store_true",
+        help="replace the optional modules that aren't installed ({}) with empty stand-ins".format(", ".join(stubbable_modules)),
+    )
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    best_cumulative_us = None
+    best_import_lines = None
+    stubbed_module_names = []
+    for _ in range(max(args.repeat, 1)):
+        (import_lines, stubbed_module_names) = run_importtime(args.module, stub_missing=args.stub_missing)
+        # The requested module is the last (outermost) line
+        cumulative_us = [aCumulative for (aName, _, aCumulative) in import_lines if aName == args.module][-1]
+        if (best_cumulative_us is None) or (cumulative_us < best_cumulative_us):
+            best_cumulative_us = cumulative_us
+            best_import_lines = import_lines
+
+    print("import {}: {:.1f} ms (fastest of {})".format(args.module, best_cumulative_us / 1000.0, max(args.repeat, 1)))
+    if len(stubbed_module_names) > 0:
+        print("Stubbed missing modules: {}".format(", ".join(stubbed_module_names)))
+    print("Slowest imports (self time):")
+    for (aName, self_us, _) in sorted(best_import_lines, key=lambda x: x[1], reverse=True)[: args.top]:
+        print("    {:>8.1f} ms  {}".format(self_us / 1000.0, aName))
+
+    is_failed = False
+    found_deferred_modules = find_deferred_imports(best_import_lines)
+    if len(found_deferred_modules) > 0:
+        is_failed = True
+        found_top_level_modules = sorted(set([aName.split(".")[0] if not aName.startswith("lib.") else aName for aName in found_deferred_modules]))
+        print("FAILED: imported modules that should be loaded lazily: {}".format(", ".join(found_top_level_modules)))
+
+    if (args.max_ms > 0) and (best_cumulative_us / 1000.0 > args.max_ms):
+        is_failed = True
+        print("FAILED: the import took {:.1f} ms, more than the {:.1f} ms budget".format(best_cumulative_us / 1000.0, args.max_ms))
+
+    if is_failed:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
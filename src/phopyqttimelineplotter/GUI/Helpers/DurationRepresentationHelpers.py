@@ -89,6 +89,39 @@ class DurationRepresentationMixin(object):
         percent_x = duration_offset / self.totalDuration
         return percent_x
 
+    # Displayed time window functions:
+    # The displayed time window is the (start, end) of the part of the timeline that spans the object's width. None (the default) means the entire timeline is displayed.
+    def get_displayed_time_window(self):
+        return getattr(self, "displayedTimeWindow", None)
+
+    # set_displayed_time_window(displayed_start_time, displayed_end_time): pass None for both to display the entire timeline again
+    def set_displayed_time_window(self, displayed_start_time, displayed_end_time):
+        if (displayed_start_time is None) or (displayed_end_time is None):
+            self.displayedTimeWindow = None
+        else:
+            self.displayedTimeWindow = (displayed_start_time, displayed_end_time)
+
+    def get_displayed_start_time(self):
+        displayedTimeWindow = self.get_displayed_time_window()
+        if displayedTimeWindow is None:
+            return self.get_total_start_time()
+        return displayedTimeWindow[0]
+
+    def get_displayed_end_time(self):
+        displayedTimeWindow = self.get_displayed_time_window()
+        if displayedTimeWindow is None:
+            return self.get_total_end_time()
+        return displayedTimeWindow[1]
+
+    def get_displayed_duration(self):
+        return self.get_displayed_end_time() - self.get_displayed_start_time()
+
+    # datetime_to_displayed_percent(newDatetime): like datetime_to_percent(...), but the percent of the displayed time window. Values outside [0, 1] are off the edges.
+    def datetime_to_displayed_percent(self, newDatetime):
+        duration_offset = newDatetime - self.get_displayed_start_time()
+        percent_x = duration_offset / self.get_displayed_duration()
+        return percent_x
+
     ## Datetime functions copied from the versions created for the PhoDurationEvent class
     # returns true if the absolute_datetime falls within the current entire timeline. !Not the viewport!
     def contains_date(self, absolute_datetime):
@@ -106,59 +139,48 @@ class DurationRepresentationMixin(object):
         return self.get_total_start_time() + relative_duration
 
 
-## Unused:
-class OffsetRepresentationMixin(object):
+## IMPORTS:
+# from phopyqttimelineplotter.GUI.Helpers.DurationRepresentationHelpers import OffsetRepresentationMixin
+
+
+class OffsetRepresentationMixin(DurationRepresentationMixin):
 
     """
+    Converts between x offsets within the object and datetimes, where the displayed time window (see DurationRepresentationMixin.set_displayed_time_window(...)) spans self.width().
+    When the timeline is drawn on a virtual canvas only as wide as the viewport, the window is the part of the timeline scrolled into view, so painting never depends on the zoomed width of the whole timeline.
+
     Object must have the following instance properties:
     self.width()
     self.height()
 
     self.totalStartTime
     self.totalEndTime
-    self.activeScaleMultiplier
     """
 
-    def get_total_start_time(self):
-        return self.totalStartTime
-
-    def get_total_end_time(self):
-        return self.totalEndTime
-
-    def get_total_duration(self):
-        return self.get_total_end_time() - self.get_total_start_time()
-
-    def get_active_scale_multiplier(self):
-        return self.activeScaleMultiplier
-
-    # Get scale from length
-    def getScale(self):
-        return float(self.get_total_duration()) / float(self.width())
-
     # Timeline position/time converion functions:
     def offset_to_percent(self, event_x, event_y):
-        percent_x = event_x / (self.width() * self.get_active_scale_multiplier())
+        percent_x = event_x / self.width()
         percent_y = event_y / self.height()
         return (percent_x, percent_y)
 
     def offset_to_duration(self, event_x):
         (percent_x, percent_y) = self.offset_to_percent(event_x, 0.0)
-        return self.get_total_duration() * percent_x
+        return self.get_displayed_duration() * percent_x
 
     def offset_to_datetime(self, event_x):
         duration_offset = self.offset_to_duration(event_x)
-        return self.get_total_start_time() + duration_offset
+        return self.get_displayed_start_time() + duration_offset
 
     def percent_to_offset(self, percent_offset):
-        event_x = percent_offset * (self.width() * self.get_active_scale_multiplier())
+        event_x = percent_offset * self.width()
         return event_x
 
     def duration_to_offset(self, duration_offset):
-        percent_x = duration_offset / self.get_total_duration()
+        percent_x = duration_offset / self.get_displayed_duration()
         event_x = self.percent_to_offset(percent_x)
         return event_x
 
     def datetime_to_offset(self, newDatetime):
-        duration_offset = newDatetime - self.get_total_start_time()
+        duration_offset = newDatetime - self.get_displayed_start_time()
         event_x = self.duration_to_offset(duration_offset)
         return event_x
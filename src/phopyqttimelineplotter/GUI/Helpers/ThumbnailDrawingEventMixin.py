@@ -44,6 +44,10 @@ class ThumbnailDrawingEventMixin(object):
     def init_ThumbnailDrawingEventMixin(self):
         self.mainWidgetLayout = QGridLayout(self)
 
+        self.thumbnailsVideoFilePath = None  # The video file whose thumbnails are displayed, set once they're first requested
+        self.hasLoadedThumbnails = False
+        self.isThumbnailRequestPending = False
+
         self.desiredThumbnailSize = 40
         self.desiredThumbnailSizeKey = str(self.desiredThumbnailSize)
         self.max_num_horizontal_thumbnails = 5
@@ -72,8 +76,21 @@ class ThumbnailDrawingEventMixin(object):
     def get_num_thumbnails_horizontal(self):
         return math.floor(float(self.width()) / float(self.desiredThumbnailSize))
 
+    # get_needs_thumbnails(): True if thumbnails were requested for this event but have since been evicted (and aren't already being re-requested)
+    def get_needs_thumbnails(self):
+        return (
+            (self.thumbnailsVideoFilePath is not None)
+            and (not self.hasLoadedThumbnails)
+            and (not self.isThumbnailRequestPending)
+        )
+
     @pyqtSlot(str, list)
     def on_thumbnails_loaded(self, filename, generated_thumbnails_list):
+        if (self.thumbnailsVideoFilePath is not None) and (
+            filename != self.thumbnailsVideoFilePath
+        ):
+            # Another video's thumbnails
+            return
         print("on_thumbnails_loaded(...)")
         print(
             "thumbnail generation complete for [{0}]: {1} frames".format(
@@ -88,5 +105,16 @@ class ThumbnailDrawingEventMixin(object):
             w = self.get_labels_array()[index]
             w.setPixmap(QtGui.QPixmap.fromImage(currThumbnailImage))
             # w.isHidden((index > self.get_num_thumbnails_horizontal()))
+        self.hasLoadedThumbnails = True
+        self.isThumbnailRequestPending = False
+
+    # on_thumbnails_evicted(filename): drops the displayed thumbnails once the generator has evicted them from its cache. The owning track re-requests them when it next repaints this event.
+    @pyqtSlot(str)
+    def on_thumbnails_evicted(self, filename):
+        if filename != self.thumbnailsVideoFilePath:
+            return
+        for w in self.get_labels_array():
+            w.clear()
+        self.hasLoadedThumbnails = False
 
     pass
@@ -0,0 +1,142 @@
+# TimelineTileCache.py
+# Contains TimelineTileCache, which keeps the static content of a timeline widget (its background, tick lines and event rectangles) rendered in fixed-width QPixmap tiles, so that repaints which only move an indicator line just draw the tiles again.
+
+from collections import OrderedDict
+import math
+
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QPainter, QPixmap
+
+## IMPORT:
+# from phopyqttimelineplotter.GUI.Helpers.TimelineTileCache import TimelineTileCache
+
+
+class TimelineTileCache(object):
+    """TimelineTileCache: the static content of a timeline widget, rendered into tiles of tile_width pixels.
+
+    Tile i covers the timeline pixels [i * tile_width, (i + 1) * tile_width), counted from the layout's origin_time at its pixels_per_second. Tiles are positioned by time rather than by widget offset, so they stay valid as the displayed time window pans, and are only re-rendered when the zoom (pixels_per_second), the height or the layout's content_key change (see set_layout(...)), or when they're invalidated because their content changed.
+    Tiles are rendered transparent, so anything drawn beneath the widget (like the tick lines of the tracks container) still shows through them.
+    At most max_tiles are kept: the least recently painted tiles beyond that are evicted, but never the ones needed by the current paint.
+    """
+
+    default_tile_width = 256
+    default_max_tiles = 24
+
+    # Changes in pixels_per_second smaller than this fraction are from rounding the displayed time window, not from zooming
+    pixels_per_second_tolerance = 1e-6
+
+    def __init__(self, tile_width=None, max_tiles=None):
+        super(TimelineTileCache, self).__init__()
+        if tile_width is None:
+            tile_width = TimelineTileCache.default_tile_width
+        if max_tiles is None:
+            max_tiles = TimelineTileCache.default_max_tiles
+        self.tile_width = tile_width
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()  # tile_index: QPixmap, least recently painted first
+        self.origin_time = None
+        self.pixels_per_second = None
+        self.layoutKey = None  # (height, device_pixel_ratio, content_key)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def set_layout(
+        self,
+        origin_time,
+        pixels_per_second,
+        height,
+        device_pixel_ratio=1.0,
+        content_key=None,
+    ):
+        """Sets the layout the tiles are rendered with, dropping all the tiles if it's changed.
+        content_key: any other value the rendered content depends on (like the track's emphasis state), compared with ==
+        """
+        newLayoutKey = (height, device_pixel_ratio, content_key)
+        is_same_scale = (self.pixels_per_second is not None) and (
+            abs(pixels_per_second - self.pixels_per_second)
+            <= (TimelineTileCache.pixels_per_second_tolerance * self.pixels_per_second)
+        )
+        if (
+            is_same_scale
+            and (origin_time == self.origin_time)
+            and (newLayoutKey == self.layoutKey)
+        ):
+            return
+        self.tiles.clear()
+        self.origin_time = origin_time
+        self.pixels_per_second = pixels_per_second
+        self.layoutKey = newLayoutKey
+
+    # invalidate(): drops all the tiles, for when the content has changed everywhere
+    def invalidate(self):
+        self.tiles.clear()
+
+    # get_timeline_x(aDatetime): the position of aDatetime in timeline pixels from the origin_time
+    def get_timeline_x(self, aDatetime):
+        return (aDatetime - self.origin_time).total_seconds() * self.pixels_per_second
+
+    def get_tile_index(self, timeline_x):
+        return int(math.floor(timeline_x / self.tile_width))
+
+    # invalidate_time_range(start_time, end_time, padding_pixels): drops the tiles overlapping [start_time, end_time] extended by padding_pixels on each side
+    def invalidate_time_range(self, start_time, end_time, padding_pixels=0):
+        if (len(self.tiles) == 0) or (self.origin_time is None):
+            return
+        first_tile_index = self.get_tile_index(
+            self.get_timeline_x(start_time) - padding_pixels
+        )
+        last_tile_index = self.get_tile_index(
+            self.get_timeline_x(end_time) + padding_pixels
+        )
+        for tile_index in list(self.tiles.keys()):
+            if first_tile_index <= tile_index <= last_tile_index:
+                del self.tiles[tile_index]
+
+    # render_tile(tile_x, height, device_pixel_ratio, render_fn): renders a new tile whose left edge is at tile_x in widget coordinates
+    def render_tile(self, tile_x, height, device_pixel_ratio, render_fn):
+        pixmap = QPixmap(
+            int(math.ceil(self.tile_width * device_pixel_ratio)),
+            int(math.ceil(height * device_pixel_ratio)),
+        )
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        tilePainter = QPainter()
+        tilePainter.begin(pixmap)
+        # render_fn paints in widget coordinates, and only what's within the tile ends up in it
+        tilePainter.translate(-tile_x, 0)
+        render_fn(tilePainter, QRect(tile_x, 0, self.tile_width, height))
+        tilePainter.end()
+        return pixmap
+
+    def paint(self, painter, displayed_start_time, exposedRect, render_fn):
+        """Draws the tiles covering exposedRect with painter, rendering the ones that aren't cached yet.
+        displayed_start_time: the time at x = 0 in the widget's coordinates
+        render_fn(tilePainter, tileRect): paints the static content within tileRect, both in widget coordinates (tilePainter is translated to the tile)
+        Returns the number of tiles that had to be rendered.
+        """
+        if self.origin_time is None:
+            print("WARNING: TimelineTileCache.paint(...) called before set_layout(...)!")
+            return 0
+        (height, device_pixel_ratio, content_key) = self.layoutKey
+        # Snapping the widget's start to a whole timeline pixel keeps the tiles aligned with each other however the window has panned
+        widget_start_x = int(round(self.get_timeline_x(displayed_start_time)))
+        first_tile_index = self.get_tile_index(widget_start_x + exposedRect.left())
+        last_tile_index = self.get_tile_index(widget_start_x + exposedRect.right())
+        num_rendered_tiles = 0
+        for tile_index in range(first_tile_index, last_tile_index + 1):
+            tile_x = (tile_index * self.tile_width) - widget_start_x
+            pixmap = self.tiles.get(tile_index)
+            if pixmap is None:
+                pixmap = self.render_tile(tile_x, height, device_pixel_ratio, render_fn)
+                self.tiles[tile_index] = pixmap
+                num_rendered_tiles += 1
+            else:
+                self.tiles.move_to_end(tile_index)
+            painter.drawPixmap(tile_x, 0, pixmap)
+
+        # Evict the least recently painted tiles, keeping the ones just painted
+        num_kept_tiles = max(self.max_tiles, last_tile_index - first_tile_index + 1)
+        while len(self.tiles) > num_kept_tiles:
+            self.tiles.popitem(last=False)
+        return num_rendered_tiles
@@ -7,7 +7,6 @@ from enum import Enum
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 from phopyqttimelineplotter.app.database.entry_models.db_model import (
     FileParentFolder,
     StaticFileExtension,
@@ -93,6 +92,9 @@ class MainObjectListsWindow(AbstractDatabaseAccessingWindow):
         CachedVideoFileLoadingOptions.LoadDatabaseAndSearchVideoFileSearchPaths
     )
 
+    # Whether the search paths are watched for changes (see VideoFilesystemLoader.set_watch_mode_enabled(...)) when the window opens. Toggled at runtime from File > Watch Search Paths for Changes.
+    ShouldWatchSearchPathsOnStartup = False
+
     TreeItem_Default_Font = QtGui.QFont("Times", 9)
     TreeItem_Default_Foreground = QBrush(Qt.black)
 
@@ -139,6 +141,15 @@ class MainObjectListsWindow(AbstractDatabaseAccessingWindow):
             self.ui.actionLoad.triggered.connect(self.handle_menu_load_event)
             self.ui.actionSave.triggered.connect(self.handle_menu_save_event)
             self.ui.actionRefresh.triggered.connect(self.handle_menu_refresh_event)
+            self.ui.actionWatchSearchPaths.setChecked(
+                MainObjectListsWindow.ShouldWatchSearchPathsOnStartup
+            )
+            self.ui.actionWatchSearchPaths.toggled.connect(
+                self.handle_menu_watch_search_paths_toggled
+            )
+            self.videoLoader.set_watch_mode_enabled(
+                self.ui.actionWatchSearchPaths.isChecked()
+            )
 
         desiredWindowWidth = 600
         self.resize(desiredWindowWidth, 800)
@@ -560,6 +571,11 @@ class MainObjectListsWindow(AbstractDatabaseAccessingWindow):
         self.rebuild_from_found_files()
         pass
 
+    @pyqtSlot(bool)
+    def handle_menu_watch_search_paths_toggled(self, is_checked):
+        print("actionWatchSearchPaths: {}".format(is_checked))
+        self.videoLoader.set_watch_mode_enabled(is_checked)
+
     def handle_add_search_directory_activated(self):
         print("handle_add_search_directory_activated")
         # options = QFileDialog.Options()
@@ -758,7 +774,7 @@ class MainObjectListsWindow(AbstractDatabaseAccessingWindow):
         output_event_file.dataReloaded.connect(self.on_data_reloaded)
         output_event_file.load_data()
 
-    @pyqtSlot(pd.DataFrame)
+    @pyqtSlot(object)  # a pandas DataFrame
     def on_data_reloaded(self, df):
         print("on_data_reloaded(df: {0})".format(str(df)))
         frame_column_names = df.columns.names
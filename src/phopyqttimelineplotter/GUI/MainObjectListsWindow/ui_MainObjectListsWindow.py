@@ -122,9 +122,14 @@ class Ui_MainObjectListsWindow(object):
         self.actionSave.setObjectName("actionSave")
         self.actionRefresh = QtWidgets.QAction(MainObjectListsWindow)
         self.actionRefresh.setObjectName("actionRefresh")
+        self.actionWatchSearchPaths = QtWidgets.QAction(MainObjectListsWindow)
+        self.actionWatchSearchPaths.setCheckable(True)
+        self.actionWatchSearchPaths.setObjectName("actionWatchSearchPaths")
         self.menuFile.addAction(self.actionLoad)
         self.menuFile.addAction(self.actionSave)
         self.menuFile.addAction(self.actionRefresh)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.actionWatchSearchPaths)
         self.menubar.addAction(self.menuFile.menuAction())
 
         self.retranslateUi(MainObjectListsWindow)
@@ -148,4 +153,6 @@ class Ui_MainObjectListsWindow(object):
         self.actionSave.setText(_translate("MainObjectListsWindow", "Save..."))
         self.actionSave.setShortcut(_translate("MainObjectListsWindow", "Ctrl+S"))
         self.actionRefresh.setText(_translate("MainObjectListsWindow", "Refresh"))
+        self.actionWatchSearchPaths.setText(_translate("MainObjectListsWindow", "Watch Search Paths for Changes"))
+        self.actionWatchSearchPaths.setToolTip(_translate("MainObjectListsWindow", "Rescan a search path when files are added to or removed from it"))
 import PhoPyQtTimelinePlotterResourceFile_rc
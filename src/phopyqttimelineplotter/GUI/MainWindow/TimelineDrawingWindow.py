@@ -27,6 +27,7 @@ from phopyqttimelineplotter.app.database.SqlAlchemyDatabase import (
     save_annotation_events_to_database,
 )
 from phopyqttimelineplotter.app.filesystem.FileExporting import FileExportingMixin, FileExportOptions
+from phopyqttimelineplotter.app.StartupTimer import StartupTimer
 from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackFilesystemLoadingMixin import (
     LabjackFilesystemLoader,
 )
@@ -39,13 +40,14 @@ from PyQt5.QtCore import (
     QEvent,
     QObject,
     QPoint,
+    QPointF,
     QRect,
     QSize,
     Qt,
     pyqtSignal,
     pyqtSlot,
 )
-from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QPainter, QPen
+from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QMouseEvent, QPainter, QPen
 from PyQt5.QtWidgets import (
     QAbstractScrollArea,
     QAbstractSlider,
@@ -61,6 +63,7 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QScrollArea,
+    QScrollBar,
     QSplitter,
     QStackedWidget,
     QTableWidget,
@@ -210,6 +213,10 @@ class TimelineDrawingWindow(
     ViewportAdjustmentMode = (
         ViewportScaleAdjustmentOptions.MaintainDesiredViewportDisplayDuration
     )
+    # UseVirtualTimelineCanvas: If True, the track widgets are only as wide as the visible timeline viewport (the "canvas"), and scrolling/zooming changes the time window that they draw (see update_timeline_canvas_time_window()).
+    #   If False, the track widgets are as wide as the entire zoomed timeline (self.get_minimum_track_width()) and are scrolled by the QScrollArea, which hits Qt's maximum widget size for long timelines or high zoom levels.
+    UseVirtualTimelineCanvas = True
+
     # Default viewport width is 1 day
     DefaultViewportDisplayDuration = timedelta(days=4.0)
     # DefaultZoom = 16.0
@@ -265,6 +272,7 @@ class TimelineDrawingWindow(
             database_connection
         )  # Call the inherited classes __init__ method
         self.ui = uic.loadUi("GUI/MainWindow/MainWindow.ui", self)  # Load the .ui file
+        StartupTimer.mark("load MainWindow.ui")
 
         self._shouldGenerateVideoThumbnails = False
 
@@ -281,7 +289,8 @@ class TimelineDrawingWindow(
         # self.trackConfigurations = []
         self.trackConfigurationsDict = dict()
         # self.trackID_ConfigurationsMap = dict() # a map from trackID to a specific configuration
-        self.videoInfoObjects = []
+        self.videoFileStartDates = []
+        self.videoFileEndDates = []
 
         # Track Options:
         # loadedVideoTrackIndicies: the video tracks to initially add to the track list
@@ -316,9 +325,11 @@ class TimelineDrawingWindow(
             self.labjackDataFilesystemLoader.on_active_global_timeline_times_changed
         )
 
+        StartupTimer.mark("create data file loaders")
         # Update the data model, and set up the timeline totalStartTime, totalEndTime, totalDuration from the loaded videos if we're in that enum mode.
         self.reloadModelFromDatabase()
         self.reload_timeline_display_bounds()
+        StartupTimer.mark("reloadModelFromDatabase")
 
         if (
             self.viewportAdjustmentMode
@@ -377,9 +388,11 @@ class TimelineDrawingWindow(
 
         # Video Thumbnail Generator:
         if self._shouldGenerateVideoThumbnails == True:
+            # Only the sized thumbnails are displayed, so the full-resolution frames aren't retained
             self.videoThumbnailGenerator = VideoPreviewThumbnailGenerator(
-                [], parent=self
+                [], shouldRetainOriginalFrames=False, parent=self
             )
+            self.videoThumbnailPopoverShownFiles = set()
             self.videoThumbnailGenerator.thumbnailGenerationComplete.connect(
                 self.on_all_videos_thumbnail_generation_complete
             )
@@ -406,8 +419,12 @@ class TimelineDrawingWindow(
 
         self.minimumEventTrackHeight = 50
 
+        StartupTimer.mark("other setup")
         self.initUI()
+        StartupTimer.mark("initUI")
         self.reload_tracks_from_track_configs()
+        self.update_track_record_pages()
+        StartupTimer.mark("load tracks")
 
         # Connect Internal Slots to signals:
         self.window_resized.connect(
@@ -1098,7 +1115,8 @@ class TimelineDrawingWindow(
                 self.extendedTracksContainerVboxLayout
             )
 
-            self.extendedTracksContainer.setFixedWidth(minimumWidgetWidth)
+            if not TimelineDrawingWindow.UseVirtualTimelineCanvas:
+                self.extendedTracksContainer.setFixedWidth(minimumWidgetWidth)
             ## Scroll Area: should contain only the extendedTracksContainer (not the video container)
             self.timelineScroll = QScrollArea(parent=self)
             self.timelineScroll.setWidget(self.extendedTracksContainer)
@@ -1108,16 +1126,35 @@ class TimelineDrawingWindow(
             self.timelineScroll.setSizeAdjustPolicy(
                 QAbstractScrollArea.AdjustToContents
             )
-            self.timelineScroll.horizontalScrollBar().valueChanged.connect(
-                self.on_viewport_slider_changd
-            )
             # self.timelineScroll.setBackgroundRole(QPalette.Dark)
             # self.timelineScroll.setFixedHeight(400)
             # self.timelineScroll.setFixedWidth(self.width())
 
+            if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+                # The scroll area only scrolls vertically, and the separate timelineCanvasScrollBar below it scrolls the time window of the tracks
+                self.timelineScroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+                self.timelineCanvasScrollBar = QScrollBar(Qt.Horizontal, parent=self)
+                self.timelineCanvasScrollBar.setSingleStep(20)
+                self.timelineScroll.viewport().installEventFilter(self)
+
+                timelineScrollContainer = QWidget(self)
+                timelineScrollContainerLayout = QVBoxLayout(timelineScrollContainer)
+                timelineScrollContainerLayout.setContentsMargins(0, 0, 0, 0)
+                timelineScrollContainerLayout.setSpacing(0)
+                timelineScrollContainerLayout.addWidget(self.timelineScroll)
+                timelineScrollContainerLayout.addWidget(self.timelineCanvasScrollBar)
+                timelineScrollWidget = timelineScrollContainer
+            else:
+                self.timelineCanvasScrollBar = None
+                timelineScrollWidget = self.timelineScroll
+
+            self.get_timeline_horizontal_scrollbar().valueChanged.connect(
+                self.on_viewport_slider_changd
+            )
+
             # Add the timeline scroll to the layout
             self.timelineViewportLayout.addWidget(
-                self.timelineScroll, 0, 0, -1, -1
+                timelineScrollWidget, 0, 0, -1, -1
             )  # Set the timeline to span all rows/columns of the layout
 
             # Add header tracks to self.timelineScroll (the viewport)
@@ -1172,7 +1209,11 @@ class TimelineDrawingWindow(
         initUI_initMenuBar(self)
 
         # minimumWidgetWidth = 500
-        minimumWidgetWidth = self.get_minimum_track_width()
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            # The virtual canvas doesn't exist yet. The tracks are sized to it by minimumTimelineTrackWidthChanged once it's laid out.
+            minimumWidgetWidth = 0
+        else:
+            minimumWidgetWidth = self.get_minimum_track_width()
 
         # Toolbar
         # self.ui.dockWidget_FooterToolbar
@@ -1215,6 +1256,8 @@ class TimelineDrawingWindow(
         # Cursor tracking
         self.cursorX = 0.0
         self.cursorY = 0.0
+        # The event track under the cursor (the only one mouse moves are forwarded to), or None
+        self.curr_hovered_timeline_track = None
 
         # The timeline-contents relative X position computed from self.cursorX
         self.timelineCursorX = 0.0
@@ -1264,26 +1307,15 @@ class TimelineDrawingWindow(
                     "Error: still failed even after trying to add sample records to database!!!"
                 )
 
-        ## TODO: The databse is allowing duplicate video files to be added.
-        # Video file objects for video tracks
-        self.videoFileRecords = (
-            self.database_connection.load_video_file_info_from_database()
-        )
-        self.videoInfoObjects = []
-        # Iterate through loaded database records to build videoInfoObjects
-
-        videoFileStartDates = []
-        videoFileEndDates = []
-
-        for aVideoFileRecord in self.videoFileRecords:
-            aVideoInfoObj = aVideoFileRecord.get_video_info_obj()
-            self.videoInfoObjects.append(aVideoInfoObj)
-            videoFileStartDates.append(aVideoFileRecord.get_start_date())
-            videoFileEndDates.append(aVideoFileRecord.get_end_date())
+        # Only the dates of the videos are needed to set the timeline bounds: the video tracks load their own records for the viewport
+        (
+            self.videoFileStartDates,
+            self.videoFileEndDates,
+        ) = self.database_connection.load_video_file_dates_from_database()
 
         # Update the labjack (matplotlib) graph for the new start and end video dates. This probably shouldn't happen, they should be updated for the timeline's global start/end times
         self.get_labjack_data_files_loader().set_start_end_video_file_dates(
-            videoFileStartDates, videoFileEndDates
+            self.videoFileStartDates, self.videoFileEndDates
         )
 
         self.update()
@@ -1300,12 +1332,8 @@ class TimelineDrawingWindow(
 
     # Required to initialize the viewport to fit the video events
     def reload_timeline_display_bounds(self):
-        videoDates = []
-        videoEndDates = []
-
-        for (index, videoInfoItem) in enumerate(self.videoInfoObjects):
-            videoDates.append(videoInfoItem.startTime)
-            videoEndDates.append(videoInfoItem.endTime)
+        videoDates = list(self.videoFileStartDates)
+        videoEndDates = list(self.videoFileEndDates)
 
         self.videoDates = np.array(videoDates)
         self.videoEndDates = np.array(videoEndDates)
@@ -1358,9 +1386,29 @@ class TimelineDrawingWindow(
             raise NotImplementedError
 
     def reload_tracks_from_track_configs(self):
+        self.update_track_loading_windows()
         self.reload_videos_from_track_configs()
         self.reload_events_from_track_configs()
 
+    # update_track_loading_windows(): limits the records that the tracks load from the database to the ones overlapping the global timeline range
+    def update_track_loading_windows(self):
+        for currTrackConfig in self.trackConfigurationsDict.values():
+            currTrackConfig.set_loading_window(self.totalStartTime, self.totalEndTime)
+
+    # update_track_record_pages(): has the paged video and event tracks load the records around the current viewport. Called whenever the viewport scrolls or zooms.
+    def update_track_record_pages(self):
+        if not self.shouldUseTrackHeaders:
+            return
+        viewport_start_time = self.get_viewport_active_start_time()
+        viewport_end_time = self.get_viewport_active_end_time()
+        for currTrackWidget in self.videoFileTrackWidgets + self.eventTrackWidgets:
+            currTrackWidget.trackConfig.request_viewport_records(
+                self.database_connection,
+                currTrackWidget,
+                viewport_start_time,
+                viewport_end_time,
+            )
+
     # Reloads the video records from the current track configs
     def reload_videos_from_track_configs(self):
         if not self.shouldUseTrackHeaders:
@@ -1434,24 +1482,136 @@ class TimelineDrawingWindow(
         contentWidgetRelativePoint = contentWidget.mapFromParent(
             QPoint(viewport_x_offset, 0)
         )
-        return contentWidgetRelativePoint.x()
+        return self.canvas_offset_to_contents_offset(contentWidgetRelativePoint.x())
+
+    ## Virtual Timeline Canvas:
+    # With UseVirtualTimelineCanvas, the "contents" offsets used by the functions above (which span the entire zoomed timeline, self.get_minimum_track_width() wide) no longer match the x offsets within the track widgets, which only span the visible canvas.
+    #   The canvas starts at the contents offset given by the horizontal scrollbar's value. Without UseVirtualTimelineCanvas the two are the same.
+
+    # get_timeline_horizontal_scrollbar(): the scrollbar that scrolls the timeline horizontally, whose value is the contents offset of the left edge of the viewport
+    def get_timeline_horizontal_scrollbar(self):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return self.timelineCanvasScrollBar
+        return self.timelineScroll.horizontalScrollBar()
+
+    # get_timeline_canvas_width(): the width of the visible part of the timeline tracks
+    def get_timeline_canvas_width(self):
+        return self.timelineScroll.viewport().width()
+
+    # get_timeline_track_fixed_width(): the width the track widgets should be, which is the entire zoomed timeline unless UseVirtualTimelineCanvas is set
+    def get_timeline_track_fixed_width(self):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return float(self.get_timeline_canvas_width())
+        return self.get_minimum_track_width()
+
+    def contents_offset_to_canvas_offset(self, contents_x_offset):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return contents_x_offset - self.get_timeline_horizontal_scrollbar().value()
+        return contents_x_offset
+
+    def canvas_offset_to_contents_offset(self, canvas_x_offset):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return canvas_x_offset + self.get_timeline_horizontal_scrollbar().value()
+        return canvas_x_offset
+
+    # ensure_contents_offset_visible(contents_x_offset): scrolls the least amount needed to bring contents_x_offset into the viewport, like QScrollArea.ensureVisible(contents_x_offset, 0, 0, 0)
+    def ensure_contents_offset_visible(self, contents_x_offset):
+        if not TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            self.timelineScroll.ensureVisible(contents_x_offset, 0, 0, 0)
+            return
+        hsb = self.get_timeline_horizontal_scrollbar()
+        canvas_width = self.get_timeline_canvas_width()
+        if contents_x_offset < hsb.value():
+            hsb.setValue(int(contents_x_offset))
+        elif contents_x_offset > (hsb.value() + canvas_width):
+            hsb.setValue(int(contents_x_offset - canvas_width))
+
+    # update_timeline_canvas_scrollbar(): sets the range of the virtual canvas' scrollbar so that it scrolls the canvas across the entire zoomed timeline. Called when the zoom or the canvas width changes.
+    def update_timeline_canvas_scrollbar(self):
+        if not TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return
+        canvas_width = self.get_timeline_canvas_width()
+        hsb = self.get_timeline_horizontal_scrollbar()
+        # Like QScrollArea, the value is kept (clamped to the new range) when the range changes
+        hsb.setRange(0, max(0, int(self.get_minimum_track_width()) - canvas_width))
+        hsb.setPageStep(canvas_width)
+
+    # update_timeline_canvas_time_window(): sets the time window drawn by the virtual canvas (the tracks, the timeline header and the reference lines) to the part of the timeline scrolled into view
+    def update_timeline_canvas_time_window(self):
+        if not TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return
+        canvas_width = self.get_timeline_canvas_width()
+        if canvas_width <= 0:
+            # Not laid out yet
+            return
+        canvas_start_offset = self.get_timeline_horizontal_scrollbar().value()
+        displayed_start_time = self.offset_to_datetime(canvas_start_offset)
+        displayed_end_time = self.offset_to_datetime(canvas_start_offset + canvas_width)
+        self.get_reference_manager().set_displayed_time_window(
+            displayed_start_time, displayed_end_time
+        )
+        for aWidget in [self.timelineMasterTrackWidget, self.extendedTracksContainer]:
+            aWidget.set_displayed_time_window(displayed_start_time, displayed_end_time)
+            aWidget.update()
+        for aTrackWidget in self.videoFileTrackWidgets + self.eventTrackWidgets:
+            aTrackWidget.set_displayed_time_window(
+                displayed_start_time, displayed_end_time
+            )
+            # The cached tiles are positioned by time, so they're still valid after panning
+            aTrackWidget.update_displayed_contents()
+
+        # The video playback line is drawn at a canvas offset, which has moved even though its time hasn't
+        if self.extendedTracksContainer.video_pos is not None:
+            videoPlaybackIndicatorMarkerContainer = (
+                self.get_reference_manager().get_indicator_marker_video_playback()
+            )
+            video_x_offset = self.contents_offset_to_canvas_offset(
+                self.datetime_to_offset(
+                    videoPlaybackIndicatorMarkerContainer.get_record().time
+                )
+            )
+            self.timelineMasterTrackWidget.on_update_video_line(video_x_offset)
+            self.extendedTracksContainer.on_update_video_line(video_x_offset)
+
+    # Called when the virtual canvas (the viewport of self.timelineScroll) is resized, which changes the width of the tracks and the duration of the displayed time window
+    def on_timeline_canvas_resized(self):
+        self.update_timeline_canvas_scrollbar()
+        self.minimumTimelineTrackWidthChanged.emit(self.get_timeline_track_fixed_width())
+        self.update_timeline_canvas_time_window()
 
-    # Returns the index of the child object that the (x, y) point falls within, or None if it doesn't fall within an event.
+    def eventFilter(self, watched, event):
+        if (
+            TimelineDrawingWindow.UseVirtualTimelineCanvas
+            and (event.type() == QEvent.Resize)
+            and (watched is self.timelineScroll.viewport())
+        ):
+            self.on_timeline_canvas_resized()
+        return super().eventFilter(watched, event)
+
+    # Returns the event track that the (x, y) point (relative to this window) falls within, or None if it isn't over one.
     def find_hovered_timeline_track(self, event_x, event_y):
         hovered_timeline_track_object = None
         for (anIndex, aTimelineTrack) in enumerate(self.eventTrackWidgets):
-            # aTrackFrame = aTimelineTrack.frameGeometry()
-            # aTrackFrame = aTimelineTrack.rect()
-            # aTrackFrame = aTimelineTrack.geometry()
-            aTrackFrame = aTimelineTrack.frameGeometry()
-
-            # print("timeline_track: ", aTrackFrame)
-            if aTrackFrame.contains(event_x, event_y):
+            # The tracks are positioned within the scrolled container, so the point is mapped into each track's own coordinates
+            aTrackPoint = aTimelineTrack.mapFrom(self, QPoint(event_x, event_y))
+            if aTimelineTrack.rect().contains(aTrackPoint):
                 hovered_timeline_track_object = aTimelineTrack
-                print("active_timeline_track[{0}]".format(anIndex))
+                # print("active_timeline_track[{0}]".format(anIndex))
                 break
         return hovered_timeline_track_object
 
+    # map_mouse_event_to_widget(event, aWidget): returns a copy of the mouse event (received by this window) with its position relative to aWidget
+    def map_mouse_event_to_widget(self, event, aWidget):
+        return QMouseEvent(
+            event.type(),
+            QPointF(aWidget.mapFrom(self, event.pos())),
+            event.windowPos(),
+            event.screenPos(),
+            event.button(),
+            event.buttons(),
+            event.modifiers(),
+        )
+
     # Event Handlers:
     def keyPressEvent(self, event):
         print("TimelineDrawingWindow.keyPressEvent(): {0}".format(str(event.key())))
@@ -1525,10 +1685,16 @@ class TimelineDrawingWindow(
 
         # TODO: Need to use offset into scroll view instead of window?
 
-        # Exhaustive event forwarding for all track widgets
-        for (anIndex, aTimelineTrack) in enumerate(self.eventTrackWidgets):
-            if aTimelineTrack.wantsMouseEvents:
-                aTimelineTrack.on_mouse_moved(event)
+        # Only the track under the cursor gets the event. The others already cleared their hover when the cursor left them (see their leaveEvent(...)).
+        self.curr_hovered_timeline_track = self.find_hovered_timeline_track(
+            event.x(), event.y()
+        )
+        if (self.curr_hovered_timeline_track is not None) and (
+            self.curr_hovered_timeline_track.wantsMouseEvents
+        ):
+            self.curr_hovered_timeline_track.on_mouse_moved(
+                self.map_mouse_event_to_widget(event, self.curr_hovered_timeline_track)
+            )
 
         self.statusBar().showMessage(text)
 
@@ -1537,7 +1703,7 @@ class TimelineDrawingWindow(
 
     def wheelEvent(self, event):
         # print("mouse wheel event! {0}".format(str(event)))
-        hsb = self.timelineScroll.horizontalScrollBar()
+        hsb = self.get_timeline_horizontal_scrollbar()
         dy = ((-event.angleDelta().y() / 8) / 15) * hsb.singleStep()
         ## Detect modifier keys being held down to modify scroll action.
         """
@@ -1619,6 +1785,8 @@ class TimelineDrawingWindow(
         return self.activeScaleMultiplier
 
     def get_viewport_width(self):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            return self.get_timeline_canvas_width()
         return self.timelineScroll.width()
 
     # Get scale from length. Only used for ReferenceManager
@@ -1824,8 +1992,13 @@ class TimelineDrawingWindow(
         )
 
     def resize_children_on_zoom(self):
-        newMinWidth = self.get_minimum_track_width()
-        self.extendedTracksContainer.setFixedWidth(newMinWidth)
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            # The tracks keep the width of the canvas, only the scrollable range and the displayed time window change
+            self.update_timeline_canvas_scrollbar()
+            self.update_timeline_canvas_time_window()
+        else:
+            newMinWidth = self.get_minimum_track_width()
+            self.extendedTracksContainer.setFixedWidth(newMinWidth)
         self.update()
 
     ## Navigation:
@@ -1833,11 +2006,9 @@ class TimelineDrawingWindow(
     # Returns the current perent scrolled the viewport is through the entire timeline.
     def get_viewport_percent_scrolled(self):
         # TODO: check that this is correct. I think it is.
+        hsb = self.get_timeline_horizontal_scrollbar()
         try:
-            return float(self.timelineScroll.horizontalScrollBar().value()) / (
-                float(self.timelineScroll.horizontalScrollBar().maximum())
-                - float(self.timelineScroll.horizontalScrollBar().minimum())
-            )
+            return float(hsb.value()) / (float(hsb.maximum()) - float(hsb.minimum()))
         except ZeroDivisionError:
             print("ERROR: ZeroDivisionError in get_viewport_percent_scrolled()!")
             return 0.0
@@ -1846,14 +2017,12 @@ class TimelineDrawingWindow(
 
     # Scrolls the viewport to the desired percent_scrolled of entire timeline.
     def set_viewport_percent_scrolled(self, percent_scrolled):
+        hsb = self.get_timeline_horizontal_scrollbar()
         scrollbar_scroll_relative_offset = float(percent_scrolled) * (
-            float(self.timelineScroll.horizontalScrollBar().maximum())
-            - float(self.timelineScroll.horizontalScrollBar().minimum())
+            float(hsb.maximum()) - float(hsb.minimum())
         )
-        scrollbar_offset = scrollbar_scroll_relative_offset + float(
-            self.timelineScroll.horizontalScrollBar().minimum()
-        )
-        self.timelineScroll.horizontalScrollBar().setValue(scrollbar_offset)
+        scrollbar_offset = scrollbar_scroll_relative_offset + float(hsb.minimum())
+        hsb.setValue(int(scrollbar_offset))
 
     # Moves and sizes the current viewport's position such that it's start position is aligned with a specific start_time and its end position is aligned with a specific end_time. This also adjusts the zoom!
     def set_viewport_to_range(self, start_time, end_time):
@@ -1869,6 +2038,11 @@ class TimelineDrawingWindow(
 
     # Gets the start datetime aligned with the left edge of the viewport
     def get_viewport_active_start_time(self):
+        if TimelineDrawingWindow.UseVirtualTimelineCanvas:
+            # The scrollbar's value is exactly the contents offset of the canvas' left edge
+            return self.offset_to_datetime(
+                self.get_timeline_horizontal_scrollbar().value()
+            )
         track_offset_x = self.percent_offset_to_track_offset(
             self.get_viewport_percent_scrolled()
         )
@@ -1902,7 +2076,7 @@ class TimelineDrawingWindow(
         # Compute appropriate offset:
         found_x_offset = self.datetime_to_offset(safe_end_time)
         # print("TimelineDrawingWindow.sync_active_viewport_end_to_datetime(endTime: {0}): found_x_offset: {1}".format(str(safe_end_time), str(found_x_offset)))
-        self.timelineScroll.ensureVisible(found_x_offset, 0, 0, 0)
+        self.ensure_contents_offset_visible(found_x_offset)
 
         # Shouldn't be needed because it triggers self.on_viewport_slider_changd(...)
         # Not calling self.on_active_zoom_changed() results in the floating headers not redrawing until the mouse moves over them for some reason...
@@ -1961,8 +2135,8 @@ class TimelineDrawingWindow(
     ## Timeline Navigation:
     def on_jump_to_start(self):
         print("on_jump_to_start()")
-        self.timelineScroll.horizontalScrollBar().setValue(
-            self.timelineScroll.horizontalScrollBar().minimum()
+        self.get_timeline_horizontal_scrollbar().setValue(
+            self.get_timeline_horizontal_scrollbar().minimum()
         )
         self.on_active_zoom_changed()
 
@@ -2134,8 +2308,8 @@ class TimelineDrawingWindow(
     def on_jump_to_end(self):
         print("on_jump_to_end()")
         # verticalScrollBar()->setValue(ui->scrollArea->verticalScrollBar()->maximum());
-        self.timelineScroll.horizontalScrollBar().setValue(
-            self.timelineScroll.horizontalScrollBar().maximum()
+        self.get_timeline_horizontal_scrollbar().setValue(
+            self.get_timeline_horizontal_scrollbar().maximum()
         )
         self.on_active_zoom_changed()
 
@@ -2447,8 +2621,9 @@ class TimelineDrawingWindow(
         curr_datetime = self.offset_to_datetime(timeline_x_offset)
         self.get_reference_manager().on_update_indicator_video_playback(curr_datetime)
 
-        self.timelineMasterTrackWidget.on_update_video_line(timeline_x_offset)
-        self.extendedTracksContainer.on_update_video_line(timeline_x_offset)
+        canvas_x_offset = self.contents_offset_to_canvas_offset(timeline_x_offset)
+        self.timelineMasterTrackWidget.on_update_video_line(canvas_x_offset)
+        self.extendedTracksContainer.on_update_video_line(canvas_x_offset)
 
         self.extendedTracksContainer.blockSignals(False)
         self.timelineMasterTrackWidget.blockSignals(False)
@@ -2461,7 +2636,8 @@ class TimelineDrawingWindow(
         self.timelineMasterTrackWidget.blockSignals(True)
         self.extendedTracksContainer.blockSignals(True)
 
-        curr_datetime = self.offset_to_datetime(x)
+        # x is relative to the (possibly virtual) canvas
+        curr_datetime = self.offset_to_datetime(self.canvas_offset_to_contents_offset(x))
         self.get_reference_manager().on_update_indicator_hover(curr_datetime)
         self.timelineMasterTrackWidget.on_update_hover(x)
         self.extendedTracksContainer.on_update_hover(x)
@@ -2507,7 +2683,7 @@ class TimelineDrawingWindow(
         # Update the reference manager
         # self.referenceManager.update_next_unused_marker(x_offset)
         self.referenceManager.update_next_unused_marker(
-            desired_datetime, self.get_minimum_track_width()
+            desired_datetime, self.get_timeline_track_fixed_width()
         )
 
         self.timelineMasterTrackWidget.update()
@@ -2831,13 +3007,19 @@ class TimelineDrawingWindow(
                     str(proposed_video_file_path)
                 )
             )
-            # register the video duration object as a receiver of the thumbnail generation finished event
-            self.get_video_thumbnail_generator().videoThumbnailGenerationComplete.connect(
-                videoDurationObj.on_thumbnails_loaded
-            )
+            if videoDurationObj.thumbnailsVideoFilePath is None:
+                # register the video duration object as a receiver of the thumbnail generation finished (and evicted) events
+                videoDurationObj.thumbnailsVideoFilePath = str(proposed_video_file_path)
+                self.get_video_thumbnail_generator().videoThumbnailGenerationComplete.connect(
+                    videoDurationObj.on_thumbnails_loaded
+                )
+                self.get_video_thumbnail_generator().videoThumbnailsEvicted.connect(
+                    videoDurationObj.on_thumbnails_evicted
+                )
 
-            # Start thumbnail generation for this video file too:
-            self.get_video_thumbnail_generator().add_video_path(
+            # Start thumbnail generation for this video file too (served from the cache or the thumbnail store if they were already generated):
+            videoDurationObj.isThumbnailRequestPending = True
+            self.get_video_thumbnail_generator().request_video_thumbnails(
                 str(proposed_video_file_path)
             )
 
@@ -3119,7 +3301,9 @@ class TimelineDrawingWindow(
             self.updateViewportZoomFactorsUsingCurrentAdjustmentMode()
             self.activeZoomChanged.emit()
             self.activeViewportChanged.emit()
-            self.minimumTimelineTrackWidthChanged.emit(self.get_minimum_track_width())
+            self.minimumTimelineTrackWidthChanged.emit(
+                self.get_timeline_track_fixed_width()
+            )
             self.update()
 
     # Sets the self.activeViewportDuration, then calls the updateViewportZoomFactorsUsingCurrentAdjustmentMode() function to update the corresponding quantity. If the value changes, emits the appropriate signals
@@ -3136,7 +3320,9 @@ class TimelineDrawingWindow(
             self.updateViewportZoomFactorsUsingCurrentAdjustmentMode()
             self.activeZoomChanged.emit()
             self.activeViewportChanged.emit()
-            self.minimumTimelineTrackWidthChanged.emit(self.get_minimum_track_width())
+            self.minimumTimelineTrackWidthChanged.emit(
+                self.get_timeline_track_fixed_width()
+            )
             self.update()
 
     """ updateViewportZoomFactorsUsingCurrentAdjustmentMode()
@@ -3198,7 +3384,9 @@ class TimelineDrawingWindow(
         self.updateViewportZoomFactorsUsingCurrentAdjustmentMode()
         self.activeZoomChanged.emit()
         self.activeViewportChanged.emit()
-        self.minimumTimelineTrackWidthChanged.emit(self.get_minimum_track_width())
+        self.minimumTimelineTrackWidthChanged.emit(
+            self.get_timeline_track_fixed_width()
+        )
         self.update()
         return
 
@@ -3224,6 +3412,8 @@ class TimelineDrawingWindow(
         # Update the UI to reflect the changes
         self.refreshUI_viewport_zoom_controls()
         self.refreshUI_viewport_info_labels()
+        self.update_timeline_canvas_time_window()
+        self.update_track_record_pages()
 
         # self.timelineScroll.horizontalScrollBar().setPageStep()
 
@@ -3231,6 +3421,8 @@ class TimelineDrawingWindow(
     def on_viewport_slider_changd(self, newValue):
         # print("TimelineDrawingWindow.on_viewport_slider_changd({0})".format(str(newValue)))
         self.refreshUI_viewport_info_labels()
+        self.update_timeline_canvas_time_window()
+        self.update_track_record_pages()
         return
 
     @pyqtSlot(datetime, datetime, timedelta)
@@ -3339,6 +3531,11 @@ class TimelineDrawingWindow(
                 str(videoFileName)
             )
         )
+        if videoFileName in self.videoThumbnailPopoverShownFiles:
+            # Thumbnails that were re-requested after being evicted from the cache (e.g. by a track repaint)
+            return
+        self.videoThumbnailPopoverShownFiles.add(videoFileName)
+
         self.video_thumbnail_popover_window = QDialog(self)
         # self.video_thumbnail_popover_window.setCentr
         # A vertical box layout
@@ -3348,23 +3545,21 @@ class TimelineDrawingWindow(
         # desiredThumbnailSizeKey = "40"
         desiredThumbnailSizeKey = "160"
 
-        # for (aSearchPathIndex, aSearchPath) in enumerate(self.searchPaths):
-        for (key_path, cache_value) in (
-            self.get_video_thumbnail_generator().get_cache().items()
-        ):
-            # key_path: the video file path that had the thumbnails generated for it
-            print(
-                "thumbnail generation complete for [{0}]: {1} frames".format(
-                    str(key_path), len(cache_value)
-                )
+        print(
+            "thumbnail generation complete for [{0}]: {1} frames".format(
+                str(videoFileName), len(generated_thumbnails_list)
             )
-            for (index, aVideoThumbnailObj) in enumerate(cache_value):
-                currThumbsDict = aVideoThumbnailObj.get_thumbs_dict()
-                # currThumbnailImage: should be a QImage
-                currThumbnailImage = currThumbsDict[desiredThumbnailSizeKey]
-                w = QLabel()
-                w.setPixmap(QtGui.QPixmap.fromImage(currThumbnailImage))
-                thumbnailsLayout.addWidget(w)
+        )
+        for (index, aVideoThumbnailObj) in enumerate(generated_thumbnails_list):
+            currThumbsDict = aVideoThumbnailObj.get_thumbs_dict()
+            # currThumbnailImage: should be a QImage
+            if desiredThumbnailSizeKey not in currThumbsDict:
+                # The video is narrower than the thumbnail size
+                continue
+            currThumbnailImage = currThumbsDict[desiredThumbnailSizeKey]
+            w = QLabel()
+            w.setPixmap(QtGui.QPixmap.fromImage(currThumbnailImage))
+            thumbnailsLayout.addWidget(w)
 
         self.video_thumbnail_popover_window.setLayout(thumbnailsLayout)
         self.video_thumbnail_popover_window.show()
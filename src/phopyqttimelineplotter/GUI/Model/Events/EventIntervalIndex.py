@@ -0,0 +1,180 @@
+# EventIntervalIndex.py
+# Contains EventIntervalIndex, a start-time-sorted index over a track's event objects used to find the events within a time range without visiting all of them.
+# Deliberately has no Qt dependencies.
+
+from datetime import timedelta
+
+import numpy as np
+
+## IMPORT:
+# from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
+
+
+class EventIntervalIndex(object):
+    """EventIntervalIndex: a sorted index over the (startTime, endTime) intervals of a list of event objects (PhoDurationEvent or subclasses).
+
+    Times are stored as float seconds relative to the first event's startTime so that both naive and timezone-aware datetimes work (as long as they aren't mixed, which the painting code already requires).
+    Instantaneous events (endTime is None) are given their drawn extent of startTime + obj.computeDuration().
+
+    Range queries binary-search the sorted start times, and use a running maximum of the end times to skip the events that end before the range starts, so long events that begin before the range are still found.
+    All returned indicies are indicies into the original (unsorted) list of objects.
+    """
+
+    def __init__(self, events, reference_datetime=None, start_offsets=None, end_offsets=None):
+        """events: the event objects to index. If start_offsets and end_offsets (float seconds relative to reference_datetime) are provided they're used instead of reading the objects' times, in which case events only needs a len(...) (e.g. an EventTable)."""
+        super(EventIntervalIndex, self).__init__()
+        self.source = events
+        self.num_events = len(events)
+        if start_offsets is not None:
+            self.reference_datetime = reference_datetime
+            self.build_sorted_offsets(
+                np.asarray(start_offsets, dtype=np.float64),
+                np.asarray(end_offsets, dtype=np.float64),
+            )
+            return
+
+        if self.num_events > 0:
+            self.reference_datetime = events[0].startTime
+        else:
+            self.reference_datetime = None
+
+        one_second = timedelta(seconds=1)
+        start_offsets = np.fromiter(
+            ((obj.startTime - self.reference_datetime) / one_second for obj in events),
+            dtype=np.float64,
+            count=self.num_events,
+        )
+        durations = np.fromiter(
+            (obj.computeDuration() / one_second for obj in events),
+            dtype=np.float64,
+            count=self.num_events,
+        )
+        self.build_sorted_offsets(start_offsets, start_offsets + durations)
+
+    # build_sorted_offsets(start_offsets, end_offsets): builds the start-sorted arrays the queries binary-search
+    def build_sorted_offsets(self, start_offsets, end_offsets):
+        # The stable sort keeps events with equal start times in their original order
+        self.sort_order = np.argsort(start_offsets, kind="stable")
+        self.start_offsets = start_offsets
+        self.end_offsets = end_offsets
+        self.sorted_start_offsets = start_offsets[self.sort_order]
+        self.sorted_end_offsets = self.end_offsets[self.sort_order]
+        # running_max_end_offsets[i]: the latest end of any of the first i + 1 events (in start order). Non-decreasing, so it can be binary-searched.
+        self.running_max_end_offsets = np.maximum.accumulate(self.sorted_end_offsets)
+
+    def __len__(self):
+        return self.num_events
+
+    # is_valid_for(events): returns True if the index was built from this same list of events and it hasn't been added to since
+    def is_valid_for(self, events):
+        return (self.source is events) and (self.num_events == len(events))
+
+    # build_if_needed(existing_index, events): returns existing_index if it's still valid for events, otherwise a newly built index
+    @staticmethod
+    def build_if_needed(existing_index, events):
+        if (existing_index is not None) and existing_index.is_valid_for(events):
+            return existing_index
+        return EventIntervalIndex(events)
+
+    # datetime_to_offset(a_datetime): converts a datetime to the index's relative float seconds
+    def datetime_to_offset(self, a_datetime):
+        return (a_datetime - self.reference_datetime) / timedelta(seconds=1)
+
+    # find_overlapping_indicies(range_start_datetime, range_end_datetime): returns the indicies of the events that overlap the closed range, in order of their start times
+    def find_overlapping_indicies(self, range_start_datetime, range_end_datetime):
+        if self.num_events == 0:
+            return np.zeros((0,), dtype=np.intp)
+        range_start_offset = self.datetime_to_offset(range_start_datetime)
+        range_end_offset = self.datetime_to_offset(range_end_datetime)
+        # Events before first_candidate (in start order) all end before the range starts, and events from last_candidate on all start after it ends
+        first_candidate = np.searchsorted(
+            self.running_max_end_offsets, range_start_offset, side="left"
+        )
+        last_candidate = np.searchsorted(
+            self.sorted_start_offsets, range_end_offset, side="right"
+        )
+        if first_candidate >= last_candidate:
+            return np.zeros((0,), dtype=np.intp)
+        candidate_slice = slice(first_candidate, last_candidate)
+        is_overlapping = self.sorted_end_offsets[candidate_slice] >= range_start_offset
+        return self.sort_order[candidate_slice][is_overlapping]
+
+    # find_next_index(following_datetime): returns the index of the earliest-starting event that starts strictly after following_datetime, or None
+    def find_next_index(self, following_datetime):
+        if self.num_events == 0:
+            return None
+        sorted_position = np.searchsorted(
+            self.sorted_start_offsets,
+            self.datetime_to_offset(following_datetime),
+            side="right",
+        )
+        if sorted_position >= self.num_events:
+            return None
+        return int(self.sort_order[sorted_position])
+
+    # find_previous_index(preceeding_datetime): walking the events in start order, returns the index of the last one before the first event that doesn't end strictly before preceeding_datetime, or None
+    def find_previous_index(self, preceeding_datetime):
+        if self.num_events == 0:
+            return None
+        # Every event in start order before this position (and no others from there on) ends before preceeding_datetime
+        num_ended_events = np.searchsorted(
+            self.running_max_end_offsets,
+            self.datetime_to_offset(preceeding_datetime),
+            side="left",
+        )
+        if num_ended_events == 0:
+            return None
+        return int(self.sort_order[num_ended_events - 1])
+
+    # compute_overlap_counts(): sweep-line over the events in start order. Returns, for each event (in original order), the number of later-starting events that start before it ends.
+    def compute_overlap_counts(self):
+        sorted_overlap_counts = np.searchsorted(
+            self.sorted_start_offsets, self.sorted_end_offsets, side="left"
+        ) - np.arange(1, self.num_events + 1)
+        overlap_counts = np.zeros((self.num_events,), dtype=np.int64)
+        overlap_counts[self.sort_order] = np.maximum(sorted_overlap_counts, 0)
+        return overlap_counts
+
+    # compute_pixel_extents(totalStartTime, totalDuration, totalParentWidth): returns the EventPixelExtents of every event's rect, matching PhoDurationEvent.compute_parent_offset_rect(...)
+    def compute_pixel_extents(self, totalStartTime, totalDuration, totalParentWidth):
+        if self.num_events == 0:
+            return EventPixelExtents(
+                np.zeros((0,), dtype=np.int64),
+                np.zeros((0,), dtype=np.int64),
+                self.sort_order,
+            )
+        total_duration_seconds = totalDuration / timedelta(seconds=1)
+        pixels_per_second = float(totalParentWidth) / total_duration_seconds
+        total_start_offset = self.datetime_to_offset(totalStartTime)
+        x = np.trunc((self.start_offsets - total_start_offset) * pixels_per_second)
+        width = np.trunc((self.end_offsets - self.start_offsets) * pixels_per_second)
+        return EventPixelExtents(x.astype(np.int64), width.astype(np.int64), self.sort_order)
+
+
+class EventPixelExtents(object):
+    """EventPixelExtents: the horizontal [x, x + width) pixel extents of a list of events at one zoom level, as computed by EventIntervalIndex.compute_pixel_extents(...).
+
+    Since x is non-decreasing in start order, the same running-maximum trick as EventIntervalIndex lets the events under a pixel be found by binary search.
+    """
+
+    def __init__(self, x, width, sort_order):
+        super(EventPixelExtents, self).__init__()
+        self.x = x
+        self.width = width
+        self.sort_order = sort_order
+        self.sorted_x = x[sort_order]
+        self.sorted_right = (x + width)[sort_order]
+        self.running_max_right = np.maximum.accumulate(self.sorted_right)
+
+    def __len__(self):
+        return len(self.x)
+
+    # find_indicies_containing(pixel_x): returns the indicies of the events whose extents contain pixel_x, in their original order
+    def find_indicies_containing(self, pixel_x):
+        first_candidate = np.searchsorted(self.running_max_right, pixel_x, side="right")
+        last_candidate = np.searchsorted(self.sorted_x, pixel_x, side="right")
+        if first_candidate >= last_candidate:
+            return np.zeros((0,), dtype=np.intp)
+        candidate_slice = slice(first_candidate, last_candidate)
+        is_containing = self.sorted_right[candidate_slice] > pixel_x
+        return np.sort(self.sort_order[candidate_slice][is_containing])
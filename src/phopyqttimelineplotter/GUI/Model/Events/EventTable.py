@@ -0,0 +1,227 @@
+# EventTable.py
+# Contains EventTable, a columnar (numpy) store of a track's events, and EventTableViewList, which only builds a view object for an event once it's actually accessed.
+# Deliberately has no Qt dependencies; the track that owns the table does the painting and provides the function that builds the views.
+
+from datetime import timedelta
+
+import numpy as np
+
+from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
+
+## IMPORT:
+# from phopyqttimelineplotter.GUI.Model.Events.EventTable import EventTable, EventTableViewList
+
+
+class EventTable(object):
+    """EventTable: the events of a track stored as parallel numpy columns instead of one PhoDurationEvent (QWidget) per event.
+
+    Columns (one entry per event, in the order of the records they were built from):
+        start_offsets, end_offsets: float64 seconds relative to reference_datetime. Instantaneous events (end_date is None) are given their drawn extent of start + instantaneous_event_duration.
+        variable_ids: int32 indicies into variable_names
+        color_indicies: int32 indicies into colors
+        flags: uint8 bitmask of the Flag* values below
+
+    The records the table was built from are kept (by reference) so a view can still be built for any single event on demand.
+    """
+
+    FlagInstantaneous = 1
+    FlagDeemphasized = 2
+
+    def __init__(
+        self,
+        reference_datetime,
+        start_offsets,
+        end_offsets,
+        variable_ids,
+        variable_names,
+        color_indicies,
+        colors,
+        flags,
+        records=None,
+    ):
+        super(EventTable, self).__init__()
+        self.reference_datetime = reference_datetime
+        self.start_offsets = start_offsets
+        self.end_offsets = end_offsets
+        self.variable_ids = variable_ids
+        self.variable_names = variable_names
+        self.color_indicies = color_indicies
+        self.colors = colors
+        self.flags = flags
+        self.records = records
+        self.interval_index = None
+
+    def __len__(self):
+        return len(self.start_offsets)
+
+    @staticmethod
+    def from_records(records, instantaneous_event_duration):
+        """Builds an EventTable from records with start_date, end_date, variable_name and variable_color attributes (e.g. FilesystemDataEvent_Record)"""
+        num_events = len(records)
+        reference_datetime = records[0].start_date if num_events > 0 else None
+        one_second = timedelta(seconds=1)
+        instantaneous_duration_seconds = instantaneous_event_duration / one_second
+
+        start_offsets = np.empty((num_events,), dtype=np.float64)
+        end_offsets = np.empty((num_events,), dtype=np.float64)
+        variable_ids = np.empty((num_events,), dtype=np.int32)
+        color_indicies = np.empty((num_events,), dtype=np.int32)
+        flags = np.zeros((num_events,), dtype=np.uint8)
+
+        variable_names = []
+        variable_name_ids = dict()
+        colors = []
+        # The records of a variable almost always share one color object, so the last color seen for each variable is checked first
+        last_variable_colors = dict()
+        for (index, aRecord) in enumerate(records):
+            start_offsets[index] = (aRecord.start_date - reference_datetime) / one_second
+            if aRecord.end_date is None:
+                end_offsets[index] = start_offsets[index] + instantaneous_duration_seconds
+                flags[index] = EventTable.FlagInstantaneous
+            else:
+                end_offsets[index] = (aRecord.end_date - reference_datetime) / one_second
+
+            variable_id = variable_name_ids.get(aRecord.variable_name, None)
+            if variable_id is None:
+                variable_id = len(variable_names)
+                variable_name_ids[aRecord.variable_name] = variable_id
+                variable_names.append(aRecord.variable_name)
+            variable_ids[index] = variable_id
+
+            last_color = last_variable_colors.get(variable_id, None)
+            if (last_color is not None) and (
+                (last_color[0] is aRecord.variable_color)
+                or (last_color[0] == aRecord.variable_color)
+            ):
+                color_indicies[index] = last_color[1]
+            else:
+                color_index = EventTable.find_color_index(colors, aRecord.variable_color)
+                last_variable_colors[variable_id] = (aRecord.variable_color, color_index)
+                color_indicies[index] = color_index
+
+        return EventTable(
+            reference_datetime,
+            start_offsets,
+            end_offsets,
+            variable_ids,
+            variable_names,
+            color_indicies,
+            colors,
+            flags,
+            records=records,
+        )
+
+    # find_color_index(colors, color): returns the index of color in the colors palette, appending it if it isn't there yet. Colors are compared with == since QColors aren't hashable.
+    @staticmethod
+    def find_color_index(colors, color):
+        for (color_index, aColor) in enumerate(colors):
+            if aColor == color:
+                return color_index
+        colors.append(color)
+        return len(colors) - 1
+
+    # get_interval_index(): returns the EventIntervalIndex of the table's events, building it on first use
+    def get_interval_index(self):
+        if self.interval_index is None:
+            self.interval_index = EventIntervalIndex(
+                self,
+                reference_datetime=self.reference_datetime,
+                start_offsets=self.start_offsets,
+                end_offsets=self.end_offsets,
+            )
+        return self.interval_index
+
+    def get_record(self, index):
+        if self.records is None:
+            return None
+        return self.records[index]
+
+    def get_start_datetime(self, index):
+        return self.reference_datetime + timedelta(seconds=float(self.start_offsets[index]))
+
+    # get_end_datetime(index): returns the event's end datetime, or None for an instantaneous event
+    def get_end_datetime(self, index):
+        if self.is_instantaneous(index):
+            return None
+        return self.reference_datetime + timedelta(seconds=float(self.end_offsets[index]))
+
+    def is_instantaneous(self, index):
+        return bool(self.flags[index] & EventTable.FlagInstantaneous)
+
+    def is_deemphasized(self, index):
+        return bool(self.flags[index] & EventTable.FlagDeemphasized)
+
+    # compute_overlaps_range(range_start_datetime, range_end_datetime): returns a boolean column that's True for the events overlapping the range, with the same semantics as PhoDurationEvent.overlaps_range(...) (instantaneous events only overlap if they start within it)
+    def compute_overlaps_range(self, range_start_datetime, range_end_datetime):
+        if len(self) == 0:
+            return np.zeros((0,), dtype=bool)
+        one_second = timedelta(seconds=1)
+        range_start_offset = (range_start_datetime - self.reference_datetime) / one_second
+        range_end_offset = (range_end_datetime - self.reference_datetime) / one_second
+        logical_end_offsets = np.where(
+            (self.flags & EventTable.FlagInstantaneous) != 0,
+            self.start_offsets,
+            self.end_offsets,
+        )
+        return (self.start_offsets <= range_end_offset) & (
+            logical_end_offsets >= range_start_offset
+        )
+
+    # set_deemphasized(is_deemphasized): sets the FlagDeemphasized of every event from the boolean column is_deemphasized
+    def set_deemphasized(self, is_deemphasized):
+        self.flags[is_deemphasized] |= EventTable.FlagDeemphasized
+        self.flags[~is_deemphasized] &= ~np.uint8(EventTable.FlagDeemphasized)
+
+    # get_size_bytes(): the memory used by the table's columns (not counting the referenced records)
+    def get_size_bytes(self):
+        return (
+            self.start_offsets.nbytes
+            + self.end_offsets.nbytes
+            + self.variable_ids.nbytes
+            + self.color_indicies.nbytes
+            + self.flags.nbytes
+        )
+
+
+class EventTableViewList(object):
+    """EventTableViewList: a list-like stand-in for a track's durationObjects that builds the view object for an event the first time it's indexed.
+
+    The tracks paint straight from the EventTable, so views are only built for the events the user hovers, selects, or opens the context menu on.
+    build_view_fn(index) is called to build the view for the event at index; built views are kept until clear() is called.
+    Note that iterating builds every view, so hot paths should use the EventTable instead.
+    """
+
+    def __init__(self, event_table, build_view_fn):
+        super(EventTableViewList, self).__init__()
+        self.event_table = event_table
+        self.build_view_fn = build_view_fn
+        self.built_views = dict()  # index: view
+
+    def __len__(self):
+        return len(self.event_table)
+
+    def __getitem__(self, index):
+        index = int(index)
+        if index < 0:
+            index = index + len(self)
+        if (index < 0) or (index >= len(self)):
+            raise IndexError("EventTableViewList index out of range")
+        view = self.built_views.get(index, None)
+        if view is None:
+            view = self.build_view_fn(index)
+            self.built_views[index] = view
+        return view
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    # get_built_view(index): returns the view for index if it's already been built, otherwise None (without building it)
+    def get_built_view(self, index):
+        return self.built_views.get(int(index), None)
+
+    def get_built_views(self):
+        return list(self.built_views.items())
+
+    def clear(self):
+        self.built_views.clear()
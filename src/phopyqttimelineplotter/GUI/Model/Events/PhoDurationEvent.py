@@ -264,33 +264,41 @@ class PhoDurationEvent(
 
     # Sets the painter's config based on the current object's state (active, emphasized, deemph, etc)
     def set_painter_config(self, aPainter):
-        currFillColor = self.color
-
-        currPenColor = PhoDurationEvent.ColorBorderBase
-        currPenWidth = 1.0
-
-        currActiveBrush = None
-        currActivePen = None
+        (currActivePen, currActiveBrush) = PhoDurationEvent.get_state_pen_and_brush(
+            self.color,
+            self.is_instantaneous_event(),
+            self.is_deemphasized,
+            self.is_emphasized,
+            self.is_active,
+        )
+        aPainter.setPen(currActivePen)
+        aPainter.setBrush(currActiveBrush)
+        return
 
-        if self.is_deemphasized:
-            currFillColor = Qt.lightGray
+    # get_state_pen_and_brush(...): returns the (pen, brush) used to draw an event of the given color in the given state. Shared with the tracks that paint events straight from an EventTable.
+    @staticmethod
+    def get_state_pen_and_brush(
+        color, is_instantaneous, is_deemphasized, is_emphasized, is_active
+    ):
+        if is_deemphasized:
+            currFillColor = QColor(Qt.lightGray)
             currFillColor.setAlpha(PhoEvent.DeEmphOpacity)
         else:
             # de-emphasized overrides emphasized status
-            if self.is_emphasized:
-                currFillColor = PhoDurationEvent.ColorEmph
+            if is_emphasized:
+                currFillColor = QColor(PhoDurationEvent.ColorEmph)
             else:
-                currFillColor = self.color
+                currFillColor = QColor(color)
 
             currFillColor.setAlpha(PhoEvent.DefaultOpacity)
 
         # Override if active (selected)
-        if self.is_active:
+        if is_active:
             currPenWidth = 4.0
             currPenColor = (
                 PhoDurationEvent.ColorBorderActive
             )  # For active events, override the pen color too
-            currFillColor = (
+            currFillColor = QColor(
                 PhoDurationEvent.ColorActive
             )  # For active events, override the color with the current active color
             currFillColor.setAlpha(PhoEvent.ActiveOpacity)
@@ -300,10 +308,10 @@ class PhoDurationEvent(
             currPenColor = PhoDurationEvent.ColorBorderBase
 
         # Instantaneous type event: for instantaneous events, we must render them in their characteristic color (which is the fill color) with a fixed width so they can be visible and recognized
-        if self.is_instantaneous_event():
+        if is_instantaneous:
 
             # painter.setPen(Qt.NoPen)
-            if self.is_emphasized:
+            if is_emphasized:
                 currPenWidth = 1.0
             else:
                 currPenWidth = 0.2
@@ -314,10 +322,7 @@ class PhoDurationEvent(
 
         currActivePen = QtGui.QPen(currPenColor, currPenWidth, join=Qt.MiterJoin)
         currActiveBrush = QBrush(currFillColor, Qt.SolidPattern)
-
-        aPainter.setPen(currActivePen)
-        aPainter.setBrush(currActiveBrush)
-        return
+        return (currActivePen, currActiveBrush)
 
     # "pass": specifies that we're leaving this method "virtual" or intensionally empty to be overriden by a subclass.
     def paint(
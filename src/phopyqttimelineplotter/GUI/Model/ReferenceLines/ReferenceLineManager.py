@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 # ReferenceLineManager.py
+import bisect
 import os
 import queue
 import sys
@@ -171,6 +172,13 @@ class ReferenceMarkerManager(IndicatorLineMixin, DurationRepresentationMixin, QO
 
         self.staticDaysMarkerData = []
         self.staticMinorMarkerData = []
+        # The sorted times of the static markers, to find the ones within the displayed time window by binary search
+        self.staticDaysMarkerTimes = []
+        self.staticMinorMarkerTimes = []
+        # Incremented whenever the static markers are rebuilt, so the widgets drawing them know to drop their cached tiles
+        self.staticMarkerDataVersion = 0
+        # The (start, end) of the time spanned by drawWidth, or None if it spans the whole timeline (see DurationRepresentationMixin)
+        self.displayedTimeWindow = None
 
         # RepresentedMarkerTime
         self.activeMarkersWindow = None
@@ -283,12 +291,54 @@ class ReferenceMarkerManager(IndicatorLineMixin, DurationRepresentationMixin, QO
             # print(newObj.time_string)
             self.staticMinorMarkerData.append(newObj)
 
+        self.staticDaysMarkerTimes = [
+            aMarkerData.time for aMarkerData in self.staticDaysMarkerData
+        ]
+        self.staticMinorMarkerTimes = [
+            aMarkerData.time for aMarkerData in self.staticMinorMarkerData
+        ]
+        self.staticMarkerDataVersion += 1
+
+    def get_static_marker_data_version(self):
+        return self.staticMarkerDataVersion
+
     def get_static_major_marker_data(self):
         return self.staticDaysMarkerData
 
     def get_static_minor_marker_data(self):
         return self.staticMinorMarkerData
 
+    # get_marker_data_in_range(markerData, markerTimes, start_time, end_time): returns the items of markerData whose (sorted) markerTimes are within [start_time, end_time]
+    @staticmethod
+    def get_marker_data_in_range(markerData, markerTimes, start_time, end_time):
+        start_index = bisect.bisect_left(markerTimes, start_time)
+        end_index = bisect.bisect_right(markerTimes, end_time)
+        return markerData[start_index:end_index]
+
+    def get_static_major_marker_data_in_range(self, start_time, end_time):
+        return ReferenceMarkerManager.get_marker_data_in_range(
+            self.staticDaysMarkerData, self.staticDaysMarkerTimes, start_time, end_time
+        )
+
+    def get_static_minor_marker_data_in_range(self, start_time, end_time):
+        return ReferenceMarkerManager.get_marker_data_in_range(
+            self.staticMinorMarkerData, self.staticMinorMarkerTimes, start_time, end_time
+        )
+
+    # get_displayed_static_major_marker_data(margin_duration): the static major markers within the displayed time window, extended by margin_duration on each side (for labels centered just off the edge)
+    def get_displayed_static_major_marker_data(self, margin_duration=timedelta(0)):
+        return self.get_static_major_marker_data_in_range(
+            self.get_displayed_start_time() - margin_duration,
+            self.get_displayed_end_time() + margin_duration,
+        )
+
+    # get_displayed_static_minor_marker_data(margin_duration): the static minor markers within the displayed time window, extended by margin_duration on each side
+    def get_displayed_static_minor_marker_data(self, margin_duration=timedelta(0)):
+        return self.get_static_minor_marker_data_in_range(
+            self.get_displayed_start_time() - margin_duration,
+            self.get_displayed_end_time() + margin_duration,
+        )
+
     ## Special Indicator Reference Markers
     """
         Like current user hovered position, current user selected position, or current video playback time.
@@ -424,9 +474,9 @@ class ReferenceMarkerManager(IndicatorLineMixin, DurationRepresentationMixin, QO
     def percent_offset_to_track_offset(drawWidth, track_percent):
         return float(drawWidth) * float(track_percent)
 
-    # compute_x_offset_from_datetime(aDatetime): depends on current duration and width
+    # compute_x_offset_from_datetime(aDatetime): depends on the displayed time window and width
     def compute_x_offset_from_datetime(self, drawWidth, aDatetime):
-        item_percent_offset = self.datetime_to_percent(aDatetime)
+        item_percent_offset = self.datetime_to_displayed_percent(aDatetime)
         item_x_offset = ReferenceMarkerManager.percent_offset_to_track_offset(
             drawWidth, item_percent_offset
         )
@@ -538,6 +588,11 @@ class ReferenceMarkerManager(IndicatorLineMixin, DurationRepresentationMixin, QO
         # self.update()
         return
 
+    # overrides DurationRepresentationMixin.set_displayed_time_window(...) to recompute the marker positions on the next draw
+    def set_displayed_time_window(self, displayed_start_time, displayed_end_time):
+        super().set_displayed_time_window(displayed_start_time, displayed_end_time)
+        self.needs_positions_update = True
+
     # Called on the width changing
     @pyqtSlot(float)
     def set_fixed_width(self, newWidth):
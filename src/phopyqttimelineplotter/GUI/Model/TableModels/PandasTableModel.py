@@ -1,6 +1,5 @@
 import sys
 
-import pandas as pd
 from PyQt5.QtCore import QAbstractTableModel, Qt
 from PyQt5.QtWidgets import QApplication, QTableView
 
@@ -0,0 +1,140 @@
+# TimestampCountPyramid.py
+# Contains TimestampCountPyramid, a multi-resolution summary of a series of event timestamps used to draw dense data tracks at a level of detail that matches the current zoom.
+# Deliberately has no Qt dependencies.
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+## IMPORT:
+# from phopyqttimelineplotter.GUI.Model.TimestampCountPyramid import TimestampCountPyramid
+
+
+class TimestampCountPyramid(object):
+    """TimestampCountPyramid: per-bin event counts of a sorted array of timestamps (float seconds since the epoch) at a series of resolutions.
+
+    Level 0 has the finest bins, and each level above it merges pairs of bins from the level below, so level k has bins of base_bin_seconds * 2^k.
+    The pyramid is built once; get_display_data(...) then returns either the raw timestamps (when few enough are visible) or the non-empty bins of the coarsest level that's still at least as fine as one pixel.
+    """
+
+    # Bounds the memory used by the finest level (and so by the whole pyramid, which is at most twice that)
+    max_base_level_bins = 2**18
+    min_base_bin_seconds = 0.001
+
+    def __init__(self, timestamps):
+        super(TimestampCountPyramid, self).__init__()
+        self.timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
+        self.levels = []
+        self.level_bin_seconds = []
+        if len(self.timestamps) == 0:
+            self.origin = 0.0
+            self.base_bin_seconds = TimestampCountPyramid.min_base_bin_seconds
+            return
+
+        self.origin = self.timestamps[0]
+        total_span_seconds = self.timestamps[-1] - self.origin
+        self.base_bin_seconds = max(
+            total_span_seconds / TimestampCountPyramid.max_base_level_bins,
+            TimestampCountPyramid.min_base_bin_seconds,
+        )
+        num_base_bins = int(total_span_seconds // self.base_bin_seconds) + 1
+        base_bin_indicies = np.minimum(
+            ((self.timestamps - self.origin) // self.base_bin_seconds).astype(np.int64),
+            num_base_bins - 1,
+        )
+        curr_level = np.bincount(base_bin_indicies, minlength=num_base_bins).astype(np.int32)
+        curr_bin_seconds = self.base_bin_seconds
+        self.levels.append(curr_level)
+        self.level_bin_seconds.append(curr_bin_seconds)
+        while len(curr_level) > 1:
+            if (len(curr_level) % 2) == 1:
+                curr_level = np.append(curr_level, np.int32(0))
+            curr_level = curr_level.reshape(-1, 2).sum(axis=1, dtype=np.int32)
+            curr_bin_seconds = curr_bin_seconds * 2.0
+            self.levels.append(curr_level)
+            self.level_bin_seconds.append(curr_bin_seconds)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def num_levels(self):
+        return len(self.levels)
+
+    # get_level_for_resolution(seconds_per_pixel): returns the coarsest level whose bins are no wider than seconds_per_pixel (or 0 if even the finest level's are wider)
+    def get_level_for_resolution(self, seconds_per_pixel):
+        if self.num_levels == 0:
+            return None
+        level_index = (
+            np.searchsorted(self.level_bin_seconds, seconds_per_pixel, side="right") - 1
+        )
+        return int(max(level_index, 0))
+
+    # count_in_range(x_min, x_max): returns the number of raw timestamps within the closed range
+    def count_in_range(self, x_min, x_max):
+        return int(
+            np.searchsorted(self.timestamps, x_max, side="right")
+            - np.searchsorted(self.timestamps, x_min, side="left")
+        )
+
+    # choose_level(x_min, x_max, pixel_width, max_raw_points): returns the level to draw the range [x_min, x_max] across pixel_width pixels at.
+    #   Returns None (meaning the raw timestamps) whenever there are no more than max_raw_points of them in the range.
+    def choose_level(self, x_min, x_max, pixel_width, max_raw_points):
+        if self.count_in_range(x_min, x_max) <= max_raw_points:
+            return None
+        seconds_per_pixel = (x_max - x_min) / max(float(pixel_width), 1.0)
+        return self.get_level_for_resolution(seconds_per_pixel)
+
+    # get_level_data(level, x_min, x_max): returns (x, counts) for the range [x_min, x_max] at level.
+    #   For level None these are the raw timestamps (each with a count of 1), otherwise only the non-empty bins are returned, with x at the center of each bin.
+    def get_level_data(self, level, x_min, x_max):
+        if level is None:
+            first_raw_index = np.searchsorted(self.timestamps, x_min, side="left")
+            last_raw_index = np.searchsorted(self.timestamps, x_max, side="right")
+            raw_x = self.timestamps[first_raw_index:last_raw_index]
+            return (raw_x, np.ones(len(raw_x), dtype=np.int32))
+
+        level_counts = self.levels[level]
+        bin_seconds = self.level_bin_seconds[level]
+        first_bin = max(int((x_min - self.origin) // bin_seconds), 0)
+        last_bin = min(int((x_max - self.origin) // bin_seconds) + 1, len(level_counts))
+        if (x_max < x_min) or (first_bin >= last_bin):
+            return (np.zeros((0,), dtype=np.float64), np.zeros((0,), dtype=np.int32))
+        visible_counts = level_counts[first_bin:last_bin]
+        non_empty_bins = np.flatnonzero(visible_counts)
+        x = self.origin + ((non_empty_bins + first_bin) + 0.5) * bin_seconds
+        return (x, visible_counts[non_empty_bins])
+
+    # get_display_data(x_min, x_max, pixel_width, max_raw_points): returns (level, x, counts) for the range [x_min, x_max] drawn across pixel_width pixels
+    def get_display_data(self, x_min, x_max, pixel_width, max_raw_points):
+        level = self.choose_level(x_min, x_max, pixel_width, max_raw_points)
+        (x, counts) = self.get_level_data(level, x_min, x_max)
+        return (level, x, counts)
+
+    # get_count_stems(x, counts): returns (stem_x, stem_y) that draw each point as a vertical line from 0 up to its count when plotted with connect="pairs"
+    @staticmethod
+    def get_count_stems(x, counts):
+        stem_x = np.repeat(np.asarray(x, dtype=np.float64), 2)
+        stem_y = np.zeros((len(stem_x),), dtype=np.float64)
+        stem_y[1::2] = counts
+        return (stem_x, stem_y)
+
+    # local_datetimes_to_timestamps(datetimes): converts naive local datetimes to float seconds since the epoch, equivalent to time.mktime(aDatetime.timetuple()) (but keeping sub-second precision).
+    #   mktime is only called once per distinct hour, which keeps the same DST handling.
+    @staticmethod
+    def local_datetimes_to_timestamps(datetimes):
+        local_values = np.asarray(datetimes, dtype="datetime64[us]")
+        if local_values.size == 0:
+            return np.zeros((0,), dtype=np.float64)
+        local_hours = local_values.astype("datetime64[h]")
+        (unique_hours, hour_indicies) = np.unique(local_hours, return_inverse=True)
+        unique_hour_timestamps = np.array(
+            [
+                time.mktime(anHour.astype(datetime).timetuple())
+                for anHour in unique_hours.astype("datetime64[s]")
+            ],
+            dtype=np.float64,
+        )
+        seconds_into_hour = (local_values - local_hours).astype(np.int64) / 1e6
+        return unique_hour_timestamps[hour_indicies.ravel()] + seconds_into_hour
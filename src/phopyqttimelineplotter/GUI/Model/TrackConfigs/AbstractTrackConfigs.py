@@ -3,9 +3,12 @@ from pathlib import Path
 
 import numpy as np
 from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import *
-from PyQt5.QtCore import QEvent, QObject, QPoint, QRect, Qt, pyqtSignal
+from PyQt5.QtCore import QEvent, QObject, QPoint, QRect, Qt, QThreadPool, pyqtSignal, pyqtSlot
+from sqlalchemy.orm.util import identity_key
 
+from phopyqttimelineplotter.app.filesystem.Workers.FilesystemWorkersBase import FilesystemWorkersBase
 from phopyqttimelineplotter.GUI.Model.ModelViewContainer import ModelViewContainer
+from phopyqttimelineplotter.GUI.Model.TrackConfigs.TrackRecordPageCache import TrackRecordPageCache
 
 # INCLUDE:
 # from phopyqttimelineplotter.GUI.Model.TrackConfigs.AbstractTrackConfigs import TrackConfigurationBase, TrackCache, TrackFilterBase
@@ -62,6 +65,20 @@ class TrackFilterBase(QObject):
     def build_filter(self, session):
         return self.build_filter_query(session).all()
 
+    # Returns the filter query limited to the records overlapping [range_start, range_end] (see StartEndDatetimeMixin.filter_overlapping_range(...))
+    def build_window_filter_query(self, session, range_start, range_end):
+        return self.trackRecordClass.filter_overlapping_range(
+            self.build_filter_query(session), session, range_start, range_end
+        )
+
+    # Returns only the records overlapping [range_start, range_end], sorted by the start_date field
+    def build_window_filter(self, session, range_start, range_end):
+        return (
+            self.build_window_filter_query(session, range_start, range_end)
+            .order_by(self.trackRecordClass.start_date)
+            .all()
+        )
+
     def _get_behavioral_box_ids_str(
         self,
         noneString="Any",
@@ -255,6 +272,10 @@ class TrackConfigurationBase(QObject):
 
     cacheUpdated = pyqtSignal()
 
+    # The pages of records are fetched on this pool, shared by all the tracks (see request_viewport_records(...))
+    record_page_threadpool = None
+    max_record_page_threads = 2
+
     def __init__(
         self,
         trackIndex,
@@ -282,12 +303,28 @@ class TrackConfigurationBase(QObject):
             parent=parent,
         )
         self.cache = TrackCache([], parent=parent)
+        # loadingWindow: None to load all the records matching the filter, or a (range_start, range_end) tuple to only load the ones overlapping it
+        self.loadingWindow = None
+
+        # Paging (only used if get_should_page_records() is True):
+        self.pageCache = None  # The TrackRecordPageCache, created for the first viewport
+        self.pageGeneration = 0  # Incremented whenever the loaded pages are discarded, so that results for the old pages are ignored
+        self.pendingPageIndicies = set()
+        self.pagedModelViewContainers = dict()  # record id: ModelViewContainer, so each record's view is only built once
+        self.pagingDatabaseConnection = None
+        self.pagingOwningTrack = None
+        self.pagingViewport = None  # The last requested (viewport_start, viewport_end)
 
     # get_should_auto_build_gui_views(): true if the gui views should automatically be built from the records after a reload(...) command
     # can be overriden by children if we don't want the GUI views auto-built
     def get_should_auto_build_gui_views(self):
         return True
 
+    # get_should_page_records(): true if the records should be loaded a page at a time around the viewport (see request_viewport_records(...)) rather than all at once by reload(...)
+    # The partition tracks build their partitions across the whole timeline, so only the tracks that build a view for each record are paged
+    def get_should_page_records(self):
+        return self.get_should_auto_build_gui_views()
+
     def get_track_id(self):
         return self.trackIndex
 
@@ -313,10 +350,37 @@ class TrackConfigurationBase(QObject):
         return self.get_filter().get_track_type().get_default_track_height()
 
     def filter_records(self, session):
-        return self.get_filter().build_filter(session)
+        if self.loadingWindow is None:
+            return self.get_filter().build_filter(session)
+        else:
+            (range_start, range_end) = self.loadingWindow
+            return self.get_filter().build_window_filter(session, range_start, range_end)
+
+    def get_loading_window(self):
+        return self.loadingWindow
+
+    # set_loading_window(range_start, range_end): limits the records loaded by the next reload(...) to those overlapping the range. Pass None for both to load all the records again.
+    def set_loading_window(self, range_start, range_end):
+        if (range_start is None) or (range_end is None):
+            self.loadingWindow = None
+        else:
+            self.loadingWindow = (range_start, range_end)
 
     # reload(...): called when the filter is changed to update the cache (reloading the records from the database) as needed
+    # Paged tracks discard their pages and fetch the ones for the last requested viewport again
     def reload(self, session, owning_parent_track):
+        if self.get_should_page_records():
+            self.reset_pages()
+            if self.pagingViewport is not None:
+                (viewport_start, viewport_end) = self.pagingViewport
+                self.request_viewport_records(
+                    self.pagingDatabaseConnection,
+                    owning_parent_track,
+                    viewport_start,
+                    viewport_end,
+                )
+            return
+
         found_records = self.filter_records(session)
         print(
             "track[{0}]: {1} records found".format(
@@ -345,6 +409,145 @@ class TrackConfigurationBase(QObject):
         self.cache.set_model_view_array(newCachedModelViewArray)
         self.cacheUpdated.emit()
 
+    ## Paging:
+    # reset_pages(): discards the loaded pages (and their views), and ignores any pages still being fetched
+    def reset_pages(self):
+        self.pageGeneration = self.pageGeneration + 1
+        self.pendingPageIndicies = set()
+        if self.pageCache is not None:
+            self.pageCache.clear()
+        self.update_cache_from_pages()
+
+    def request_viewport_records(
+        self, database_connection, owning_parent_track, viewport_start, viewport_end
+    ):
+        """Makes sure the records overlapping the viewport (plus a margin of pages on each side) are loaded, fetching any missing pages on a background session.
+        Called whenever the viewport moves or the zoom changes. The cache is updated (emitting cacheUpdated) as each page arrives.
+        """
+        if not self.get_should_page_records():
+            return
+        self.pagingDatabaseConnection = database_connection
+        self.pagingOwningTrack = owning_parent_track
+        self.pagingViewport = (viewport_start, viewport_end)
+
+        page_duration = TrackRecordPageCache.get_page_duration(viewport_end - viewport_start)
+        if (self.pageCache is None) or (self.pageCache.page_duration != page_duration):
+            # The zoom changed enough to need differently sized pages
+            self.pageCache = TrackRecordPageCache(page_duration)
+            self.pageGeneration = self.pageGeneration + 1
+            self.pendingPageIndicies = set()
+
+        if self.loadingWindow is None:
+            (limit_start, limit_end) = (None, None)
+        else:
+            (limit_start, limit_end) = self.loadingWindow
+        required_page_indicies = self.pageCache.get_required_page_indicies(
+            viewport_start, viewport_end, limit_start, limit_end
+        )
+        missing_page_indicies = self.pageCache.set_required_page_indicies(
+            required_page_indicies
+        )
+        for page_index in missing_page_indicies:
+            if page_index in self.pendingPageIndicies:
+                continue
+            self.pendingPageIndicies.add(page_index)
+            (page_start, page_end) = self.pageCache.get_page_bounds(page_index)
+            aWorker = FilesystemWorkersBase(
+                [self.pageGeneration, page_index],
+                TrackConfigurationBase.load_record_page,
+                database_connection,
+                self.get_filter(),
+                page_start,
+                page_end,
+            )
+            aWorker.signals.result.connect(self.on_record_page_loaded)
+            aWorker.signals.error.connect(self.on_record_page_failed)
+            TrackConfigurationBase.get_record_page_threadpool().start(aWorker)
+
+    @staticmethod
+    def get_record_page_threadpool():
+        if TrackConfigurationBase.record_page_threadpool is None:
+            TrackConfigurationBase.record_page_threadpool = QThreadPool()
+            TrackConfigurationBase.record_page_threadpool.setMaxThreadCount(
+                TrackConfigurationBase.max_record_page_threads
+            )
+        return TrackConfigurationBase.record_page_threadpool
+
+    # load_record_page(...): run on a worker thread. Loads the records of a page on the worker thread's own session (see DatabaseConnectionRef.get_session()), since the GUI thread's session can't be shared.
+    @staticmethod
+    def load_record_page(
+        page_keys,
+        database_connection,
+        trackFilter,
+        page_start,
+        page_end,
+        progress_callback=None,
+    ):
+        # Removing the thread's session on exit detaches the records (keeping their loaded values) so they can be attached to the GUI thread's session
+        with database_connection.thread_session() as session:
+            return trackFilter.build_window_filter(session, page_start, page_end)
+
+    @pyqtSlot(list, object)
+    def on_record_page_loaded(self, page_keys, records):
+        (page_generation, page_index) = page_keys
+        if page_generation != self.pageGeneration:
+            return  # The pages were discarded since this one was requested
+        self.pendingPageIndicies.discard(page_index)
+        session = self.pagingDatabaseConnection.get_session()
+        attached_records = [
+            TrackConfigurationBase.attach_record(session, aRecord) for aRecord in records
+        ]
+        self.pageCache.set_page(page_index, attached_records)
+        self.update_cache_from_pages()
+
+    @pyqtSlot(list, tuple)
+    def on_record_page_failed(self, page_keys, error_info):
+        (page_generation, page_index) = page_keys
+        print(
+            "WARNING: track[{0}] failed to load the records of page {1}: {2}".format(
+                self.get_track_id(), page_index, str(error_info[1])
+            )
+        )
+        if page_generation == self.pageGeneration:
+            # Allows it to be requested again by the next viewport change
+            self.pendingPageIndicies.discard(page_index)
+
+    # attach_record(session, aRecord): returns the session's instance of a record loaded by another session. A record already in the session is used as is (so any unsaved edits to it are kept), otherwise the loaded one is merged in without querying the database again.
+    @staticmethod
+    def attach_record(session, aRecord):
+        existing_record = session.identity_map.get(identity_key(instance=aRecord), None)
+        if existing_record is not None:
+            return existing_record
+        return session.merge(aRecord, load=False)
+
+    # update_cache_from_pages(): rebuilds the cache from the records of the loaded pages, reusing the views already built for them
+    def update_cache_from_pages(self):
+        if self.pageCache is None:
+            records = []
+        else:
+            records = self.pageCache.get_records(lambda aRecord: aRecord.start_date)
+
+        previous_model_view_containers = self.pagedModelViewContainers
+        self.pagedModelViewContainers = dict()
+        built_model_view_container_array = []
+        for aRecord in records:
+            aModelViewContainer = previous_model_view_containers.pop(aRecord.id, None)
+            if (aModelViewContainer is None) or (
+                aModelViewContainer.get_record() is not aRecord
+            ):
+                aGuiView = self.get_filter().trackRecordClass.get_gui_view(
+                    aRecord, parent=self.pagingOwningTrack
+                )
+                aModelViewContainer = ModelViewContainer(aRecord, aGuiView)
+            self.pagedModelViewContainers[aRecord.id] = aModelViewContainer
+            built_model_view_container_array.append(aModelViewContainer)
+
+        self.update_cache(built_model_view_container_array)
+        # The owning track has replaced its views by now, so the views of the records that are no longer loaded can be deleted
+        for aModelViewContainer in previous_model_view_containers.values():
+            if aModelViewContainer.get_view() is not None:
+                aModelViewContainer.get_view().deleteLater()
+
     def get_cache(self):
         return self.cache
 
@@ -79,6 +79,10 @@ class DataFileTrackFilter(TrackFilterBase):
 
         return []
 
+    # The data file records aren't loaded from the database, so the window is ignored
+    def build_window_filter(self, session, range_start, range_end):
+        return self.build_filter(session)
+
     def __str__(self):
         return "DataFileTrackConfig: behavioral_box_ids: {0}, experiment_ids: {1}, cohort_ids: {2}, animal_ids: {3}, dataFileName: {4}".format(
             self._get_behavioral_box_ids_str(),
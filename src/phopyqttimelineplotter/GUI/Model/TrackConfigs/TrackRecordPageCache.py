@@ -0,0 +1,127 @@
+# TrackRecordPageCache.py
+# Contains TrackRecordPageCache, which splits a track's time axis into fixed-duration pages and keeps the records of a bounded number of them, so a track only holds the records near the viewport.
+# Deliberately has no Qt dependencies; the track config that owns the cache does the fetching.
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import math
+
+## IMPORT:
+# from phopyqttimelineplotter.GUI.Model.TrackConfigs.TrackRecordPageCache import TrackRecordPageCache
+
+
+class TrackRecordPageCache(object):
+    """TrackRecordPageCache: the records of a track stored by page, where page i covers [page_origin + i * page_duration, page_origin + (i + 1) * page_duration].
+
+    The page_duration is chosen from the viewport duration (see get_page_duration(...)), so the viewport always spans at most two pages, and margin_pages more on each side are fetched ahead of scrolling.
+    At most max_loaded_pages are kept: when more are loaded the least recently required ones are evicted first, but never the pages currently required by the viewport.
+    A record overlapping several pages is returned by each of their queries, so get_records() merges them by record_key_fn (the record's database id by default).
+    """
+
+    page_origin = datetime(2000, 1, 1)
+    minimum_page_duration = timedelta(minutes=1)
+    default_margin_pages = 1
+    default_max_loaded_pages = 12
+
+    def __init__(
+        self,
+        page_duration,
+        margin_pages=None,
+        max_loaded_pages=None,
+        record_key_fn=None,
+    ):
+        super(TrackRecordPageCache, self).__init__()
+        if margin_pages is None:
+            margin_pages = TrackRecordPageCache.default_margin_pages
+        if max_loaded_pages is None:
+            max_loaded_pages = TrackRecordPageCache.default_max_loaded_pages
+        if record_key_fn is None:
+            record_key_fn = TrackRecordPageCache.get_record_id
+        self.page_duration = page_duration
+        self.margin_pages = margin_pages
+        # The viewport and its margins always need at most (2 + 2 * margin_pages) pages, which must fit
+        self.max_loaded_pages = max(max_loaded_pages, 2 + 2 * margin_pages)
+        self.record_key_fn = record_key_fn
+        self.pages = OrderedDict()  # page_index: list of records, least recently required first
+        self.required_page_indicies = []
+
+    @staticmethod
+    def get_record_id(aRecord):
+        return aRecord.id
+
+    # get_page_duration(viewport_duration): the smallest power of two multiple of minimum_page_duration that's at least viewport_duration, so small zoom changes keep the same pages
+    @staticmethod
+    def get_page_duration(viewport_duration):
+        num_minimum_durations = max(
+            viewport_duration / TrackRecordPageCache.minimum_page_duration, 1.0
+        )
+        return TrackRecordPageCache.minimum_page_duration * (
+            2 ** int(math.ceil(math.log2(num_minimum_durations)))
+        )
+
+    def __len__(self):
+        return len(self.pages)
+
+    def get_page_index(self, aDatetime):
+        return int(
+            math.floor(
+                (aDatetime - TrackRecordPageCache.page_origin) / self.page_duration
+            )
+        )
+
+    # get_page_bounds(page_index): returns the (page_start, page_end) datetimes of a page
+    def get_page_bounds(self, page_index):
+        page_start = TrackRecordPageCache.page_origin + (self.page_duration * page_index)
+        return (page_start, page_start + self.page_duration)
+
+    def get_required_page_indicies(
+        self, viewport_start, viewport_end, limit_start=None, limit_end=None
+    ):
+        """Returns the indicies of the pages overlapping [viewport_start, viewport_end] plus margin_pages on each side, excluding any entirely outside [limit_start, limit_end] (if provided)"""
+        first_page_index = self.get_page_index(viewport_start) - self.margin_pages
+        last_page_index = self.get_page_index(viewport_end) + self.margin_pages
+        if limit_start is not None:
+            first_page_index = max(first_page_index, self.get_page_index(limit_start))
+        if limit_end is not None:
+            last_page_index = min(last_page_index, self.get_page_index(limit_end))
+        return list(range(first_page_index, last_page_index + 1))
+
+    # set_required_page_indicies(page_indicies): marks the pages the viewport currently needs, which are moved to the most recently used end and can't be evicted. Returns the ones that aren't loaded.
+    def set_required_page_indicies(self, page_indicies):
+        self.required_page_indicies = list(page_indicies)
+        missing_page_indicies = []
+        for page_index in self.required_page_indicies:
+            if page_index in self.pages:
+                self.pages.move_to_end(page_index)
+            else:
+                missing_page_indicies.append(page_index)
+        return missing_page_indicies
+
+    def has_page(self, page_index):
+        return page_index in self.pages
+
+    # set_page(page_index, records): stores the records of a page, evicting the least recently required pages beyond max_loaded_pages. Returns the evicted page indicies.
+    def set_page(self, page_index, records):
+        self.pages[page_index] = list(records)
+        self.pages.move_to_end(page_index)
+        evicted_page_indicies = []
+        for candidate_page_index in list(self.pages.keys()):
+            if len(self.pages) <= self.max_loaded_pages:
+                break
+            if candidate_page_index in self.required_page_indicies:
+                continue
+            del self.pages[candidate_page_index]
+            evicted_page_indicies.append(candidate_page_index)
+        return evicted_page_indicies
+
+    def clear(self):
+        self.pages.clear()
+        self.required_page_indicies = []
+
+    # get_records(get_start_date_fn): returns the records of all the loaded pages, each only once, sorted by get_start_date_fn(record)
+    def get_records(self, get_start_date_fn):
+        unique_records = dict()
+        for page_records in self.pages.values():
+            for aRecord in page_records:
+                unique_records.setdefault(self.record_key_fn(aRecord), aRecord)
+        return sorted(unique_records.values(), key=get_start_date_fn)
@@ -150,6 +150,11 @@ class TrackConfigDataCacheMixin(object):
         return self.durationObjects
 
     # performReloadConfigCache(...): actually tells the config cache to update
+    # Until the owning window sets a loading window on the config, only the records overlapping the track's own time range are loaded
     @pyqtSlot()
     def performReloadConfigCache(self):
+        if self.get_track_config().get_loading_window() is None:
+            self.get_track_config().set_loading_window(
+                self.totalStartTime, self.totalEndTime
+            )
         self.get_track_config().reload(self.database_connection.get_session(), self)
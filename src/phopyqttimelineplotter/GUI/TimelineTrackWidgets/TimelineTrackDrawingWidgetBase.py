@@ -26,9 +26,13 @@ from PyQt5.QtWidgets import (
 )
 
 from phopyqttimelineplotter.GUI.Helpers.DateTimeRenders import DateTimeRenderMixin
+from phopyqttimelineplotter.GUI.Helpers.DurationRepresentationHelpers import (
+    OffsetRepresentationMixin,
+)
 from phopyqttimelineplotter.GUI.Helpers.FixedTimelineContentsWidthMixin import (
     FixedTimelineContentsWidthMixin,
 )
+from phopyqttimelineplotter.GUI.Helpers.TimelineTileCache import TimelineTileCache
 from phopyqttimelineplotter.GUI.UI.AbstractDatabaseAccessingWidgets import (
     AbstractDatabaseAccessingWidget,
 )
@@ -49,6 +53,7 @@ class ItemSelectionOptions(Enum):
 # The base timeline track widget which all others should inherit from
 class TimelineTrackDrawingWidgetBase(
     DateTimeRenderMixin,
+    OffsetRepresentationMixin,
     FixedTimelineContentsWidthMixin,
     AbstractDatabaseAccessingWidget,
 ):
@@ -62,6 +67,9 @@ class TimelineTrackDrawingWidgetBase(
         -1
     )  # The integer value that indicates no object has been selected in the timeline
 
+    # How far (in pixels) past an object's rect its drawing can extend (borders, labels and handles), so the cached tiles there are also dropped when it changes
+    static_tiles_padding_pixels = 8
+
     def __init__(
         self,
         trackID,
@@ -80,6 +88,10 @@ class TimelineTrackDrawingWidgetBase(
         self.totalEndTime = totalEndTime
         self.totalDuration = self.totalEndTime - self.totalStartTime
         self.fixedWidth = 800.0
+        # The (start, end) of the time spanned by the track's width, or None if it spans the whole timeline (see OffsetRepresentationMixin)
+        self.displayedTimeWindow = None
+        # The track's objects and background, cached in tiles so that moving the hover/video lines over it doesn't repaint them (see paint_static_tiles(...))
+        self.staticTileCache = TimelineTileCache()
 
         self.wantsKeyboardEvents = wantsKeyboardEvents
         self.wantsMouseEvents = wantsMouseEvents
@@ -123,6 +135,48 @@ class TimelineTrackDrawingWidgetBase(
     def paintEvent(self, event):
         pass
 
+    # update(): the track's own code calls update() whenever its objects, their states or its filter change, so a full update also drops the cached static tiles.
+    #   Repaints that don't change the content (panning, or the parent's indicator lines moving over the track) should call update_displayed_contents() instead.
+    def update(self, *args):
+        if len(args) == 0:
+            self.invalidate_static_tiles()
+        QWidget.update(self, *args)
+
+    # update_displayed_contents(): schedules a repaint that reuses the cached static tiles
+    def update_displayed_contents(self):
+        QWidget.update(self)
+
+    # invalidate_static_tiles(start_time, end_time): drops the cached tiles overlapping [start_time, end_time], or all of them if either is None
+    def invalidate_static_tiles(self, start_time=None, end_time=None):
+        if (start_time is None) or (end_time is None):
+            self.staticTileCache.invalidate()
+        else:
+            self.staticTileCache.invalidate_time_range(
+                start_time,
+                end_time,
+                padding_pixels=TimelineTrackDrawingWidgetBase.static_tiles_padding_pixels,
+            )
+
+    # get_static_tiles_content_key(): anything other than the layout that all of the static content depends on
+    def get_static_tiles_content_key(self):
+        return self.is_track_emphasized()
+
+    # paint_static_tiles(painter, exposedRect, render_fn): draws the track's static content within exposedRect from the tile cache, calling render_fn(tilePainter, tileRect) to render any missing tiles
+    def paint_static_tiles(self, painter, exposedRect, render_fn):
+        displayed_seconds = self.get_displayed_duration().total_seconds()
+        if (self.width() <= 0) or (displayed_seconds <= 0):
+            return
+        self.staticTileCache.set_layout(
+            self.get_total_start_time(),
+            float(self.width()) / displayed_seconds,
+            self.height(),
+            self.devicePixelRatioF(),
+            self.get_static_tiles_content_key(),
+        )
+        self.staticTileCache.paint(
+            painter, self.get_displayed_start_time(), exposedRect, render_fn
+        )
+
     def get_background_gradient(self, height):
         middleColor = QColor(40, 40, 40, 64)
         edgeColor = QColor(38, 38, 38, 255)
@@ -196,38 +250,6 @@ class TimelineTrackDrawingWidgetBase(
     def get_is_under_mouse(self):
         return self.underMouse()
 
-    # Timeline position/time converion functions:
-    # Get scale from length
-    # def getScale(self):
-    #     return float(self.totalDuration)/float(self.width())
-
-    def offset_to_percent(self, event_x, event_y):
-        percent_x = event_x / self.width()
-        percent_y = event_y / self.height()
-        return (percent_x, percent_y)
-
-    def offset_to_duration(self, event_x):
-        (percent_x, percent_y) = self.offset_to_percent(event_x, 0.0)
-        return self.totalDuration * percent_x
-
-    def offset_to_datetime(self, event_x):
-        duration_offset = self.offset_to_duration(event_x)
-        return self.totalStartTime + duration_offset
-
-    def percent_to_offset(self, percent_offset):
-        event_x = percent_offset * self.width()
-        return event_x
-
-    def duration_to_offset(self, duration_offset):
-        percent_x = duration_offset / self.totalDuration
-        event_x = self.percent_to_offset(percent_x)
-        return event_x
-
-    def datetime_to_offset(self, newDatetime):
-        duration_offset = newDatetime - self.totalStartTime
-        event_x = self.duration_to_offset(duration_offset)
-        return event_x
-
     def enterEvent(self, QEvent):
         # print("TimelineTrackDrawingWidgetBase.enterEvent(...): track_id: {0}".format(self.trackID))
         self.trackInteractionState.set_hover_state(ItemHoverState.Emphasized)
@@ -145,6 +145,7 @@ class TimelineTrackDrawingWidget_AnnotationComments(
             # newAnnotation.on_edit_by_dragging_handle_end.connect(self.handleEndSliderValueChange)
             self.durationObjects.append(newAnnotationView)
 
+        self.rebuild_event_index()
         self.update()
 
     # overrides
@@ -181,29 +182,41 @@ class TimelineTrackDrawingWidget_AnnotationComments(
     def paintEvent(self, event):
         qp = QtGui.QPainter()
         qp.begin(self)
-        # TODO: minor speedup by re-using the array of QRect objects if the size doesn't change
-        self.eventRect = np.repeat(QRect(0, 0, 0, 0), len(self.durationObjects))
-        self.instantaneousEventRect = np.repeat(
-            QRect(0, 0, 0, 0), len(self.instantaneousObjects)
+        self.paint_static_tiles(qp, event.rect(), self.paint_static_contents)
+        qp.end()
+
+    # paint_static_contents(painter, exposedRect): paints the comments within exposedRect, which paintEvent(...) renders into the cached tiles
+    def paint_static_contents(self, qp, exposedRect):
+        self.eventRect = self.get_reusable_rect_array(
+            self.eventRect, len(self.durationObjects)
+        )
+        self.instantaneousEventRect = self.get_reusable_rect_array(
+            self.instantaneousEventRect, len(self.instantaneousObjects)
         )
 
-        ## TODO: Use viewport information to only draw the currently displayed rectangles instead of having to draw it all at once.
+        # Objects are positioned relative to the whole track, but only the ones within the exposed rect are painted
         drawRect = self.rect()
 
         # Draw the duration objects
-        for (index, obj) in enumerate(self.durationObjects):
-            self.eventRect[index] = obj.paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
-            )
+        self.paint_visible_objects(
+            qp,
+            self.durationObjects,
+            self.get_duration_objects_index(),
+            self.eventRect,
+            drawRect,
+            exposedRect,
+        )
 
         # Draw the instantaneous event objects
         for (index, obj) in enumerate(self.instantaneousObjects):
             self.instantaneousEventRect[index] = obj.paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
+                qp,
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect,
             )
 
-        qp.end()
-
     def set_active_filter(self, start_datetime, end_datetime):
         # Draw the duration objects
         for (index, obj) in enumerate(self.durationObjects):
@@ -6,17 +6,11 @@ import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 
-import matplotlib
-import matplotlib.animation as animation
-import matplotlib.colors as mcolors
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
 
 # matplotlib.use("Qt5agg") # or "Qt5agg" depending on you version of Qt
 # from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from pandas.plotting import register_matplotlib_converters
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtCore import QEvent, QObject, QPoint, QRect, QSize, Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPen
@@ -35,10 +29,24 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
-register_matplotlib_converters()
+# matplotlib, pyqtgraph and pandas are only imported once a data track first draws a graph in the corresponding display mode
+pd_plotting = LazyModule("pandas.plotting")
 
+# register_matplotlib_converters(): lets matplotlib plot the pandas/datetime timestamps. Called when matplotlib is first used by either display path.
+def register_matplotlib_converters(_matplotlib_module=None):
+    pd_plotting.register_matplotlib_converters()
+
+
+plt = LazyModule("matplotlib.pyplot", on_loaded=register_matplotlib_converters)
+mdates = LazyModule("matplotlib.dates")
+
+pg = LazyModule("pyqtgraph")
+# Subclasses pyqtgraph's AxisItem, so importing it imports pyqtgraph
+pg_time_axis = LazyModule("lib.pg_time_axis")
+MatplotlibWidget = LazyModule(
+    "pyqtgraph.widgets.MatplotlibWidget", on_loaded=register_matplotlib_converters
+)
 
-import pyqtgraph as pg
 from phopyqttimelineplotter.app.database.SqlAlchemyDatabase import (
     convert_TimestampedAnnotation,
     create_TimestampedAnnotation,
@@ -46,16 +54,16 @@ from phopyqttimelineplotter.app.database.SqlAlchemyDatabase import (
     modify_TimestampedAnnotation_endDate,
     modify_TimestampedAnnotation_startDate,
 )
-from lib.pg_time_axis import DateAxisItem
 
 # from pyqtgraph import PlotWidget, plot, widgets
 # from pyqtgraph.widgets import MatplotlibWidget
-from pyqtgraph import PlotWidget, plot
-
-# from pyqtgraph.widgets import pg.widgets.MatplotlibWidget
-from pyqtgraph.widgets import MatplotlibWidget
 
+from phopyqttimelineplotter.GUI.Model.Events.EventTable import (
+    EventTable,
+    EventTableViewList,
+)
 from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent_AnnotationComment import *
+from phopyqttimelineplotter.GUI.Model.TimestampCountPyramid import TimestampCountPyramid
 from phopyqttimelineplotter.GUI.Model.TrackType import (
     TrackConfigDataCacheMixin,
     TrackConfigMixin,
@@ -105,6 +113,10 @@ class TimelineTrackDrawingWidget_DataFile(
     default_itemSelectionMode = ItemSelectionOptions.SingleSelection
 
     default_dataDisplayMode = DataTrackDisplayMode.pyQtGraph
+    # Graph level-of-detail: below this many events in view they're plotted individually, above it the pyramid level matching the zoom is plotted
+    default_graphMaxRawPoints = 2000
+    # How much of the view's width to also load on either side, so small pans don't need to reload the plotted data
+    default_graphLoadedRangePadding = 0.5
     # default_dataDisplayMode = DataTrackDisplayMode.matplotlibGraph
 
     def __init__(
@@ -157,6 +169,11 @@ class TimelineTrackDrawingWidget_DataFile(
         self.dataDisplayMode = (
             TimelineTrackDrawingWidget_DataFile.default_dataDisplayMode
         )
+        # Graph level-of-detail state, keyed by variable name
+        self.dataSeriesPyramids = dict()
+        self.dataSeriesPlotItems = dict()
+        self.dataSeriesLoadedRanges = dict()
+        self.dataSeriesLoadedMaxCounts = dict()
         if self.dataDisplayMode.should_use_child_graph():
             self.setLayout(QVBoxLayout())
             self.build_child_graph_widget()
@@ -197,25 +214,38 @@ class TimelineTrackDrawingWidget_DataFile(
         self.reset_on_reload()
         active_cache = self.trackConfig.get_cache()
         active_model_view_array = active_cache.get_model_view_array()
-        self.durationRecords = []
-        self.durationObjects = []
-
         # durationRecords should be of type: FilesystemLabjackEvent_Record
-        for aContainerObj in active_model_view_array:
-            self.durationRecords.append(aContainerObj.get_record())
+        self.durationRecords = [
+            aContainerObj.get_record() for aContainerObj in active_model_view_array
+        ]
 
-            # Note: self.durationObjects is empty if we aren't in standardEventDrawing dataDisplayMode
-            if self.dataDisplayMode.should_build_event_views():
-                newAnnotationIndex = len(self.durationObjects)
-                newAnnotationView = aContainerObj.get_view()
-                newAnnotationView.setAccessibleName(str(newAnnotationIndex))
-                self.durationObjects.append(newAnnotationView)
+        # Note: self.durationObjects is empty if we aren't in standardEventDrawing dataDisplayMode
+        if self.dataDisplayMode.should_build_event_views():
+            # The events are painted from the columns of the table, and a view is only built for an event when it's hovered, selected, etc.
+            self.eventTable = EventTable.from_records(
+                self.durationRecords, PhoDurationEvent.InstantaneousEventDuration
+            )
+            self.durationObjects = EventTableViewList(
+                self.eventTable, self.build_event_view
+            )
+        else:
+            self.eventTable = None
+            self.durationObjects = []
 
         if self.dataDisplayMode.should_use_child_graph():
             self.update_child_graph_widget()
 
+        self.rebuild_event_index()
         self.update()
 
+    # build_event_view(index): builds the view (a PhoDurationEvent) for the event at index when self.durationObjects is first indexed there
+    def build_event_view(self, index):
+        aRecord = self.durationRecords[index]
+        newAnnotationView = aRecord.get_gui_view(aRecord, parent=None)
+        newAnnotationView.setAccessibleName(str(index))
+        newAnnotationView.is_deemphasized = self.eventTable.is_deemphasized(index)
+        return newAnnotationView
+
     def build_child_graph_widget(self):
         self.graphWidget = None
         if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
@@ -242,7 +272,7 @@ class TimelineTrackDrawingWidget_DataFile(
         if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
 
             # Add the Date-time axis
-            axis = DateAxisItem(orientation="bottom")
+            axis = pg_time_axis.DateAxisItem(orientation="bottom")
             axis.attachToPlotItem(self.graphWidget.getPlotItem())
 
             # Add Background colour to white
@@ -250,7 +280,7 @@ class TimelineTrackDrawingWidget_DataFile(
             self.graphWidget.setBackground(clear_color)
 
             # Add Axis Labels
-            self.graphWidget.setLabel("left", "Temperature (°C)", color="red", size=30)
+            self.graphWidget.setLabel("left", "Events", color="red", size=30)
             # self.graphWidget.setLabel('bottom', 'Hour (H)', color='red', size=30)
 
             # Add legend
@@ -258,13 +288,13 @@ class TimelineTrackDrawingWidget_DataFile(
 
             self.graphWidget.showGrid(x=True, y=True)
 
-            curr_global_min_x_val = time.mktime(self.totalStartTime.timetuple())
-            curr_global_max_x_val = time.mktime(self.totalEndTime.timetuple())
+            self.update_graph_x_range()
+            self.graphWidget.setYRange(0, 1.1, padding=0)
 
-            self.graphWidget.setXRange(
-                curr_global_min_x_val, curr_global_max_x_val, padding=0
+            # Re-plot at the matching level of detail whenever the user pans or zooms
+            self.graphWidget.getPlotItem().sigXRangeChanged.connect(
+                self.on_graph_x_range_changed
             )
-            self.graphWidget.setYRange(0, 1.1, padding=0)
 
         elif self.dataDisplayMode is DataTrackDisplayMode.matplotlibGraph:
             # TODO: configure the matplotlib plot:
@@ -284,16 +314,13 @@ class TimelineTrackDrawingWidget_DataFile(
     def plot(self, x, y, plotname, color):
         if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
             pen = pg.mkPen(color=color)
-            self.graphWidget.plot(
+            return self.graphWidget.plot(
                 x,
                 y,
                 name=plotname,
                 pen=pen,
-                symbol="+",
-                symbolSize=30,
-                symbolBrush=(color),
+                connect="pairs",
             )
-            pass
 
         elif self.dataDisplayMode is DataTrackDisplayMode.matplotlibGraph:
             subplot = self.graphWidget.getFigure().add_subplot(111)
@@ -310,34 +337,42 @@ class TimelineTrackDrawingWidget_DataFile(
         out_data_series = dict()
         out_variable_names = list()
 
-        all_variable_timestamps = []
-        for aDurationRecord in self.durationRecords:
-            # Add x-value
-            curr_x_val = None
-            if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
-                curr_x_val = time.mktime(aDurationRecord.start_date.timetuple())
-                pass
-            elif self.dataDisplayMode is DataTrackDisplayMode.matplotlibGraph:
-                curr_x_val = aDurationRecord.start_date
-                pass
-
-            all_variable_timestamps.append(curr_x_val)
-            curr_var_name = aDurationRecord.variable_name
-            curr_var_color = aDurationRecord.variable_color
-            # curr_extended_info_dict = aDurationRecord.extended_info_dict
-
-            if curr_var_name not in out_data_series.keys():
-                # create a new series if needed
-                out_variable_names.append(curr_var_name)
-                out_data_series[curr_var_name] = {
-                    "x": list(),
-                    "y": list(),
-                    "color": curr_var_color,
-                    "name": curr_var_name,
-                }
+        # Convert all the start dates at once instead of calling time.mktime(...) for each record
+        record_start_dates = [
+            aDurationRecord.start_date for aDurationRecord in self.durationRecords
+        ]
+        if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
+            all_variable_timestamps = (
+                TimestampCountPyramid.local_datetimes_to_timestamps(record_start_dates)
+            )
+        else:
+            all_variable_timestamps = np.array(record_start_dates, dtype=object)
 
-            out_data_series[curr_var_name]["x"].append(curr_x_val)
-            out_data_series[curr_var_name]["y"].append(1.0)
+        # Group the records by variable, keeping the variables in the order they're first seen
+        record_variable_names = np.array(
+            [aDurationRecord.variable_name for aDurationRecord in self.durationRecords]
+        )
+        (
+            unique_variable_names,
+            first_record_indicies,
+            record_variable_indicies,
+        ) = np.unique(record_variable_names, return_index=True, return_inverse=True)
+        record_variable_indicies = record_variable_indicies.ravel()
+        for aUniqueIndex in np.argsort(first_record_indicies):
+            curr_var_name = str(unique_variable_names[aUniqueIndex])
+            curr_var_color = self.durationRecords[
+                first_record_indicies[aUniqueIndex]
+            ].variable_color
+            curr_x_vals = all_variable_timestamps[
+                record_variable_indicies == aUniqueIndex
+            ]
+            out_variable_names.append(curr_var_name)
+            out_data_series[curr_var_name] = {
+                "x": curr_x_vals,
+                "y": np.ones(len(curr_x_vals)),
+                "color": curr_var_color,
+                "name": curr_var_name,
+            }
 
         numVariables = len(out_variable_names)
         if numVariables > 0:
@@ -345,16 +380,24 @@ class TimelineTrackDrawingWidget_DataFile(
             print("out_data_series contains {} items...".format(numVariables))
 
             if self.dataDisplayMode is DataTrackDisplayMode.pyQtGraph:
+                self.graphWidget.clear()
+                self.dataSeriesPyramids = dict()
+                self.dataSeriesPlotItems = dict()
+                self.dataSeriesLoadedRanges = dict()
+                self.dataSeriesLoadedMaxCounts = dict()
                 for (aVariableName, aDictValue) in out_data_series.items():
-                    # plot data: x, y values
-                    self.plot(
-                        aDictValue["x"],
-                        aDictValue["y"],
+                    # Build the pyramid once, then plot only the level matching the current zoom
+                    self.dataSeriesPyramids[aVariableName] = TimestampCountPyramid(
+                        aDictValue["x"]
+                    )
+                    self.dataSeriesPlotItems[aVariableName] = self.plot(
+                        [],
+                        [],
                         aDictValue["name"],
                         aDictValue["color"],
                     )
 
-                pass
+                self.update_graph_level_of_detail()
 
             elif self.dataDisplayMode is DataTrackDisplayMode.matplotlibGraph:
                 # Create figure and plot a stem plot with the date
@@ -428,6 +471,83 @@ class TimelineTrackDrawingWidget_DataFile(
 
             pass
 
+    # update_graph_x_range(): sets the graph's x-range to the displayed time window, so it lines up with the other tracks
+    def update_graph_x_range(self):
+        if self.dataDisplayMode is not DataTrackDisplayMode.pyQtGraph:
+            return
+        if getattr(self, "graphWidget", None) is None:
+            return
+        curr_displayed_min_x_val = time.mktime(
+            self.get_displayed_start_time().timetuple()
+        )
+        curr_displayed_max_x_val = time.mktime(
+            self.get_displayed_end_time().timetuple()
+        )
+        self.graphWidget.setXRange(
+            curr_displayed_min_x_val, curr_displayed_max_x_val, padding=0
+        )
+
+    # overrides OffsetRepresentationMixin.set_displayed_time_window(...) to pan/zoom the graph along with the track
+    def set_displayed_time_window(self, displayed_start_time, displayed_end_time):
+        super().set_displayed_time_window(displayed_start_time, displayed_end_time)
+        self.update_graph_x_range()
+
+    @pyqtSlot(object, object)
+    def on_graph_x_range_changed(self, viewBox, newXRange):
+        self.update_graph_level_of_detail()
+
+    # update_graph_level_of_detail(): plots each variable's pyramid at the level matching the graph's current x-range.
+    #   The plotted data is only replaced when the matching level changes or the view leaves the (padded) range that was last loaded.
+    def update_graph_level_of_detail(self):
+        if self.dataDisplayMode is not DataTrackDisplayMode.pyQtGraph:
+            return
+        plotItem = self.graphWidget.getPlotItem()
+        (view_x_min, view_x_max) = plotItem.viewRange()[0]
+        view_pixel_width = plotItem.getViewBox().width()
+        view_span = view_x_max - view_x_min
+        padding = TimelineTrackDrawingWidget_DataFile.default_graphLoadedRangePadding
+        max_raw_points = TimelineTrackDrawingWidget_DataFile.default_graphMaxRawPoints
+        did_change_data = False
+
+        for (aVariableName, aPyramid) in self.dataSeriesPyramids.items():
+            desired_level = aPyramid.choose_level(
+                view_x_min, view_x_max, view_pixel_width, max_raw_points
+            )
+            loaded_range = self.dataSeriesLoadedRanges.get(aVariableName, None)
+            if loaded_range is not None:
+                (loaded_level, loaded_x_min, loaded_x_max) = loaded_range
+                if (
+                    (loaded_level == desired_level)
+                    and (loaded_x_min <= view_x_min)
+                    and (view_x_max <= loaded_x_max)
+                ):
+                    # Already showing the right level for this part of the timeline
+                    continue
+
+            loaded_x_min = view_x_min - (view_span * padding)
+            loaded_x_max = view_x_max + (view_span * padding)
+            (x, counts) = aPyramid.get_level_data(
+                desired_level, loaded_x_min, loaded_x_max
+            )
+            # Each event (or bin of events) is a stem as tall as its count
+            (stem_x, stem_y) = TimestampCountPyramid.get_count_stems(x, counts)
+            self.dataSeriesPlotItems[aVariableName].setData(stem_x, stem_y)
+            self.dataSeriesLoadedRanges[aVariableName] = (
+                desired_level,
+                loaded_x_min,
+                loaded_x_max,
+            )
+            self.dataSeriesLoadedMaxCounts[aVariableName] = (
+                int(counts.max()) if len(counts) > 0 else 1
+            )
+            did_change_data = True
+
+        if did_change_data:
+            # Fit the y-axis to the tallest stem loaded
+            self.graphWidget.setYRange(
+                0, 1.1 * max(self.dataSeriesLoadedMaxCounts.values()), padding=0
+            )
+
     # overrides
     def reset_hovered(self):
         super().reset_hovered()
@@ -440,44 +560,46 @@ class TimelineTrackDrawingWidget_DataFile(
         if self.dataDisplayMode.should_paint_events():
             qp = QtGui.QPainter()
             qp.begin(self)
-            # TODO: minor speedup by re-using the array of QRect objects if the size doesn't change
-            self.eventRect = np.repeat(QRect(0, 0, 0, 0), len(self.durationObjects))
-            self.instantaneousEventRect = np.repeat(
-                QRect(0, 0, 0, 0), len(self.instantaneousObjects)
-            )
+            self.paint_static_tiles(qp, event.rect(), self.paint_static_contents)
+            qp.end()
 
-            ## TODO: Use viewport information to only draw the currently displayed rectangles instead of having to draw it all at once.
-            drawRect = self.rect()
-
-            # Draw the duration objects
-            for (index, obj) in enumerate(self.durationObjects):
-                self.eventRect[index] = obj.paint(
-                    qp,
-                    self.totalStartTime,
-                    self.totalEndTime,
-                    self.totalDuration,
-                    drawRect,
-                )
+    # paint_static_contents(painter, exposedRect): paints the events within exposedRect, which paintEvent(...) renders into the cached tiles
+    def paint_static_contents(self, qp, exposedRect):
+        self.instantaneousEventRect = self.get_reusable_rect_array(
+            self.instantaneousEventRect, len(self.instantaneousObjects)
+        )
 
-            # Draw the instantaneous event objects
-            for (index, obj) in enumerate(self.instantaneousObjects):
-                self.instantaneousEventRect[index] = obj.paint(
-                    qp,
-                    self.totalStartTime,
-                    self.totalEndTime,
-                    self.totalDuration,
-                    drawRect,
-                )
+        # Objects are positioned relative to the whole track, but only the ones within the exposed rect are painted
+        drawRect = self.rect()
 
-            qp.end()
+        # Draw the duration objects
+        if self.eventTable is not None:
+            self.paint_visible_table_events(
+                qp, self.eventTable, self.durationObjects, drawRect, exposedRect
+            )
+
+        # Draw the instantaneous event objects
+        for (index, obj) in enumerate(self.instantaneousObjects):
+            self.instantaneousEventRect[index] = obj.paint(
+                qp,
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect,
+            )
 
         # Note: An efficient pyqtgraph function that returns a QPainterPath from pairs of points that should be connected in the most efficient way possible. This seems like a good way to draw spikes.
         # qpPath = pg.arrayToQPath(x, y, connect='pairs')
 
     def set_active_filter(self, start_datetime, end_datetime):
         # Draw the duration objects
-        for (index, obj) in enumerate(self.durationObjects):
-            obj.is_deemphasized = not obj.overlaps_range(start_datetime, end_datetime)
+        if self.eventTable is not None:
+            self.eventTable.set_deemphasized(
+                ~self.eventTable.compute_overlaps_range(start_datetime, end_datetime)
+            )
+            # Only the views that have already been built need updating, the rest pick up the flag when they're built
+            for (index, obj) in self.durationObjects.get_built_views():
+                obj.is_deemphasized = self.eventTable.is_deemphasized(index)
         # Draw the instantaneous event objects
         for (index, obj) in enumerate(self.instantaneousObjects):
             obj.is_deemphasized = not obj.overlaps_range(start_datetime, end_datetime)
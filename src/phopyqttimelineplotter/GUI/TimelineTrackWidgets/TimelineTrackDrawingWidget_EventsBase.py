@@ -23,6 +23,7 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
+from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
 from phopyqttimelineplotter.GUI.TimelineTrackWidgets.TimelineTrackDrawingWidget_SelectionBase import (
     TimelineTrackDrawingWidget_SelectionBase,
 )
@@ -72,6 +73,7 @@ class TimelineTrackDrawingWidget_EventsBase(TimelineTrackDrawingWidget_Selection
         self.instantaneousEventRect = np.repeat(
             QRect(0, 0, 0, 0), len(instantaneousObjects)
         )
+        self.instantaneousObjectsIndex = None
         # Selected Object
         self.shouldDismissSelectionUponMouseButtonRelease = (
             TimelineTrackDrawingWidget_EventsBase.default_shouldDismissSelectionUponMouseButtonRelease
@@ -87,44 +89,71 @@ class TimelineTrackDrawingWidget_EventsBase(TimelineTrackDrawingWidget_Selection
         # Set up signals
         self.attach_child_duration_object_signals()
 
+    # connect_child_signal(signal, slot): connects the signal to the slot only once, since the paged track configs reuse the same duration objects across reloads
+    @staticmethod
+    def connect_child_signal(signal, slot):
+        try:
+            signal.disconnect(slot)
+        except TypeError:
+            pass  # Wasn't connected yet
+        signal.connect(slot)
+
     # attach_child_duration_object_signals(): called to attach the signals to the children duration objects
     def attach_child_duration_object_signals(self):
         for aDurationObject in self.durationObjects:
-            aDurationObject.on_info.connect(self.on_child_action_info)
-            aDurationObject.on_edit.connect(self.on_child_action_modify)
-            aDurationObject.on_annotate.connect(self.on_child_action_comment)
-            aDurationObject.on_delete.connect(self.on_child_action_delete)
+            self.connect_child_signal(aDurationObject.on_info, self.on_child_action_info)
+            self.connect_child_signal(aDurationObject.on_edit, self.on_child_action_modify)
+            self.connect_child_signal(aDurationObject.on_annotate, self.on_child_action_comment)
+            self.connect_child_signal(aDurationObject.on_delete, self.on_child_action_delete)
+
+    # get_instantaneous_objects_index(): returns the EventIntervalIndex of self.instantaneousObjects, rebuilding it if they've changed
+    def get_instantaneous_objects_index(self):
+        self.instantaneousObjectsIndex = EventIntervalIndex.build_if_needed(
+            self.instantaneousObjectsIndex, self.instantaneousObjects
+        )
+        return self.instantaneousObjectsIndex
 
     def paintEvent(self, event):
         qp = QtGui.QPainter()
         qp.begin(self)
-        # TODO: minor speedup by re-using the array of QRect objects if the size doesn't change
-        self.eventRect = np.repeat(QRect(0, 0, 0, 0), len(self.durationObjects))
-        self.instantaneousEventRect = np.repeat(
-            QRect(0, 0, 0, 0), len(self.instantaneousObjects)
+        self.paint_static_tiles(qp, event.rect(), self.paint_static_contents)
+        qp.end()
+
+    # paint_static_contents(painter, exposedRect): paints the background and the objects within exposedRect, which paintEvent(...) renders into the cached tiles
+    def paint_static_contents(self, qp, exposedRect):
+        self.eventRect = self.get_reusable_rect_array(
+            self.eventRect, len(self.durationObjects)
+        )
+        self.instantaneousEventRect = self.get_reusable_rect_array(
+            self.instantaneousEventRect, len(self.instantaneousObjects)
         )
 
-        ## TODO: Use viewport information to only draw the currently displayed rectangles instead of having to draw it all at once.
-        # drawRect = event.rect()
+        # Objects are positioned relative to the whole track, but only the ones within the exposed rect are painted
         drawRect = self.rect()
 
         # Draw the linear horizontal gradient.
         lgrad = self.get_background_gradient(drawRect.height())
 
-        qp.fillRect(drawRect, lgrad)
+        qp.fillRect(exposedRect, lgrad)
 
         # Draw the duration objects
-        for (index, obj) in enumerate(self.durationObjects):
-            self.eventRect[index] = obj.paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
-            )
+        self.paint_visible_objects(
+            qp,
+            self.durationObjects,
+            self.get_duration_objects_index(),
+            self.eventRect,
+            drawRect,
+            exposedRect,
+        )
         # Draw the instantaneous event objects
-        for (index, obj) in enumerate(self.instantaneousObjects):
-            self.instantaneousEventRect[index] = obj.paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
-            )
-
-        qp.end()
+        self.paint_visible_objects(
+            qp,
+            self.instantaneousObjects,
+            self.get_instantaneous_objects_index(),
+            self.instantaneousEventRect,
+            drawRect,
+            exposedRect,
+        )
 
     def set_active_filter(self, start_datetime, end_datetime):
         # Draw the duration objects
@@ -135,32 +164,13 @@ class TimelineTrackDrawingWidget_EventsBase(TimelineTrackDrawingWidget_Selection
             obj.is_deemphasized = not obj.overlaps_range(start_datetime, end_datetime)
         self.update()
 
-    # TODO: find_overlapping_events(...) doesn't yet work
+    # find_overlapping_events(): returns a dict mapping the index of each duration object that's overlapped to the number of later-starting objects that start before it ends
     def find_overlapping_events(self):
-        currOpenEvents = []
-        currTime = None
+        overlap_counts = self.get_duration_objects_index().compute_overlap_counts()
         overlappingEvents = dict()
-
-        for (index, obj) in enumerate(self.durationObjects):
-            currTime = obj.startTime
-
-            for anOpenEventIndex, anOpenEvent in currOpenEvents:
-                if anOpenEvent.endTime <= currTime:
-                    # the event is now closed. Remove it from the currOpenEvents array
-                    currOpenEvents.remove((anOpenEventIndex, anOpenEvent))
-                else:
-                    # Otherwise the event is still open and we should check and see if it overlaps this event
-                    if anOpenEventIndex in overlappingEvents.keys():
-                        overlappingEvents[anOpenEventIndex] = (
-                            overlappingEvents[anOpenEventIndex] + 1
-                        )
-                    else:
-                        overlappingEvents[anOpenEventIndex] = 1
-
-            # Add the current to the array of open events
-            currOpenEvents.append((index, obj))
-
-        return overlappingEvents  # If there is no next event, return None
+        for index in np.flatnonzero(overlap_counts):
+            overlappingEvents[int(index)] = int(overlap_counts[index])
+        return overlappingEvents
 
     def on_button_clicked(self, event):
         super().on_button_clicked(event)
@@ -196,7 +206,6 @@ class TimelineTrackDrawingWidget_EventsBase(TimelineTrackDrawingWidget_Selection
                 self.hovered_object.computeDuration(),
             )
             QToolTip.showText(event.globalPos(), text, self, self.hovered_object_rect)
-            self.update()
 
     # Menu Event Handlers:
     @pyqtSlot(int)
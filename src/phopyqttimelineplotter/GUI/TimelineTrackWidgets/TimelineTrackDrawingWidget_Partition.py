@@ -317,36 +317,54 @@ class TimelineTrackDrawingWidget_Partition(
     def paintEvent(self, event):
         qp = QtGui.QPainter()
         qp.begin(self)
-        # TODO: minor speedup by re-using the array of QRect objects if the size doesn't change
+        # The rects are needed for hit-testing even when the partitions are drawn from the cached tiles
+        self.update_partition_rects()
+        self.paint_static_tiles(qp, event.rect(), self.paint_static_contents)
+        qp.end()
+
+    # update_partition_rects(): computes the rect of every partition in the track's current coordinates, without painting them
+    def update_partition_rects(self):
+        drawRect = self.rect()
         self.eventRect = np.repeat(QRect(0, 0, 0, 0), len(self.partitions))
-        self.instantaneousEventRect = np.repeat(QRect(0, 0, 0, 0), len(self.cutObjects))
+        for (index, obj) in enumerate(self.partitions):
+            parentOffsetRect = obj.get_view().compute_parent_offset_rect(
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect.width(),
+                drawRect.height(),
+            )
+            self.eventRect[index] = parentOffsetRect.translated(
+                drawRect.x(), drawRect.y()
+            )
 
-        # Draw the trace cursor
-        # qp.setPen(QtGui.QPen(EventsDrawingWindow.TraceCursorColor, 20.0, join=Qt.MiterJoin))
-        # qp.drawRect(event.rect().x(), event.rect().y(), EventsDrawingWindow.TraceCursorWidth, self.height())
+    # paint_static_contents(painter, exposedRect): paints the partitions and cuts, which paintEvent(...) renders into the cached tiles
+    def paint_static_contents(self, qp, exposedRect):
+        self.instantaneousEventRect = np.repeat(QRect(0, 0, 0, 0), len(self.cutObjects))
 
         ## TODO: Use viewport information to only draw the currently displayed rectangles instead of having to draw it all at once.
-        # print('eventRect:', event.rect())
-        # print('selftRect:', self.rect())
-        # print('')
-
-        # drawRect = event.rect()
         drawRect = self.rect()
 
         # Draw the duration objects
         for (index, obj) in enumerate(self.partitions):
             obj.get_view().update()
-            self.eventRect[index] = obj.get_view().paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
+            obj.get_view().paint(
+                qp,
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect,
             )
         # Draw the instantaneous event objects
         for (index, obj) in enumerate(self.cutObjects):
             self.instantaneousEventRect[index] = obj.paint(
-                qp, self.totalStartTime, self.totalEndTime, self.totalDuration, drawRect
+                qp,
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect,
             )
 
-        qp.end()
-
     def mouseDoubleClickEvent(self, event):
         print("Mouse double clicked! ({0},{1})".format(event.x(), event.y()))
 
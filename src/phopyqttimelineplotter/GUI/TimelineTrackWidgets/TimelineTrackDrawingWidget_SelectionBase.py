@@ -22,6 +22,9 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
+from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
+from phopyqttimelineplotter.GUI.Model.Events.EventTable import EventTable
+from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent import PhoDurationEvent
 from phopyqttimelineplotter.GUI.TimelineTrackWidgets.TimelineTrackDrawingWidgetBase import (
     ItemSelectionOptions,
     TimelineTrackDrawingWidgetBase,
@@ -40,6 +43,9 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
     default_TrackTitleFont = QFont("Helvetica", 22)
     default_TrackTitlePen = QPen(Qt.gray)
 
+    # How far (in pixels) outside of a paintEvent's exposed rect to still paint events, so borders and handles straddling its edges are drawn
+    exposed_rect_padding_pixels = 8
+
     def __init__(
         self,
         trackID,
@@ -64,6 +70,14 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
         self.durationRecords = []
         self.durationObjects = durationObjects
         self.eventRect = np.repeat(QRect(0, 0, 0, 0), len(durationObjects))
+        # If not None, the EventTable the durationObjects (an EventTableViewList) were built from. The track then paints and hit-tests from its columns.
+        self.eventTable = None
+
+        # Start-time-sorted index of the durationObjects, rebuilt lazily whenever they change
+        self.durationObjectsIndex = None
+        # The (x, width) pixel extents of every duration object, only recomputed when the index, width, or displayed time range changes
+        self.eventHitExtents = None
+        self.eventHitExtentsCacheKey = None
 
         # Hovered Object
         self.hovered_object_index = None
@@ -108,32 +122,23 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             self.durationObjects[anObjIndex] for anObjIndex in prevSelectedItemIndicies
         ]
 
-    # Find the next event
+    # Find the next event: returns the (index, obj) of the earliest event starting after following_datetime
     def find_next_event(self, following_datetime):
-        for (index, obj) in enumerate(self.durationObjects):
-            if obj.startTime > following_datetime:
-                return (index, obj)
-        return None  # If there is no next event, return None
+        found_index = self.get_duration_objects_index().find_next_index(
+            following_datetime
+        )
+        if found_index is None:
+            return None  # If there is no next event, return None
+        return (found_index, self.durationObjects[found_index])
 
-    # Find the previous event
+    # Find the previous event: returns the (index, obj) of the last event (in start order) before the first one that doesn't end before preceeding_datetime
     def find_previous_event(self, preceeding_datetime):
-        best_found_candidate_index = None
-        best_found_candidate_object = None
-
-        for (index, obj) in enumerate(self.durationObjects):
-            if obj.endTime < preceeding_datetime:
-                best_found_candidate_index = index
-                best_found_candidate_object = obj
-            else:
-                # otherwise if the object's endTime is later than our desired preceeding_datetime, we have our candidate to return
-                break
-
-        if (best_found_candidate_index is None) and (
-            best_found_candidate_object is None
-        ):
+        found_index = self.get_duration_objects_index().find_previous_index(
+            preceeding_datetime
+        )
+        if found_index is None:
             return None
-        else:
-            return (best_found_candidate_index, best_found_candidate_object)
+        return (found_index, self.durationObjects[found_index])
 
     # Returns the currently selected partition index or None if none are selected
     def get_selected_event_index(self):
@@ -161,12 +166,204 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
 
     # Returns the index of the child object that the (x, y) point falls within, or None if it doesn't fall within an event.
     def find_child_object(self, event_x, event_y):
-        clicked_object_index = None
-        for (index, aRect) in enumerate(self.eventRect):
-            if aRect.contains(event_x, event_y):
-                clicked_object_index = index
-                break
-        return clicked_object_index
+        if (event_y < 0) or (event_y >= self.height()):
+            return None
+        hit_indicies = self.get_event_hit_extents().find_indicies_containing(event_x)
+        if len(hit_indicies) == 0:
+            return None
+        return int(hit_indicies[0])
+
+    ## Event Index/Viewport Functions:
+    # get_duration_objects_index(): returns the EventIntervalIndex of self.durationObjects, rebuilding it if they've changed
+    def get_duration_objects_index(self):
+        if self.eventTable is not None:
+            self.durationObjectsIndex = self.eventTable.get_interval_index()
+        else:
+            self.durationObjectsIndex = EventIntervalIndex.build_if_needed(
+                self.durationObjectsIndex, self.durationObjects
+            )
+        return self.durationObjectsIndex
+
+    # rebuild_event_index(): rebuilds the index of the durationObjects. Should be called whenever they're reloaded.
+    def rebuild_event_index(self):
+        if self.eventTable is not None:
+            self.durationObjectsIndex = self.eventTable.get_interval_index()
+        else:
+            self.durationObjectsIndex = EventIntervalIndex(self.durationObjects)
+        self.eventHitExtents = None
+        self.eventHitExtentsCacheKey = None
+
+    # get_event_hit_extents(): returns the cached EventPixelExtents of every duration object, recomputing them only if the zoom, width or displayed time window has changed
+    def get_event_hit_extents(self):
+        durationObjectsIndex = self.get_duration_objects_index()
+        cacheKey = (
+            durationObjectsIndex,
+            self.width(),
+            self.get_displayed_start_time(),
+            self.get_displayed_end_time(),
+        )
+        if self.eventHitExtentsCacheKey != cacheKey:
+            self.eventHitExtents = durationObjectsIndex.compute_pixel_extents(
+                self.get_displayed_start_time(),
+                self.get_displayed_duration(),
+                self.width(),
+            )
+            self.eventHitExtentsCacheKey = cacheKey
+        return self.eventHitExtents
+
+    # get_event_hit_rect(index): returns the rect of the duration object at index, whether or not it's been painted
+    def get_event_hit_rect(self, index):
+        eventHitExtents = self.get_event_hit_extents()
+        return QRect(
+            int(eventHitExtents.x[index]),
+            0,
+            int(eventHitExtents.width[index]),
+            self.height(),
+        )
+
+    # get_exposed_time_range(exposedRect): returns the (start, end) datetimes covered by the exposed rect of a paintEvent (plus padding)
+    def get_exposed_time_range(self, exposedRect):
+        padding = TimelineTrackDrawingWidget_SelectionBase.exposed_rect_padding_pixels
+        return (
+            self.offset_to_datetime(exposedRect.left() - padding),
+            self.offset_to_datetime(exposedRect.right() + 1 + padding),
+        )
+
+    # get_reusable_rect_array(rect_array, num_rects): returns rect_array unless its length no longer matches num_rects
+    @staticmethod
+    def get_reusable_rect_array(rect_array, num_rects):
+        if (rect_array is not None) and (len(rect_array) == num_rects):
+            return rect_array
+        return np.repeat(QRect(0, 0, 0, 0), num_rects)
+
+    # paint_visible_objects(...): paints only the objects overlapping the exposedRect, storing their painted rects in object_rects. Returns the number of objects painted.
+    def paint_visible_objects(
+        self, painter, objects, objects_index, object_rects, drawRect, exposedRect
+    ):
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(exposedRect)
+        # Paint in the original order so overlapping objects stack the same way they did when everything was painted
+        visible_indicies = np.sort(
+            objects_index.find_overlapping_indicies(exposedStartTime, exposedEndTime)
+        )
+        for index in visible_indicies:
+            object_rects[index] = objects[index].paint(
+                painter,
+                self.get_displayed_start_time(),
+                self.get_displayed_end_time(),
+                self.get_displayed_duration(),
+                drawRect,
+            )
+        return len(visible_indicies)
+
+    # paint_visible_table_events(...): paints the events of eventTable overlapping the exposedRect straight from its columns, without building a view for each event. Returns the number of events within the exposedRect.
+    #   Events whose views have already been built (in eventViews, because they were hovered or selected) paint themselves on top so that their state is shown.
+    def paint_visible_table_events(
+        self, painter, eventTable, eventViews, drawRect, exposedRect
+    ):
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(exposedRect)
+        visible_indicies = np.sort(
+            eventTable.get_interval_index().find_overlapping_indicies(
+                exposedStartTime, exposedEndTime
+            )
+        )
+        if len(visible_indicies) == 0:
+            return 0
+
+        eventHitExtents = self.get_event_hit_extents()
+        # Many events land on the same pixels when zoomed out, so each distinct (x, width, variable, color, flags) is only drawn once
+        event_keys = np.stack(
+            [
+                eventHitExtents.x[visible_indicies] + drawRect.x(),
+                eventHitExtents.width[visible_indicies],
+                eventTable.variable_ids[visible_indicies],
+                eventTable.color_indicies[visible_indicies],
+                eventTable.flags[visible_indicies],
+            ],
+            axis=1,
+        ).astype(np.int64)
+        # Sorted by (color, flags) first so each style's events are contiguous. (np.lexsort is much faster than np.unique(..., axis=0) here.)
+        event_keys = event_keys[
+            np.lexsort(
+                (
+                    event_keys[:, 1],
+                    event_keys[:, 0],
+                    event_keys[:, 2],
+                    event_keys[:, 4],
+                    event_keys[:, 3],
+                )
+            )
+        ]
+        is_first_of_key = np.ones((len(event_keys),), dtype=bool)
+        is_first_of_key[1:] = np.any(event_keys[1:] != event_keys[:-1], axis=1)
+        unique_event_keys = event_keys[is_first_of_key]
+
+        y = drawRect.y()
+        height = drawRect.height()
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Set the pen and brush once per (color, flags) group
+        is_first_of_style = np.ones((len(unique_event_keys),), dtype=bool)
+        is_first_of_style[1:] = np.any(
+            unique_event_keys[1:, 3:5] != unique_event_keys[:-1, 3:5], axis=1
+        )
+        style_starts = np.flatnonzero(is_first_of_style)
+        style_ends = np.append(style_starts[1:], len(unique_event_keys))
+        for (style_start, style_end) in zip(style_starts, style_ends):
+            (color_index, flags) = unique_event_keys[style_start, 3:5]
+            is_instantaneous = bool(flags & EventTable.FlagInstantaneous)
+            (aPen, aBrush) = PhoDurationEvent.get_state_pen_and_brush(
+                eventTable.colors[color_index],
+                is_instantaneous,
+                bool(flags & EventTable.FlagDeemphasized),
+                False,
+                False,
+            )
+            painter.setPen(aPen)
+            painter.setBrush(aBrush)
+            group_keys = unique_event_keys[style_start:style_end]
+            if is_instantaneous:
+                painter.drawRects(
+                    [
+                        QRect(int(x), y, int(width), height)
+                        for (x, width) in group_keys[:, 0:2]
+                    ]
+                )
+            else:
+                for (x, width, variable_id) in group_keys[:, 0:3]:
+                    eventRect = QRect(int(x), y, int(width), height)
+                    painter.drawRoundedRect(
+                        eventRect,
+                        PhoDurationEvent.RectCornerRounding,
+                        PhoDurationEvent.RectCornerRounding,
+                    )
+                    painter.drawText(
+                        eventRect,
+                        Qt.AlignCenter,
+                        str(eventTable.variable_names[variable_id]),
+                    )
+        painter.restore()
+
+        for (index, aView) in eventViews.get_built_views():
+            if (
+                eventHitExtents.x[index] <= exposedRect.right() + 1
+                and eventHitExtents.x[index] + eventHitExtents.width[index]
+                >= exposedRect.left()
+            ):
+                aView.paint(
+                    painter,
+                    self.get_displayed_start_time(),
+                    self.get_displayed_end_time(),
+                    self.get_displayed_duration(),
+                    drawRect,
+                )
+        return len(visible_indicies)
+
+    # invalidate_duration_object_tiles(index): drops the cached static tiles the duration object at index is drawn in, since its state has changed
+    def invalidate_duration_object_tiles(self, index):
+        anObj = self.durationObjects[index]
+        self.invalidate_static_tiles(
+            anObj.startTime, anObj.startTime + anObj.computeDuration()
+        )
 
     def deselect_all(self):
         # print("deselect_all()")
@@ -174,6 +371,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             prevSelectedItemIndex = self.selected_duration_object_indicies[0]
             self.selected_duration_object_indicies.remove(prevSelectedItemIndex)
             self.durationObjects[prevSelectedItemIndex].set_state_deselected()
+            self.invalidate_duration_object_tiles(prevSelectedItemIndex)
 
     def select(self, new_selection_index):
         # Select the object
@@ -187,6 +385,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             # Doesn't already contain the object
             self.selected_duration_object_indicies.append(new_selection_index)
             self.durationObjects[new_selection_index].set_state_selected()
+            self.invalidate_duration_object_tiles(new_selection_index)
             return True
 
     def deselect(self, selection_index):
@@ -195,6 +394,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             # Already contains the object.
             self.selected_duration_object_indicies.remove(selection_index)
             self.durationObjects[selection_index].set_state_deselected()
+            self.invalidate_duration_object_tiles(selection_index)
             return True
         else:
             return False
@@ -204,6 +404,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             prevSelectedItemIndex = self.hovered_duration_object_indicies[0]
             self.hovered_duration_object_indicies.remove(prevSelectedItemIndex)
             self.durationObjects[prevSelectedItemIndex].set_state_deemphasized()
+            self.invalidate_duration_object_tiles(prevSelectedItemIndex)
 
     def emphasize(self, new_emph_index):
         # Select the object
@@ -217,6 +418,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             # Doesn't already contain the object
             self.hovered_duration_object_indicies.append(new_emph_index)
             self.durationObjects[new_emph_index].set_state_emphasized()
+            self.invalidate_duration_object_tiles(new_emph_index)
             return True
 
     def deemphasize(self, emph_index):
@@ -225,6 +427,7 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
             # Already contains the object.
             self.hovered_duration_object_indicies.remove(emph_index)
             self.durationObjects[emph_index].set_state_deemphasized()
+            self.invalidate_duration_object_tiles(emph_index)
             return True
         else:
             return False
@@ -356,31 +559,30 @@ class TimelineTrackDrawingWidget_SelectionBase(TimelineTrackDrawingWidgetBase):
 
     def on_mouse_moved(self, event):
         # print("TimelineTrackDrawingWidget_SelectionBase: mouse move!")
-        needs_update = False
+        prev_hovered_object_index = self.hovered_object_index
 
         if not self.underMouse():
             self.clear_hover()
             self.hover_changed.emit(self.trackID, -1)
-            needs_update = True
         else:
             self.hovered_object_index = self.find_child_object(event.x(), event.y())
             if self.hovered_object_index is None:
                 # No object hovered
                 self.clear_hover()
                 self.hover_changed.emit(self.trackID, -1)
-                needs_update = True
             else:
                 self.hovered_object = self.durationObjects[self.hovered_object_index]
                 self.emphasize(self.hovered_object_index)
-                self.hovered_object_rect = self.eventRect[self.hovered_object_index]
+                self.hovered_object_rect = self.get_event_hit_rect(
+                    self.hovered_object_index
+                )
                 # text = "event: {0}\nstart_time: {1}\nend_time: {2}\nduration: {3}".format(self.hovered_object.name, self.hovered_object.startTime, self.hovered_object.endTime, self.hovered_object.computeDuration())
                 # QToolTip.showText(event.globalPos(), text, self, self.hovered_object_rect)
-                needs_update = True
                 self.hover_changed.emit(self.trackID, self.hovered_object_index)
 
-        # Update if needed
-        if needs_update:
-            self.update()
+        # Only the hovered objects' tiles have changed (see emphasize(...)), so the rest of the track is drawn from the cache
+        if self.hovered_object_index != prev_hovered_object_index:
+            self.update_displayed_contents()
 
         super().on_mouse_moved(event)
 
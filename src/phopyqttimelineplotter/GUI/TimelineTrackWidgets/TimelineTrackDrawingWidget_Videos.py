@@ -82,10 +82,24 @@ class TimelineTrackDrawingWidget_Videos(
     def attach_child_duration_object_signals(self):
         super().attach_child_duration_object_signals()
         for aDurationObject in self.durationObjects:
-            aDurationObject.on_generate_thumbnails.connect(
-                self.on_child_action_generate_thumbnails
+            self.connect_child_signal(
+                aDurationObject.on_generate_thumbnails,
+                self.on_child_action_generate_thumbnails,
             )
 
+    ## Override:
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # Lazily re-request the thumbnails of any visible videos that had theirs evicted from the thumbnail cache
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(event.rect())
+        for index in self.get_duration_objects_index().find_overlapping_indicies(
+            exposedStartTime, exposedEndTime
+        ):
+            if self.durationObjects[index].get_needs_thumbnails():
+                self.child_action_generate_thumbnails.emit(
+                    self.trackID, self.durationObjects[index]
+                )
+
     # Updates the member variables from the database
     # Note: if there are any pending changes, they will be persisted on this action
     def reloadModelFromDatabase(self):
@@ -112,13 +126,14 @@ class TimelineTrackDrawingWidget_Videos(
             newViewIndex = len(self.durationObjects)
             newView = aContainerObj.get_view()
             newView.setAccessibleName(str(newViewIndex))
-            newView.on_create_marker_at_start.connect(self.on_create_playhead_selection)
-            newView.on_create_marker_at_end.connect(self.on_create_playhead_selection)
+            self.connect_child_signal(newView.on_create_marker_at_start, self.on_create_playhead_selection)
+            self.connect_child_signal(newView.on_create_marker_at_end, self.on_create_playhead_selection)
             self.durationObjects.append(newView)
 
         # Attach the signals to the new durationObjects:
         self.attach_child_duration_object_signals()
 
+        self.rebuild_event_index()
         self.update()
 
     # Clears the "now playing" status from any videos in the track
@@ -66,15 +66,23 @@ class ExtendedTracksContainerWidget(TickedTimelineDrawingBaseWidget):
 
         self.backgroundColor = ExtendedTracksContainerWidget.defaultBackgroundColor
 
-    def draw_tick_lines(self, painter):
+    def draw_tick_lines(self, painter, exposedRect=None):
         ## Overrides parent's implementation for the larger background view
+        if exposedRect is None:
+            exposedRect = self.rect()
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(
+            exposedRect, TickedTimelineDrawingBaseWidget.tickLineMarginPixels
+        )
         # y-positions are offset from the top of the frame
         painter.setPen(
             ExtendedTracksContainerWidget.staticTimeDelininationTickLineProperties.get_pen()
         )
 
         # Major markers (day markers)
-        for aStaticMarkerData in self.referenceManager.get_static_major_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_major_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
@@ -85,7 +93,10 @@ class ExtendedTracksContainerWidget(TickedTimelineDrawingBaseWidget):
         )
 
         # Minor Markers
-        for aStaticMarkerData in self.referenceManager.get_static_minor_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_minor_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
@@ -96,7 +107,8 @@ class ExtendedTracksContainerWidget(TickedTimelineDrawingBaseWidget):
         qp.begin(self)
         qp.setRenderHint(QPainter.Antialiasing)
 
-        self.draw_tick_lines(qp)
+        # The tick lines come from the cached tiles, so moving the hover/video lines only redraws those
+        self.paint_static_tiles(qp, event.rect())
         self.draw_indicator_lines(qp)
 
         self.get_reference_manager().draw(qp, event.rect(), self.getScale())
@@ -117,8 +129,9 @@ class ExtendedTracksContainerWidget(TickedTimelineDrawingBaseWidget):
 
     # Mouse movement
     def mouseMoveEvent(self, e):
+        prev_pos = self.pos
         self.pos = e.pos()
         x = self.pos.x()
         self.hoverChanged.emit(x)
-        self.update()
+        self.update_indicator_columns(prev_pos, self.pos)
         super().mouseMoveEvent(e)
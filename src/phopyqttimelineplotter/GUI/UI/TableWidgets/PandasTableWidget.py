@@ -1,7 +1,6 @@
 # coding: utf-8
 import sys
 
-import pandas as pd
 from PyQt5 import QtGui, QtWidgets, uic
 from PyQt5.QtCore import (
     QAbstractTableModel,
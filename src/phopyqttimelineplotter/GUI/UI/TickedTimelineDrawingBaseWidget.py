@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
+import math
 import os
 import sys
 import tempfile
@@ -35,9 +36,13 @@ from PyQt5.QtWidgets import QFrame, QScrollArea, QVBoxLayout, QWidget
 __backgroudColor__ = QColor(60, 63, 65)
 
 from phopyqttimelineplotter.GUI.Helpers.DateTimeRenders import DateTimeRenderMixin
+from phopyqttimelineplotter.GUI.Helpers.DurationRepresentationHelpers import (
+    OffsetRepresentationMixin,
+)
 from phopyqttimelineplotter.GUI.Helpers.FixedTimelineContentsWidthMixin import (
     FixedTimelineContentsWidthMixin,
 )
+from phopyqttimelineplotter.GUI.Helpers.TimelineTileCache import TimelineTileCache
 from phopyqttimelineplotter.GUI.Model.ReferenceLines.ReferenceLineManager import (
     ReferenceMarkerManager,
 )
@@ -48,7 +53,10 @@ from phopyqttimelineplotter.GUI.Model.ReferenceLines.ReferenceMarkerVisualHelper
 
 
 class TickedTimelineDrawingBaseWidget(
-    DateTimeRenderMixin, FixedTimelineContentsWidthMixin, QWidget
+    DateTimeRenderMixin,
+    OffsetRepresentationMixin,
+    FixedTimelineContentsWidthMixin,
+    QWidget,
 ):
     """A class that draws "ticks" which are evenly spaced lines along its entire width.
     Used by qtimeline.py and ExtendedTrackContainerWidget.py
@@ -72,6 +80,11 @@ class TickedTimelineDrawingBaseWidget(
     videoPlaybackLineProperties = TickProperties(Qt.red, 1.0, Qt.SolidLine)
     hoverLineProperties = TickProperties(Qt.cyan, 0.8, Qt.DashLine)
 
+    # How far (in pixels) outside of the exposed rect to still draw the tick lines, so the wide ones straddling its edges are drawn
+    tickLineMarginPixels = 2
+    # How far (in pixels) either side of an indicator line's x its (antialiased) drawing can extend
+    indicatorLineMarginPixels = 2
+
     def __init__(
         self, totalStartTime, totalEndTime, totalDuration, duration, parent=None
     ):
@@ -87,6 +100,10 @@ class TickedTimelineDrawingBaseWidget(
 
         # Set variables
         self.fixedWidth = 800.0
+        # The (start, end) of the time spanned by the widget's width, or None if it spans the whole timeline (see OffsetRepresentationMixin)
+        self.displayedTimeWindow = None
+        # The tick lines (and any other static layers), cached in tiles so that moving the indicator lines doesn't redraw them (see paint_static_tiles(...))
+        self.staticTileCache = TimelineTileCache()
         self.backgroundColor = __backgroudColor__
         self.pos = None
         self.video_pos = None
@@ -109,7 +126,20 @@ class TickedTimelineDrawingBaseWidget(
     def get_reference_manager(self):
         return self.referenceManager
 
-    def draw_tick_lines(self, painter):
+    # get_exposed_time_range(exposedRect, margin_pixels): returns the (start, end) datetimes covered by exposedRect, extended by margin_pixels on each side
+    def get_exposed_time_range(self, exposedRect, margin_pixels=0):
+        return (
+            self.offset_to_datetime(exposedRect.left() - margin_pixels),
+            self.offset_to_datetime(exposedRect.right() + 1 + margin_pixels),
+        )
+
+    # draw_tick_lines(painter, exposedRect): draws the tick lines of the static markers within exposedRect (the whole widget if None)
+    def draw_tick_lines(self, painter, exposedRect=None):
+        if exposedRect is None:
+            exposedRect = self.rect()
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(
+            exposedRect, TickedTimelineDrawingBaseWidget.tickLineMarginPixels
+        )
         # Draw dash lines
         # point = 0
         painter.setPen(
@@ -119,7 +149,10 @@ class TickedTimelineDrawingBaseWidget(
         painter.drawLine(0, 40, self.width(), 40)
 
         # Major markers (day markers)
-        for aStaticMarkerData in self.referenceManager.get_static_major_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_major_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
@@ -130,12 +163,40 @@ class TickedTimelineDrawingBaseWidget(
         )
 
         # Minor Markers
-        for aStaticMarkerData in self.referenceManager.get_static_minor_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_minor_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
             painter.drawLine(item_x_offset, 40, item_x_offset, 30)
 
+    # draw_static_layers(painter, exposedRect): draws everything that only changes with the zoom or the static markers, which paint_static_tiles(...) renders into the cached tiles
+    def draw_static_layers(self, painter, exposedRect):
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.draw_tick_lines(painter, exposedRect)
+
+    # invalidate_static_tiles(): drops the cached tiles, for when something drawn by draw_static_layers(...) has changed
+    def invalidate_static_tiles(self):
+        self.staticTileCache.invalidate()
+
+    # paint_static_tiles(painter, exposedRect): draws the static layers within exposedRect from the tile cache, rendering any missing tiles with draw_static_layers(...)
+    def paint_static_tiles(self, painter, exposedRect):
+        displayed_seconds = self.get_displayed_duration().total_seconds()
+        if (self.width() <= 0) or (displayed_seconds <= 0):
+            return
+        self.staticTileCache.set_layout(
+            self.get_total_start_time(),
+            float(self.width()) / displayed_seconds,
+            self.height(),
+            self.devicePixelRatioF(),
+            self.referenceManager.get_static_marker_data_version(),
+        )
+        self.staticTileCache.paint(
+            painter, self.get_displayed_start_time(), exposedRect, self.draw_static_layers
+        )
+
     # Draws the tick marks and the indicator lines
     def draw_indicator_lines(self, painter):
 
@@ -167,7 +228,7 @@ class TickedTimelineDrawingBaseWidget(
         qp.begin(self)
         qp.setRenderHint(QPainter.Antialiasing)
 
-        self.draw_tick_lines(qp)
+        self.paint_static_tiles(qp, event.rect())
         self.draw_indicator_lines(qp)
 
         self.get_reference_manager().draw(qp, event.rect(), self.getScale())
@@ -249,21 +310,36 @@ class TickedTimelineDrawingBaseWidget(
         self.pointerTimePos = self.pointerPos * self.getScale()
         self.update()
 
+    # get_indicator_half_width(): how far (in pixels) either side of an indicator line's x everything drawn for it extends
+    def get_indicator_half_width(self):
+        return TickedTimelineDrawingBaseWidget.indicatorLineMarginPixels
+
+    # update_indicator_columns(prev_pos, new_pos): schedules a repaint of only the columns an indicator line moved from and to (either can be None)
+    def update_indicator_columns(self, prev_pos, new_pos):
+        half_width = int(math.ceil(self.get_indicator_half_width()))
+        for aPos in (prev_pos, new_pos):
+            if aPos is not None:
+                self.update(
+                    QRect(int(aPos.x()) - half_width, 0, (2 * half_width) + 1, self.height())
+                )
+
     @pyqtSlot(int)
     def on_update_hover(self, x):
         self.is_driven_externally = True
+        prev_pos = self.pos
         self.pos = QPoint(x, 0)
-        self.update()
+        self.update_indicator_columns(prev_pos, self.pos)
 
     @pyqtSlot(int)
     def on_update_video_line(self, x):
+        prev_video_pos = self.video_pos
         # passing in None for x allows the line to be removed
         if x is None:
             self.video_pos = None
         else:
             self.video_pos = QPoint(x, 0)
 
-        self.update()
+        self.update_indicator_columns(prev_video_pos, self.video_pos)
 
     # Main Window Slots:
     @pyqtSlot()
@@ -65,13 +65,26 @@ class QTimeLine(TickedTimelineDrawingBaseWidget):
         self.indicatorTextVerticalOffset_Hover = 0.0
         self.indicatorTextVerticalOffset_VideoPlayback = 0.0
 
-    # Draw the date labels:
-    def drawTextLabels(self, painter):
+    # Overrides the parent's so that the time label centered on each indicator line is repainted along with it
+    def get_indicator_half_width(self):
+        return self.halfTextLabelWidth + TickedTimelineDrawingBaseWidget.indicatorLineMarginPixels
+
+    # Draw the date labels within exposedRect (the whole widget if None):
+    def drawTextLabels(self, painter, exposedRect=None):
+        if exposedRect is None:
+            exposedRect = self.rect()
+        # Only the labels overlapping the exposedRect are drawn, including the ones centered just off its edges
+        (exposedStartTime, exposedEndTime) = self.get_exposed_time_range(
+            exposedRect, self.halfTextLabelWidth
+        )
 
         # Major markers (day markers)
         painter.setPen(self.textColor)
         painter.setFont(self.font)
-        for aStaticMarkerData in self.referenceManager.get_static_major_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_major_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
@@ -86,7 +99,10 @@ class QTimeLine(TickedTimelineDrawingBaseWidget):
 
         # Minor markers (hour markers)
         painter.setFont(self.minor_font)
-        for aStaticMarkerData in self.referenceManager.get_static_minor_marker_data():
+        displayedMarkerData = self.referenceManager.get_static_minor_marker_data_in_range(
+            exposedStartTime, exposedEndTime
+        )
+        for aStaticMarkerData in displayedMarkerData:
             item_x_offset = self.referenceManager.compute_x_offset_from_datetime(
                 self.width(), aStaticMarkerData.time
             )
@@ -157,21 +173,29 @@ class QTimeLine(TickedTimelineDrawingBaseWidget):
         painter.setPen(QPen(self.activeColor, 5, Qt.SolidLine))
         painter.drawLine(0, 40, self.width(), 40)
 
+    # Overrides the parent's to add the date labels and baseline to the cached tiles
+    def draw_static_layers(self, painter, exposedRect):
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Draw the static date labels:
+        self.drawTextLabels(painter, exposedRect)
+
+        # Draw bottom horizontal baseline line
+        self.drawHorizontalBaseLine(painter)
+
+        self.draw_tick_lines(painter, exposedRect)
+
     def paintEvent(self, event):
         qp = QPainter()
         qp.begin(self)
         qp.setRenderHint(QPainter.Antialiasing)
 
-        # Draw the static date labels:
-        self.drawTextLabels(qp)
+        # Draw the static date labels, baseline and tick lines from the cached tiles
+        self.paint_static_tiles(qp, event.rect())
 
         # Draw the dynamic indicator labels
         self.drawCurrentIndicatorTextLabels(qp)
 
-        # Draw bottom horizontal baseline line
-        self.drawHorizontalBaseLine(qp)
-
-        self.draw_tick_lines(qp)
         self.draw_indicator_lines(qp)
 
         if self.pointerPos is not None:
@@ -233,7 +257,9 @@ class QTimeLine(TickedTimelineDrawingBaseWidget):
     # Set text color
     def setTextColor(self, color):
         self.textColor = color
+        self.invalidate_static_tiles()
 
     # Set Font
     def setTextFont(self, font):
         self.font = font
+        self.invalidate_static_tiles()
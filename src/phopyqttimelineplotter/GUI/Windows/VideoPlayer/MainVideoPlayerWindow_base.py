@@ -12,9 +12,12 @@ from PyQt5.QtWidgets import QApplication, QFileDialog, QMainWindow, \
 from PyQt5.QtGui import QCursor
 from PyQt5.QtCore import QDir, QTimer, Qt, QModelIndex, QSortFilterProxyModel
 
-from lib import vlc
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from phopyqttimelineplotter.app.model import TimestampModel, ToggleButtonModel, TimestampDelta
 
+# lib.vlc (libvlc's ctypes bindings) loads libvlc, so it's only imported once a video is first played
+vlc = LazyModule("lib.vlc")
+
 """
 The software displays/plays a video file with variable speed and navigation settings.
 The software runs a timer.
@@ -11,7 +11,7 @@ from phopyqttimelineplotter.app.filesystem.VideoPreviewThumbnailGeneratingMixin
     VideoThumbnail,
 )
 from phopyqttimelineplotter.app.model import TimestampDelta, TimestampModel, ToggleButtonModel
-from lib import vlc
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from PyQt5 import uic
 from PyQt5.QtCore import (
     QDir,
@@ -36,6 +36,9 @@ from phopyqttimelineplotter.GUI.Helpers.DateTimeRenders import DateTimeRenderMix
 from phopyqttimelineplotter.GUI.Model.DataMovieLinkInfo import *
 from phopyqttimelineplotter.GUI.Model.Errors import SimpleErrorStatusMixin
 
+# lib.vlc (libvlc's ctypes bindings) loads libvlc, so it's only imported once a video is first played
+vlc = LazyModule("lib.vlc")
+
 """
 The software displays/plays a video file with variable speed and navigation settings.
 The software runs a timer, which calls both self.timer_handler() and self.update_ui().
@@ -527,7 +530,6 @@ class VideoPlaybackRenderingWidgetMixin(DateTimeRenderMixin, object):
 class VLCVideoEventMixin(object):
 
     # vlc_event_media_time_change_handler(...) is called on VLC's MediaPlayerTimeChanged event
-    @vlc.callbackmethod
     def vlc_event_media_time_change_handler(self, _):
         # print('Time changed!')
 
@@ -549,7 +551,6 @@ class VLCVideoEventMixin(object):
             self.restart_needed = True
 
     # vlc_event_media_player_media_changed_handler(...) is called on VLC's MediaPlayerMediaChanged event
-    @vlc.callbackmethod
     def vlc_event_media_player_media_changed_handler(self, _):
         print("vlc_event_media_player_media_changed_handler()")
         print(
@@ -562,7 +563,6 @@ class VLCVideoEventMixin(object):
         self.on_media_changed_VideoPlaybackRenderingWidgetMixin()
 
     # vlc_event_media_duration_changed_handler(...) is called on VLC's MediaDurationChanged event
-    @vlc.callbackmethod
     def vlc_event_media_duration_changed_handler(self, _):
         print("vlc_event_media_duration_changed_handler()")
         print(
@@ -573,7 +573,6 @@ class VLCVideoEventMixin(object):
         )
 
     # vlc_event_media_player_parsed_changed_handler(...) is called on VLC's MediaParsedChanged event
-    @vlc.callbackmethod
     def vlc_event_media_player_parsed_changed_handler(self, _):
         print("vlc_event_media_player_parsed_changed_handler()")
         print(
@@ -584,7 +583,6 @@ class VLCVideoEventMixin(object):
         )
 
     # vlc_event_media_player_length_changed_handler(...) is called on VLC's MediaPlayerLengthChanged event
-    @vlc.callbackmethod
     def vlc_event_media_player_length_changed_handler(self, _):
         print("vlc_event_media_player_length_changed_handler()")
         print(
@@ -7,7 +7,7 @@ import traceback
 
 import qtawesome as qta
 from phopyqttimelineplotter.app.model import ToggleButtonModel
-from lib import vlc
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from PyQt5 import uic
 from PyQt5.QtCore import QDir, QModelIndex, QSortFilterProxyModel, Qt, QTimer
 from PyQt5.QtGui import QCursor
@@ -22,6 +22,9 @@ from PyQt5.QtWidgets import (
 
 from phopyqttimelineplotter.GUI.Model.DataMovieLinkInfo import *
 
+# Only imported once the widget creates its VLC instance
+vlc = LazyModule("lib.vlc")
+
 """
 The software displays/plays a video file with variable speed and navigation settings.
 The software runs a timer, which calls both self.timer_handler() and self.update_ui().
@@ -386,7 +389,6 @@ class VideoPlayerWidget(QWidget):
         print(newProposedFrame)
 
     # media_time_change_handler(...) is called on VLC's MediaPlayerTimeChanged event
-    @vlc.callbackmethod
     def media_time_change_handler(self, _):
         # print('Time changed!')
 
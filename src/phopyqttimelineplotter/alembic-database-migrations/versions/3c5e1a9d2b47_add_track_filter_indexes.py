@@ -0,0 +1,55 @@
+"""Add composite indexes for the track filter and time range queries
+
+Revision ID: 3c5e1a9d2b47
+Revises: f0f6a9772667
+Create Date: 2026-10-18 15:40:12.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c5e1a9d2b47'
+down_revision = 'f0f6a9772667'
+branch_labels = None
+depends_on = None
+
+# (table name, index name, columns). Must match the Index objects in the models' __table_args__ (db_model.py)
+track_filter_indexes = [
+    ('CategoricalDurationLabels', 'ix_CategoricalDurationLabels_subcontext_id_start_date', ['subcontext_id', 'start_date']),
+    ('CategoricalDurationLabels', 'ix_CategoricalDurationLabels_behavioral_box_id_start_date', ['behavioral_box_id', 'start_date']),
+    ('CategoricalDurationLabels', 'ix_CategoricalDurationLabels_start_date_end_date', ['start_date', 'end_date']),
+    ('TimestampedAnnotations', 'ix_TimestampedAnnotations_subcontext_start_date', ['subcontext', 'start_date']),
+    ('TimestampedAnnotations', 'ix_TimestampedAnnotations_behavioral_box_id_start_date', ['behavioral_box_id', 'start_date']),
+    ('TimestampedAnnotations', 'ix_TimestampedAnnotations_start_date_end_date', ['start_date', 'end_date']),
+    ('VideoFile', 'ix_VideoFile_behavioral_box_id_start_date', ['behavioral_box_id', 'start_date']),
+    ('VideoFile', 'ix_VideoFile_is_original_video_start_date', ['is_original_video', 'start_date']),
+    ('VideoFile', 'ix_VideoFile_start_date_end_date', ['start_date', 'end_date']),
+]
+
+
+def get_existing_index_names(table_name):
+    # Databases created by DatabaseConnectionRef.build_new_database(...) after the indexes were added to the models already have them
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return None
+    return set([anIndex['name'] for anIndex in inspector.get_indexes(table_name)])
+
+
+def upgrade():
+    for (table_name, index_name, columns) in track_filter_indexes:
+        existing_index_names = get_existing_index_names(table_name)
+        if (existing_index_names is None) or (index_name in existing_index_names):
+            continue
+        op.create_index(index_name, table_name, columns)
+    # Update the query planner's statistics so that it picks the new indexes
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    for (table_name, index_name, columns) in reversed(track_filter_indexes):
+        existing_index_names = get_existing_index_names(table_name)
+        if (existing_index_names is None) or (index_name not in existing_index_names):
+            continue
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,46 @@
+"""Add a unique index on the parent folder and full name of video files
+
+Revision ID: 8e4b2d6f1a35
+Revises: 3c5e1a9d2b47
+Create Date: 2026-10-18 16:52:40.513927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2d6f1a35'
+down_revision = '3c5e1a9d2b47'
+branch_labels = None
+depends_on = None
+
+# Must match the Index in VideoFile.__table_args__ (db_model.py)
+video_file_unique_index_name = 'ix_VideoFile_file_video_folder_file_fullname'
+video_file_unique_index_columns = ['file_video_folder', 'file_fullname']
+
+
+def get_existing_index_names(table_name):
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return None
+    return set([anIndex['name'] for anIndex in inspector.get_indexes(table_name)])
+
+
+def upgrade():
+    existing_index_names = get_existing_index_names('VideoFile')
+    if (existing_index_names is None) or (video_file_unique_index_name in existing_index_names):
+        return
+    # Files that were registered more than once in the same folder would fail the index. Keep the first record of each.
+    op.execute(
+        'DELETE FROM VideoFile WHERE id NOT IN '
+        '(SELECT MIN(id) FROM VideoFile GROUP BY file_video_folder, file_fullname)'
+    )
+    op.create_index(video_file_unique_index_name, 'VideoFile', video_file_unique_index_columns, unique=True)
+
+
+def downgrade():
+    existing_index_names = get_existing_index_names('VideoFile')
+    if (existing_index_names is None) or (video_file_unique_index_name not in existing_index_names):
+        return
+    op.drop_index(video_file_unique_index_name, table_name='VideoFile')
@@ -0,0 +1,56 @@
+# LazyModule.py
+# Stand-ins for heavy optional modules (matplotlib, pyqtgraph, cv2, pandas, h5py, scipy, silx, vlc) that only import them the first time they're actually used, so they aren't paid for on startup.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+import importlib
+
+## IMPORT:
+# from phopyqttimelineplotter.app.LazyModule import LazyModule
+
+
+class LazyModule(object):
+    """LazyModule: a module-level stand-in for a module that's imported on the first attribute access.
+
+    Replace an eager import with the equivalent LazyModule:
+        import cv2                          ->  cv2 = LazyModule("cv2")
+        import matplotlib.colors as mcolors ->  mcolors = LazyModule("matplotlib.colors")
+        from lib import vlc                 ->  vlc = LazyModule("lib.vlc")
+
+    Nothing is imported until an attribute is used (cv2.imread, pd.DataFrame, ...), so the stand-in must not be used at module or class definition time (decorators, signal signatures, base classes), or it's imported right away.
+    If on_loaded is provided it's called with the module once, right after it's first imported (e.g. to register converters).
+    """
+
+    def __init__(self, module_name, on_loaded=None):
+        # Set through __dict__ so that they never go through __getattr__
+        self.__dict__["_module_name"] = module_name
+        self.__dict__["_module"] = None
+        self.__dict__["_on_loaded"] = on_loaded
+
+    # load(): imports the module if needed and returns it
+    def load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_module_name"])
+            self.__dict__["_module"] = module
+            on_loaded = self.__dict__["_on_loaded"]
+            if on_loaded is not None:
+                on_loaded(module)
+        return module
+
+    def is_loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't found normally, i.e. the module's
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self):
+        if self.is_loaded():
+            return "<LazyModule {} (loaded)>".format(self.__dict__["_module_name"])
+        return "<LazyModule {} (not loaded)>".format(self.__dict__["_module_name"])
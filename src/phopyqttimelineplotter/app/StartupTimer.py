@@ -0,0 +1,71 @@
+# StartupTimer.py
+# Records how long each stage of launching the application takes, so the startup time can be broken down.
+# Deliberately has no Qt dependencies so that it can be imported first, before the (slow) Qt and database imports it measures.
+
+import time
+from contextlib import contextmanager
+
+## IMPORT:
+# from phopyqttimelineplotter.app.StartupTimer import StartupTimer
+
+
+class StartupTimer(object):
+    """StartupTimer: process-wide startup timings, kept on the class since the stages are spread across modules.
+
+    The clock starts when this module is first imported. Each stage is recorded either by measure(label) around it, or by mark(label) at its end (measuring from the previous mark).
+    print_report() prints the stages in order with their durations and the total since the clock started.
+    """
+
+    is_enabled = True
+
+    start_time = time.perf_counter()
+    last_mark_time = start_time
+    stages = []  # (label, duration_seconds, depth) in the order they started
+    curr_depth = 0
+
+    @staticmethod
+    def mark(label):
+        """Records the time since the previous mark (or measure(...)) as the stage label"""
+        now = time.perf_counter()
+        if StartupTimer.is_enabled:
+            StartupTimer.stages.append(
+                (label, now - StartupTimer.last_mark_time, StartupTimer.curr_depth)
+            )
+        StartupTimer.last_mark_time = now
+
+    @staticmethod
+    @contextmanager
+    def measure(label):
+        """Records the time taken by the with block as the stage label. Stages recorded within it are listed after it in the report, indented under it."""
+        stage_start_time = time.perf_counter()
+        stage_depth = StartupTimer.curr_depth
+        # Reserve the stage's place before the ones nested in it
+        stage_index = len(StartupTimer.stages)
+        StartupTimer.stages.append((label, 0.0, stage_depth))
+        StartupTimer.curr_depth += 1
+        StartupTimer.last_mark_time = stage_start_time
+        try:
+            yield
+        finally:
+            StartupTimer.curr_depth = stage_depth
+            now = time.perf_counter()
+            StartupTimer.stages[stage_index] = (label, now - stage_start_time, stage_depth)
+            StartupTimer.last_mark_time = now
+            if not StartupTimer.is_enabled:
+                del StartupTimer.stages[stage_index:]
+
+    @staticmethod
+    def get_elapsed_seconds():
+        return time.perf_counter() - StartupTimer.start_time
+
+    @staticmethod
+    def print_report(title="Startup timings"):
+        if not StartupTimer.is_enabled:
+            return
+        print("{0} ({1:.1f} ms total):".format(title, StartupTimer.get_elapsed_seconds() * 1000.0))
+        for (label, duration_seconds, depth) in StartupTimer.stages:
+            print(
+                "    {0}{1}: {2:.1f} ms".format(
+                    ("    " * depth), label, duration_seconds * 1000.0
+                )
+            )
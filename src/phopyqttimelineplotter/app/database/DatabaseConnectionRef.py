@@ -1,12 +1,16 @@
 # coding: utf-8
 import os
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 import sqlalchemy as db
 from phopyqttimelineplotter.app.BehaviorsList import BehaviorInfoOptions, BehaviorsManager
+from phopyqttimelineplotter.app.StartupTimer import StartupTimer
 from phopyqttimelineplotter.app.database.entry_models.Behaviors import Behavior, BehaviorGroup, CategoryColors
 from phopyqttimelineplotter.app.database.entry_models.DatabaseBase import Base, metadata
+from phopyqttimelineplotter.app.database.entry_models.DatabaseVersion import DatabaseVersion
 
 ## DATABASE MODELS:
 from phopyqttimelineplotter.app.database.entry_models.db_model import (
@@ -30,8 +34,12 @@ from phopyqttimelineplotter.app.database.utility_functions import *
 from PyQt5 import QtCore, QtGui
 from PyQt5.QtCore import QEvent, QObject, Qt, pyqtSignal
 from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPalette, QPen
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+from sqlalchemy.orm import joinedload, scoped_session, selectinload, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.pool import QueuePool
 
 from phopyqttimelineplotter.GUI.Model.AlchemicalModels.alchemical_model import (
     SqlAlchemyTableModel,
@@ -74,31 +82,63 @@ class DatabasePendingItemsState(QObject):
 
 """
 An open reference to the databse shared by the different windows
+
+The thread that connects (the GUI thread) uses self.session. Any other thread (like a QThreadPool worker) that calls get_session() gets a session of its own from self.ScopedSession, which it should release with remove_thread_session() (or by using thread_session()) when it's done.
+The database is opened in WAL mode, so the workers' reads don't block the GUI thread's writes (or the other way around).
+The tables are only created, and the sample records only added, when the database's DatabaseVersion row is older than database_schema_version/database_seed_version, so opening an up to date database doesn't write to it.
 """
 
 
 class DatabaseConnectionRef(QObject):
+
+    # SQLite settings applied to every pooled connection (see on_engine_connect(...))
+    sqlite_journal_mode = "WAL"
+    # NORMAL is still safe from corruption in WAL mode, it only skips the fsync on each commit
+    sqlite_synchronous = "NORMAL"
+    sqlite_cache_size_kib = 64 * 1024
+    sqlite_mmap_size_bytes = 256 * 1024 * 1024
+    # How long a writer waits for another connection's write lock before failing with "database is locked"
+    sqlite_busy_timeout_seconds = 10.0
+    # Older SQLite builds allow at most 999 bound parameters per statement, so longer IN (...) lists are split into queries of this many values
+    max_query_parameters = 900
+
+    # Connections kept open by the engine's pool, one for the GUI thread and each concurrently running worker
+    pool_size = 5
+    pool_max_overflow = 10
+
+    # Increment database_schema_version when tables are added to the models, so that existing databases run create_all again (indexes and columns of existing tables need an alembic migration instead)
+    database_schema_version = 1
+    # Increment database_seed_version when the sample records added by initSampleDatabase() change, so that existing databases get them
+    database_seed_version = 1
+
     def __init__(self, db_file):
         super(DatabaseConnectionRef, self).__init__(None)
         self.db_file = db_file
         self.engine = None
         self.session = None
         self.DBSession = None
+        self.ScopedSession = None
+        self.owning_thread_id = None
         self.enable_debug_printing = True
 
-        self.connect()
-        self.initSampleDatabase()
+        with StartupTimer.measure("DatabaseConnectionRef({0})".format(db_file)):
+            self.connect()
+            self.initSampleDatabaseIfNeeded()
 
     def connect(self):
         (self.engine, self.DBSession, self.session) = self.create_connection(
             db_file=self.db_file, shouldBuildTablesIfNeeded=True
         )
+        # Sessions for the other threads, each created on first use by that thread
+        self.ScopedSession = scoped_session(self.DBSession)
+        self.owning_thread_id = threading.get_ident()
 
     def commit(self):
-        if self.session:
+        session = self.get_session()
+        if session:
             try:
                 # See https://stackoverflow.com/questions/52075642/how-to-handle-unique-data-in-sqlalchemy-flask-pyhon
-                self.session.commit()
+                session.commit()
                 if self.enable_debug_printing:
                     print("Committed changes!")
                 return True
@@ -119,9 +159,10 @@ class DatabaseConnectionRef(QObject):
             return False
 
     def rollback(self):
-        if self.session:
+        session = self.get_session()
+        if session:
             try:
-                self.session.rollback()
+                session.rollback()
                 return True
             except Exception as e:
                 print("rollback: Other exception! Trying to continue", e)
@@ -132,9 +173,10 @@ class DatabaseConnectionRef(QObject):
 
     # Gets the modified records
     def get_pending_modified(self):
-        if self.session:
+        session = self.get_session()
+        if session:
             try:
-                return self.session.dirty
+                return session.dirty
             except Exception as e:
                 print("get_pending_modified: Other exception! Trying to continue", e)
                 return []
@@ -143,9 +185,10 @@ class DatabaseConnectionRef(QObject):
 
     # Gets the new records
     def get_pending_new(self):
-        if self.session:
+        session = self.get_session()
+        if session:
             try:
-                return self.session.new
+                return session.new
             except Exception as e:
                 print("get_pending_new: Other exception! Trying to continue", e)
                 return []
@@ -165,11 +208,33 @@ class DatabaseConnectionRef(QObject):
     def close(self):
         if self.session:
             self.session.close()
+        if self.ScopedSession is not None:
+            self.ScopedSession.remove()
 
     ## Getters:
 
+    # get_session(): the session of the calling thread. That's self.session on the thread that connected, and a session of the thread's own on any other.
     def get_session(self):
-        return self.session
+        if (self.ScopedSession is None) or self.is_owning_thread():
+            return self.session
+        return self.ScopedSession()
+
+    def is_owning_thread(self):
+        return threading.get_ident() == self.owning_thread_id
+
+    # remove_thread_session(): closes the calling (non-owning) thread's session, detaching its records. Pooled threads should call this when their work is done, so the next task on the thread starts with a fresh session.
+    def remove_thread_session(self):
+        if (self.ScopedSession is None) or self.is_owning_thread():
+            return
+        self.ScopedSession.remove()
+
+    # thread_session(): a context manager giving the calling thread's session, which is removed on exit (unless it's the owning thread's self.session)
+    @contextmanager
+    def thread_session(self):
+        try:
+            yield self.get_session()
+        finally:
+            self.remove_thread_session()
 
     def get_engine(self):
         return self.engine
@@ -198,30 +263,111 @@ class DatabaseConnectionRef(QObject):
         :param db_file: database file
         :return: Connection object or None
         """
-        engine = db.create_engine("sqlite:///" + db_file)
+        # The pooled connections are handed between threads (never used by two at once), so pysqlite's same-thread check is disabled
+        engine = db.create_engine(
+            "sqlite:///" + db_file,
+            poolclass=QueuePool,
+            pool_size=DatabaseConnectionRef.pool_size,
+            max_overflow=DatabaseConnectionRef.pool_max_overflow,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": DatabaseConnectionRef.sqlite_busy_timeout_seconds,
+            },
+        )
+        event.listen(engine, "connect", DatabaseConnectionRef.on_engine_connect)
         Base.metadata.bind = engine
+        StartupTimer.mark("create engine")
         if shouldBuildTablesIfNeeded:
-            self.build_new_database(engine)
-            print("New database built at {0}".format(db_file))
+            database_version = DatabaseConnectionRef.load_database_version(engine)
+            StartupTimer.mark("load database version")
+            if (database_version is None) or (
+                database_version.schema_version
+                < DatabaseConnectionRef.database_schema_version
+            ):
+                with StartupTimer.measure("build tables"):
+                    if self.build_new_database(engine):
+                        DatabaseConnectionRef.save_database_version(
+                            engine,
+                            schema_version=DatabaseConnectionRef.database_schema_version,
+                        )
+                print("New database built at {0}".format(db_file))
 
-        DBSession = sessionmaker()
-        DBSession.bind = engine
+        DBSession = sessionmaker(bind=engine)
         session = DBSession()
         return (engine, DBSession, session)
 
+    # load_database_version(engine): returns the database's DatabaseVersion values (as a row with schema_version and seed_version), or None if it doesn't have any yet
+    @staticmethod
+    def load_database_version(engine):
+        try:
+            if not engine.has_table(DatabaseVersion.__tablename__):
+                return None
+            return engine.execute(
+                DatabaseVersion.__table__.select().where(DatabaseVersion.id == 1)
+            ).first()
+        except OperationalError as e:
+            print("WARNING: failed to load the database version: {0}".format(str(e)))
+            return None
+
+    # save_database_version(engine, schema_version=None, seed_version=None): updates the versions that aren't None, creating the row if needed (with the others at 0)
+    @staticmethod
+    def save_database_version(engine, schema_version=None, seed_version=None):
+        values = dict()
+        if schema_version is not None:
+            values["schema_version"] = schema_version
+        if seed_version is not None:
+            values["seed_version"] = seed_version
+        table = DatabaseVersion.__table__
+        with engine.begin() as connection:
+            result = connection.execute(
+                table.update().where(table.c.id == 1).values(**values)
+            )
+            if result.rowcount == 0:
+                row_values = {"id": 1, "schema_version": 0, "seed_version": 0}
+                row_values.update(values)
+                connection.execute(table.insert().values(**row_values))
+
+    # on_engine_connect(dbapi_connection, connection_record): sets the SQLite pragmas on each new connection in the pool. journal_mode is persistent in the database file, the others only last for the connection.
+    @staticmethod
+    def on_engine_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(
+                "PRAGMA journal_mode={0}".format(DatabaseConnectionRef.sqlite_journal_mode)
+            )
+            cursor.execute(
+                "PRAGMA synchronous={0}".format(DatabaseConnectionRef.sqlite_synchronous)
+            )
+            # A negative cache_size is in KiB rather than pages
+            cursor.execute(
+                "PRAGMA cache_size=-{0:d}".format(DatabaseConnectionRef.sqlite_cache_size_kib)
+            )
+            cursor.execute(
+                "PRAGMA mmap_size={0:d}".format(DatabaseConnectionRef.sqlite_mmap_size_bytes)
+            )
+        except Exception as e:
+            print("WARNING: failed to configure the SQLite connection: {0}".format(str(e)))
+        finally:
+            cursor.close()
+
     ## LOADING:=
-    def load_categorical_duration_labels_from_database(self, contextConfigObj):
+    # load_categorical_duration_labels_from_database(contextConfigObj, range_start=None, range_end=None): if range_start and range_end are provided only the labels overlapping that range are loaded
+    def load_categorical_duration_labels_from_database(
+        self, contextConfigObj, range_start=None, range_end=None
+    ):
         if self.enable_debug_printing:
             print("Loading categorical_duration_labels from database:")
         session = self.get_session()
         currSearchSubcontext = contextConfigObj.get_subcontext()
         # annotations = session.query(CategoricalDurationLabel).options(selectinload(CategoricalDurationLabel.Context)).all()
-        records = (
-            session.query(CategoricalDurationLabel)
-            .filter(CategoricalDurationLabel.Subcontext == currSearchSubcontext)
-            .order_by(CategoricalDurationLabel.start_date)
-            .all()
+        query = session.query(CategoricalDurationLabel).filter(
+            CategoricalDurationLabel.Subcontext == currSearchSubcontext
         )
+        if (range_start is not None) and (range_end is not None):
+            query = CategoricalDurationLabel.filter_overlapping_range(
+                query, session, range_start, range_end
+            )
+        records = query.order_by(CategoricalDurationLabel.start_date).all()
         return records
 
     def load_annotation_events_from_database(self):
@@ -313,6 +459,55 @@ class DatabaseConnectionRef(QObject):
         objs = session.query(ExVideoFile).all()
         return objs
 
+    # load_new_video_files_from_database(parent_folder, file_fullnames): loads the video files in parent_folder with one of the full names, and adds them to parent_folder.videoFiles (as already loaded, not as a change), so that newly inserted files can be loaded without reloading the whole folder
+    def load_new_video_files_from_database(self, parent_folder, file_fullnames):
+        if self.enable_debug_printing:
+            print("Loading {0} new video_file_info from database:".format(len(file_fullnames)))
+        session = self.get_session()
+        file_fullnames = list(file_fullnames)
+        objs = []
+        # Chunked, since SQLite limits the number of bound parameters in a query
+        for chunk_start_index in range(0, len(file_fullnames), DatabaseConnectionRef.max_query_parameters):
+            objs.extend(
+                session.query(ExVideoFile)
+                .filter(ExVideoFile.file_video_folder == parent_folder.id)
+                .filter(
+                    ExVideoFile.file_fullname.in_(
+                        file_fullnames[chunk_start_index:(chunk_start_index + DatabaseConnectionRef.max_query_parameters)]
+                    )
+                )
+                .all()
+            )
+        # If parent_folder.videoFiles isn't loaded yet it will already include them when it is
+        if "videoFiles" not in db.inspect(parent_folder).unloaded:
+            loaded_ids = set(aVideoFile.id for aVideoFile in parent_folder.videoFiles)
+            set_committed_value(
+                parent_folder,
+                "videoFiles",
+                list(parent_folder.videoFiles)
+                + [aVideoFile for aVideoFile in objs if aVideoFile.id not in loaded_ids],
+            )
+        return objs
+
+    # load_video_file_dates_from_database(): returns (videoFileStartDates, videoFileEndDates), the datetimes of every video with an end date in start order, without loading the full video records
+    def load_video_file_dates_from_database(self):
+        if self.enable_debug_printing:
+            print("Loading video_file dates from database:")
+        session = self.get_session()
+        found_rows = (
+            session.query(ExVideoFile.start_date, ExVideoFile.end_date)
+            .filter(ExVideoFile.end_date.isnot(None))
+            .order_by(ExVideoFile.start_date)
+            .all()
+        )
+        videoFileStartDates = [
+            datetime_from_database(start_date) for (start_date, end_date) in found_rows
+        ]
+        videoFileEndDates = [
+            datetime_from_database(end_date) for (start_date, end_date) in found_rows
+        ]
+        return (videoFileStartDates, videoFileEndDates)
+
     ## SAVING:
     def save_to_database(self, recordsList, recordTypeName):
         if self.enable_debug_printing:
@@ -630,6 +825,80 @@ class DatabaseConnectionRef(QObject):
 
         return
 
+    def upsert_video_files_to_database(
+        self, new_video_file_rows, updated_video_file_rows=None
+    ):
+        """Inserts and updates video files in a single transaction, without building a record object (or committing) per file.
+        new_video_file_rows: dicts of VideoFile column values (see VideoFile.get_column_values_from_parsed_video_result_obj(...)). Rows whose (file_video_folder, file_fullname) is already in the database are skipped by the unique index.
+        updated_video_file_rows: dicts with the 'id' of an existing VideoFile and the column values to change
+        The records already loaded in the session aren't expired by the commit (the rows bypass them), and the loaded records of updated_video_file_rows get the new values, so callers don't need to reload them.
+        Returns (num_inserted_records, num_updated_records), or None if the transaction failed and was rolled back.
+        """
+        if updated_video_file_rows is None:
+            updated_video_file_rows = []
+        if self.enable_debug_printing:
+            print(
+                "Upserting {0} new and {1} updated video_file_info to database: {2}".format(
+                    len(new_video_file_rows),
+                    len(updated_video_file_rows),
+                    self.get_path(),
+                )
+            )
+        session = self.get_session()
+        num_inserted_records = 0
+        try:
+            if len(new_video_file_rows) > 0:
+                # A single executemany. "OR IGNORE" leaves the existing row in place if it violates the unique index
+                insert_statement = ExVideoFile.__table__.insert().prefix_with(
+                    "OR IGNORE", dialect="sqlite"
+                )
+                result = session.execute(insert_statement, list(new_video_file_rows))
+                num_inserted_records = max(result.rowcount, 0)
+            if len(updated_video_file_rows) > 0:
+                session.bulk_update_mappings(ExVideoFile, list(updated_video_file_rows))
+        except Exception as e:
+            print(
+                "ERROR: Other exception ({0}) while trying to upsert video_file_info to database! Rolling back".format(
+                    str(e)
+                )
+            )
+            self.rollback()
+            return None
+
+        if self.enable_debug_printing:
+            print(
+                "Inserted",
+                num_inserted_records,
+                "of",
+                len(new_video_file_rows),
+                "new and updated",
+                len(updated_video_file_rows),
+                "video_file_info in database.",
+            )
+        # Save (commit) the changes. Expiring every loaded record would make each one be reloaded (one query at a time) the next time it's used.
+        previous_expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False
+        try:
+            did_commit = self.commit()
+        finally:
+            session.expire_on_commit = previous_expire_on_commit
+        if not did_commit:
+            return None
+
+        # Keep the loaded versions of the updated records in sync, without marking them as modified
+        for anUpdatedRow in updated_video_file_rows:
+            aLoadedVideoFile = session.identity_map.get(
+                identity_key(ExVideoFile, anUpdatedRow["id"])
+            )
+            if aLoadedVideoFile is not None:
+                for (aColumnName, aValue) in anUpdatedRow.items():
+                    if aColumnName != "id":
+                        set_committed_value(aLoadedVideoFile, aColumnName, aValue)
+
+        if self.enable_debug_printing:
+            print("done.")
+        return (num_inserted_records, len(updated_video_file_rows))
+
     ## Deleting:
     def delete_from_database(self, recordsList):
         if self.enable_debug_printing:
@@ -882,6 +1151,21 @@ class DatabaseConnectionRef(QObject):
         return
 
     ## Defaults/Static Database Setup:
+    # initSampleDatabaseIfNeeded(): adds the sample records with initSampleDatabase() unless this database already has the current database_seed_version
+    def initSampleDatabaseIfNeeded(self):
+        database_version = DatabaseConnectionRef.load_database_version(self.engine)
+        if (database_version is not None) and (
+            database_version.seed_version >= DatabaseConnectionRef.database_seed_version
+        ):
+            StartupTimer.mark("check sample records")
+            return False
+        with StartupTimer.measure("add sample records"):
+            self.initSampleDatabase()
+            DatabaseConnectionRef.save_database_version(
+                self.engine, seed_version=DatabaseConnectionRef.database_seed_version
+            )
+        return True
+
     def initSampleDatabase(self):
         # Need to load all first
         print("Adding sample records if needed...")
@@ -0,0 +1,24 @@
+# coding: utf-8
+from sqlalchemy import Column, Integer, Text
+
+from phopyqttimelineplotter.app.database.entry_models.DatabaseBase import Base, metadata
+
+## Import Statement:
+# from phopyqttimelineplotter.app.database.entry_models.DatabaseVersion import DatabaseVersion
+
+class DatabaseVersion(Base):
+    """DatabaseVersion: a single row (id 1) recording which versions of the schema and of the sample records a database file has been set up with.
+    See DatabaseConnectionRef.database_schema_version and DatabaseConnectionRef.database_seed_version.
+    """
+    __tablename__ = 'databaseVersion'
+
+    id = Column(Integer, primary_key=True)
+    schema_version = Column(Integer, nullable=False)
+    seed_version = Column(Integer, nullable=False)
+    notes = Column(Text)
+
+    def __init__(self, id, schema_version, seed_version, notes=None):
+        self.id = id
+        self.schema_version = schema_version
+        self.seed_version = seed_version
+        self.notes = notes
@@ -1,8 +1,9 @@
 # coding: utf-8
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from phopyqttimelineplotter.app.database.entry_models.DatabaseBase import Base, metadata
+from phopyqttimelineplotter.app.database.utility_functions import datetime_to_database
 from phopyqttimelineplotter.app.filesystem.VideoUtils import FoundVideoFileResult, VideoParsedResults
 from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPen
@@ -25,14 +26,20 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Table,
     Text,
     UniqueConstraint,
+    and_,
+    func,
+    literal,
+    or_,
+    select,
     text,
 )
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import aliased, relationship
 from sqlalchemy.sql.sqltypes import NullType
 
 from phopyqttimelineplotter.GUI.Helpers.DateTimeRenders import DateTimeRenderMixin
@@ -166,6 +173,36 @@ class StartEndDatetimeMixin(DateTimeRenderMixin, object):
             "end_date": self.get_full_long_date_time_string(self.get_end_date()),
         }
 
+    # date_column_value(aDatetime): converts a datetime to the value stored in the start_date/end_date columns (integer milliseconds since the epoch)
+    @classmethod
+    def date_column_value(cls, aDatetime):
+        return datetime_to_database(aDatetime)
+
+    # earliest_possible_start(range_start): the SQL expression for the earliest start_date of a record that could overlap a range starting at range_start, which is range_start less the longest (end_date - start_date) of any record in the table.
+    #   The longest duration is a scalar subquery (served by the (start_date, end_date) index) rather than a value computed up front, so it always includes the latest writes, including those of other processes sharing the database file.
+    @classmethod
+    def earliest_possible_start(cls, range_start):
+        longestRecord = aliased(cls)
+        longest_duration = select(
+            [func.coalesce(func.max(longestRecord.end_date - longestRecord.start_date), 0)]
+        ).as_scalar()
+        return cls.date_column_value(range_start) - longest_duration
+
+    @classmethod
+    def filter_overlapping_range(cls, query, session, range_start, range_end):
+        """Adds the filters to query that limit it to the records overlapping [range_start, range_end], with the same semantics as the views' overlaps_range(...) (records without an end_date only overlap if they start within the range).
+        A record can only overlap the range if it starts after earliest_possible_start(range_start), so start_date is bounded on both sides and the (..., start_date) indexes only have to scan the records near the range rather than every record before it.
+        """
+        range_start_value = cls.date_column_value(range_start)
+        return query.filter(
+            cls.start_date >= cls.earliest_possible_start(range_start),
+            cls.start_date <= cls.date_column_value(range_end),
+            or_(
+                cls.end_date >= range_start_value,
+                and_(cls.end_date == None, cls.start_date >= range_start_value),
+            ),
+        )
+
 
 class Animal(Base):
     __tablename__ = "Animals"
@@ -413,6 +450,25 @@ class CategoricalDurationLabel(
     Context = relationship("Context", foreign_keys=[context_id])
     Subcontext = relationship("Subcontext", foreign_keys=[subcontext_id])
 
+    # Match the track filters (which select by subcontext or box and order by start_date) and the range queries of filter_overlapping_range(...). Created for existing databases by the alembic migration 3c5e1a9d2b47.
+    __table_args__ = (
+        Index(
+            "ix_CategoricalDurationLabels_subcontext_id_start_date",
+            "subcontext_id",
+            "start_date",
+        ),
+        Index(
+            "ix_CategoricalDurationLabels_behavioral_box_id_start_date",
+            "behavioral_box_id",
+            "start_date",
+        ),
+        Index(
+            "ix_CategoricalDurationLabels_start_date_end_date",
+            "start_date",
+            "end_date",
+        ),
+    )
+
     # def __init__(self,id,start_date,end_date,label_created_date,label_created_user,last_updated_date,last_updated_user,context_id,subcontext_id,\
     #      type_id, subtype_id, tertiarytype_id, primary_text, secondary_text, tertiary_text, notes):
     #     self.id = id
@@ -571,6 +627,31 @@ class CategoricalDurationLabel(
     def get_end_date(self):
         return self.end_date
 
+    @classmethod
+    def date_column_value(cls, aDatetime):
+        return aDatetime
+
+    # The DateTime columns are stored as strings by SQLite, so the durations are computed from their julian days.
+    #   datetime(...) drops the fractional seconds (rounding the bound down), and the extra second covers the rounding of the julian days.
+    @classmethod
+    def earliest_possible_start(cls, range_start):
+        longestRecord = aliased(cls)
+        longest_duration_days = select(
+            [
+                func.coalesce(
+                    func.max(
+                        func.julianday(longestRecord.end_date)
+                        - func.julianday(longestRecord.start_date)
+                    ),
+                    0.0,
+                )
+            ]
+        ).as_scalar()
+        return func.datetime(
+            func.julianday(literal(range_start - timedelta(seconds=1), DateTime))
+            - longest_duration_days
+        )
+
 
 class TimestampedAnnotation(
     StartEndDatetimeMixin, ReferenceBoxExperCohortAnimalMixin, Base
@@ -594,6 +675,25 @@ class TimestampedAnnotation(
     Context = relationship("Context", foreign_keys=[context])
     Subcontext = relationship("Subcontext", foreign_keys=[subcontext])
 
+    # See CategoricalDurationLabel.__table_args__
+    __table_args__ = (
+        Index(
+            "ix_TimestampedAnnotations_subcontext_start_date",
+            "subcontext",
+            "start_date",
+        ),
+        Index(
+            "ix_TimestampedAnnotations_behavioral_box_id_start_date",
+            "behavioral_box_id",
+            "start_date",
+        ),
+        Index(
+            "ix_TimestampedAnnotations_start_date_end_date",
+            "start_date",
+            "end_date",
+        ),
+    )
+
     """
     TimestampedAnnotation:
         .context = Column(Integer, ForeignKey('Contexts.id'), server_default=text("1"))
@@ -702,6 +802,28 @@ class VideoFile(StartEndDatetimeMixin, ReferenceBoxExperCohortAnimalMixin, Base)
     staticFileExtension = relationship("StaticFileExtension")
     fileParentFolder = relationship("FileParentFolder", back_populates="videoFiles")
 
+    # See CategoricalDurationLabel.__table_args__. The video tracks always filter on is_original_video.
+    # A file is only registered once per parent folder, which DatabaseConnectionRef.upsert_video_files_to_database(...) relies on. Created for existing databases (after removing any duplicates) by the alembic migration 8e4b2d6f1a35.
+    __table_args__ = (
+        Index(
+            "ix_VideoFile_file_video_folder_file_fullname",
+            "file_video_folder",
+            "file_fullname",
+            unique=True,
+        ),
+        Index(
+            "ix_VideoFile_behavioral_box_id_start_date",
+            "behavioral_box_id",
+            "start_date",
+        ),
+        Index(
+            "ix_VideoFile_is_original_video_start_date",
+            "is_original_video",
+            "start_date",
+        ),
+        Index("ix_VideoFile_start_date_end_date", "start_date", "end_date"),
+    )
+
     @staticmethod
     def get_track_type():
         return TrackType.Video
@@ -873,8 +995,29 @@ class VideoFile(StartEndDatetimeMixin, ReferenceBoxExperCohortAnimalMixin, Base)
     def from_parsed_video_result_obj(
         aParsedVideoResultObj, anExperimentID=1, aCohortID=1, anAnimalID=3, notes=""
     ):
-        aFullPath = str(aParsedVideoResultObj.path)
         aFullParentPath = str(aParsedVideoResultObj.parent_path)  # The parent path
+        return VideoFile(
+            None,
+            **VideoFile.get_column_values_from_parsed_video_result_obj(
+                aParsedVideoResultObj,
+                aFullParentPath,
+                anExperimentID,
+                aCohortID,
+                anAnimalID,
+                notes,
+            )
+        )
+
+    # get_column_values_from_parsed_video_result_obj(...): returns a dict of the column values (except id) of a VideoFile for aParsedVideoResultObj without building the record, for bulk inserts (see DatabaseConnectionRef.upsert_video_files_to_database(...))
+    @staticmethod
+    def get_column_values_from_parsed_video_result_obj(
+        aParsedVideoResultObj,
+        aParentFolderID,
+        anExperimentID=1,
+        aCohortID=1,
+        anAnimalID=3,
+        notes="",
+    ):
         aFullName = aParsedVideoResultObj.full_name  # The full name including extension
         aBaseName = (
             aParsedVideoResultObj.base_name
@@ -906,22 +1049,21 @@ class VideoFile(StartEndDatetimeMixin, ReferenceBoxExperCohortAnimalMixin, Base)
         )
         duration = int(aParsedVideoResultObj.get_duration().total_seconds() * 1000.0)
 
-        return VideoFile(
-            None,
-            aFullName,
-            aBaseName,
-            anExtension,
-            aFullParentPath,
-            startTime,
-            endTime,
-            duration,
-            aBBID,
-            anExperimentID,
-            aCohortID,
-            anAnimalID,
-            is_original_video,
-            notes,
-        )
+        return {
+            "file_fullname": aFullName,
+            "file_basename": aBaseName,
+            "file_extension": anExtension,
+            "file_video_folder": aParentFolderID,
+            "start_date": startTime,
+            "end_date": endTime,
+            "duration": duration,
+            "behavioral_box_id": aBBID,
+            "experiment_id": anExperimentID,
+            "cohort_id": aCohortID,
+            "animal_id": anAnimalID,
+            "is_original_video": is_original_video,
+            "notes": notes,
+        }
 
     @staticmethod
     def get_gui_view(aVideoRecord, parent=None):
@@ -0,0 +1,73 @@
+# DataFileProcessPool.py
+# Runs a data file loading function on each of a list of files in separate worker processes, handing back the results in file order.
+# Deliberately has no Qt dependencies so that it can be used from worker threads.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# from phopyqttimelineplotter.app.filesystem.DataFileProcessPool import DataFileProcessPool
+
+
+class DataFileProcessPool(object):
+    """DataFileProcessPool: fans the parsing of data files out to a ProcessPoolExecutor, since parsing is CPU bound and a single thread is limited by the GIL.
+
+    load_fn must be a module-level function or a static method (so it can be pickled) and should return compact, picklable values (numpy arrays, dicts of arrays) rather than QObjects, which can't cross the process boundary.
+    map_in_file_order(...) yields the results in the order of file_paths, so a caller that merges them as they're yielded gets the same order as loading the files one after another.
+    With max_processes <= 1, or a single file, the files are loaded in the calling thread instead (the previous behavior).
+    Exceptions of the propagated_exception_types (programming errors, like a loader that doesn't implement load_data_file_arrays(...)) aren't treated as a failure to load one file: they're re-raised to the caller.
+    """
+
+    # The workers are spawned, so each one has to import the loader's modules before it can start parsing. More than a few rarely helps since the files are also read from the same disk.
+    default_max_processes = min(4, os.cpu_count() or 1)
+
+    # Raised out of map_in_file_order(...) rather than yielded as a file's error, since they'd fail the same way for every file
+    propagated_exception_types = (NotImplementedError,)
+
+    def __init__(self, max_processes=None):
+        super(DataFileProcessPool, self).__init__()
+        if max_processes is None:
+            max_processes = DataFileProcessPool.default_max_processes
+        self.max_processes = max_processes
+
+    def should_use_processes(self, num_files):
+        return (self.max_processes > 1) and (num_files > 1)
+
+    def map_in_file_order(self, load_fn, file_paths, *args):
+        """Calls load_fn(aFilePath, *args) for each of file_paths.
+        Yields (aFilePath, result, error) in the order of file_paths as each becomes available: error is None on success, or the exception raised while loading that file (with result None).
+        Exceptions of the propagated_exception_types are raised instead (any remaining files are cancelled).
+        """
+        file_paths = list(file_paths)
+        if not self.should_use_processes(len(file_paths)):
+            for aFilePath in file_paths:
+                try:
+                    result = load_fn(aFilePath, *args)
+                except DataFileProcessPool.propagated_exception_types:
+                    raise
+                except Exception as e:
+                    yield (aFilePath, None, e)
+                    continue
+                yield (aFilePath, result, None)
+            return
+
+        # Spawn (rather than fork) the workers, since this process has Qt and other threads running
+        with ProcessPoolExecutor(
+            max_workers=min(len(file_paths), self.max_processes),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(load_fn, aFilePath, *args) for aFilePath in file_paths
+            ]
+            # Waiting on the futures in order means a file that finishes early is held until the ones before it are done, but the workers keep going in the meantime
+            for (aFilePath, aFuture) in zip(file_paths, futures):
+                try:
+                    result = aFuture.result()
+                except DataFileProcessPool.propagated_exception_types:
+                    for aPendingFuture in futures:
+                        aPendingFuture.cancel()
+                    raise
+                except Exception as e:
+                    yield (aFilePath, None, e)
+                    continue
+                yield (aFilePath, result, None)
@@ -4,14 +4,15 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
-import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+from phopyqttimelineplotter.app.LazyModule import LazyModule
+from phopyqttimelineplotter.app.filesystem.DataFileProcessPool import DataFileProcessPool
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
 )
 from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import FilesystemRecordBase
+from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
 from phopyqttimelineplotter.app.filesystem.Workers.VideoFilesystemWorkers import VideoFilesystemWorker
 from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtCore import (
@@ -59,6 +60,10 @@ from phopyqttimelineplotter.GUI.UI.AbstractDatabaseAccessingWidgets import (
 
 # from phopyqttimelineplotter.app.filesystem.DeeplabcutOutputFilesystemLoadingMixin import DeeplabCutOutputFileType, DeeplabcutEventFile, DeeplabcutFilesystemLoader
 
+# pandas reads the output files and matplotlib converts the variable color names, both only once a file is loaded
+pd = LazyModule("pandas")
+mcolors = LazyModule("matplotlib.colors")
+
 """ DeeplabCutOutputFileType: the different possible types of deeplabcut produced data files
 
 """
@@ -92,7 +97,7 @@ class DeeplabCutOutputFileType(Enum):
 
 class DeeplabcutEventFile(QObject):
 
-    dataReloaded = pyqtSignal(pd.DataFrame)
+    dataReloaded = pyqtSignal(object)  # a pandas DataFrame
 
     def __init__(self, filePath, file_format, parent=None):
         super().__init__(parent=parent)
@@ -170,12 +175,14 @@ class DeeplabcutFilesystemLoader(QObject):
     deeplabcutDataFileLoaded = pyqtSignal()
     loadingDeeplabcutDataFilesComplete = pyqtSignal()
 
-    def __init__(self, deeplabcutFilePaths, parent=None):
+    def __init__(self, deeplabcutFilePaths, maxLoadingProcesses=None, parent=None):
         super(DeeplabcutFilesystemLoader, self).__init__(
             parent=parent
         )  # Call the inherited classes __init__ method
         self.cache = dict()
         self.deeplabcutFilePaths = deeplabcutFilePaths
+        # The files themselves are parsed by worker processes. maxLoadingProcesses of 1 loads them one after another in the worker thread instead.
+        self.process_pool = DataFileProcessPool(maxLoadingProcesses)
 
         self.loadedDeeplabcutFiles = []
         self.pending_operation_status = PendingFilesystemOperation(
@@ -288,8 +295,8 @@ class DeeplabcutFilesystemLoader(QObject):
 
         numVariables = len(active_deeplabcut_variable_names)
 
-        earliestVideoTime = videoDates.min()
-        latestVideoTime = videoEndDates.max()
+        # Built once and shared by all the variables
+        videoIntervalIndex = VideoIntervalIndex(videoDates, videoEndDates)
 
         ## Iterate through the event variables and pre-process them
         variableData = []
@@ -324,22 +331,17 @@ class DeeplabcutFilesystemLoader(QObject):
             deeplabcutVariableSpecificEvents = []
             ## Find times within video ranges:
             # activeVideoIndicies: contains an int index or None for each timestamp to indiciate which video (if any) the timestamp occured within
-            activeVideoIndicies = np.empty_like(activeTimestamps)
+            (
+                activeVideoIndicies,
+                videoRelativeOffsets,
+                isWithinVideoSpan,
+            ) = videoIntervalIndex.assign_videos(activeTimestamps)
             for index, anActiveTimestamp in enumerate(activeTimestamps):
-                shouldCreateEvent = True
-                video_relative_offset = None
-                # Check if the timestamp is within the range of time that that videos span
-                if earliestVideoTime <= anActiveTimestamp <= latestVideoTime:
-                    # Loop through each video to see if the event is included within its duration (not currently used)
-                    for (videoIndex, videoStartDate) in enumerate(videoDates):
-                        videoEndDate = videoEndDates[videoIndex]
-                        if videoStartDate <= anActiveTimestamp <= videoEndDate:
-                            activeVideoIndicies[index] = videoIndex
-                            video_relative_offset = anActiveTimestamp - videoStartDate
-                            break
-                else:
-                    if shouldLimitEventsToVideoDates:
-                        shouldCreateEvent = False
+                # Events outside the range of time that the videos span are skipped if shouldLimitEventsToVideoDates
+                shouldCreateEvent = isWithinVideoSpan[index] or (
+                    not shouldLimitEventsToVideoDates
+                )
+                video_relative_offset = videoRelativeOffsets[index]
 
                 if shouldCreateEvent:
                     currExtendedInfoDict = {
@@ -543,7 +545,27 @@ class DeeplabcutFilesystemLoader(QObject):
 
         return (dateTimes, onesEventFormatDataArray)
 
+    """ load_data_file_arrays(...): loads the file's arrays as a dict, to be passed to loadDeeplabcutEventsFile(...) as its preloadedFileArrays
+        Doesn't build any records or other QObjects, so it's what the worker processes run when the files are loaded by a DataFileProcessPool.
+    """
+
+    @staticmethod
+    def load_data_file_arrays(
+        deeplabcutFilePath, usePhoServerFormat=False, phoServerFormatIsStdOut=True
+    ):
+        (
+            dateTimes,
+            onesEventFormatDataArray,
+        ) = DeeplabcutFilesystemLoader.loadDeeplabcutEventsFile_loadFromFile(
+            deeplabcutFilePath, usePhoServerFormat, phoServerFormatIsStdOut
+        )
+        return {
+            "dateTimes": dateTimes,
+            "onesEventFormatDataArray": onesEventFormatDataArray,
+        }
+
     """ loadDeeplabcutEventsFile(...): new.
+        If preloadedFileArrays is not None (the dict returned by load_data_file_arrays(...)) it's used instead of loading the file, and the loading options are ignored.
 
     """
 
@@ -556,17 +578,18 @@ class DeeplabcutFilesystemLoader(QObject):
         limitedVariablesToCreateEventsFor=None,
         usePhoServerFormat=False,
         phoServerFormatIsStdOut=True,
+        preloadedFileArrays=None,
     ):
         ## Load the Deeplabcut events data from an exported MATLAB file
         # If shouldLimitEventsToVideoDates is True then only events that fall between the earliest video start date and the latest video finish date are included
         # If shouldLimitEventsToVariables is not None, then only events that are of type of the variable with the name in the array are included
         ## TODO: shouldLimitEventsToVideoDates should also affect the returned dateTimes, dataArray, etc.
-        (
-            dateTimes,
-            onesEventFormatDataArray,
-        ) = DeeplabcutFilesystemLoader.loadDeeplabcutEventsFile_loadFromFile(
-            deeplabcutFilePath, usePhoServerFormat, phoServerFormatIsStdOut
-        )
+        if preloadedFileArrays is None:
+            preloadedFileArrays = DeeplabcutFilesystemLoader.load_data_file_arrays(
+                deeplabcutFilePath, usePhoServerFormat, phoServerFormatIsStdOut
+            )
+        dateTimes = preloadedFileArrays["dateTimes"]
+        onesEventFormatDataArray = preloadedFileArrays["onesEventFormatDataArray"]
 
         ## Pre-process the data
         if limitedVariablesToCreateEventsFor is not None:
@@ -579,8 +602,8 @@ class DeeplabcutFilesystemLoader(QObject):
 
         numVariables = len(active_deeplabcut_variable_names)
 
-        earliestVideoTime = videoDates.min()
-        latestVideoTime = videoEndDates.max()
+        # Built once and shared by all the variables
+        videoIntervalIndex = VideoIntervalIndex(videoDates, videoEndDates)
 
         ## Iterate through the event variables and pre-process them
         variableData = []
@@ -615,22 +638,17 @@ class DeeplabcutFilesystemLoader(QObject):
             # deeplabcutVariableSpecificEvents = []
             ## Find times within video ranges:
             # activeVideoIndicies: contains an int index or None for each timestamp to indiciate which video (if any) the timestamp occured within
-            activeVideoIndicies = np.empty_like(activeTimestamps)
+            (
+                activeVideoIndicies,
+                videoRelativeOffsets,
+                isWithinVideoSpan,
+            ) = videoIntervalIndex.assign_videos(activeTimestamps)
             for index, anActiveTimestamp in enumerate(activeTimestamps):
-                shouldCreateEvent = True
-                video_relative_offset = None
-                # Check if the timestamp is within the range of time that that videos span
-                if earliestVideoTime <= anActiveTimestamp <= latestVideoTime:
-                    # Loop through each video to see if the event is included within its duration (not currently used)
-                    for (videoIndex, videoStartDate) in enumerate(videoDates):
-                        videoEndDate = videoEndDates[videoIndex]
-                        if videoStartDate <= anActiveTimestamp <= videoEndDate:
-                            activeVideoIndicies[index] = videoIndex
-                            video_relative_offset = anActiveTimestamp - videoStartDate
-                            break
-                else:
-                    if shouldLimitEventsToVideoDates:
-                        shouldCreateEvent = False
+                # Events outside the range of time that the videos span are skipped if shouldLimitEventsToVideoDates
+                shouldCreateEvent = isWithinVideoSpan[index] or (
+                    not shouldLimitEventsToVideoDates
+                )
+                video_relative_offset = videoRelativeOffsets[index]
 
                 if shouldCreateEvent:
                     currExtendedInfoDict = {
@@ -687,10 +705,10 @@ class DeeplabcutFilesystemLoader(QObject):
         deeplabcutEventRecords = sorted(deeplabcutEventRecords, key=keyfun)
 
         # Build the corresponding GUI objects
+        # The views aren't built here: the data tracks paint from an EventTable and only build the views of the events the user interacts with (see EventTableViewList)
         built_model_view_container_array = []
         for (index, aRecord) in enumerate(deeplabcutEventRecords):
-            aGuiView = aRecord.get_gui_view(aRecord, parent=None)
-            aModelViewContainer = ModelViewContainer(aRecord, aGuiView)
+            aModelViewContainer = ModelViewContainer(aRecord, None)
             built_model_view_container_array.append(aModelViewContainer)
 
         # return (dateTimes, onesEventFormatDataArray, variableData, deeplabcutEvents)
@@ -738,9 +756,25 @@ class DeeplabcutFilesystemLoader(QObject):
             OperationTypes.FilesystemDeeplabcutFileLoad, numPendingFiles
         )
 
-        for (sub_index, aFoundDeeplabcutDataFile) in enumerate(
-            active_deeplabcut_data_file_paths
+        # The files are parsed by worker processes and handed back in file order
+        for (
+            aFoundDeeplabcutDataFile,
+            fileArrays,
+            loadingError,
+        ) in self.process_pool.map_in_file_order(
+            DeeplabcutFilesystemLoader.load_data_file_arrays,
+            active_deeplabcut_data_file_paths,
+            True,  # usePhoServerFormat
+            False,  # phoServerFormatIsStdOut
         ):
+            parsedFiles = parsedFiles + 1
+            if loadingError is not None:
+                print(
+                    "WARNING: failed to load deeplabcut file {}: {}".format(
+                        str(aFoundDeeplabcutDataFile), str(loadingError)
+                    )
+                )
+                continue
 
             outEventFileObj = DeeplabcutEventFile(aFoundDeeplabcutDataFile)
             # (dateTimes, onesEventFormatDataArray, variableData, deeplabcutEvents) = DeeplabcutFilesystemLoader.loadDeeplabcutFiles(aFoundDeeplabcutDataFile, self.videoStartDates, self.videoEndDates, usePhoServerFormat=True, phoServerFormatIsStdOut=False)
@@ -754,8 +788,7 @@ class DeeplabcutFilesystemLoader(QObject):
                 self.videoStartDates,
                 self.videoEndDates,
                 shouldLimitEventsToVideoDates=False,
-                usePhoServerFormat=True,
-                phoServerFormatIsStdOut=False,
+                preloadedFileArrays=fileArrays,
             )
             outEventFileObj.set_loaded_values(
                 dateTimes, [], [], deeplabcutEventContainers
@@ -777,7 +810,6 @@ class DeeplabcutFilesystemLoader(QObject):
             # Add the current video file path to the loaded files
             self.loadedDeeplabcutFiles.append(aFoundDeeplabcutDataFile)
 
-            parsedFiles = parsedFiles + 1
             progress_callback.emit(
                 active_deeplabcut_data_file_paths, (parsedFiles * 100 / numPendingFiles)
             )
@@ -0,0 +1,69 @@
+# DirectorySnapshot.py
+# Records the name, size and mtime of the files in a directory so that a rescan only has to re-parse the files that were added, removed or modified since the previous scan.
+# Deliberately has no Qt dependencies so that it can be used from worker threads.
+
+import fnmatch
+import os
+
+# from phopyqttimelineplotter.app.filesystem.DirectorySnapshot import DirectorySnapshot
+
+
+class DirectorySnapshot(object):
+    """DirectorySnapshot: the (size, mtime_ns) of each file directly within a directory whose name matches one of file_name_patterns.
+
+    Captured with a single os.scandir(...) pass, which doesn't open or parse any of the files.
+    diff(...) between an older and a newer snapshot gives the names of the files that need to be re-parsed (added or modified) or dropped (removed).
+    """
+
+    def __init__(self, dir_path, file_name_patterns, entries):
+        super(DirectorySnapshot, self).__init__()
+        self.dir_path = str(dir_path)
+        self.file_name_patterns = list(file_name_patterns)
+        self.entries = entries  # file name: (size, mtime_ns)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def matches_any_pattern(file_name, file_name_patterns):
+        return any(fnmatch.fnmatch(file_name, aPattern) for aPattern in file_name_patterns)
+
+    @staticmethod
+    def capture(dir_path, file_name_patterns):
+        """Returns a new DirectorySnapshot of dir_path. Raises OSError if the directory can't be listed."""
+        entries = dict()
+        with os.scandir(dir_path) as directory_iterator:
+            for anEntry in directory_iterator:
+                if not DirectorySnapshot.matches_any_pattern(anEntry.name, file_name_patterns):
+                    continue
+                try:
+                    if not anEntry.is_file():
+                        continue
+                    entry_stat = anEntry.stat()
+                except OSError:
+                    # Removed between being listed and being stat-ed
+                    continue
+                entries[anEntry.name] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+        return DirectorySnapshot(dir_path, file_name_patterns, entries)
+
+    # diff(newer_snapshot): returns the sorted lists of file names (added_names, removed_names, modified_names) going from this snapshot to newer_snapshot
+    def diff(self, newer_snapshot):
+        previous_names = set(self.entries.keys())
+        newer_names = set(newer_snapshot.entries.keys())
+        added_names = sorted(newer_names - previous_names)
+        removed_names = sorted(previous_names - newer_names)
+        modified_names = sorted(
+            aName
+            for aName in (previous_names & newer_names)
+            if self.entries[aName] != newer_snapshot.entries[aName]
+        )
+        return (added_names, removed_names, modified_names)
+
+    # filter_names(file_names, file_name_patterns): returns just the file_names matching one of file_name_patterns
+    @staticmethod
+    def filter_names(file_names, file_name_patterns):
+        return [
+            aName
+            for aName in file_names
+            if DirectorySnapshot.matches_any_pattern(aName, file_name_patterns)
+        ]
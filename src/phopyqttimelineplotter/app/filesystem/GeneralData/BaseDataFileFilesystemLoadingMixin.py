@@ -8,9 +8,8 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
-import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+from phopyqttimelineplotter.app.filesystem.DataFileProcessPool import DataFileProcessPool
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
@@ -140,7 +139,7 @@ class BaseDataFilesystemLoader(QObject):
     dataFileLoaded = pyqtSignal()
     loadingDataFilesComplete = pyqtSignal()
 
-    def __init__(self, dataFilePaths, parent=None):
+    def __init__(self, dataFilePaths, maxLoadingProcesses=None, parent=None):
         super(BaseDataFilesystemLoader, self).__init__(
             parent=parent
         )  # Call the inherited classes __init__ method
@@ -157,6 +156,8 @@ class BaseDataFilesystemLoader(QObject):
         self.dataFilesystemWorker = None
         self.threadpool = QThreadPool()
         self.threadpool.setMaxThreadCount(2)
+        # The files themselves are parsed by worker processes. maxLoadingProcesses of 1 loads them one after another in the worker thread instead.
+        self.process_pool = DataFileProcessPool(maxLoadingProcesses)
 
         print(
             "Multithreading with maximum %d threads" % self.threadpool.maxThreadCount()
@@ -287,71 +288,63 @@ class BaseDataFilesystemLoader(QObject):
 
     """
     The main execution function
-    Must be overriden by specific file types to perform the loading action
+    The files are parsed by load_data_file_arrays(...) in the worker processes of self.process_pool, and each file's arrays are turned into its event file object by build_data_event_file(...) in this thread, in file order.
+    Specific file types override those (and get_data_file_arrays_args()) to perform the loading action
     """
 
     def on_load_data_files_execute_thread(
         self, active_data_file_paths, progress_callback
     ):
-
-        should_filter_for_invalid_events = True
-        # should_filter_for_invalid_events = False
-
         currProgress = 0.0
         parsedFiles = 0
         numPendingFiles = len(active_data_file_paths)
         self.pending_operation_status.restart(
-            OperationTypes.FilesystemBaseDataFileLoad, numPendingFiles
+            OperationTypes.FilesystemDataFileLoad, numPendingFiles
         )
 
         new_cache = dict()
 
         # active_cache = self.cache
         active_cache = new_cache
-        # Loop through all the data data file paths and parse the files into a BaseDataEventFile object.
-        for (sub_index, aFoundBaseDataDataFile) in enumerate(active_data_file_paths):
-
-            # BaseDataEventFile: this serves as a container to hold the loaded events
-            outEventFileObj = BaseDataEventFile(aFoundBaseDataDataFile)
-
-            # Call the static "loadBaseDataEventsFile(...) function:
-            (
-                dateTimes,
-                dataEventContainers,
-                phoServerFormatArgs,
-            ) = BaseDataFilesystemLoader.loadBaseDataEventsFile(
-                aFoundBaseDataDataFile,
-                self.videoStartDates,
-                self.videoEndDates,
-                shouldLimitEventsToVideoDates=False,
-                usePhoServerFormat=True,
-                phoServerFormatIsStdOut=False,
-                should_filter_for_invalid_events=should_filter_for_invalid_events,
-            )
+        # Loop through the data file paths (in order) as their arrays are loaded and build an event file object from each.
+        for (
+            aFoundDataFile,
+            fileArrays,
+            loadingError,
+        ) in self.process_pool.map_in_file_order(
+            type(self).load_data_file_arrays,
+            active_data_file_paths,
+            *self.get_data_file_arrays_args()
+        ):
+            parsedFiles = parsedFiles + 1
+            if loadingError is not None:
+                print(
+                    "WARNING: failed to load data file {}: {}".format(
+                        str(aFoundDataFile), str(loadingError)
+                    )
+                )
+                continue
 
-            print("Loading complete... setting loaded values")
-            # Cache the loaded values into the BaseDataEventFile object.
-            outEventFileObj.set_loaded_values(dateTimes, [], dataEventContainers, None)
+            outEventFileObj = self.build_data_event_file(aFoundDataFile, fileArrays)
             print("done updating cache...")
 
-            if not (aFoundBaseDataDataFile in active_cache.keys()):
-                # print('Creating new cache entry for {}...'.format(str(aFoundBaseDataDataFile)))
+            if not (aFoundDataFile in active_cache.keys()):
+                # print('Creating new cache entry for {}...'.format(str(aFoundDataFile)))
                 # Parent doesn't yet exist in cache
-                active_cache[aFoundBaseDataDataFile] = outEventFileObj
+                active_cache[aFoundDataFile] = outEventFileObj
             else:
                 # Parent already exists
                 print(
                     "WARNING: data file path {} already exists in the temporary cache. Updating its values...".format(
-                        str(aFoundBaseDataDataFile)
+                        str(aFoundDataFile)
                     )
                 )
-                active_cache[aFoundBaseDataDataFile] = outEventFileObj
+                active_cache[aFoundDataFile] = outEventFileObj
                 pass
 
-            parsedFiles = parsedFiles + 1
             # progress_callback.emit(active_data_file_paths, (parsedFiles*100/numPendingFiles))
             progress_callback.emit(
-                [aFoundBaseDataDataFile, outEventFileObj],
+                [aFoundDataFile, outEventFileObj],
                 (parsedFiles * 100 / numPendingFiles),
             )
 
@@ -359,6 +352,14 @@ class BaseDataFilesystemLoader(QObject):
         # Returns the cache when done
         return new_cache
 
+    # get_data_file_arrays_args(): the arguments passed to load_data_file_arrays(...) after the file path, the same for every file
+    def get_data_file_arrays_args(self):
+        return ()
+
+    # build_data_event_file(dataFilePath, fileArrays): builds the event file object (e.g. a BaseDataEventFile) of a file from the arrays returned by load_data_file_arrays(...). Runs in the loader's worker thread.
+    def build_data_event_file(self, dataFilePath, fileArrays):
+        raise NotImplementedError
+
     @pyqtSlot(list, object)
     def on_load_data_files_print_output(self, active_video_paths, s):
         print(s)
@@ -394,6 +395,14 @@ class BaseDataFilesystemLoader(QObject):
 
     ## Static Methods:
 
+    """ load_data_file_arrays(dataFilePath, *args): parses a single file, returning compact picklable values (numpy arrays) rather than QObjects.
+        Runs in a worker process (see DataFileProcessPool), so it must be a static method
+    """
+
+    @staticmethod
+    def load_data_file_arrays(dataFilePath, *args):
+        raise NotImplementedError
+
     """ loadBaseDataEventsFile(...): new.
         dataEventRecords: a sorted list of FilesystemDataEvent_Record type objects for all variable types
 
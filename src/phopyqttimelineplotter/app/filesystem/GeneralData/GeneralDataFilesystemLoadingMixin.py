@@ -6,18 +6,21 @@ import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
 )
 from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import FilesystemLabjackEvent_Record
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsExporter import (
+    LabjackEventsExporter,
+)
 from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
     LabjackEventsLoader,
     PhoServerFormatArgs,
 )
+from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
 from phopyqttimelineplotter.app.filesystem.Workers.FileMetadataWorkers import FileMetadataWorker
 from phopyqttimelineplotter.app.filesystem.Workers.VideoFilesystemWorkers import VideoFilesystemWorker
 from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
@@ -28,6 +31,10 @@ from phopyqttimelineplotter.GUI.Model.ModelViewContainer import ModelViewContain
 # from phopyqttimelineplotter.app.filesystem.GeneralDataFilesystemLoadingMixin import LabjackEventFile, GeneralDataFilesystemLoader
 
 
+# Only needed to convert the variable color names once a file is loaded
+mcolors = LazyModule("matplotlib.colors")
+
+
 class LabjackEventFile(QObject):
     """LabjackEventFile: a single imported data file containing one or more labjack events."""
 
@@ -94,11 +101,16 @@ class GeneralDataFilesystemLoader(QObject):
     generalDataFileLoaded = pyqtSignal()
     loadingGeneralDataFilesComplete = pyqtSignal()
 
-    def __init__(self, generalFilePaths, parent=None):
+    # The background export stage used when loadLabjackEventsFile(...) is called with shouldExportLoadedData, shared by all loaders
+    events_exporter = LabjackEventsExporter()
+
+    def __init__(self, generalFilePaths, shouldExportLoadedData=False, parent=None):
         super(GeneralDataFilesystemLoader, self).__init__(
             parent=parent
         )  # Call the inherited classes __init__ method
         self.cache = dict()
+        # If shouldExportLoadedData is True each loaded file is also exported (in the background) by GeneralDataFilesystemLoader.events_exporter
+        self.shouldExportLoadedData = shouldExportLoadedData
         self.generalFilePaths = generalFilePaths
 
         self.loadedLabjackFiles = []
@@ -290,6 +302,7 @@ class GeneralDataFilesystemLoader(QObject):
                 usePhoServerFormat=True,
                 phoServerFormatIsStdOut=False,
                 should_filter_for_invalid_events=should_filter_for_invalid_events,
+                shouldExportLoadedData=self.shouldExportLoadedData,
             )
 
             print("Loading complete... setting loaded values")
@@ -376,10 +389,12 @@ class GeneralDataFilesystemLoader(QObject):
         usePhoServerFormat=False,
         phoServerFormatIsStdOut=True,
         should_filter_for_invalid_events=True,
+        shouldExportLoadedData=False,
     ):
         ## Load the Labjack events data from an exported MATLAB file
         # If shouldLimitEventsToVideoDates is True then only events that fall between the earliest video start date and the latest video finish date are included
         # If shouldLimitEventsToVariables is not None, then only events that are of type of the variable with the name in the array are included
+        # If shouldExportLoadedData is True the loaded events are queued to be exported by GeneralDataFilesystemLoader.events_exporter, which writes them in the background.
         ## TODO: shouldLimitEventsToVideoDates should also affect the returned dateTimes, dataArray, etc.
         (
             dateTimes,
@@ -399,15 +414,8 @@ class GeneralDataFilesystemLoader(QObject):
 
         numVariables = len(active_labjack_variable_names)
 
-        if (videoDates is not None) and (len(videoDates) > 0):
-            earliestVideoTime = videoDates.min()
-        else:
-            earliestVideoTime = datetime.min
-
-        if (videoEndDates is not None) and (len(videoEndDates) > 0):
-            latestVideoTime = videoEndDates.max()
-        else:
-            latestVideoTime = datetime.max
+        # Built once and shared by all the variables
+        videoIntervalIndex = VideoIntervalIndex(videoDates, videoEndDates)
 
         ## Iterate through the event variables and pre-process them
         variableData = []
@@ -440,22 +448,17 @@ class GeneralDataFilesystemLoader(QObject):
             labjackVariableSpecificRecords = []
             ## Find times within video ranges:
             # activeVideoIndicies: contains an int index or None for each timestamp to indicate which video (if any) the timestamp occurred within
-            activeVideoIndicies = np.empty_like(activeTimestamps)
+            (
+                activeVideoIndicies,
+                videoRelativeOffsets,
+                isWithinVideoSpan,
+            ) = videoIntervalIndex.assign_videos(activeTimestamps)
             for index, anActiveTimestamp in enumerate(activeTimestamps):
-                shouldCreateEvent = True
-                video_relative_offset = None
-                # Check if the timestamp is within the range of time that that videos span
-                if earliestVideoTime <= anActiveTimestamp <= latestVideoTime:
-                    # Loop through each video to see if the event is included within its duration (not currently used)
-                    for (videoIndex, videoStartDate) in enumerate(videoDates):
-                        videoEndDate = videoEndDates[videoIndex]
-                        if videoStartDate <= anActiveTimestamp <= videoEndDate:
-                            activeVideoIndicies[index] = videoIndex
-                            video_relative_offset = anActiveTimestamp - videoStartDate
-                            break
-                else:
-                    if shouldLimitEventsToVideoDates:
-                        shouldCreateEvent = False
+                # Events outside the range of time that the videos span are skipped if shouldLimitEventsToVideoDates
+                shouldCreateEvent = isWithinVideoSpan[index] or (
+                    not shouldLimitEventsToVideoDates
+                )
+                video_relative_offset = videoRelativeOffsets[index]
 
                 if shouldCreateEvent:
                     currExtendedInfoDict = {
@@ -557,101 +560,29 @@ class GeneralDataFilesystemLoader(QObject):
         variableData: counts match those printed in filter_invalid_events function
         """
 
-        """
-        converts the variableData list of dicts to a proper Pandas dataframe
-        """
-
-        def get_variables_as_dict_of_dataframes(
-            variableData, active_labjack_variable_names
-        ):
-            # Convert to dataframe:
-            variableDataFramesDict = dict()
-            # Loop through all variables and build a dataframe for each variable data in variableData
-            # for aVariableIndex in range(0, numVariables):
-            for (aVariableIndex, currVariableName) in enumerate(
-                active_labjack_variable_names
-            ):
-                # currVariableName = active_labjack_variable_names[aVariableIndex]
-                variableDataFramesDict[currVariableName] = pd.DataFrame.from_dict(
-                    variableData[aVariableIndex]
-                )
-
-            return variableDataFramesDict
-
-        def get_dict_of_dataframes_as_dataframe(variableDataFramesDict):
-            return pd.concat(variableDataFramesDict)
-            # return pd.concat(variableDataFramesDict, keys=['s1', 's2'],  names=['Series name', 'Row ID'])
-
-        # """ Export Dataframe to file:
-        # Writing dataframe to file data/output/LabjackDataExport/output_dataframe_1-9-2020...
-        # C:\Users\halechr\repo\PhoPyQtTimelinePlotter\app\filesystem\LabjackFilesystemLoadingMixin.py:257: PerformanceWarning:
-        # your performance may suffer as PyTables will pickle object types that it cannot
-        # map directly to c-types [inferred_type->mixed-integer,key->block2_values] [items->['videoIndicies', 'variableSpecificRecords']]
-        # """
-        base_name = "output_dataframe_1-9-2020"
-        out_dataframe_export_parent_path = Path("data/output/LabjackDataExport/")
-        out_dataframe_export_path_basic = out_dataframe_export_parent_path.joinpath(
-            "{}_basic_store.h5".format(str(base_name))
-        )  # Used for basic objects
-        out_dataframe_export_path_pandas = out_dataframe_export_parent_path.joinpath(
-            "{}_pandas_store.h5".format(str(base_name))
-        )  # Used for pandas Dataframe and Series objects
-        out_records_dataframe_CSV_export_path = (
-            out_dataframe_export_parent_path.joinpath(
-                "{}_records.csv".format(str(base_name))
-            )
-        )  # Exported CSV
-
-        print("Converting variableData to dict of Pandas Dataframes...")
-        out_dict_of_df = get_variables_as_dict_of_dataframes(
-            variableData, active_labjack_variable_names
-        )
-
-        # # Write basic variables:
-        # print('Writing dataframe to file {}...'.format(str(out_dataframe_export_path_basic)))
-        # store_basic = pd.HDFStore(out_dataframe_export_path_basic)
-        # # store_basic['variableData'] = variableData
-        # # store_basic['active_labjack_variable_names'] = active_labjack_variable_names
-        # # store_basic['variables_dict_of_dataframes'] = out_dict_of_df
-        # store_basic.close()
-        # print('    done writing basic variables to HDF file.')
-
-        print("Converting variableData to Pandas Dataframe...")
-        # out_df = get_variables_as_dataframe(variableData, active_labjack_variable_names)
-        out_df = get_dict_of_dataframes_as_dataframe(out_dict_of_df)
-        out_series = pd.Series(out_dict_of_df)
-        out_record_df = LabjackEventsLoader.build_records_dataframe(labjackEventRecords)
-        # can save it out to CSV here if we want to:
-        LabjackEventsLoader.writeRecordsDataframeToCsvFile(
-            out_record_df, filePath=out_records_dataframe_CSV_export_path
-        )
-
-        # out_df.to_json(orient='split')
-        print(
-            "Writing dataframe to file {}...".format(
-                str(out_dataframe_export_path_pandas)
+        if shouldExportLoadedData:
+            # Queued rather than written here, so the load doesn't wait on the disk
+            print("Queueing the export of the loaded labjack events...")
+            GeneralDataFilesystemLoader.events_exporter.submit(
+                generalFilePath,
+                active_labjack_variable_names,
+                [
+                    LabjackEventsExporter.build_variable_columns(
+                        aVariableData["timestamps"],
+                        aVariableData["values"],
+                        aVariableData["videoIndicies"],
+                    )
+                    for aVariableData in variableData
+                ],
+                LabjackEventsLoader.build_records_export_columns(labjackEventRecords),
             )
-        )
-        # out_df.to_pickle(out_dataframe_export_path)
-        store_pandas = pd.HDFStore(out_dataframe_export_path_pandas)
-        # store.get_storer('df').attrs.my_attribute = dict(A = 10)
-        store_pandas["variables_dataframe"] = out_df
-        store_pandas["variables_series_of_dataframes"] = out_series
-
-        store_pandas["records_dataframe"] = out_record_df
-        store_pandas.close()
-
-        print("    done writing pandas variables to HDF file.")
-        # for (aVariableIndex, aVariableData) in enumerate(variableData):
-        #     aVariableData['']
 
         # Build the corresponding GUI objects
         print("building container array...")
-        ## TODO: defer until needed? Some might be filtered out anyway.
+        # The views aren't built here: the data tracks paint from an EventTable and only build the views of the events the user interacts with (see EventTableViewList)
         built_model_view_container_array = []
         for (index, aRecord) in enumerate(labjackEventRecords):
-            aGuiView = aRecord.get_gui_view(aRecord, parent=None)
-            aModelViewContainer = ModelViewContainer(aRecord, aGuiView)
+            aModelViewContainer = ModelViewContainer(aRecord, None)
             built_model_view_container_array.append(aModelViewContainer)
 
         # labjackEvents = [FilesystemLabjackEvent_Record.get_gui_view(aRecord, parent=None) for aRecord in labjackEventRecords]
@@ -0,0 +1,114 @@
+# LabjackEventsExporter.py
+# Writes the events loaded from a Labjack file out to a CSV of the records and an HDF5 store of per-variable frames, on a background thread so that loading never waits on the disk.
+# Deliberately has no Qt dependencies so that it can be used from worker threads.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from phopyqttimelineplotter.app.LazyModule import LazyModule
+
+# from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsExporter import LabjackEventsExporter
+
+# The export is opt-in, so pandas is only imported once it first runs
+pd = LazyModule("pandas")
+
+
+class LabjackEventsExporter(object):
+    """LabjackEventsExporter: the opt-in export stage run after a Labjack file has been loaded.
+
+    The loader extracts plain typed columns in its own thread (see build_variable_columns(...) and LabjackEventsLoader.build_records_export_columns(...)) and submit(...)s them.
+    The frames are then built and written by a single background thread, so the exports of different files never write at the same time and the load doesn't wait on them.
+    Every column is datetime64, numeric or string, and the frames are written in the HDF5 "table" format, which stores the strings (the record columns and the variable name index level) as fixed-width string columns.
+    The default "fixed" format would pickle them instead, since pandas holds strings in object columns. A variable's videos are stored as an int64 video_index, -1 for none.
+
+    Each source file is exported to its own {file stem}_records.csv and {file stem}_pandas_store.h5 in export_directory. The store contains:
+        variables_dataframe: the (timestamp, value, video_index) of every variable's events, indexed by (variable name, row)
+        variables/{variable name}: the events of a single variable
+        records_dataframe: the (start_date, variable_name, event_type, port) of each record in time order, the same as the CSV
+    """
+
+    default_export_directory = "data/output/LabjackDataExport"
+
+    def __init__(self, export_directory=None):
+        super(LabjackEventsExporter, self).__init__()
+        if export_directory is None:
+            export_directory = LabjackEventsExporter.default_export_directory
+        self.export_directory = Path(export_directory)
+        self.lock = threading.Lock()
+        self.executor = None  # Started by the first submit(...)
+
+    @staticmethod
+    def build_variable_columns(timestamps, values, videoIndicies):
+        """Converts a variable's timestamps, values and videoIndicies (an object array of int or None) to a dict of typed arrays"""
+        return {
+            "timestamp": np.array(timestamps, dtype="datetime64[us]"),
+            "value": np.asarray(values, dtype=np.float64),
+            "video_index": np.array(
+                [(-1 if aVideoIndex is None else aVideoIndex) for aVideoIndex in videoIndicies],
+                dtype=np.int64,
+            ),
+        }
+
+    @staticmethod
+    def build_variables_dataframe(variableNames, variableColumns):
+        """Returns (variables_dataframe, variableDataFramesDict), where variables_dataframe is the concatenation of the per-variable frames keyed by variable name"""
+        variableDataFramesDict = dict()
+        for (aVariableName, aVariableColumns) in zip(variableNames, variableColumns):
+            variableDataFramesDict[aVariableName] = pd.DataFrame(aVariableColumns)
+        return (pd.concat(variableDataFramesDict), variableDataFramesDict)
+
+    @staticmethod
+    def write_export(exportDirectory, baseName, variableNames, variableColumns, recordColumns):
+        """Writes the export files for a single source file. Returns (csvPath, hdfPath)"""
+        exportDirectory = Path(exportDirectory)
+        exportDirectory.mkdir(parents=True, exist_ok=True)
+        csvPath = exportDirectory.joinpath("{}_records.csv".format(baseName))
+        hdfPath = exportDirectory.joinpath("{}_pandas_store.h5".format(baseName))
+
+        (variables_dataframe, variableDataFramesDict) = LabjackEventsExporter.build_variables_dataframe(
+            variableNames, variableColumns
+        )
+        records_dataframe = pd.DataFrame(recordColumns)
+        records_dataframe.to_csv(csvPath)
+        with pd.HDFStore(hdfPath, mode="w") as store:
+            store.put("variables_dataframe", variables_dataframe, format="table")
+            for (aVariableName, aVariableDataFrame) in variableDataFramesDict.items():
+                store.put("variables/{}".format(aVariableName), aVariableDataFrame, format="table")
+            store.put("records_dataframe", records_dataframe, format="table")
+        return (csvPath, hdfPath)
+
+    def run_export(self, sourceFilePath, variableNames, variableColumns, recordColumns):
+        baseName = Path(sourceFilePath).stem
+        try:
+            (csvPath, hdfPath) = LabjackEventsExporter.write_export(
+                self.export_directory, baseName, variableNames, variableColumns, recordColumns
+            )
+        except Exception as e:
+            print(
+                "WARNING: failed to export the labjack events of {}: {}".format(
+                    str(sourceFilePath), str(e)
+                )
+            )
+            return None
+        print("Exported the labjack events of {} to {} and {}".format(str(sourceFilePath), str(csvPath), str(hdfPath)))
+        return (csvPath, hdfPath)
+
+    def submit(self, sourceFilePath, variableNames, variableColumns, recordColumns):
+        """Queues the export of a loaded file and returns immediately.
+        variableColumns: a list with the build_variable_columns(...) dict of each of variableNames
+        recordColumns: a dict of equal-length typed arrays, one row per record
+        Returns a concurrent.futures.Future of (csvPath, hdfPath), or None if the export failed.
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1)
+            return self.executor.submit(
+                self.run_export,
+                sourceFilePath,
+                list(variableNames),
+                variableColumns,
+                recordColumns,
+            )
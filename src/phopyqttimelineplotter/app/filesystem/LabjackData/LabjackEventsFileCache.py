@@ -0,0 +1,156 @@
+# LabjackEventsFileCache.py
+# A persistent on-disk cache of the arrays parsed (and filtered) from Labjack event files, so that unchanged files don't have to be re-parsed on every launch.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
+
+# from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsFileCache import LabjackEventsFileCache
+
+
+class LabjackEventsFileCache(object):
+    """LabjackEventsFileCache: caches the arrays loaded from Labjack event files as directories of .npy files.
+
+    Each source file gets one entry directory (named by a hash of its resolved path and the loading options) containing:
+        metadata.json: the source file's path, size and mtime, the parser version and the loading options
+        one .npy file per cached array
+
+    An entry is only used if the source file's size and mtime and the parser version (cache_format_version and PhoServerFormatBulkParser.parser_version) all still match; otherwise it's deleted and the file is re-parsed.
+    Arrays are memory-mapped when loaded, so an entry costs almost nothing to open.
+    """
+
+    # Increment whenever the layout of a cache entry changes, or whenever LabjackFilesystemLoader.load_data_file_arrays(...) changes what it caches for the same options (filtering, which rows or columns are kept, ...).
+    # Entries written with a different version are never served, so upgrading can't load arrays produced by older loading code.
+    # 2: the invalid events are found from the per-variable columns (LabjackFilesystemLoader.build_variable_event_columns(...)) before caching
+    # 3: the options include which Matlab columns are read and whether only their event samples are kept
+    # 4: the options no longer repeat the Matlab columns read, which follow from active_labjack_variable_names
+    cache_format_version = 4
+
+    metadata_file_name = "metadata.json"
+
+    def __init__(self, cache_directory="data/cache/LabjackEventFiles"):
+        super(LabjackEventsFileCache, self).__init__()
+        self.cache_directory = Path(cache_directory)
+
+    @staticmethod
+    def get_parser_version():
+        return "{}.{}".format(
+            LabjackEventsFileCache.cache_format_version,
+            PhoServerFormatBulkParser.parser_version,
+        )
+
+    @staticmethod
+    def get_source_file_stats(filePath):
+        """Returns the (size, mtime_ns) of the source file used to validate its cache entry"""
+        file_stat = os.stat(filePath)
+        return (file_stat.st_size, file_stat.st_mtime_ns)
+
+    def get_entry_path(self, filePath, options):
+        key_string = json.dumps(
+            [str(Path(filePath).resolve()), options], sort_keys=True, default=str
+        )
+        key_hash = hashlib.sha1(key_string.encode("utf-8")).hexdigest()
+        return self.cache_directory.joinpath(key_hash)
+
+    def load(self, filePath, options):
+        """Returns a dict of (memory-mapped) arrays for filePath, or None if there's no valid cache entry for it."""
+        entry_path = self.get_entry_path(filePath, options)
+        metadata_path = entry_path.joinpath(LabjackEventsFileCache.metadata_file_name)
+        if not metadata_path.exists():
+            return None
+
+        try:
+            with open(metadata_path, "r") as metadata_file:
+                metadata = json.load(metadata_file)
+            (source_size, source_mtime_ns) = LabjackEventsFileCache.get_source_file_stats(
+                filePath
+            )
+            is_entry_valid = (
+                (metadata["source_size"] == source_size)
+                and (metadata["source_mtime_ns"] == source_mtime_ns)
+                and (metadata["parser_version"] == LabjackEventsFileCache.get_parser_version())
+            )
+            if not is_entry_valid:
+                print(
+                    "LabjackEventsFileCache: {} has changed since it was cached. Invalidating its entry...".format(
+                        str(filePath)
+                    )
+                )
+                self.invalidate(filePath, options)
+                return None
+
+            loaded_arrays = dict()
+            for anArrayName in metadata["array_names"]:
+                loaded_arrays[anArrayName] = np.load(
+                    entry_path.joinpath("{}.npy".format(anArrayName)), mmap_mode="r"
+                )
+            return loaded_arrays
+
+        except (OSError, ValueError, KeyError) as e:
+            print(
+                "WARNING: LabjackEventsFileCache failed to load the entry for {}: {}".format(
+                    str(filePath), str(e)
+                )
+            )
+            self.invalidate(filePath, options)
+            return None
+
+    def save(self, filePath, options, arrays):
+        """Writes the dict of arrays as the cache entry for filePath. Object arrays aren't supported, since they can't be memory-mapped."""
+        entry_path = self.get_entry_path(filePath, options)
+        # Write to a temporary directory first so that a partially written entry is never loaded
+        temp_entry_path = entry_path.with_name(
+            "{}.tmp{}".format(entry_path.name, os.getpid())
+        )
+        try:
+            (source_size, source_mtime_ns) = LabjackEventsFileCache.get_source_file_stats(
+                filePath
+            )
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            temp_entry_path.mkdir(parents=True)
+            for (anArrayName, anArray) in arrays.items():
+                np.save(
+                    temp_entry_path.joinpath("{}.npy".format(anArrayName)),
+                    np.asarray(anArray),
+                    allow_pickle=False,
+                )
+
+            metadata = {
+                "source_path": str(Path(filePath).resolve()),
+                "source_size": source_size,
+                "source_mtime_ns": source_mtime_ns,
+                "parser_version": LabjackEventsFileCache.get_parser_version(),
+                "options": options,
+                "array_names": list(arrays.keys()),
+            }
+            with open(
+                temp_entry_path.joinpath(LabjackEventsFileCache.metadata_file_name), "w"
+            ) as metadata_file:
+                json.dump(metadata, metadata_file, default=str)
+
+            shutil.rmtree(entry_path, ignore_errors=True)
+            os.replace(temp_entry_path, entry_path)
+            return True
+
+        except (OSError, ValueError) as e:
+            print(
+                "WARNING: LabjackEventsFileCache failed to save the entry for {}: {}".format(
+                    str(filePath), str(e)
+                )
+            )
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            return False
+
+    def invalidate(self, filePath, options):
+        shutil.rmtree(self.get_entry_path(filePath, options), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.cache_directory, ignore_errors=True)
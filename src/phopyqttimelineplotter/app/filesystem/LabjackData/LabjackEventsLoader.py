@@ -6,11 +6,15 @@ import pathlib
 import re
 from enum import Enum
 
-import h5py as h5py
 import numpy as np
-import pandas as pd
-import scipy.io as sio
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from phopyqttimelineplotter.app.filesystem.FilesystemRecordBase import FilesystemLabjackEvent_Record
+from phopyqttimelineplotter.app.filesystem.LabjackData.MatlabLabjackDataReader import (
+    MatlabLabjackDataReader,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
 from PyQt5.QtCore import QEvent, QObject, Qt, pyqtSignal
 
 from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent import (
@@ -23,6 +27,11 @@ from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent import (
 # from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import loadLabjackDataFromPhoServerFormat, loadLabjackDataFromMatlabFormat, labjack_variable_names, labjack_variable_colors_dict, labjack_variable_indicies_dict, labjack_variable_event_type, labjack_variable_port_location, writeLinesToCsvFile
 # from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import LabjackEventsLoader, PhoServerFormatArgs
 
+# Only the .mat loaders (h5py for v7.3 files, scipy.io for older ones) and the records DataFrame export need these
+h5py = LazyModule("h5py")
+sio = LazyModule("scipy.io")
+pd = LazyModule("pandas")
+
 
 class PhoServerFormatArgs(QObject):
     """class PhoServerFormatArgs: A simple wrapper class that holds the arguments to filter_invalid_events for phoServerFormat"""
@@ -141,6 +150,11 @@ class LabjackEventsLoader(object):
     labjack_variable_colors_dict = dict( zip(labjack_variable_names, labjack_variable_colors) )
     labjack_variable_indicies_dict = dict( zip(labjack_variable_names, labjack_variable_indicies) )
 
+    # Integer codes for the ports and event types, used by the columnar functions
+    labjack_event_type_names = ["BeamBreak", "Dispense"]
+    labjack_port_codes_dict = dict( zip(labjack_portNames, range(len(labjack_portNames))) )
+    labjack_event_type_codes_dict = dict( zip(labjack_event_type_names, range(len(labjack_event_type_names))) )
+
     ## TODO: Generalize to work with analog sensors (like the new 1-9-2020 running wheel absolute rotary encoder)
     rx_stdout_data_line = re.compile(
         r"^(?P<milliseconds_since_epoch>\d{13}): (?P<DIO0>[10]), (?P<DIO1>[10]), (?P<DIO2>[10]), (?P<DIO3>[10]), (?P<DIO4>[10]), (?P<DIO5>[10]), (?P<DIO6>[10]), (?P<DIO7>[10]), (?P<MIO0>[10]),"
@@ -191,23 +205,150 @@ class LabjackEventsLoader(object):
     )
 
     # matPath = 'C:\Users\watsonlab\Documents\code\PhoLabjackCSVHelper\Output\LabjackTimeTable.mat'
+    # matlab2datetime(matlab_datenum): converts a single datenum. Use MatlabLabjackDataReader.matlab_datenums_to_datetime64(...) for arrays of them.
     @staticmethod
     def matlab2datetime(matlab_datenum):
         day = dt.datetime.fromordinal(int(matlab_datenum))
         dayfrac = dt.timedelta(days=matlab_datenum % 1) - dt.timedelta(days=366)
         return day + dayfrac
 
+    # Still a Python call per element, so only for small arrays
     helper_timenum_to_datetime = np.vectorize(
         lambda x: LabjackEventsLoader.matlab2datetime(x)
     )
 
-    """ find_invalid_events(labjackEvents)
+    """ find_invalid_events(labjackEvents, labjackEventType, eventColumns=None)
+        eventColumns: optional (portCodes, eventTypeCodes, startDates) for labjackEvents as returned by build_event_columns(...), for callers that can build them without iterating the event objects.
+        returns: 1. a dict of invalidDispenseEventTimestamps: {'Water1': list, 'Water2': list, 'Food1': list, 'Food2': list, 'any': list}
+                2. valid_labjack_events_mask: a mask of the size of labjackEvents that can be used to filter out the invalid labjack events
+    """
+
+    @staticmethod
+    def find_invalid_events(labjackEvents, labjackEventType, eventColumns=None):
+        if eventColumns is None:
+            eventColumns = LabjackEventsLoader.build_event_columns(
+                labjackEvents, labjackEventType
+            )
+            if eventColumns is None:
+                return None
+        (portCodes, eventTypeCodes, startDates) = eventColumns
+
+        valid_labjack_events_mask = LabjackEventsLoader.find_invalid_events_columnar(
+            portCodes, eventTypeCodes, startDates
+        )
+
+        invalidDispenseEventTimestamps = {
+            aPort: [] for aPort in LabjackEventsLoader.labjack_portNames
+        }
+        invalid_event_indicies = np.flatnonzero(~valid_labjack_events_mask)
+        invalidDispenseEventTimestamps["any"] = list(startDates[invalid_event_indicies])
+        for (aPortCode, aPort) in enumerate(LabjackEventsLoader.labjack_portNames):
+            invalidDispenseEventTimestamps[aPort] = list(
+                startDates[
+                    invalid_event_indicies[portCodes[invalid_event_indicies] == aPortCode]
+                ]
+            )
+
+        # Produces invalidDispenseEventTimestamps
+        return (invalidDispenseEventTimestamps, valid_labjack_events_mask)
+
+    """ build_event_columns(labjackEvents, labjackEventType)
+        Extracts the columns needed by find_invalid_events_columnar(...) from a sequence of event objects.
+        returns: (portCodes, eventTypeCodes, startDates), where the codes are indicies into labjack_portNames/labjack_event_type_names (-1 if unknown) and startDates is an object array of the events' start_date values.
+    """
+
+    @staticmethod
+    def build_event_columns(labjackEvents, labjackEventType):
+        # how the extended data dict is accessed depends on the labjackEventType
+        if labjackEventType is LabjackEventType.phoDurationEvent:
+            extendedDatas = [anEvent.extended_data for anEvent in labjackEvents]
+        elif labjackEventType is LabjackEventType.filesystemLabjackEvent_Record:
+            extendedDatas = [anEvent.get_extended_data() for anEvent in labjackEvents]
+        else:
+            print("ERROR: Unknown Type!")
+            return None
+
+        portCodes = np.array(
+            [
+                LabjackEventsLoader.labjack_port_codes_dict.get(anExtendedData["port"], -1)
+                for anExtendedData in extendedDatas
+            ],
+            dtype=np.int64,
+        )
+        eventTypeCodes = np.array(
+            [
+                LabjackEventsLoader.labjack_event_type_codes_dict.get(
+                    anExtendedData["event_type"], -1
+                )
+                for anExtendedData in extendedDatas
+            ],
+            dtype=np.int64,
+        )
+        startDates = np.empty(len(labjackEvents), dtype=object)
+        startDates[:] = [anEvent.start_date for anEvent in labjackEvents]
+        return (portCodes, eventTypeCodes, startDates)
+
+    """ find_invalid_events_columnar(portCodes, eventTypeCodes, timestamps)
+        Vectorized equivalent of find_invalid_events_iterative(...) that operates on columns instead of event objects.
+            portCodes: int array of indicies into labjack_portNames
+            eventTypeCodes: int array of indicies into labjack_event_type_names. Events of any other type are ignored.
+            timestamps: an array of comparable event timestamps (datetime64 or datetime objects), in the order the events occurred
+        A Dispense event is invalid if no BeamBreak on the same port preceeds it, or if the most recent Dispense on the same port is more recent than the most recent BeamBreak on that port.
+        returns: valid_labjack_events_mask
+    """
+
+    @staticmethod
+    def find_invalid_events_columnar(portCodes, eventTypeCodes, timestamps):
+        portCodes = np.asarray(portCodes)
+        eventTypeCodes = np.asarray(eventTypeCodes)
+        timestamps = np.asarray(timestamps)
+        num_events = len(portCodes)
+        valid_labjack_events_mask = np.ones(num_events, dtype=bool)
+        if num_events == 0:
+            return valid_labjack_events_mask
+
+        # Group the events by port, keeping them in order within each port
+        port_sort_indicies = np.argsort(portCodes, kind="stable")
+        sortedPortCodes = portCodes[port_sort_indicies]
+        sortedEventTypeCodes = eventTypeCodes[port_sort_indicies]
+        sortedTimestamps = timestamps[port_sort_indicies]
+
+        positions = np.arange(num_events)
+        is_group_start = np.concatenate(([True], sortedPortCodes[1:] != sortedPortCodes[:-1]))
+        group_start_positions = np.maximum.accumulate(np.where(is_group_start, positions, 0))
+
+        is_beambreak = sortedEventTypeCodes == LabjackEventsLoader.labjack_event_type_codes_dict["BeamBreak"]
+        is_dispense = sortedEventTypeCodes == LabjackEventsLoader.labjack_event_type_codes_dict["Dispense"]
+
+        # The position of the most recent beambreak at or before each position, and of the most recent dispense strictly before each position (-1 if none).
+        previous_beambreak_positions = np.maximum.accumulate(np.where(is_beambreak, positions, -1))
+        previous_dispense_positions = np.concatenate(
+            ([-1], np.maximum.accumulate(np.where(is_dispense, positions, -1))[:-1])
+        )
+        # Anything before the start of the current port's group belongs to a different port
+        has_previous_beambreak = previous_beambreak_positions >= group_start_positions
+        has_previous_dispense = previous_dispense_positions >= group_start_positions
+
+        # If no beambreak preceeds it, it's invalid. If the most recent dispense event is more recent then the last beambreak, there is a problem!
+        is_dispense_after_dispense = np.zeros(num_events, dtype=bool)
+        needs_comparison = is_dispense & has_previous_beambreak & has_previous_dispense
+        is_dispense_after_dispense[needs_comparison] = (
+            sortedTimestamps[previous_dispense_positions[needs_comparison]]
+            > sortedTimestamps[previous_beambreak_positions[needs_comparison]]
+        )
+        is_invalid = is_dispense & (~has_previous_beambreak | is_dispense_after_dispense)
+
+        valid_labjack_events_mask[port_sort_indicies[is_invalid]] = False
+        return valid_labjack_events_mask
+
+    """ find_invalid_events_iterative(labjackEvents, labjackEventType)
+        The original event-by-event implementation of find_invalid_events(...). Kept as the reference implementation for find_invalid_events_columnar(...).
         returns: 1. a dict of invalidDispenseEventTimestamps: {'Water1': list, 'Water2': list, 'Food1': list, 'Food2': list, 'any': list}
                 2. valid_labjack_events_mask: a mask of the size of labjackEvents that can be used to filter out the invalid labjack events
     """
 
     @staticmethod
-    def find_invalid_events(labjackEvents, labjackEventType):
+    def find_invalid_events_iterative(labjackEvents, labjackEventType):
         previousFoundDispenseEventTimestamp = {
             "Water1": None,
             "Water2": None,
@@ -300,8 +441,10 @@ class LabjackEventsLoader(object):
         # Produces invalidDispenseEventTimestamps
         return (invalidDispenseEventTimestamps, valid_labjack_events_mask)
 
-    """ filter_invalid_events(dateTimes, onesEventFormatDataArray, variableData, labjackEvents, phoServerFormatArgs):
+    """ filter_invalid_events(dateTimes, onesEventFormatDataArray, variableData, labjackEvents, phoServerFormatArgs, eventColumns):
         Filters invalid events from the loaded data structures
+        eventColumns: optional (portCodes, eventTypeCodes, startDates) for labjackEvents, see find_invalid_events(...)
+            labjackEvents may be None if eventColumns is given, in which case only the arrays are filtered (and None is returned in place of the filtered labjackEvents)
         returns: filtered (dateTimes, onesEventFormatDataArray, variableData,  labjackEvents, phoServerFormatArgs)
     """
 
@@ -312,8 +455,12 @@ class LabjackEventsLoader(object):
         variableData,
         labjackEvents,
         phoServerFormatArgs=None,
+        eventColumns=None,
     ):
-        num_labjack_events = len(labjackEvents)
+        if labjackEvents is None:
+            num_labjack_events = len(eventColumns[0])
+        else:
+            num_labjack_events = len(labjackEvents)
         if num_labjack_events <= 0:
             # print("WARNING: labjackEvents is empty!")
             return (
@@ -325,27 +472,29 @@ class LabjackEventsLoader(object):
             )
 
         active_labjack_event_type = None
-        first_labjack_event_obj = labjackEvents[0]
-        if type(first_labjack_event_obj) is PhoDurationEvent:
-            active_labjack_event_type = LabjackEventType.phoDurationEvent
-
-        elif type(first_labjack_event_obj) is FilesystemLabjackEvent_Record:
-            active_labjack_event_type = LabjackEventType.filesystemLabjackEvent_Record
-        else:
-            print("ERROR: Unknown Type!")
-            return None
+        active_variableData_event_specific_key = None
+        if labjackEvents is not None:
+            first_labjack_event_obj = labjackEvents[0]
+            if type(first_labjack_event_obj) is PhoDurationEvent:
+                active_labjack_event_type = LabjackEventType.phoDurationEvent
+
+            elif type(first_labjack_event_obj) is FilesystemLabjackEvent_Record:
+                active_labjack_event_type = LabjackEventType.filesystemLabjackEvent_Record
+            else:
+                print("ERROR: Unknown Type!")
+                return None
 
-        # Get the key for the items (either events or records) that belong to a specific variable:
-        active_variableData_event_specific_key = (
-            active_labjack_event_type.get_variable_specific_items_key()
-        )
+            # Get the key for the items (either events or records) that belong to a specific variable:
+            active_variableData_event_specific_key = (
+                active_labjack_event_type.get_variable_specific_items_key()
+            )
 
         # Produces invalidDispenseEventTimestamps
         (
             invalidDispenseEventTimestamps,
             valid_labjack_events_mask,
         ) = LabjackEventsLoader.find_invalid_events(
-            labjackEvents, active_labjack_event_type
+            labjackEvents, active_labjack_event_type, eventColumns=eventColumns
         )
 
         # Filter the erroneous events from the individual arrays in each variableData
@@ -383,19 +532,21 @@ class LabjackEventsLoader(object):
             variableData[dispenseVariableIndex]["values"] = variableData[
                 dispenseVariableIndex
             ]["values"][mask]
-            # Issue with this key: variableSpecificEvents
-            variableData[dispenseVariableIndex][
-                active_variableData_event_specific_key
-            ] = np.array(
+            if active_variableData_event_specific_key is not None:
+                # Issue with this key: variableSpecificEvents
                 variableData[dispenseVariableIndex][
                     active_variableData_event_specific_key
+                ] = np.array(
+                    variableData[dispenseVariableIndex][
+                        active_variableData_event_specific_key
+                    ]
+                )[
+                    mask
                 ]
-            )[
-                mask
-            ]
-            variableData[dispenseVariableIndex]["videoIndicies"] = variableData[
-                dispenseVariableIndex
-            ]["videoIndicies"][mask]
+            if "videoIndicies" in variableData[dispenseVariableIndex]:
+                variableData[dispenseVariableIndex]["videoIndicies"] = variableData[
+                    dispenseVariableIndex
+                ]["videoIndicies"][mask]
             print(
                 "    done.",
                 len(variableData[dispenseVariableIndex]["timestamps"]),
@@ -462,7 +613,11 @@ class LabjackEventsLoader(object):
             dateTimes[dateTimes_mask],
             onesEventFormatDataArray[dateTimes_mask],
             variableData,
-            labjackEvents[valid_labjack_events_mask],
+            (
+                labjackEvents[valid_labjack_events_mask]
+                if (labjackEvents is not None)
+                else None
+            ),
             phoServerFormatArgs,
         )
 
@@ -471,28 +626,56 @@ class LabjackEventsLoader(object):
         mat_dict = sio.loadmat(matPath, squeeze_me=True, struct_as_record=False)
         return mat_dict
 
-    # used by loadLabjackDataFromMatlabFormat(...)
+    # Opens the whole h5py file. loadLabjackDataFromMatlabFormat(...) reads it through a MatlabLabjackDataReader instead
     @staticmethod
     def loadLabjackDataNew(filePath):
         file = h5py.File(filePath, "r")
         return file
 
     @staticmethod
-    def loadLabjackDataFromMatlabFormat(filePath):
-        # The exported MATLAB .mat file contains:
-        # a single struct named 'labjackDataOutput':
-        # 'dateTime': 5388702 x 1 double array - contains timestamps at which the sensor values were sampled
-        # 'dataArray': 5388702 x 8 double array - contains sensor values at each sampled timestamp
-        # 'ColumnNames': 1 x 8 cell array - contains names of variables
-        file = LabjackEventsLoader.loadLabjackDataNew(filePath)
-        # Get the 'labjackDataOutput' matlab variable from the loaded file.
-        data = file.get("labjackDataOutput")
-        # Do try and convert the dateNums to datetimes:
-        dateNums = np.squeeze(np.array(data["dateTime"]))
-        # dateTimes = [matlab2datetime(tval[0]) for tval in dateNums]
-        # dateTimes = np.array(dateTimes)
-        dateTimes = np.array(LabjackEventsLoader.helper_timenum_to_datetime(dateNums))
-        dataArray = np.array(data["dataArray"]).T
+    def loadLabjackDataFromMatlabFormat(
+        filePath,
+        variableIndicies=None,
+        shouldKeepOnlyEventSamples=False,
+        shouldReturnDatetime64=False,
+    ):
+        """Loads the 'labjackDataOutput' struct of an exported MATLAB .mat file and returns (dateNums, dateTimes, dataArray)
+        The exported MATLAB .mat file contains:
+        a single struct named 'labjackDataOutput':
+        'dateTime': 5388702 x 1 double array - contains timestamps at which the sensor values were sampled
+        'dataArray': 5388702 x 8 double array - contains sensor values at each sampled timestamp
+        'ColumnNames': 1 x 8 cell array - contains names of variables
+        The file is read by MatlabLabjackDataReader, which only reads the columns in variableIndicies (all of them if None). The dataArray still has a column for every variable, but the others are zero.
+        If shouldKeepOnlyEventSamples is True only the samples where at least one of the variableIndicies is non-zero are returned (like loadLabjackDataFromPhoServerFormatStreaming(...)), and only their datenums are converted.
+        If shouldReturnDatetime64 is False (the default) dateTimes are converted to datetime objects for the callers that expect them.
+        """
+        with MatlabLabjackDataReader(filePath) as reader:
+            if variableIndicies is None:
+                variableIndicies = list(range(reader.get_num_columns()))
+            else:
+                variableIndicies = list(variableIndicies)
+            if shouldKeepOnlyEventSamples:
+                (
+                    _,
+                    dateNums,
+                    variableDataArray,
+                ) = reader.read_event_samples(variableIndicies)
+            else:
+                dateNums = reader.read_datenums()
+                variableDataArray = reader.read_columns(variableIndicies)
+            numColumns = reader.get_num_columns()
+
+        if variableIndicies == list(range(numColumns)):
+            dataArray = variableDataArray
+        else:
+            dataArray = np.zeros(
+                (variableDataArray.shape[0], numColumns), dtype=variableDataArray.dtype
+            )
+            dataArray[:, variableIndicies] = variableDataArray
+
+        dateTimes = MatlabLabjackDataReader.matlab_datenums_to_datetime64(dateNums)
+        if not shouldReturnDatetime64:
+            dateTimes = PhoServerFormatBulkParser.datetime64_to_datetimes(dateTimes)
         return (dateNums, dateTimes, dataArray)
 
     """ def parsePhoServerFormatFilepath(filePathString)
@@ -653,108 +836,26 @@ class LabjackEventsLoader(object):
 
     ## TODO: Generalize to work with analog sensors (like the new 1-9-2020 running wheel absolute rotary encoder)
     @staticmethod
-    def loadLabjackDataFromPhoServerFormat(filePath, shouldUseStdOutFormat=True):
-        # Loads from a txt file output by my PhoServer C++ program and returns (relevantFileLines, dateTimes, onesEventFormatOutputData)
-        def _parse_line(line):
-            """
-            Do a regex search against all defined regexes and
-            return the key and match result of the first matching regex
-
-            """
-            if shouldUseStdOutFormat:
-                active_rx_dict = LabjackEventsLoader.rx_stdout_dict
-            else:
-                active_rx_dict = LabjackEventsLoader.rx_csv_dict
-
-            for key, rx in active_rx_dict.items():
-                match = rx.search(line)
-                if match:
-                    return key, match
-            # if there are no matches
-            return None, None
-
-        def parse_file(filepath):
-            """
-            Parse text at given filepath
-
-            Parameters
-            ----------
-            filepath : str
-                Filepath for file_object to be parsed
-
-            Returns
-            -------
-            data : pd.DataFrame
-                Parsed data
-            """
-
-            parsedDateTimes = []  # create an empty list to collect the data
-            parsedDataArray = []
-            relevantFileLines = []
-            # open the file and read through it line by line
-            with open(filepath, "r") as file_object:
-                line = file_object.readline()
-                while line:
-                    # at each line check for a match with a regex
-                    key, match = _parse_line(line)
-
-                    # extract data line elements
-                    if key == "data":
-                        milliseconds_since_epoch = match.group(
-                            "milliseconds_since_epoch"
-                        )
-                        # DIO0 = match.group('DIO0')
-                        # DIO1 = match.group('DIO1')
-                        # DIO2 = match.group('DIO2')
-                        # DIO3 = match.group('DIO3')
-                        # DIO4 = match.group('DIO4')
-                        # DIO5 = match.group('DIO5')
-                        # DIO6 = match.group('DIO6')
-                        # DIO7 = match.group('DIO7')
-                        # MIO0 = match.group('MIO0')
-                        DIO0 = match.group("DIO0")
-                        DIO1 = match.group("DIO1")
-                        DIO2 = match.group("DIO2")
-                        DIO3 = match.group("DIO3")
-                        DIO4 = match.group("DIO4")
-                        DIO5 = match.group("DIO5")
-                        DIO6 = match.group("DIO6")
-                        DIO7 = match.group("DIO7")
-                        MIO0 = match.group("MIO0")
-
-                        # local time
-                        t = dt.datetime.fromtimestamp(
-                            float(milliseconds_since_epoch) / 1000.0
-                        )
-
-                        parsedDateTimes.append(t)
-                        # rowData = [DIO0, DIO1, DIO2, DIO3, DIO4, DIO5, DIO6, DIO7, MIO0]
-                        rowData = [
-                            int(DIO0),
-                            int(DIO1),
-                            int(DIO2),
-                            int(DIO3),
-                            int(DIO4),
-                            int(DIO5),
-                            int(DIO6),
-                            int(DIO7),
-                            int(MIO0),
-                        ]
-                        # rowData = [DIO0, DIO1, DIO2, DIO3, DIO4, DIO5, DIO6, DIO7, MIO0] == '1'
-                        parsedDataArray.append(rowData)
-                        # Append the line
-                        relevantFileLines.append(line)
-
-                    line = file_object.readline()
-
-            return (
-                np.array(relevantFileLines),
-                np.array(parsedDateTimes),
-                np.array(parsedDataArray),
-            )
-
+    def loadLabjackDataFromPhoServerFormat(
+        filePath, shouldUseStdOutFormat=True, shouldReturnDatetime64=False
+    ):
+        """Loads from a txt file output by my PhoServer C++ program and returns (outputPhoServerFormatArgs, dateTimes, onesEventFormatOutputData)
+        The file is parsed in bulk by PhoServerFormatBulkParser. Timestamps are kept as local-time datetime64[ms] values while parsing.
+        If shouldReturnDatetime64 is False (the default) dateTimes (and outputPhoServerFormatArgs.relevantDateTimes) are converted to datetime objects for the callers that expect them.
+        """
         parsedFileInfoDict = LabjackEventsLoader.parsePhoServerFormatFilepath(filePath)
-        (relevantFileLines, dateTimes, dataArray) = parse_file(filePath)
+        (
+            millisecondsSinceEpoch,
+            dataArray,
+            lineOffsets,
+        ) = PhoServerFormatBulkParser.parse_file(
+            filePath, shouldUseStdOutFormat=shouldUseStdOutFormat
+        )
+        dateTimes = PhoServerFormatBulkParser.milliseconds_to_local_datetime64(
+            millisecondsSinceEpoch
+        )
+        if not shouldReturnDatetime64:
+            dateTimes = PhoServerFormatBulkParser.datetime64_to_datetimes(dateTimes)
 
         # Parse to find the transitions ( "roll" rotates the array to left some step length)
         # A False followed by a True can then be expressed as: https://stackoverflow.com/questions/47750593/finding-false-true-transitions-in-a-numpy-array?rq=1
@@ -776,9 +877,12 @@ class LabjackEventsLoader(object):
         # Build output object
         # out_filtered_csv_path = r'C:\Users\halechr\repo\phoPythonVideoFileParser\results\erroneousEventsRemoved.csv'
         out_filtered_csv_path = None
+        # Only the lines that contain events are read back from the file
         outputPhoServerFormatArgs = PhoServerFormatArgs(
             dateTimes[falling_edges_row_indicies],
-            relevantFileLines[falling_edges_row_indicies],
+            PhoServerFormatBulkParser.read_lines(
+                filePath, lineOffsets[falling_edges_row_indicies]
+            ),
             out_filtered_csv_path,
             parsedFileInfoDict,
         )
@@ -788,21 +892,93 @@ class LabjackEventsLoader(object):
         onesEventFormatOutputData[falling_edge_cells_result] = 1.0
         return (outputPhoServerFormatArgs, dateTimes, onesEventFormatOutputData)
 
+    @staticmethod
+    def loadLabjackDataFromPhoServerFormatStreaming(
+        filePath, shouldUseStdOutFormat=True, shouldReturnDatetime64=False
+    ):
+        """The streaming version of loadLabjackDataFromPhoServerFormat(...) for files too large to parse at once. Returns (outputPhoServerFormatArgs, dateTimes, onesEventFormatOutputData) in the same way.
+        The file is read in fixed-size blocks by PhoServerFormatBulkParser.iter_falling_edges(...), so the memory used depends on the number of events rather than the size of the file.
+        Only the samples where at least one event occurred are kept: dateTimes and onesEventFormatOutputData have a row per event sample instead of a row per sample in the file.
+        The dateTimes of each variable's events (the rows where its column is 1) are the same as loadLabjackDataFromPhoServerFormat(...) returns.
+        """
+        parsedFileInfoDict = LabjackEventsLoader.parsePhoServerFormatFilepath(filePath)
+        millisecondsChunks = []
+        fallingEdgesChunks = []
+        eventLinesChunks = []
+        for (
+            millisecondsSinceEpoch,
+            fallingEdges,
+            lineOffsets,
+            eventLines,
+        ) in PhoServerFormatBulkParser.iter_falling_edges(
+            filePath,
+            shouldUseStdOutFormat=shouldUseStdOutFormat,
+            shouldReadEventLines=True,
+        ):
+            millisecondsChunks.append(millisecondsSinceEpoch)
+            fallingEdgesChunks.append(fallingEdges)
+            eventLinesChunks.append(eventLines)
+
+        if len(millisecondsChunks) > 0:
+            millisecondsSinceEpoch = np.concatenate(millisecondsChunks)
+            fallingEdges = np.concatenate(fallingEdgesChunks)
+            eventLines = np.concatenate(eventLinesChunks)
+        else:
+            millisecondsSinceEpoch = np.zeros((0,), dtype=np.int64)
+            fallingEdges = np.zeros(
+                (0, PhoServerFormatBulkParser.num_variables), dtype=np.int8
+            )
+            eventLines = np.zeros((0,), dtype=str)
+
+        dateTimes = PhoServerFormatBulkParser.milliseconds_to_local_datetime64(
+            millisecondsSinceEpoch
+        )
+        if not shouldReturnDatetime64:
+            dateTimes = PhoServerFormatBulkParser.datetime64_to_datetimes(dateTimes)
+
+        # As in loadLabjackDataFromPhoServerFormat(...), the relevantDateTimes have an entry for each falling edge (so a sample with two events appears twice)
+        falling_edge_cells_result = np.where(fallingEdges > 0)
+        falling_edges_row_indicies = falling_edge_cells_result[0]
+        out_filtered_csv_path = None
+        outputPhoServerFormatArgs = PhoServerFormatArgs(
+            dateTimes[falling_edges_row_indicies],
+            eventLines[falling_edges_row_indicies],
+            out_filtered_csv_path,
+            parsedFileInfoDict,
+        )
+        onesEventFormatOutputData = fallingEdges.astype(np.float64)
+        return (outputPhoServerFormatArgs, dateTimes, onesEventFormatOutputData)
+
     """ loadLabjackEventsFile_loadFromFile(...): Just loads the file
     Called by loadLabjackEventsFile(...)
         Calls the static LabjackEventsLoader functions for the appropriate file format (phoServer format or Matlab format).
+        matlabVariableIndicies: if not None, only these columns are read from a Matlab format file and only the samples containing an event in one of them are returned (see loadLabjackDataFromMatlabFormat(...))
         Returns a onesEventFormatDataArray.
     """
 
     @staticmethod
     def loadLabjackEventsFile_loadFromFile(
-        labjackFilePath, usePhoServerFormat=False, phoServerFormatIsStdOut=True
+        labjackFilePath,
+        usePhoServerFormat=False,
+        phoServerFormatIsStdOut=True,
+        shouldStreamPhoServerFormat=False,
+        matlabVariableIndicies=None,
     ):
         ## Load the Labjack events data from an exported MATLAB file
         # Used only for PhoServerFormat:
         phoServerFormatArgs = None
 
-        if usePhoServerFormat:
+        if usePhoServerFormat and shouldStreamPhoServerFormat:
+            # Only the event samples are returned, see loadLabjackDataFromPhoServerFormatStreaming(...)
+            (
+                phoServerFormatArgs,
+                dateTimes,
+                onesEventFormatDataArray,
+            ) = LabjackEventsLoader.loadLabjackDataFromPhoServerFormatStreaming(
+                labjackFilePath, shouldUseStdOutFormat=phoServerFormatIsStdOut
+            )
+
+        elif usePhoServerFormat:
             (
                 phoServerFormatArgs,
                 dateTimes,
@@ -816,7 +992,11 @@ class LabjackEventsLoader(object):
                 dateNums,
                 dateTimes,
                 onesEventFormatDataArray,
-            ) = LabjackEventsLoader.loadLabjackDataFromMatlabFormat(labjackFilePath)
+            ) = LabjackEventsLoader.loadLabjackDataFromMatlabFormat(
+                labjackFilePath,
+                variableIndicies=matlabVariableIndicies,
+                shouldKeepOnlyEventSamples=(matlabVariableIndicies is not None),
+            )
 
         return (dateTimes, onesEventFormatDataArray, phoServerFormatArgs)
 
@@ -854,6 +1034,30 @@ class LabjackEventsLoader(object):
     ):
         records_dataframe.to_csv(filePath)
 
+    """
+        Builds the typed columns of the records (in order) exported by LabjackEventsExporter: start_date (datetime64[us]) and the variable_name, event_type and port strings
+    """
+
+    @staticmethod
+    def build_records_export_columns(labjackEventRecords):
+        extendedDatas = [aRecord.get_extended_data() for aRecord in labjackEventRecords]
+        return {
+            "start_date": np.array(
+                [aRecord.start_date for aRecord in labjackEventRecords],
+                dtype="datetime64[us]",
+            ),
+            "variable_name": np.array(
+                [aRecord.variable_name for aRecord in labjackEventRecords], dtype=str
+            ),
+            "event_type": np.array(
+                [anExtendedData["event_type"] for anExtendedData in extendedDatas],
+                dtype=str,
+            ),
+            "port": np.array(
+                [anExtendedData["port"] for anExtendedData in extendedDatas], dtype=str
+            ),
+        }
+
     """
         Builds a records dataframe out of the list of labjackEventRecords
     """
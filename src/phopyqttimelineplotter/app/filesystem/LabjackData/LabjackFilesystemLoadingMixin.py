@@ -7,9 +7,8 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
-import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
@@ -19,10 +18,20 @@ from phopyqttimelineplotter.app.filesystem.GeneralData.BaseDataFileFilesystemLoa
     BaseDataEventFile,
     BaseDataFilesystemLoader,
 )
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsExporter import (
+    LabjackEventsExporter,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsFileCache import (
+    LabjackEventsFileCache,
+)
 from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
     LabjackEventsLoader,
     PhoServerFormatArgs,
 )
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
+from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
 from phopyqttimelineplotter.app.filesystem.VideoUtils import (
     CachedFileSource,
     FoundVideoFileResult,
@@ -77,6 +86,9 @@ from phopyqttimelineplotter.GUI.UI.AbstractDatabaseAccessingWidgets import (
 
 # from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackFilesystemLoadingMixin import LabjackEventFile, LabjackFilesystemLoader
 
+# Only imported once a file's variable colors are first converted to QColors
+mcolors = LazyModule("matplotlib.colors")
+
 
 # from pyqtgraph import ProgressDialog
 # import pyqtgraph as pg
@@ -128,7 +140,6 @@ class LabjackEventFile(BaseDataEventFile):
         BaseDataEventFile.set_loaded_values(
             self,
             dateTimes,
-            onesEventFormatDataArray,
             variableData,
             labjackEventsContainerArray,
             phoServerFormatArgs,
@@ -137,6 +148,16 @@ class LabjackEventFile(BaseDataEventFile):
             onesEventFormatDataArray  # set the custom values
         )
 
+    # get_dateTimes(): the dateTimes are kept as a datetime64 array (see LabjackFilesystemLoader.loadLabjackEventsFile(...)) and only converted to datetimes the first time they're asked for
+    def get_dateTimes(self):
+        if isinstance(self.dateTimes, np.ndarray) and np.issubdtype(
+            self.dateTimes.dtype, np.datetime64
+        ):
+            self.dateTimes = PhoServerFormatBulkParser.datetime64_to_datetimes(
+                self.dateTimes
+            )
+        return self.dateTimes
+
 
 class LabjackFilesystemLoader(BaseDataFilesystemLoader):
     """LabjackFilesystemLoader: this object tries to find Labjack-exported data files in the filesystem and make them accessible in memory
@@ -167,86 +188,58 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
     def loadedLabjackFiles(self, value):
         self.loadedDataFiles = value
 
-    def __init__(self, labjackFilePaths, parent=None):
+    def __init__(
+        self,
+        labjackFilePaths,
+        maxLoadingProcesses=None,
+        shouldExportLoadedData=False,
+        parent=None,
+    ):
+        # If shouldExportLoadedData is True each loaded file is also exported (in the background) by LabjackFilesystemLoader.events_exporter
+        self.shouldExportLoadedData = shouldExportLoadedData
         super(LabjackFilesystemLoader, self).__init__(
-            labjackFilePaths, parent=parent
+            labjackFilePaths, maxLoadingProcesses=maxLoadingProcesses, parent=parent
         )  # Call the inherited classes __init__ method
 
-    def on_load_data_files_execute_thread(
-        self, active_labjack_data_file_paths, progress_callback
-    ):
-        """
-        The main execution function - overriden by specific file types to perform the loading action
-        """
+    def get_data_file_arrays_args(self):
+        """The arguments after the file path passed to load_data_file_arrays(...) for each file"""
         should_filter_for_invalid_events = True
         # should_filter_for_invalid_events = False
-
-        currProgress = 0.0
-        parsedFiles = 0
-        numPendingFiles = len(active_labjack_data_file_paths)
-        self.pending_operation_status.restart(
-            OperationTypes.FilesystemDataFileLoad, numPendingFiles
+        return (
+            LabjackEventsLoader.labjack_variable_names,
+            True,  # usePhoServerFormat
+            False,  # phoServerFormatIsStdOut
+            should_filter_for_invalid_events,
+            True,  # should_use_file_cache
+            True,  # shouldStreamPhoServerFormat
         )
 
-        new_cache = dict()
-
-        # active_cache = self.cache
-        active_cache = new_cache
-        # Loop through all the labjack data file paths and parse the files into a LabjackEventFile object.
-        for (sub_index, aFoundLabjackDataFile) in enumerate(
-            active_labjack_data_file_paths
-        ):
-
-            # LabjackEventFile: this serves as a container to hold the loaded events
-            outEventFileObj = LabjackEventFile(aFoundLabjackDataFile)
+    def build_data_event_file(self, aFoundLabjackDataFile, fileArrays):
+        """Builds the LabjackEventFile for a file from the arrays loaded by load_data_file_arrays(...). Called in file order from the base class's on_load_data_files_execute_thread(...)"""
+        # LabjackEventFile: this serves as a container to hold the loaded events
+        outEventFileObj = LabjackEventFile(aFoundLabjackDataFile)
 
-            # Call the static "loadLabjackEventsFile(...) function:
-            (
-                dateTimes,
-                labjackEventContainers,
-                phoServerFormatArgs,
-            ) = LabjackFilesystemLoader.loadLabjackEventsFile(
-                aFoundLabjackDataFile,
-                self.videoStartDates,
-                self.videoEndDates,
-                shouldLimitEventsToVideoDates=False,
-                usePhoServerFormat=True,
-                phoServerFormatIsStdOut=False,
-                should_filter_for_invalid_events=should_filter_for_invalid_events,
-            )
-
-            print("Loading complete... setting loaded values")
-            # Cache the loaded values into the LabjackEventFile object.
-            # outEventFileObj.set_loaded_values(dateTimes, [], [], labjackEventContainers, phoServerFormatArgs)
-            outEventFileObj.set_loaded_values(
-                dateTimes, [], labjackEventContainers, None, []
-            )
-            print("done updating cache...")
-
-            if not (aFoundLabjackDataFile in active_cache.keys()):
-                # print('Creating new cache entry for {}...'.format(str(aFoundLabjackDataFile)))
-                # Parent doesn't yet exist in cache
-                active_cache[aFoundLabjackDataFile] = outEventFileObj
-            else:
-                # Parent already exists
-                print(
-                    "WARNING: labjack file path {} already exists in the temporary cache. Updating its values...".format(
-                        str(aFoundLabjackDataFile)
-                    )
-                )
-                active_cache[aFoundLabjackDataFile] = outEventFileObj
-                pass
-
-            parsedFiles = parsedFiles + 1
-            # progress_callback.emit(active_labjack_data_file_paths, (parsedFiles*100/numPendingFiles))
-            progress_callback.emit(
-                [aFoundLabjackDataFile, outEventFileObj],
-                (parsedFiles * 100 / numPendingFiles),
-            )
+        # Call the static "loadLabjackEventsFile(...) function with the already loaded arrays:
+        (
+            dateTimes,
+            labjackEventContainers,
+            phoServerFormatArgs,
+        ) = LabjackFilesystemLoader.loadLabjackEventsFile(
+            aFoundLabjackDataFile,
+            self.videoStartDates,
+            self.videoEndDates,
+            shouldLimitEventsToVideoDates=False,
+            preloadedFileArrays=fileArrays,
+            shouldExportLoadedData=self.shouldExportLoadedData,
+        )
 
-        # return "Done."
-        # Returns the cache when done
-        return new_cache
+        print("Loading complete... setting loaded values")
+        # Cache the loaded values into the LabjackEventFile object.
+        # outEventFileObj.set_loaded_values(dateTimes, [], [], labjackEventContainers, phoServerFormatArgs)
+        outEventFileObj.set_loaded_values(
+            dateTimes, [], labjackEventContainers, None, []
+        )
+        return outEventFileObj
 
     # @pyqtSlot(list, object)
     # def on_load_labjack_data_files_print_output(self, active_video_paths, s):
@@ -263,6 +256,293 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
 
     ## Static Methods:
 
+    # Persistent on-disk cache of the parsed (and filtered) arrays for each labjack file, shared by all loaders
+    events_file_cache = LabjackEventsFileCache()
+
+    # The background export stage used when loadLabjackEventsFile(...) is called with shouldExportLoadedData, shared by all loaders
+    events_exporter = LabjackEventsExporter()
+
+    @staticmethod
+    def build_events_file_cache_arrays(
+        dateTimes,
+        onesEventFormatDataArray,
+        variableData,
+        phoServerFormatArgs,
+    ):
+        """Packs the loaded values into a dict of non-object arrays that can be saved by LabjackEventsFileCache"""
+        cacheArrays = {
+            "dateTimes": np.array(dateTimes, dtype="datetime64[us]"),
+            "onesEventFormatDataArray": np.asarray(
+                onesEventFormatDataArray, dtype=np.int8
+            ),
+        }
+        for (variableIndex, aVariableData) in enumerate(variableData):
+            cacheArrays["variable{}_timestamps".format(variableIndex)] = np.array(
+                aVariableData["timestamps"], dtype="datetime64[us]"
+            )
+            cacheArrays["variable{}_values".format(variableIndex)] = np.asarray(
+                aVariableData["values"], dtype=np.float64
+            )
+        if phoServerFormatArgs is not None:
+            cacheArrays["relevantDateTimes"] = np.array(
+                phoServerFormatArgs.relevantDateTimes, dtype="datetime64[us]"
+            )
+            cacheArrays["relevantFileLines"] = np.array(
+                phoServerFormatArgs.relevantFileLines, dtype=str
+            )
+        return cacheArrays
+
+    @staticmethod
+    def unpack_events_file_cache_arrays(labjackFilePath, cacheArrays, numVariables):
+        """The inverse of build_events_file_cache_arrays(...). Returns (dateTimes, onesEventFormatDataArray, phoServerFormatArgs, variableTimestamps, variableValues)
+        dateTimes is left as the cached datetime64 array rather than converted to datetimes, since it has a row for every sample and is rarely used (see LabjackEventFile.get_dateTimes()). The much shorter variableTimestamps are converted, since the records are built from them.
+        """
+        dateTimes = cacheArrays["dateTimes"]
+        variableTimestamps = [
+            PhoServerFormatBulkParser.datetime64_to_datetimes(
+                cacheArrays["variable{}_timestamps".format(variableIndex)]
+            )
+            for variableIndex in range(0, numVariables)
+        ]
+        variableValues = [
+            np.array(cacheArrays["variable{}_values".format(variableIndex)])
+            for variableIndex in range(0, numVariables)
+        ]
+        phoServerFormatArgs = None
+        if "relevantDateTimes" in cacheArrays:
+            phoServerFormatArgs = PhoServerFormatArgs(
+                PhoServerFormatBulkParser.datetime64_to_datetimes(
+                    cacheArrays["relevantDateTimes"]
+                ),
+                np.array(cacheArrays["relevantFileLines"]),
+                None,
+                LabjackEventsLoader.parsePhoServerFormatFilepath(labjackFilePath),
+            )
+        return (
+            dateTimes,
+            cacheArrays["onesEventFormatDataArray"],
+            phoServerFormatArgs,
+            variableTimestamps,
+            variableValues,
+        )
+
+    @staticmethod
+    def build_variable_records(
+        currVariableName,
+        activeTimestamps,
+        videoIntervalIndex,
+        shouldLimitEventsToVideoDates,
+    ):
+        """Builds the FilesystemLabjackEvent_Record objects for the activeTimestamps of a single variable.
+        videoIntervalIndex: a VideoIntervalIndex of the videos, used to find the video (if any) each timestamp occurred within
+        Returns (activeVideoIndicies, labjackVariableSpecificRecords)
+        """
+        dataArrayVariableIndex = LabjackEventsLoader.labjack_variable_indicies_dict[
+            currVariableName
+        ]
+        currVariableColorTuple = mcolors.to_rgb(
+            LabjackEventsLoader.labjack_variable_colors_dict[currVariableName]
+        )
+        currVariableColor = QColor(
+            int(255.0 * currVariableColorTuple[0]),
+            int(255.0 * currVariableColorTuple[1]),
+            int(255.0 * currVariableColorTuple[2]),
+        )
+
+        # Acumulate records one variable at a time
+        labjackVariableSpecificRecords = []
+        ## Find times within video ranges:
+        # activeVideoIndicies: contains an int index or None for each timestamp to indicate which video (if any) the timestamp occurred within
+        (
+            activeVideoIndicies,
+            videoRelativeOffsets,
+            isWithinVideoSpan,
+        ) = videoIntervalIndex.assign_videos(activeTimestamps)
+        for index, anActiveTimestamp in enumerate(activeTimestamps):
+            # Events outside the range of time that the videos span are skipped if shouldLimitEventsToVideoDates
+            shouldCreateEvent = isWithinVideoSpan[index] or (
+                not shouldLimitEventsToVideoDates
+            )
+            video_relative_offset = videoRelativeOffsets[index]
+
+            if shouldCreateEvent:
+                currExtendedInfoDict = {
+                    "videoIndex": activeVideoIndicies[index],
+                    "video_relative_offset": video_relative_offset,
+                    "event_type": LabjackEventsLoader.labjack_variable_event_type[
+                        dataArrayVariableIndex
+                    ],
+                    "dispense_type": LabjackEventsLoader.labjack_variable_event_type[
+                        dataArrayVariableIndex
+                    ],
+                    "port": LabjackEventsLoader.labjack_variable_port_location[
+                        dataArrayVariableIndex
+                    ],
+                }
+                # Create a new record object
+                ## TODO: should this have a different parent?
+                currRecord = FilesystemLabjackEvent_Record(
+                    anActiveTimestamp.replace(tzinfo=None),
+                    None,
+                    currVariableName,
+                    currVariableColor,
+                    currExtendedInfoDict,
+                    parent=None,
+                )
+                labjackVariableSpecificRecords.append(currRecord)
+
+        return (activeVideoIndicies, labjackVariableSpecificRecords)
+
+    @staticmethod
+    def build_variable_event_columns(active_labjack_variable_names, variableData):
+        """Builds the (portCodes, eventTypeCodes, startDates) columns used by LabjackEventsLoader.filter_invalid_events(...) straight from the per-variable timestamps, without building any records.
+        The events are sorted by timestamp (a stable sort, like sorting the records by start_date)
+        """
+        numVariables = len(active_labjack_variable_names)
+        eventVariableIndicies = np.repeat(
+            np.arange(numVariables),
+            [len(variableData[variableIndex]["timestamps"]) for variableIndex in range(0, numVariables)],
+        )
+        eventDataArrayVariableIndicies = np.array(
+            [
+                LabjackEventsLoader.labjack_variable_indicies_dict[aVariableName]
+                for aVariableName in active_labjack_variable_names
+            ],
+            dtype=np.int64,
+        )[eventVariableIndicies]
+        portCodes = np.array(
+            [
+                LabjackEventsLoader.labjack_port_codes_dict[aPort]
+                for aPort in LabjackEventsLoader.labjack_variable_port_location
+            ],
+            dtype=np.int64,
+        )[eventDataArrayVariableIndicies]
+        eventTypeCodes = np.array(
+            [
+                LabjackEventsLoader.labjack_event_type_codes_dict[anEventType]
+                for anEventType in LabjackEventsLoader.labjack_variable_event_type
+            ],
+            dtype=np.int64,
+        )[eventDataArrayVariableIndicies]
+        startDates = np.empty(len(eventVariableIndicies), dtype=object)
+        startDates[:] = [
+            aTimestamp.replace(tzinfo=None)
+            for variableIndex in range(0, numVariables)
+            for aTimestamp in variableData[variableIndex]["timestamps"]
+        ]
+
+        event_sort_indicies = np.argsort(startDates, kind="stable")
+        return (
+            portCodes[event_sort_indicies],
+            eventTypeCodes[event_sort_indicies],
+            startDates[event_sort_indicies],
+        )
+
+    @staticmethod
+    def load_data_file_arrays(
+        labjackFilePath,
+        active_labjack_variable_names,
+        usePhoServerFormat,
+        phoServerFormatIsStdOut,
+        should_filter_for_invalid_events,
+        should_use_file_cache=True,
+        shouldStreamPhoServerFormat=False,
+    ):
+        """Loads the parsed (and filtered) arrays of a labjack file from LabjackFilesystemLoader.events_file_cache, or parses and filters the file and caches them.
+        Returns the dict of arrays built by build_events_file_cache_arrays(...).
+        No records or other QObjects are built, so this is what the worker processes run when the files are loaded by a DataFileProcessPool.
+        If shouldStreamPhoServerFormat is True PhoServer format files are streamed in blocks rather than parsed whole (see LabjackEventsLoader.loadLabjackDataFromPhoServerFormatStreaming(...)), and the cached dateTimes/onesEventFormatDataArray only have the rows containing events.
+        Only the columns of the active variables are read from Matlab format files, and the cached dateTimes/onesEventFormatDataArray also only have the rows containing events.
+        """
+        numVariables = len(active_labjack_variable_names)
+        # Only these columns are read from Matlab format files, and only the samples with an event in one of them are kept
+        matlabVariableIndicies = [
+            LabjackEventsLoader.labjack_variable_indicies_dict[aVariableName]
+            for aVariableName in active_labjack_variable_names
+        ]
+
+        # The video dates aren't part of the cache key, since the records (which depend on them) are always rebuilt from the cached per-variable timestamps.
+        # Neither are the Matlab columns read, since they follow from active_labjack_variable_names
+        cache_options = {
+            "usePhoServerFormat": usePhoServerFormat,
+            "phoServerFormatIsStdOut": phoServerFormatIsStdOut,
+            "should_filter_for_invalid_events": should_filter_for_invalid_events,
+            "active_labjack_variable_names": list(active_labjack_variable_names),
+            "shouldStreamPhoServerFormat": shouldStreamPhoServerFormat,
+        }
+        if should_use_file_cache:
+            cacheArrays = LabjackFilesystemLoader.events_file_cache.load(
+                labjackFilePath, cache_options
+            )
+            if cacheArrays is not None:
+                print("Loading labjack events for {} from cache...".format(str(labjackFilePath)))
+                # Plain ndarray views of the memory-mapped files, so nothing is read until it's used. They're only copied if they have to be pickled back from a worker process.
+                return {aKey: np.asarray(anArray) for (aKey, anArray) in cacheArrays.items()}
+
+        (
+            dateTimes,
+            onesEventFormatDataArray,
+            phoServerFormatArgs,
+        ) = LabjackEventsLoader.loadLabjackEventsFile_loadFromFile(
+            labjackFilePath,
+            usePhoServerFormat,
+            phoServerFormatIsStdOut,
+            shouldStreamPhoServerFormat=shouldStreamPhoServerFormat,
+            matlabVariableIndicies=matlabVariableIndicies,
+        )
+        # Find the non-zero entries for each variable
+        variableData = []
+        for variableIndex in range(0, numVariables):
+            dataArrayVariableIndex = LabjackEventsLoader.labjack_variable_indicies_dict[
+                active_labjack_variable_names[variableIndex]
+            ]
+            currVariableDataValues = onesEventFormatDataArray[:, dataArrayVariableIndex]
+            nonZeroEntries = np.nonzero(currVariableDataValues)
+            variableData.append(
+                {
+                    "timestamps": dateTimes[nonZeroEntries],
+                    "values": currVariableDataValues[
+                        nonZeroEntries
+                    ],  # This is just all ones for 0/1 array
+                }
+            )
+
+        if should_filter_for_invalid_events:
+            print("Filtering for invalid events...")
+            ### Post-processing to detect erronious events, only for food2
+            (
+                dateTimes,
+                onesEventFormatDataArray,
+                variableData,
+                _,
+                phoServerFormatArgs,
+            ) = LabjackEventsLoader.filter_invalid_events(
+                dateTimes,
+                onesEventFormatDataArray,
+                variableData,
+                None,
+                phoServerFormatArgs=phoServerFormatArgs,
+                eventColumns=LabjackFilesystemLoader.build_variable_event_columns(
+                    active_labjack_variable_names, variableData
+                ),
+            )
+            print("    done.")
+        else:
+            print("Skipping filtering...")
+
+        cacheArrays = LabjackFilesystemLoader.build_events_file_cache_arrays(
+            dateTimes,
+            onesEventFormatDataArray,
+            variableData,
+            phoServerFormatArgs,
+        )
+        if should_use_file_cache:
+            print("Saving labjack events for {} to cache...".format(str(labjackFilePath)))
+            LabjackFilesystemLoader.events_file_cache.save(
+                labjackFilePath, cache_options, cacheArrays
+            )
+        return cacheArrays
+
     """ loadLabjackEventsFile(...): new.
         labjackEventRecords: a sorted list of FilesystemLabjackEvent_Record type objects for all variable types
     """
@@ -277,20 +557,21 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
         usePhoServerFormat=False,
         phoServerFormatIsStdOut=True,
         should_filter_for_invalid_events=True,
+        should_use_file_cache=True,
+        preloadedFileArrays=None,
+        shouldExportLoadedData=False,
+        shouldStreamPhoServerFormat=False,
     ):
         """Load the Labjack events data from an exported MATLAB file
         # If shouldLimitEventsToVideoDates is True then only events that fall between the earliest video start date and the latest video finish date are included
         # If shouldLimitEventsToVariables is not None, then only events that are of type of the variable with the name in the array are included
+        # If should_use_file_cache is True the parsed and filtered arrays are loaded from/saved to LabjackFilesystemLoader.events_file_cache, so unchanged files are only parsed once.
+        # If preloadedFileArrays is not None it's used instead of calling load_data_file_arrays(...) (e.g. when the arrays were already loaded by a worker process), and the loading options are ignored.
+        # If shouldExportLoadedData is True the loaded events are queued to be exported by LabjackFilesystemLoader.events_exporter, which writes them in the background.
+        # If shouldStreamPhoServerFormat is True a PhoServer format file is read in fixed-size blocks, so files larger than memory can be loaded. The returned dateTimes and dataArray then only have the rows containing events.
+        # The returned dateTimes are a datetime64 array, which LabjackEventFile.get_dateTimes() converts to datetimes when they're first needed.
         ## TODO: shouldLimitEventsToVideoDates should also affect the returned dateTimes, dataArray, etc.
         """
-        (
-            dateTimes,
-            onesEventFormatDataArray,
-            phoServerFormatArgs,
-        ) = LabjackEventsLoader.loadLabjackEventsFile_loadFromFile(
-            labjackFilePath, usePhoServerFormat, phoServerFormatIsStdOut
-        )
-
         ## Pre-process the data
         if limitedVariablesToCreateEventsFor is not None:
             active_labjack_variable_names = limitedVariablesToCreateEventsFor
@@ -301,15 +582,30 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
 
         numVariables = len(active_labjack_variable_names)
 
-        if (videoDates is not None) and (len(videoDates) > 0):
-            earliestVideoTime = videoDates.min()
-        else:
-            earliestVideoTime = datetime.min
+        fileArrays = preloadedFileArrays
+        if fileArrays is None:
+            fileArrays = LabjackFilesystemLoader.load_data_file_arrays(
+                labjackFilePath,
+                active_labjack_variable_names,
+                usePhoServerFormat,
+                phoServerFormatIsStdOut,
+                should_filter_for_invalid_events,
+                should_use_file_cache=should_use_file_cache,
+                shouldStreamPhoServerFormat=shouldStreamPhoServerFormat,
+            )
+        # The arrays were filtered (if should_filter_for_invalid_events was set) before the records are built from them, so the records don't need to be filtered
+        (
+            dateTimes,
+            onesEventFormatDataArray,
+            phoServerFormatArgs,
+            variableTimestamps,
+            variableValues,
+        ) = LabjackFilesystemLoader.unpack_events_file_cache_arrays(
+            labjackFilePath, fileArrays, numVariables
+        )
 
-        if (videoEndDates is not None) and (len(videoEndDates) > 0):
-            latestVideoTime = videoEndDates.max()
-        else:
-            latestVideoTime = datetime.max
+        # Built once and shared by all the variables
+        videoIntervalIndex = VideoIntervalIndex(videoDates, videoEndDates)
 
         ## Iterate through the event variables and pre-process them
         variableData = []
@@ -318,99 +614,37 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
         # Can't check for invalid events in here because we do it variable by variable.
         for variableIndex in range(0, numVariables):
             currVariableName = active_labjack_variable_names[variableIndex]
-            dataArrayVariableIndex = LabjackEventsLoader.labjack_variable_indicies_dict[
-                currVariableName
-            ]
-            currVariableDataValues = onesEventFormatDataArray[:, dataArrayVariableIndex]
-            currVariableColorTuple = mcolors.to_rgb(
-                LabjackEventsLoader.labjack_variable_colors_dict[currVariableName]
-            )
-            currVariableColor = QColor(
-                int(255.0 * currVariableColorTuple[0]),
-                int(255.0 * currVariableColorTuple[1]),
-                int(255.0 * currVariableColorTuple[2]),
+            activeTimestamps = variableTimestamps[variableIndex]
+            (
+                activeVideoIndicies,
+                labjackVariableSpecificRecords,
+            ) = LabjackFilesystemLoader.build_variable_records(
+                currVariableName,
+                activeTimestamps,
+                videoIntervalIndex,
+                shouldLimitEventsToVideoDates,
             )
 
-            # Find the non-zero entries for the current variable
-            nonZeroEntries = np.nonzero(currVariableDataValues)
-            activeValues = currVariableDataValues[
-                nonZeroEntries
-            ]  # This is just all ones for 0/1 array
-            activeTimestamps = dateTimes[nonZeroEntries]
-
-            # Acumulate records one variable at a time
-            labjackVariableSpecificRecords = []
-            ## Find times within video ranges:
-            # activeVideoIndicies: contains an int index or None for each timestamp to indicate which video (if any) the timestamp occurred within
-            activeVideoIndicies = np.empty_like(activeTimestamps)
-            for index, anActiveTimestamp in enumerate(activeTimestamps):
-                shouldCreateEvent = True
-                video_relative_offset = None
-                # Check if the timestamp is within the range of time that that videos span
-                if earliestVideoTime <= anActiveTimestamp <= latestVideoTime:
-                    # Loop through each video to see if the event is included within its duration (not currently used)
-                    for (videoIndex, videoStartDate) in enumerate(videoDates):
-                        videoEndDate = videoEndDates[videoIndex]
-                        if videoStartDate <= anActiveTimestamp <= videoEndDate:
-                            activeVideoIndicies[index] = videoIndex
-                            video_relative_offset = anActiveTimestamp - videoStartDate
-                            break
-                else:
-                    if shouldLimitEventsToVideoDates:
-                        shouldCreateEvent = False
-
-                if shouldCreateEvent:
-                    currExtendedInfoDict = {
-                        "videoIndex": activeVideoIndicies[index],
-                        "video_relative_offset": video_relative_offset,
-                        "event_type": LabjackEventsLoader.labjack_variable_event_type[
-                            dataArrayVariableIndex
-                        ],
-                        "dispense_type": LabjackEventsLoader.labjack_variable_event_type[
-                            dataArrayVariableIndex
-                        ],
-                        "port": LabjackEventsLoader.labjack_variable_port_location[
-                            dataArrayVariableIndex
-                        ],
-                    }
-                    # Create a new record object
-                    ## TODO: should this have a different parent?
-                    currRecord = FilesystemLabjackEvent_Record(
-                        anActiveTimestamp.replace(tzinfo=None),
-                        None,
-                        currVariableName,
-                        currVariableColor,
-                        currExtendedInfoDict,
-                        parent=None,
-                    )
-                    labjackVariableSpecificRecords.append(currRecord)
-
             # Append the variable-specific events to the master list of events
             labjackEventRecords.extend(labjackVariableSpecificRecords)
             # Add the value-dict for this variable to the 'variableData' list
             variableData.append(
                 {
                     "timestamps": activeTimestamps,
-                    "values": activeValues,
+                    "values": variableValues[variableIndex],
                     "videoIndicies": activeVideoIndicies,
                     "variableSpecificRecords": labjackVariableSpecificRecords,
                 }
             )
 
-        # Sort events by timestamp
-        try:
-            import operator
-        except ImportError:
-            keyfun = lambda x: x.start_date  # use a lambda if no operator module
-        else:
-            keyfun = operator.attrgetter(
-                "start_date"
-            )  # use operator since it's faster than lambda
-        labjackEventRecords = sorted(labjackEventRecords, key=keyfun)
-
+        # Sort events by timestamp (a stable sort, like sorted(...) with a start_date key)
+        recordStartDates = np.empty(len(labjackEventRecords), dtype=object)
+        recordStartDates[:] = [aRecord.start_date for aRecord in labjackEventRecords]
+        record_sort_indicies = np.argsort(recordStartDates, kind="stable")
         # Be sure to convert into a numpy array AFTER sorting
-        labjackEventRecords = np.array(labjackEventRecords)
-        # labjackEvents = np.array(labjackEvents)
+        unsortedLabjackEventRecords = np.empty(len(labjackEventRecords), dtype=object)
+        unsortedLabjackEventRecords[:] = labjackEventRecords
+        labjackEventRecords = unsortedLabjackEventRecords[record_sort_indicies]
 
         print(
             "    done. {} total labjackEvents loaded".format(
@@ -429,29 +663,6 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
 
         variable-specific lengths (in this file): (1433, 6717, 1496, 12422, 772, 3223, 851, 14275)
         """
-        if should_filter_for_invalid_events:
-            print("Filtering for invalid events...")
-            ### Post-processing to detect erronious events, only for food2
-            (
-                dateTimes,
-                onesEventFormatDataArray,
-                variableData,
-                labjackEventRecords,
-                phoServerFormatArgs,
-            ) = LabjackEventsLoader.filter_invalid_events(
-                dateTimes,
-                onesEventFormatDataArray,
-                variableData,
-                labjackEventRecords,
-                phoServerFormatArgs=phoServerFormatArgs,
-            )
-            print(
-                "Post-filtering: {} events remain".format(str(len(labjackEventRecords)))
-            )
-            print("    done.")
-        else:
-            print("Skipping filtering...")
-
         """ Post-filtering:
         dateTimes: ndarray, shape (68574,)
         labjackEventRecords: ndarray, shape (33646,)
@@ -459,101 +670,29 @@ class LabjackFilesystemLoader(BaseDataFilesystemLoader):
         variableData: counts match those printed in filter_invalid_events function
         """
 
-        """
-        converts the variableData list of dicts to a proper Pandas dataframe
-        """
-
-        def get_variables_as_dict_of_dataframes(
-            variableData, active_labjack_variable_names
-        ):
-            # Convert to dataframe:
-            variableDataFramesDict = dict()
-            # Loop through all variables and build a dataframe for each variable data in variableData
-            # for aVariableIndex in range(0, numVariables):
-            for (aVariableIndex, currVariableName) in enumerate(
-                active_labjack_variable_names
-            ):
-                # currVariableName = active_labjack_variable_names[aVariableIndex]
-                variableDataFramesDict[currVariableName] = pd.DataFrame.from_dict(
-                    variableData[aVariableIndex]
-                )
-
-            return variableDataFramesDict
-
-        def get_dict_of_dataframes_as_dataframe(variableDataFramesDict):
-            return pd.concat(variableDataFramesDict)
-            # return pd.concat(variableDataFramesDict, keys=['s1', 's2'],  names=['Series name', 'Row ID'])
-
-        # """ Export Dataframe to file:
-        # Writing dataframe to file data/output/LabjackDataExport/output_dataframe_1-9-2020...
-        # C:\Users\halechr\repo\PhoPyQtTimelinePlotter\app\filesystem\LabjackFilesystemLoadingMixin.py:257: PerformanceWarning:
-        # your performance may suffer as PyTables will pickle object types that it cannot
-        # map directly to c-types [inferred_type->mixed-integer,key->block2_values] [items->['videoIndicies', 'variableSpecificRecords']]
-        # """
-        base_name = "output_dataframe_1-9-2020"
-        out_dataframe_export_parent_path = Path("data/output/LabjackDataExport/")
-        out_dataframe_export_path_basic = out_dataframe_export_parent_path.joinpath(
-            "{}_basic_store.h5".format(str(base_name))
-        )  # Used for basic objects
-        out_dataframe_export_path_pandas = out_dataframe_export_parent_path.joinpath(
-            "{}_pandas_store.h5".format(str(base_name))
-        )  # Used for pandas Dataframe and Series objects
-        out_records_dataframe_CSV_export_path = (
-            out_dataframe_export_parent_path.joinpath(
-                "{}_records.csv".format(str(base_name))
-            )
-        )  # Exported CSV
-
-        print("Converting variableData to dict of Pandas Dataframes...")
-        out_dict_of_df = get_variables_as_dict_of_dataframes(
-            variableData, active_labjack_variable_names
-        )
-
-        # # Write basic variables:
-        # print('Writing dataframe to file {}...'.format(str(out_dataframe_export_path_basic)))
-        # store_basic = pd.HDFStore(out_dataframe_export_path_basic)
-        # # store_basic['variableData'] = variableData
-        # # store_basic['active_labjack_variable_names'] = active_labjack_variable_names
-        # # store_basic['variables_dict_of_dataframes'] = out_dict_of_df
-        # store_basic.close()
-        # print('    done writing basic variables to HDF file.')
-
-        print("Converting variableData to Pandas Dataframe...")
-        # out_df = get_variables_as_dataframe(variableData, active_labjack_variable_names)
-        out_df = get_dict_of_dataframes_as_dataframe(out_dict_of_df)
-        out_series = pd.Series(out_dict_of_df)
-        out_record_df = LabjackEventsLoader.build_records_dataframe(labjackEventRecords)
-        # can save it out to CSV here if we want to:
-        LabjackEventsLoader.writeRecordsDataframeToCsvFile(
-            out_record_df, filePath=out_records_dataframe_CSV_export_path
-        )
-
-        # out_df.to_json(orient='split')
-        print(
-            "Writing dataframe to file {}...".format(
-                str(out_dataframe_export_path_pandas)
+        if shouldExportLoadedData:
+            # Queued rather than written here, so the load doesn't wait on the disk
+            print("Queueing the export of the loaded labjack events...")
+            LabjackFilesystemLoader.events_exporter.submit(
+                labjackFilePath,
+                active_labjack_variable_names,
+                [
+                    LabjackEventsExporter.build_variable_columns(
+                        aVariableData["timestamps"],
+                        aVariableData["values"],
+                        aVariableData["videoIndicies"],
+                    )
+                    for aVariableData in variableData
+                ],
+                LabjackEventsLoader.build_records_export_columns(labjackEventRecords),
             )
-        )
-        # out_df.to_pickle(out_dataframe_export_path)
-        store_pandas = pd.HDFStore(out_dataframe_export_path_pandas)
-        # store.get_storer('df').attrs.my_attribute = dict(A = 10)
-        store_pandas["variables_dataframe"] = out_df
-        store_pandas["variables_series_of_dataframes"] = out_series
-
-        store_pandas["records_dataframe"] = out_record_df
-        store_pandas.close()
-
-        print("    done writing pandas variables to HDF file.")
-        # for (aVariableIndex, aVariableData) in enumerate(variableData):
-        #     aVariableData['']
 
         # Build the corresponding GUI objects
         print("building container array...")
-        ## TODO: defer until needed? Some might be filtered out anyway.
+        # The views aren't built here: the data tracks paint from an EventTable and only build the views of the events the user interacts with (see EventTableViewList)
         built_model_view_container_array = []
         for (index, aRecord) in enumerate(labjackEventRecords):
-            aGuiView = aRecord.get_gui_view(aRecord, parent=None)
-            aModelViewContainer = ModelViewContainer(aRecord, aGuiView)
+            aModelViewContainer = ModelViewContainer(aRecord, None)
             built_model_view_container_array.append(aModelViewContainer)
 
         # labjackEvents = [FilesystemLabjackEvent_Record.get_gui_view(aRecord, parent=None) for aRecord in labjackEventRecords]
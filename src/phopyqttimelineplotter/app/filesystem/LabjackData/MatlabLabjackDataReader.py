@@ -0,0 +1,145 @@
+# MatlabLabjackDataReader.py
+# Reads the 'labjackDataOutput' struct of a MATLAB v7.3 .mat file (saved by the PhoLabjackCSVHelper MATLAB scripts) lazily with h5py, so that only the columns and rows that are needed are read from the file.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+import numpy as np
+
+from phopyqttimelineplotter.app.LazyModule import LazyModule
+
+# from phopyqttimelineplotter.app.filesystem.LabjackData.MatlabLabjackDataReader import MatlabLabjackDataReader
+
+h5py = LazyModule("h5py")
+
+
+class MatlabLabjackDataReader(object):
+    """MatlabLabjackDataReader: lazy access to the 'labjackDataOutput' struct of a .mat file, which contains:
+        'dateTime': numSamples x 1 double array - the MATLAB datenums at which the sensor values were sampled, in ascending order
+        'dataArray': numSamples x numColumns double array - the sensor values at each sampled timestamp
+        'ColumnNames': 1 x numColumns cell array - the names of the variables
+
+    v7.3 .mat files are HDF5 files that store MATLAB's column-major arrays transposed, so 'dataArray' is a (numColumns, numSamples) dataset and each of its columns is a contiguous row of the dataset.
+    Nothing is read until it's asked for: read_columns(...) only reads the requested columns, and read_event_samples(...) only reads the datenums between the first and last event.
+
+    Use as a context manager, or call close() when done:
+        with MatlabLabjackDataReader(filePath) as reader:
+            dataArray = reader.read_columns([4, 5])
+    """
+
+    data_variable_name = "labjackDataOutput"
+
+    # The MATLAB datenum of 1970-01-01 00:00:00 (MATLAB's day 1 is 0000-01-01, 366 days before Python's date.fromordinal(1))
+    matlab_datenum_unix_epoch = 719529
+    nanoseconds_per_day = 86400 * (10 ** 9)
+    microseconds_per_day = 86400 * (10 ** 6)
+
+    def __init__(self, filePath):
+        super(MatlabLabjackDataReader, self).__init__()
+        self.filePath = filePath
+        self.file = h5py.File(filePath, "r")
+        self.data = self.file.get(MatlabLabjackDataReader.data_variable_name)
+        if self.data is None:
+            self.file.close()
+            raise KeyError(
+                "No '{}' variable in {}".format(
+                    MatlabLabjackDataReader.data_variable_name, str(filePath)
+                )
+            )
+        self.dateTimeDataset = self.data["dateTime"]
+        self.dataArrayDataset = self.data["dataArray"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    @staticmethod
+    def matlab_datenums_to_datetime64(dateNums):
+        """Converts MATLAB datenums to (naive) datetime64[ns] values, with the same result as LabjackEventsLoader.matlab2datetime(...) but without a Python call per sample.
+        Like matlab2datetime(...) the time of day is rounded to the nearest microsecond, which is about the resolution of a double datenum anyway.
+        """
+        dateNums = np.asarray(dateNums, dtype=np.float64)
+        wholeDays = np.floor(dateNums)
+        dayMicroseconds = np.round(
+            (dateNums - wholeDays) * MatlabLabjackDataReader.microseconds_per_day
+        ).astype(np.int64)
+        nanosecondsSinceEpoch = (
+            wholeDays.astype(np.int64) - MatlabLabjackDataReader.matlab_datenum_unix_epoch
+        ) * MatlabLabjackDataReader.nanoseconds_per_day + (dayMicroseconds * 1000)
+        return nanosecondsSinceEpoch.astype("datetime64[ns]")
+
+    @staticmethod
+    def datetimes_to_matlab_datenums(dateTimes):
+        """The inverse of matlab_datenums_to_datetime64(...), for datetime objects or datetime64 values"""
+        nanosecondsSinceEpoch = (
+            np.asarray(dateTimes).astype("datetime64[ns]").astype(np.int64)
+        )
+        return MatlabLabjackDataReader.matlab_datenum_unix_epoch + (
+            nanosecondsSinceEpoch / float(MatlabLabjackDataReader.nanoseconds_per_day)
+        )
+
+    def get_num_samples(self):
+        return int(np.prod(self.dateTimeDataset.shape))
+
+    def get_num_columns(self):
+        return int(self.dataArrayDataset.shape[0])
+
+    def read_datenums(self, start_row=0, stop_row=None, row_indicies=None):
+        """Reads the datenums of the rows in [start_row, stop_row), or only those at row_indicies (relative to start_row) if provided"""
+        if stop_row is None:
+            stop_row = self.get_num_samples()
+        if self.dateTimeDataset.shape[0] == 1:
+            dateNums = self.dateTimeDataset[0, start_row:stop_row]
+        else:
+            dateNums = self.dateTimeDataset[start_row:stop_row, 0]
+        if row_indicies is not None:
+            dateNums = dateNums[row_indicies]
+        return dateNums
+
+    def read_columns(self, column_indicies=None):
+        """Reads the dataArray values of column_indicies (all columns if None) for every sample.
+        Returns a (numSamples, len(column_indicies)) array, in the same orientation as the MATLAB dataArray.
+        """
+        if column_indicies is None:
+            column_indicies = range(self.get_num_columns())
+        column_indicies = list(column_indicies)
+        outputArray = np.empty(
+            (self.get_num_samples(), len(column_indicies)),
+            dtype=self.dataArrayDataset.dtype,
+        )
+        for (output_column_index, column_index) in enumerate(column_indicies):
+            # Each column is a contiguous row of the transposed dataset
+            self.dataArrayDataset.read_direct(
+                outputArray,
+                source_sel=np.s_[column_index, :],
+                dest_sel=np.s_[:, output_column_index],
+            )
+        return outputArray
+
+    def read_event_samples(self, column_indicies=None):
+        """Reads only the samples where at least one of column_indicies is non-zero.
+        Returns (row_indicies, dateNums, dataArray), where row_indicies are the rows of the samples in the file and dataArray has a column for each of column_indicies.
+        """
+        dataArray = self.read_columns(column_indicies)
+        event_row_indicies = np.flatnonzero(np.any(dataArray != 0, axis=1))
+        if len(event_row_indicies) == 0:
+            return (
+                event_row_indicies,
+                np.zeros((0,), dtype=np.float64),
+                dataArray[event_row_indicies],
+            )
+        # Only the datenums between the first and last event are read
+        first_event_row = event_row_indicies[0]
+        last_event_row = event_row_indicies[-1]
+        dateNums = self.read_datenums(
+            first_event_row,
+            last_event_row + 1,
+            row_indicies=(event_row_indicies - event_row_indicies[0]),
+        )
+        return (event_row_indicies, dateNums, dataArray[event_row_indicies])
+
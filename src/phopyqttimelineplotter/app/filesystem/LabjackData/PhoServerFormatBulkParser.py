@@ -0,0 +1,259 @@
+# PhoServerFormatBulkParser.py
+# Parses the .txt/.csv logs output by the PhoServer C++ program in bulk, using vectorized numpy operations on the raw file bytes instead of running a regex on every line.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+import mmap
+import time
+
+import numpy as np
+
+# from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import PhoServerFormatBulkParser
+
+
+class PhoServerFormatBulkParser(object):
+    """PhoServerFormatBulkParser: vectorized equivalent of matching LabjackEventsLoader.rx_stdout_data_line/rx_csv_data_line against every line of a file.
+
+    Every data line in a PhoServer log starts with a fixed-width prefix, so each format is described by a byte template:
+        'D': a decimal digit of milliseconds_since_epoch
+        'B': a '0' or '1' DIO0-DIO7/MIO0 value
+        anything else: a literal byte that must match exactly
+
+    Lines are checked against the template a chunk at a time, so memory use is bounded by lines_per_chunk rather than by the file size.
+    """
+
+    # Increment whenever the parsed output changes (used to invalidate anything derived from the parsed results)
+    parser_version = 1
+
+    stdout_line_template = b"DDDDDDDDDDDDD: B, B, B, B, B, B, B, B, B,"
+    csv_line_template = b"DDDDDDDDDDDDD,B,B,B,B,B,B,B,B,B"
+    # The number of DIO0-DIO7/MIO0 columns in the dataArrays (the same for both formats)
+    num_variables = stdout_line_template.count(b"B")
+
+    lines_per_chunk = 65536
+
+    # The size of the blocks iter_falling_edges(...) reads the file in. Its memory use is bounded by this (plus the events found), whatever the size of the file.
+    bytes_per_block = 16 * 1024 * 1024
+
+    @staticmethod
+    def get_line_template(shouldUseStdOutFormat=True):
+        if shouldUseStdOutFormat:
+            return PhoServerFormatBulkParser.stdout_line_template
+        else:
+            return PhoServerFormatBulkParser.csv_line_template
+
+    @staticmethod
+    def build_template_columns(template):
+        """Splits a line template into (digit_columns, bit_columns, literal_columns, literal_values)"""
+        template_array = np.frombuffer(template, dtype=np.uint8)
+        is_digit_column = template_array == ord("D")
+        is_bit_column = template_array == ord("B")
+        is_literal_column = ~(is_digit_column | is_bit_column)
+        literal_columns = np.flatnonzero(is_literal_column)
+        return (
+            np.flatnonzero(is_digit_column),
+            np.flatnonzero(is_bit_column),
+            literal_columns,
+            template_array[literal_columns],
+        )
+
+    @staticmethod
+    def find_line_bounds(buffer):
+        """Returns (line_starts, line_ends) byte offsets for every line in the uint8 buffer. line_ends excludes the newline character."""
+        buffer_length = len(buffer)
+        newline_positions = np.flatnonzero(buffer == ord("\n"))
+        line_starts = np.concatenate(([0], newline_positions + 1))
+        line_ends = np.concatenate((newline_positions, [buffer_length]))
+        # A buffer ending with a newline doesn't have a final (empty) line
+        if line_starts[-1] >= buffer_length:
+            line_starts = line_starts[:-1]
+            line_ends = line_ends[:-1]
+        return (line_starts.astype(np.int64), line_ends.astype(np.int64))
+
+    @staticmethod
+    def parse_buffer(buffer, shouldUseStdOutFormat=True, buffer_offset=0):
+        """Parses every data line in the uint8 buffer.
+        Returns (millisecondsSinceEpoch, dataArray, lineOffsets):
+            millisecondsSinceEpoch: int64 array, shape (numSamples,)
+            dataArray: int8 array, shape (numSamples, 9) with the DIO0-DIO7, MIO0 values
+            lineOffsets: int64 array, shape (numSamples, 2) with the (start, end) byte offsets of each matching line (shifted by buffer_offset)
+        """
+        template = PhoServerFormatBulkParser.get_line_template(shouldUseStdOutFormat)
+        (
+            digit_columns,
+            bit_columns,
+            literal_columns,
+            literal_values,
+        ) = PhoServerFormatBulkParser.build_template_columns(template)
+        template_length = len(template)
+        digit_weights = 10 ** np.arange(len(digit_columns) - 1, -1, -1, dtype=np.int64)
+        template_offsets = np.arange(template_length, dtype=np.int64)
+
+        (line_starts, line_ends) = PhoServerFormatBulkParser.find_line_bounds(buffer)
+        # Lines shorter than the template can never match
+        is_candidate_line = (line_ends - line_starts) >= template_length
+        line_starts = line_starts[is_candidate_line]
+        line_ends = line_ends[is_candidate_line]
+
+        parsedMilliseconds = []
+        parsedDataArrays = []
+        parsedLineOffsets = []
+        for chunk_start in range(0, len(line_starts), PhoServerFormatBulkParser.lines_per_chunk):
+            chunk_slice = slice(chunk_start, chunk_start + PhoServerFormatBulkParser.lines_per_chunk)
+            chunk_line_starts = line_starts[chunk_slice]
+            # prefixes: shape (numLines, template_length)
+            prefixes = buffer[chunk_line_starts[:, np.newaxis] + template_offsets]
+            # uint8 subtraction wraps anything below '0' around to a large value, so a single comparison checks both bounds
+            digits = prefixes[:, digit_columns] - np.uint8(ord("0"))
+            bits = prefixes[:, bit_columns] - np.uint8(ord("0"))
+            is_match = (
+                np.all(digits <= 9, axis=1)
+                & np.all(bits <= 1, axis=1)
+                & np.all(prefixes[:, literal_columns] == literal_values, axis=1)
+            )
+            parsedMilliseconds.append(digits[is_match].astype(np.int64) @ digit_weights)
+            parsedDataArrays.append(bits[is_match].astype(np.int8))
+            parsedLineOffsets.append(
+                np.column_stack((chunk_line_starts[is_match], line_ends[chunk_slice][is_match]))
+            )
+
+        if len(parsedMilliseconds) == 0:
+            return (
+                np.zeros((0,), dtype=np.int64),
+                np.zeros((0, len(bit_columns)), dtype=np.int8),
+                np.zeros((0, 2), dtype=np.int64),
+            )
+
+        return (
+            np.concatenate(parsedMilliseconds),
+            np.concatenate(parsedDataArrays),
+            np.concatenate(parsedLineOffsets) + buffer_offset,
+        )
+
+    @staticmethod
+    def parse_file(filePath, shouldUseStdOutFormat=True):
+        """Memory-maps the file at filePath and parses it with parse_buffer(...). Returns (millisecondsSinceEpoch, dataArray, lineOffsets)"""
+        with open(filePath, "rb") as file_object:
+            try:
+                mapped_file = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be memory-mapped
+                return PhoServerFormatBulkParser.parse_buffer(
+                    np.zeros((0,), dtype=np.uint8), shouldUseStdOutFormat
+                )
+            with mapped_file:
+                buffer = np.frombuffer(mapped_file, dtype=np.uint8)
+                try:
+                    return PhoServerFormatBulkParser.parse_buffer(buffer, shouldUseStdOutFormat)
+                finally:
+                    # Release the view on the mapping so it can be closed
+                    del buffer
+
+    @staticmethod
+    def find_falling_edges(dataArray, previousRow=None):
+        """Returns an int8 array the shape of dataArray with a 1 wherever a variable went from 1 to 0 since the previous sample.
+        previousRow: the last row of the previous block, or None if dataArray starts the file (so its first row can't contain a falling edge)
+        """
+        if previousRow is None:
+            previousRow = dataArray[0]
+        transitions = np.diff(dataArray, axis=0, prepend=previousRow[np.newaxis, :])
+        return (transitions < 0).astype(np.int8)
+
+    @staticmethod
+    def iter_falling_edges(
+        filePath, shouldUseStdOutFormat=True, shouldReadEventLines=False, bytes_per_block=None
+    ):
+        """Streams the file in fixed-size blocks, yielding only the samples where at least one variable has a falling edge.
+        The last row of each block is carried over to the next, so the edges are the same as diffing the whole file at once, and a line split between two blocks is carried over too.
+        Yields (millisecondsSinceEpoch, fallingEdges, lineOffsets, eventLines) for each block containing events:
+            millisecondsSinceEpoch: int64 array, shape (numEvents,)
+            fallingEdges: int8 array, shape (numEvents, 9) with a 1 for each variable that fell at that sample
+            lineOffsets: int64 array, shape (numEvents, 2) with the (start, end) byte offsets of the lines in the file
+            eventLines: None, or if shouldReadEventLines an array of the events' lines (as returned by read_lines(...))
+        """
+        if bytes_per_block is None:
+            bytes_per_block = PhoServerFormatBulkParser.bytes_per_block
+        previousRow = None
+        carriedBytes = b""
+        block_file_offset = 0  # The offset in the file of the start of the current block
+        with open(filePath, "rb") as file_object:
+            while True:
+                newBytes = file_object.read(bytes_per_block)
+                is_end_of_file = len(newBytes) == 0
+                block = carriedBytes + newBytes
+                if is_end_of_file:
+                    complete_length = len(block)
+                else:
+                    complete_length = block.rfind(b"\n") + 1
+                # The unfinished line at the end of the block is parsed with the next one
+                carriedBytes = block[complete_length:]
+
+                if complete_length > 0:
+                    (
+                        millisecondsSinceEpoch,
+                        dataArray,
+                        lineOffsets,
+                    ) = PhoServerFormatBulkParser.parse_buffer(
+                        np.frombuffer(block, dtype=np.uint8, count=complete_length),
+                        shouldUseStdOutFormat,
+                    )
+                    if len(millisecondsSinceEpoch) > 0:
+                        fallingEdges = PhoServerFormatBulkParser.find_falling_edges(
+                            dataArray, previousRow
+                        )
+                        previousRow = dataArray[-1].copy()
+                        is_event = np.any(fallingEdges, axis=1)
+                        if np.any(is_event):
+                            eventLineOffsets = lineOffsets[is_event]
+                            eventLines = None
+                            if shouldReadEventLines:
+                                eventLines = np.array(
+                                    [
+                                        block[line_start:line_end].decode().rstrip("\r") + "\n"
+                                        for (line_start, line_end) in eventLineOffsets
+                                    ]
+                                )
+                            yield (
+                                millisecondsSinceEpoch[is_event],
+                                fallingEdges[is_event],
+                                eventLineOffsets + block_file_offset,
+                                eventLines,
+                            )
+
+                block_file_offset = block_file_offset + complete_length
+                if is_end_of_file:
+                    break
+
+    @staticmethod
+    def read_lines(filePath, lineOffsets):
+        """Reads just the lines at the (start, end) lineOffsets returned by parse_file(...). Each line is returned with its trailing newline, as readline() would."""
+        outLines = []
+        with open(filePath, "rb") as file_object:
+            for (line_start, line_end) in lineOffsets:
+                file_object.seek(int(line_start))
+                aLine = file_object.read(int(line_end - line_start)).decode()
+                outLines.append(aLine.rstrip("\r") + "\n")
+        return np.array(outLines)
+
+    @staticmethod
+    def milliseconds_to_local_datetime64(millisecondsSinceEpoch):
+        """Converts milliseconds since the epoch to naive local-time datetime64[ms] values, equivalent to datetime.fromtimestamp(ms / 1000.0).
+        The UTC offset is looked up once per distinct hour instead of once per sample, which correctly handles DST transitions.
+        """
+        millisecondsSinceEpoch = np.asarray(millisecondsSinceEpoch, dtype=np.int64)
+        if millisecondsSinceEpoch.size == 0:
+            return millisecondsSinceEpoch.astype("datetime64[ms]")
+        (unique_hours, hour_indicies) = np.unique(
+            millisecondsSinceEpoch // 3600000, return_inverse=True
+        )
+        hour_utc_offsets_ms = np.array(
+            [time.localtime(int(anHour) * 3600).tm_gmtoff * 1000 for anHour in unique_hours],
+            dtype=np.int64,
+        )
+        return (millisecondsSinceEpoch + hour_utc_offsets_ms[hour_indicies.ravel()]).astype(
+            "datetime64[ms]"
+        )
+
+    @staticmethod
+    def datetime64_to_datetimes(datetime64Values):
+        """Converts datetime64 values to an object array of naive datetime.datetime objects for display/legacy code."""
+        return np.asarray(datetime64Values).astype("datetime64[us]").astype(object)
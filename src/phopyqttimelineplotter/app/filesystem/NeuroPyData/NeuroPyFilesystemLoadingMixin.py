@@ -7,9 +7,8 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
-import matplotlib.colors as mcolors
 import numpy as np
-import pandas as pd
+from phopyqttimelineplotter.app.LazyModule import LazyModule
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
@@ -33,9 +32,6 @@ from phopyqttimelineplotter.app.filesystem.Workers.VideoFilesystemWorkers import
 
 from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QPainter, QPen
 
-import silx.io
-from silx.io.url import DataUrl # DataUrl
-
 from phopyqttimelineplotter.GUI.Model.ModelViewContainer import ModelViewContainer
 from phopyqttimelineplotter.GUI.UI.AbstractDatabaseAccessingWidgets import (
     AbstractDatabaseAccessingQObject,
@@ -47,6 +43,10 @@ from phopyqttimelineplotter.GUI.UI.AbstractDatabaseAccessingWidgets import (
 
 # from phopyqttimelineplotter.app.filesystem.NeuroPyData.NeuroPyFilesystemLoadingMixin import NeuroPyEventFile, NeuroPyFilesystemLoader
 
+# silx is only imported once the selected h5 data is first loaded
+silx_io = LazyModule("silx.io")
+silx_io_url = LazyModule("silx.io.url")  # DataUrl
+
 
 class NeuroPyEventFile(BaseDataEventFile):
     """NeuroPyEventFile: a single imported data file containing one or more labjack events."""
@@ -189,10 +189,10 @@ class NeuroPyFilesystemLoader(BaseDataFilesystemLoader):
             currVariableName = active_variable_names[variableIndex]
             currVariableDataUrl = h5DataSelectionDict[currVariableName]
             assert currVariableDataUrl is not None
-            assert isinstance(currVariableDataUrl, DataUrl)
+            assert isinstance(currVariableDataUrl, silx_io_url.DataUrl)
             
             ## Here we actually load the values:
-            currVariableDataValues = silx.io.get_data(currVariableDataUrl)
+            currVariableDataValues = silx_io.get_data(currVariableDataUrl)
             activeLoadedDataValuesDict[currVariableName] = currVariableDataValues
             
             # dataArrayVariableIndex = cls.variable_indicies_dict[currVariableName]
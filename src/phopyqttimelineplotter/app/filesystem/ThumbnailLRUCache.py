@@ -0,0 +1,129 @@
+# ThumbnailLRUCache.py
+# A least-recently-used cache with a byte budget, used to bound the memory held by the in-memory video thumbnail caches.
+# Deliberately has no Qt dependencies; the cached entries only need to provide get_size_bytes().
+
+import threading
+from collections import OrderedDict
+
+# from phopyqttimelineplotter.app.filesystem.ThumbnailLRUCache import ThumbnailLRUCache
+
+
+class ThumbnailLRUCache(object):
+    """ThumbnailLRUCache: maps keys (video file paths) to entries (VideoSpecificThumbnailCache objects), evicting the least recently used entries once their total size exceeds max_size_bytes.
+
+    Each entry's size is read from entry.get_size_bytes() when it's put(...) and whenever update_size(...) is called for it, so entries that grow after being added must be re-measured.
+    The most recently used entry is never evicted, even if it alone exceeds the budget, since it's the one currently being filled or displayed.
+    get(...) counts hits and misses, and on_evicted(key, entry) callbacks are called (outside the lock) for each evicted entry.
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, max_size_bytes):
+        super(ThumbnailLRUCache, self).__init__()
+        self.max_size_bytes = max_size_bytes
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()  # key: entry, ordered from least to most recently used
+        self.entry_sizes = dict()  # key: the entry's size when it was last measured
+        self.size_bytes = 0
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+        self.evicted_callbacks = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    # add_evicted_callback(callback): callback(key, entry) is called after an entry is evicted
+    def add_evicted_callback(self, callback):
+        self.evicted_callbacks.append(callback)
+
+    def get(self, key):
+        """Returns the entry for key and marks it as the most recently used, or None. Counts as a hit or a miss."""
+        with self.lock:
+            entry = self.entries.get(key, None)
+            if entry is None:
+                self.num_misses = self.num_misses + 1
+                return None
+            self.num_hits = self.num_hits + 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def peek(self, key):
+        """Returns the entry for key (or None) without affecting its recency or the hit/miss counts"""
+        with self.lock:
+            return self.entries.get(key, None)
+
+    def put(self, key, entry):
+        """Adds (or re-adds) entry as the most recently used, then evicts entries until the cache is within its budget"""
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            evicted_entries = self._update_size_locked(key)
+        self._notify_evicted(evicted_entries)
+
+    def update_size(self, key):
+        """Re-measures the entry for key after it has changed, then evicts entries until the cache is within its budget"""
+        with self.lock:
+            if key not in self.entries:
+                return
+            evicted_entries = self._update_size_locked(key)
+        self._notify_evicted(evicted_entries)
+
+    def remove(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            self.size_bytes = self.size_bytes - self.entry_sizes.pop(key, 0)
+            return entry
+
+    def set_max_size_bytes(self, max_size_bytes):
+        with self.lock:
+            self.max_size_bytes = max_size_bytes
+            evicted_entries = self._evict_locked()
+        self._notify_evicted(evicted_entries)
+
+    def keys(self):
+        with self.lock:
+            return list(self.entries.keys())
+
+    def items(self):
+        with self.lock:
+            return list(self.entries.items())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.entry_sizes.clear()
+            self.size_bytes = 0
+
+    def get_statistics(self):
+        with self.lock:
+            return {
+                "num_entries": len(self.entries),
+                "size_bytes": self.size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+                "hits": self.num_hits,
+                "misses": self.num_misses,
+                "evictions": self.num_evictions,
+            }
+
+    def _update_size_locked(self, key):
+        new_size = self.entries[key].get_size_bytes()
+        self.size_bytes = self.size_bytes - self.entry_sizes.get(key, 0) + new_size
+        self.entry_sizes[key] = new_size
+        return self._evict_locked()
+
+    def _evict_locked(self):
+        evicted_entries = []
+        while (self.size_bytes > self.max_size_bytes) and (len(self.entries) > 1):
+            (evicted_key, evicted_entry) = self.entries.popitem(last=False)
+            self.size_bytes = self.size_bytes - self.entry_sizes.pop(evicted_key, 0)
+            self.num_evictions = self.num_evictions + 1
+            evicted_entries.append((evicted_key, evicted_entry))
+        return evicted_entries
+
+    def _notify_evicted(self, evicted_entries):
+        for (evicted_key, evicted_entry) in evicted_entries:
+            for aCallback in self.evicted_callbacks:
+                aCallback(evicted_key, evicted_entry)
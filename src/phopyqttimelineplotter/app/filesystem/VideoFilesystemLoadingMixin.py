@@ -9,6 +9,7 @@ from phopyqttimelineplotter.app.database.entry_models.db_model import (
     StaticFileExtension,
     VideoFile,
 )
+from phopyqttimelineplotter.app.filesystem.DirectorySnapshot import DirectorySnapshot
 from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
@@ -17,13 +18,16 @@ from phopyqttimelineplotter.app.filesystem.VideoConversionHelpers import (
     HandbrakeConversionQueue,
     save_handbrake_conversion_queue,
 )
+from phopyqttimelineplotter.app.filesystem.VideoMetadataService import VideoMetadataService
 from phopyqttimelineplotter.app.filesystem.VideoUtils import (
     CachedFileSource,
     FoundDeeplabcutOutputFileResult,
     FoundVideoFileResult,
     VideoParsedResults,
+    deeplabcutOutputFileNamePatterns,
     findDeeplabCutProducedOutputFiles,
     findVideoFiles,
+    videoFileNamePatterns,
 )
 from phopyqttimelineplotter.app.filesystem.Workers.FileMetadataWorkers import FileMetadataWorker
 from phopyqttimelineplotter.app.filesystem.Workers.VideoFilesystemWorkers import VideoFilesystemWorker
@@ -31,12 +35,14 @@ from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtCore import (
     QDir,
     QEvent,
+    QFileSystemWatcher,
     QObject,
     QPoint,
     QRect,
     QSize,
     Qt,
     QThreadPool,
+    QTimer,
     pyqtSignal,
     pyqtSlot,
 )
@@ -108,6 +114,8 @@ class ParentDirectoryCache(QObject):
             dict()
         )  # A map from a videoFile's base name to a list of data files
 
+        self.filesystem_snapshot = None  # The DirectorySnapshot taken by the last filesystem scan, used to rescan incrementally
+
     def get_full_path(self):
         return str(self.full_path)
 
@@ -150,6 +158,52 @@ class ParentDirectoryCache(QObject):
     def get_filesystem_video_files(self):
         return self.found_filesystem_video_files
 
+    # get_filesystem_video_files_needing_metadata(): the found filesystem video files whose metadata (duration) hasn't been parsed yet, which after an incremental rescan are only the new or modified ones
+    def get_filesystem_video_files_needing_metadata(self):
+        return [
+            aFoundVideoFile
+            for aFoundVideoFile in self.found_filesystem_video_files
+            if aFoundVideoFile.video_parsed_results is None
+        ]
+
+    def get_filesystem_snapshot(self):
+        return self.filesystem_snapshot
+
+    def set_filesystem_snapshot(self, new_snapshot):
+        self.filesystem_snapshot = new_snapshot
+
+    # apply_found_filesystem_video_file_changes(...): updates the filesystem versions of the video files from an incremental rescan and intellegently rebuilds the combined video files.
+    #   updated_found_video_files: the newly parsed versions of the added or modified files. They replace any existing files with the same full name.
+    #   removed_full_names: the full names of the files that no longer exist
+    def apply_found_filesystem_video_file_changes(
+        self, updated_found_video_files, removed_full_names
+    ):
+        replaced_full_names = set(removed_full_names)
+        replaced_full_names.update(
+            aFoundVideoFile.get_full_name() for aFoundVideoFile in updated_found_video_files
+        )
+        self.found_filesystem_video_files = [
+            aFoundVideoFile
+            for aFoundVideoFile in self.found_filesystem_video_files
+            if aFoundVideoFile.get_full_name() not in replaced_full_names
+        ] + list(updated_found_video_files)
+        self.rebuild_combined_video_files()
+
+    # apply_found_filesystem_deeplabcut_data_output_file_changes(...): the data file equivalent of apply_found_filesystem_video_file_changes(...)
+    def apply_found_filesystem_deeplabcut_data_output_file_changes(
+        self, updated_found_data_output_files, removed_full_names
+    ):
+        replaced_full_names = set(removed_full_names)
+        replaced_full_names.update(
+            aDataFile.get_full_name() for aDataFile in updated_found_data_output_files
+        )
+        self.found_filesystem_data_output_files = [
+            aDataFile
+            for aDataFile in self.found_filesystem_data_output_files
+            if aDataFile.get_full_name() not in replaced_full_names
+        ] + list(updated_found_data_output_files)
+        self.rebuild_combined_data_files()
+
     def get_database_video_files(self):
         return self.database_video_files
 
@@ -242,6 +296,54 @@ class ParentDirectoryCache(QObject):
             finalOutputParsedVideoResultFilesList, key=lambda obj: obj.parsed_date
         )
 
+    # add_database_video_files(new_db_video_files): adds the newly inserted database video files that aren't in self.database_video_files yet and merges just them into the combined video files, which rebuild_combined_video_files() would otherwise redo for every file in the folder.
+    def add_database_video_files(self, new_db_video_files):
+        loaded_ids = set(aVideoFile.id for aVideoFile in self.database_video_files)
+        new_db_video_files = [
+            aVideoFile for aVideoFile in new_db_video_files if aVideoFile.id not in loaded_ids
+        ]
+        if len(new_db_video_files) == 0:
+            return
+        self.database_video_files = list(self.database_video_files) + new_db_video_files
+        finalOutputParsedVideoResultFilesDict = {
+            anOutputFile.get_full_name(): anOutputFile
+            for anOutputFile in self.finalOutputParsedVideoResultFiles
+        }
+        for aLoadedDatabaseVideoFileRecord in new_db_video_files:
+            newObj = aLoadedDatabaseVideoFileRecord.get_parsed_video_result_obj()
+            newFullName = newObj.get_full_name()
+            currSource = self.finalOutputParsedVideoResultFileSources.get(newFullName)
+            if currSource is None:
+                self.finalOutputParsedVideoResultFileSources[
+                    newFullName
+                ] = CachedFileSource.OnlyFromDatabase
+                finalOutputParsedVideoResultFilesDict[newFullName] = newObj
+            elif currSource == CachedFileSource.OnlyFromFilesystem:
+                # The same precedence as rebuild_combined_video_files(): the filesystem version is kept if its metadata was loaded
+                if (
+                    finalOutputParsedVideoResultFilesDict[newFullName].get_computed_end_date()
+                    is not None
+                ):
+                    self.finalOutputParsedVideoResultFileSources[
+                        newFullName
+                    ] = CachedFileSource.NewestFromFilesystem
+                else:
+                    self.finalOutputParsedVideoResultFileSources[
+                        newFullName
+                    ] = CachedFileSource.NewestFromDatabase
+                    finalOutputParsedVideoResultFilesDict[newFullName] = newObj
+            else:
+                # Already had a database version
+                continue
+
+            finalOutputParsedVideoResultFilesDict[newFullName].set_source(
+                self.finalOutputParsedVideoResultFileSources[newFullName]
+            )
+
+        self.finalOutputParsedVideoResultFiles = sorted(
+            finalOutputParsedVideoResultFilesDict.values(), key=lambda obj: obj.parsed_date
+        )
+
     # Simple Getter to the combined_video_files function
     def get_combined_video_files(self):
         return self.finalOutputParsedVideoResultFiles
@@ -304,6 +406,9 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
 
     findFilesInSearchDirectoryComplete = pyqtSignal(str)
 
+    # How long watch mode waits after the last change to a watched search path before rescanning it, so that a burst of changes (or a recording being created) only causes one rescan
+    watch_rescan_delay_msec = 5000
+
     def __init__(self, database_connection, videoFileSearchPaths, parent=None):
         super(VideoFilesystemLoader, self).__init__(
             database_connection, parent=parent
@@ -318,6 +423,19 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
         )
 
         self.shouldEnableFilesystemMetadataUpdate = True
+        # Caches the ffprobe metadata of the found video files between scans/launches
+        self.videoMetadataService = VideoMetadataService()
+
+        # If True, search paths that were already scanned are rescanned incrementally: only the files added, removed or modified since the last scan are re-parsed (and re-probed)
+        self.shouldUseIncrementalRescan = True
+        self.isFindingFilesystemVideos = False
+
+        # Watch mode (see set_watch_mode_enabled(...)):
+        self.filesystemWatcher = None
+        self.pendingWatchRescanSearchPaths = set()
+        self.watchRescanTimer = QTimer(self)
+        self.watchRescanTimer.setSingleShot(True)
+        self.watchRescanTimer.timeout.connect(self.on_watch_rescan_timer_timeout)
 
         self.searchPaths = videoFileSearchPaths
         self.reload_on_search_paths_changed()
@@ -451,71 +569,129 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
 
         self.foundFilesUpdated.emit()  # note that no files are updated at this point, but I think this is called to refresh the filesystem UI tree to indicate that it's try to find files in these dirs.
 
+    # saveVideoFilesToDatabase(): registers the found filesystem video files that aren't in the database yet in a single transaction (see DatabaseConnectionRef.upsert_video_files_to_database(...)), then loads just the inserted records into the cache of the folders that changed.
+    # The found files are diffed against the cached database files by (parent folder id, full name), the same key as VideoFile's unique index. Files already in the database that didn't have an end date or duration get the newly computed ones.
     def saveVideoFilesToDatabase(self):
         print("VideoFilesystemLoader.saveVideoFilesToDatabase(...)")
-        # TODO: should we reload the cache again from database? Prob not needed.
+        new_video_file_rows = []
+        updated_video_file_rows = []
+        new_file_extensions = dict()
+        new_video_file_keys = set()
+        # The cache entries of the folders with new files, by parent folder id
+        new_video_file_cache_values = dict()
+        num_unparsed_video_files = 0
         for (key_path, cache_value) in self.cache.items():
             loaded_parent_folder_obj = cache_value.get_database_parent_folder()
             curr_filesystem_search_path_video_files = (
                 cache_value.get_filesystem_video_files()
             )
-            existing_database_video_files = (
-                cache_value.get_database_video_files()
-            )  # Get cached database files
+            if (loaded_parent_folder_obj is None) or (
+                loaded_parent_folder_obj.id is None
+            ):
+                if len(curr_filesystem_search_path_video_files) > 0:
+                    print(
+                        "WARNING: search path {0} has no parent folder in the database, skipping its {1} video files.".format(
+                            key_path, len(curr_filesystem_search_path_video_files)
+                        )
+                    )
+                continue
+
+            parent_folder_id = loaded_parent_folder_obj.id
+            # Get cached database files
+            existing_database_video_files = {
+                (
+                    anExistingVideoFile.file_video_folder,
+                    anExistingVideoFile.file_fullname,
+                ): anExistingVideoFile
+                for anExistingVideoFile in cache_value.get_database_video_files()
+            }
 
-            # Loop through all found filesystem video files to see if any need new records to be created in the database
             for aFoundVideoFile in curr_filesystem_search_path_video_files:
-                # Get the appropriate file extension parent
-                currFileExtension = aFoundVideoFile.file_extension[1:].lower()
-                parent_file_extension_obj = None
-                if currFileExtension in self.fileExtensionDict.keys():
-                    parent_file_extension_obj = self.fileExtensionDict[
-                        currFileExtension
-                    ]
-                else:
-                    # Key doesn't exist!
-                    print(
-                        "Video File extension {0} doesn't exist in database! Adding it and saving.".format(
+                video_file_key = (parent_folder_id, aFoundVideoFile.full_name)
+                anExistingVideoFile = existing_database_video_files.get(video_file_key)
+                if (anExistingVideoFile is None) and (
+                    video_file_key in new_video_file_keys
+                ):
+                    # Found more than once
+                    continue
+
+                if (
+                    (anExistingVideoFile is not None)
+                    and (anExistingVideoFile.end_date is not None)
+                    and (anExistingVideoFile.duration is not None)
+                ):
+                    # Already saved with its metadata
+                    continue
+
+                if aFoundVideoFile.get_computed_end_date() is None:
+                    # Not probed yet, so it will be saved once its metadata is known
+                    num_unparsed_video_files += 1
+                    continue
+
+                video_file_row = VideoFile.get_column_values_from_parsed_video_result_obj(
+                    aFoundVideoFile, parent_folder_id, None, None, None, "auto"
+                )
+                if anExistingVideoFile is None:
+                    currFileExtension = aFoundVideoFile.file_extension[1:].lower()
+                    if not (currFileExtension in self.fileExtensionDict.keys()):
+                        new_file_extensions[currFileExtension] = StaticFileExtension(
                             currFileExtension
                         )
-                    )
-                    parent_file_extension_obj = StaticFileExtension(currFileExtension)
-                    # Add it to the database
-                    self.database_connection.save_static_file_extensions_to_database(
-                        [parent_file_extension_obj]
-                    )
+                    new_video_file_rows.append(video_file_row)
+                    new_video_file_keys.add(video_file_key)
+                    new_video_file_cache_values[parent_folder_id] = cache_value
 
-                # What is this? Also, should we only save video files with properly computed end dates? Should we update those that didn't have computed end dates, but do now?
-                potentially_computed_end_date = aFoundVideoFile.get_computed_end_date()
-                if potentially_computed_end_date:
-                    computed_end_date = str(potentially_computed_end_date)
                 else:
-                    computed_end_date = "Loading..."
-
-                # Check if the videoFile exists:
-                need_create_new_video_file = True
-                for anExistingVideoFile in existing_database_video_files:
-                    if anExistingVideoFile.file_fullname == aFoundVideoFile.full_name:
-                        # print("File already exists, skipping...")
-                        need_create_new_video_file = False
-                        break
-                    else:
-                        continue
-
-                if need_create_new_video_file:
-                    # Create the video file if needed
-
-                    aNewVideoFileRecord = VideoFile.from_parsed_video_result_obj(
-                        aFoundVideoFile, None, None, None, "auto"
+                    updated_video_file_rows.append(
+                        {
+                            "id": anExistingVideoFile.id,
+                            "end_date": video_file_row["end_date"],
+                            "duration": video_file_row["duration"],
+                        }
                     )
-                    # aNewVideoFileRecord = aFoundVideoFile.get_database_videoFile_record(None,None,None,'auto')
-                    aNewVideoFileRecord.staticFileExtension = parent_file_extension_obj
-                    aNewVideoFileRecord.fileParentFolder = loaded_parent_folder_obj
 
-                    # Add the video file record
-                    self.database_connection.save_video_file_info_to_database(
-                        [aNewVideoFileRecord]
-                    )
+        if num_unparsed_video_files > 0:
+            print(
+                "WARNING: skipping {0} video files whose metadata hasn't been loaded yet.".format(
+                    num_unparsed_video_files
+                )
+            )
+
+        if len(new_file_extensions) > 0:
+            print(
+                "Video File extensions {0} don't exist in database! Adding them and saving.".format(
+                    list(new_file_extensions.keys())
+                )
+            )
+            self.database_connection.save_static_file_extensions_to_database(
+                list(new_file_extensions.values())
+            )
+            self.fileExtensionDict.update(new_file_extensions)
+
+        if (len(new_video_file_rows) == 0) and (len(updated_video_file_rows) == 0):
+            return
+
+        upsert_result = self.database_connection.upsert_video_files_to_database(
+            new_video_file_rows, updated_video_file_rows
+        )
+        if (upsert_result is None) or (len(new_file_extensions) > 0):
+            # The rollback (or the file extensions' commit) expired every loaded record, so they're all reloaded at once rather than one at a time when next used
+            self.reloadModelFromDatabase()
+            return
+
+        # The records were inserted without going through the session, so only they are loaded into the cache of their folders. The updated records were updated in place, and their files already had the filesystem version in the combined files.
+        new_video_file_names = dict()
+        for (parent_folder_id, file_fullname) in new_video_file_keys:
+            new_video_file_names.setdefault(parent_folder_id, []).append(file_fullname)
+        for (parent_folder_id, file_fullnames) in new_video_file_names.items():
+            cache_value = new_video_file_cache_values[parent_folder_id]
+            cache_value.add_database_video_files(
+                self.database_connection.load_new_video_files_from_database(
+                    cache_value.get_database_parent_folder(), file_fullnames
+                )
+            )
+
+        self.foundFilesUpdated.emit()
 
     # rebuildDatabaseRecordParentFolders(): iterates through self.searchPaths and performs the following operations:
     # 1. Creates new ParentDirectoryCache entries in self.cache[aFinalSearchPath] if they don't already exist.
@@ -591,6 +767,81 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
 
     ## Primary Filesystem Functions
 
+    ##
+    #### FILESYSTEM: WATCH MODE FUNCTIONS:
+
+    # set_watch_mode_enabled(is_enabled): while enabled, the search paths are watched for changes (such as new recordings) while the app is open, and changed ones are rescanned incrementally
+    def set_watch_mode_enabled(self, is_enabled):
+        if is_enabled:
+            if self.filesystemWatcher is None:
+                self.filesystemWatcher = QFileSystemWatcher(self)
+                self.filesystemWatcher.directoryChanged.connect(
+                    self.on_watched_directory_changed
+                )
+            self.update_watched_search_paths()
+        else:
+            if self.filesystemWatcher is not None:
+                self.filesystemWatcher.directoryChanged.disconnect(
+                    self.on_watched_directory_changed
+                )
+                self.filesystemWatcher.deleteLater()
+                self.filesystemWatcher = None
+            self.watchRescanTimer.stop()
+            self.pendingWatchRescanSearchPaths.clear()
+
+    def is_watch_mode_enabled(self):
+        return self.filesystemWatcher is not None
+
+    # update_watched_search_paths(): makes the watcher watch exactly the current self.searchPaths
+    def update_watched_search_paths(self):
+        if self.filesystemWatcher is None:
+            return
+        watched_paths = set(self.filesystemWatcher.directories())
+        desired_paths = set(
+            aSearchPath for aSearchPath in self.searchPaths if Path(aSearchPath).is_dir()
+        )
+        removed_paths = watched_paths - desired_paths
+        added_paths = desired_paths - watched_paths
+        if len(removed_paths) > 0:
+            self.filesystemWatcher.removePaths(sorted(removed_paths))
+        if len(added_paths) > 0:
+            failed_paths = self.filesystemWatcher.addPaths(sorted(added_paths))
+            for aFailedPath in failed_paths:
+                print(
+                    "WARNING: VideoFilesystemLoader couldn't watch search path {}".format(
+                        aFailedPath
+                    )
+                )
+
+    @pyqtSlot(str)
+    def on_watched_directory_changed(self, changed_path):
+        print(
+            "VideoFilesystemLoader.on_watched_directory_changed({0})".format(
+                str(changed_path)
+            )
+        )
+        self.pendingWatchRescanSearchPaths.add(changed_path)
+        # (Re)start the delay, so the rescan happens once the directory has been quiet for a while
+        self.watchRescanTimer.start(VideoFilesystemLoader.watch_rescan_delay_msec)
+
+    @pyqtSlot()
+    def on_watch_rescan_timer_timeout(self):
+        if len(self.pendingWatchRescanSearchPaths) == 0:
+            return
+        if self.isFindingFilesystemVideos:
+            # Wait for the running scan to finish first
+            self.watchRescanTimer.start(VideoFilesystemLoader.watch_rescan_delay_msec)
+            return
+        changed_search_paths = [
+            aSearchPath
+            for aSearchPath in sorted(self.pendingWatchRescanSearchPaths)
+            if aSearchPath in self.cache.keys()
+        ]
+        self.pendingWatchRescanSearchPaths.clear()
+        if len(changed_search_paths) > 0:
+            # Only the changed search paths are rescanned (incrementally), without reloading from the database
+            self.find_filesystem_video(changed_search_paths)
+
     ##
     #### FILESYSTEM: VIDEOS METADATA THREADING FUNCTIONS:
 
@@ -623,21 +874,39 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
     def on_find_video_metadata_execute_thread(
         self, active_search_paths, progress_callback
     ):
-        currProgress = 0.0
-        parsedFiles = 0
+        foundVideoFiles = []
+        for (key_path, cache_value) in self.cache.items():
+            # Iterate through all found file-lists. Files kept from before an incremental rescan already have their metadata.
+            foundVideoFiles.extend(cache_value.get_filesystem_video_files_needing_metadata())
+
+        num_found_video_files = len(foundVideoFiles)
         self.pending_operation_status.restart(
-            OperationTypes.FilesystemMetadataLoad, self.total_found_files
+            OperationTypes.FilesystemMetadataLoad, num_found_video_files
         )
 
-        for (key_path, cache_value) in self.cache.items():
-            # Iterate through all found file-lists
-            for (sub_index, aFoundVideoFile) in enumerate(
-                cache_value.get_filesystem_video_files()
-            ):
-                # Iterate through all found video-files in a given list
-                aFoundVideoFile.parse()
-                parsedFiles = parsedFiles + 1
-                progress_callback.emit(parsedFiles * 100 / self.total_found_files)
+        def on_probe_progress(num_completed, num_total):
+            progress_callback.emit(
+                active_search_paths, int(num_completed * 100 / num_total)
+            )
+
+        # Only new or changed files are actually probed (concurrently); the rest come from the metadata cache
+        probeResults = self.videoMetadataService.probe_files(
+            [aFoundVideoFile.get_full_path() for aFoundVideoFile in foundVideoFiles],
+            progress_callback=on_probe_progress,
+        )
+        for aFoundVideoFile in foundVideoFiles:
+            currProbeResult = probeResults.get(aFoundVideoFile.get_full_path(), None)
+            if currProbeResult is None:
+                # Couldn't be probed, leave the duration unknown
+                continue
+            try:
+                aFoundVideoFile.parse(currProbeResult)
+            except Exception as e:
+                print(
+                    "WARNING: couldn't get the duration of {}: {}".format(
+                        aFoundVideoFile.get_full_path(), str(e)
+                    )
+                )
 
         return "Done."
 
@@ -666,6 +935,7 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
             )
         )
         # Pass the function to execute
+        self.isFindingFilesystemVideos = True
 
         self.videoFilesystemWorker = VideoFilesystemWorker(
             activeSearchPaths, self.on_find_filesystem_video_execute_thread
@@ -708,20 +978,78 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
 
         # Clear the top-level nodes
         for aSearchPath in active_search_paths:
+            self.total_found_files = self.total_found_files + self.scan_search_path(
+                aSearchPath
+            )
+
+            searchedSearchPaths = searchedSearchPaths + 1
+            self.findFilesInSearchDirectoryComplete.emit(aSearchPath)
+            progress_callback.emit(
+                active_search_paths,
+                int(searchedSearchPaths * 100 / self.total_search_paths),
+            )
+
+        return "Done."
+
+    # scan_search_path(aSearchPath): finds the video (and data) files in aSearchPath and updates its cache entry. Returns the number of files found.
+    #   If the search path was scanned before (and self.shouldUseIncrementalRescan), only the files added, removed or modified since then are parsed.
+    def scan_search_path(self, aSearchPath):
+        curr_search_path_cache = self.cache[aSearchPath]
+        previous_snapshot = curr_search_path_cache.get_filesystem_snapshot()
+        try:
+            # Taken before parsing, so a file modified mid-scan differs from the snapshot and is re-parsed next time
+            new_snapshot = DirectorySnapshot.capture(
+                aSearchPath, videoFileNamePatterns + deeplabcutOutputFileNamePatterns
+            )
+        except OSError as e:
+            print(
+                "WARNING: VideoFilesystemLoader couldn't list search path {}: {}".format(
+                    str(aSearchPath), str(e)
+                )
+            )
+            new_snapshot = None
+
+        is_incremental = (
+            self.shouldUseIncrementalRescan
+            and (previous_snapshot is not None)
+            and (new_snapshot is not None)
+        )
+        if is_incremental:
+            (added_names, removed_names, modified_names) = previous_snapshot.diff(
+                new_snapshot
+            )
+            print(
+                "VideoFilesystemLoader: incrementally rescanning {}: {} added, {} removed, {} modified...".format(
+                    str(aSearchPath), len(added_names), len(removed_names), len(modified_names)
+                )
+            )
+            try:
+                self.apply_search_path_changes(
+                    aSearchPath, added_names + modified_names, removed_names + modified_names
+                )
+            except OSError as e:
+                # A file changed again while being parsed. Fall back to a full scan.
+                print(
+                    "WARNING: VideoFilesystemLoader incremental rescan of {} failed ({}). Rescanning it fully...".format(
+                        str(aSearchPath), str(e)
+                    )
+                )
+                is_incremental = False
 
+        if not is_incremental:
             if (
                 VideoFilesystemLoader.VideoFileLoadingMode
                 == CachedVideoFileLoadingOptions.LoadDatabaseAndSearchVideoFileSearchPaths
             ):
+                # Unless it's disabled, the metadata (duration) is found afterwards by find_video_metadata(...), which only probes new or changed files
                 curr_search_path_video_files = findVideoFiles(
-                    aSearchPath, shouldPrint=False
+                    aSearchPath,
+                    shouldPrint=False,
+                    shouldParseMetadata=(not self.shouldEnableFilesystemMetadataUpdate),
                 )
-                self.cache[aSearchPath].set_found_filesystem_video_files(
+                curr_search_path_cache.set_found_filesystem_video_files(
                     curr_search_path_video_files
                 )  # Intellegently updates the cached/found video files
-                self.total_found_files = self.total_found_files + len(
-                    curr_search_path_video_files
-                )
 
             if (
                 VideoFilesystemLoader.DataFileLoadingMode
@@ -730,23 +1058,56 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
                 curr_search_path_deeplabcut_data_files = (
                     findDeeplabCutProducedOutputFiles(aSearchPath, shouldPrint=False)
                 )
-                self.cache[
-                    aSearchPath
-                ].set_found_filesystem_deeplabcut_data_output_files(
-                    curr_search_path_deeplabcut_data_files
-                )
-                self.total_found_files = self.total_found_files + len(
+                curr_search_path_cache.set_found_filesystem_deeplabcut_data_output_files(
                     curr_search_path_deeplabcut_data_files
                 )
 
-            searchedSearchPaths = searchedSearchPaths + 1
-            self.findFilesInSearchDirectoryComplete.emit(aSearchPath)
-            progress_callback.emit(
-                active_search_paths,
-                (searchedSearchPaths * 100 / self.total_search_paths),
+        curr_search_path_cache.set_filesystem_snapshot(new_snapshot)
+        return len(curr_search_path_cache.get_filesystem_video_files()) + len(
+            curr_search_path_cache.get_found_filesystem_data_output_files()
+        )
+
+    # apply_search_path_changes(aSearchPath, changed_names, removed_names): re-parses just the changed (added or modified) files of aSearchPath and drops the removed ones from its cache entry
+    def apply_search_path_changes(self, aSearchPath, changed_names, removed_names):
+        curr_search_path_cache = self.cache[aSearchPath]
+        if (
+            VideoFilesystemLoader.VideoFileLoadingMode
+            == CachedVideoFileLoadingOptions.LoadDatabaseAndSearchVideoFileSearchPaths
+        ):
+            changed_video_names = DirectorySnapshot.filter_names(
+                changed_names, videoFileNamePatterns
             )
+            removed_video_names = DirectorySnapshot.filter_names(
+                removed_names, videoFileNamePatterns
+            )
+            if (len(changed_video_names) > 0) or (len(removed_video_names) > 0):
+                updated_video_files = findVideoFiles(
+                    aSearchPath,
+                    shouldPrint=False,
+                    shouldParseMetadata=(not self.shouldEnableFilesystemMetadataUpdate),
+                    only_file_names=changed_video_names,
+                )
+                curr_search_path_cache.apply_found_filesystem_video_file_changes(
+                    updated_video_files, removed_video_names
+                )
 
-        return "Done."
+        if (
+            VideoFilesystemLoader.DataFileLoadingMode
+            == CachedDataFileLoadingOptions.LoadDatabaseAndSearchVideoFileSearchPaths
+        ):
+            changed_data_names = DirectorySnapshot.filter_names(
+                changed_names, deeplabcutOutputFileNamePatterns
+            )
+            removed_data_names = DirectorySnapshot.filter_names(
+                removed_names, deeplabcutOutputFileNamePatterns
+            )
+            if (len(changed_data_names) > 0) or (len(removed_data_names) > 0):
+                updated_data_files = findDeeplabCutProducedOutputFiles(
+                    aSearchPath, shouldPrint=False, only_file_names=changed_data_names
+                )
+                curr_search_path_cache.apply_found_filesystem_deeplabcut_data_output_file_changes(
+                    updated_data_files, removed_data_names
+                )
 
     @pyqtSlot(list, object)
     def on_find_filesystem_video_print_output(self, active_search_paths, s):
@@ -760,9 +1121,11 @@ class VideoFilesystemLoader(AbstractDatabaseAccessingQObject):
             )
         )
 
+        self.isFindingFilesystemVideos = False
         # Returned results in self.found_files_lists
         # self.rebuild_from_found_files()
         self.rebuildDatabaseRecordParentFolders()
+        self.update_watched_search_paths()
         self.findVideosComplete.emit()
         self.foundFilesUpdated.emit()
 
@@ -0,0 +1,155 @@
+# VideoFrameExtractor.py
+# Decodes the requested frames of a video file and resizes them to thumbnails, visiting the frames in order so that nearby frames are reached by decoding forward rather than seeking.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+from phopyqttimelineplotter.app.LazyModule import LazyModule
+from phopyqttimelineplotter.app.filesystem.VideoThumbnailStore import VideoThumbnailStore
+
+# from phopyqttimelineplotter.app.filesystem.VideoFrameExtractor import VideoFrameExtractor
+
+# Only imported once a video file is first opened
+cv2 = LazyModule("cv2")
+
+
+class VideoFrameExtractor(object):
+    """VideoFrameExtractor: static functions that extract frames and thumbnails from a video file with OpenCV.
+
+    Every seek (cap.set(cv2.CAP_PROP_POS_FRAMES, ...)) makes the decoder jump back to the preceding keyframe and decode forward from there, which is slow on long-GOP mp4s.
+    So the requested frames are visited in sorted order, and any frame no more than max_sequential_grab_gap frames past the current position is reached by grab()-ing (decoding without converting) the frames in between instead.
+    Frames are only retrieve()-d (converted to an image) when they were actually requested.
+    """
+
+    # x264's default maximum keyframe interval. A seek has to decode up to this many frames from the preceding keyframe anyway, so decoding forward across a smaller gap is never slower.
+    max_sequential_grab_gap = 250
+
+    # get_default_frame_ids(video_length): the frames used when no specific frames are requested: the first frame, or 5 frames spread across the video
+    @staticmethod
+    def get_default_frame_ids(video_length):
+        if video_length >= 4:
+            return [
+                0,
+                round(video_length * 0.25),
+                round(video_length * 0.5),
+                round(video_length * 0.75),
+                video_length - 1,
+            ]
+        return [0]
+
+    @staticmethod
+    def read_frames(video_filename, desired_frame_indexes, enable_debug_print=False):
+        """Decodes the desired_frame_indexes (None for the default frames) of the video.
+        Returns (video_info, frames):
+            video_info: a dict with the video's "video_length", "frame_width" and "default_frame_ids", or None if the video couldn't be opened
+            frames: a list of (frame_index, RGB image) tuples in increasing frame order. Out-of-range indicies are clamped and duplicates are only decoded once.
+        """
+        frames = []
+        cap = cv2.VideoCapture(str(video_filename))
+        try:
+            # The last frame index reported by CAP_PROP_FRAME_COUNT frequently can't be decoded, so it's excluded
+            video_length = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - 1
+            if (not cap.isOpened()) or (video_length <= 0):
+                return (None, frames)
+
+            video_info = {
+                "video_length": video_length,
+                "frame_width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                "default_frame_ids": VideoFrameExtractor.get_default_frame_ids(
+                    video_length
+                ),
+            }
+            if desired_frame_indexes is None:
+                frame_ids = video_info["default_frame_ids"]
+            else:
+                frame_ids = VideoThumbnailStore.clamp_frame_indicies(
+                    desired_frame_indexes, video_length
+                )
+
+            next_frame_position = 0  # The index of the frame the next grab() decodes
+            for aFrameNumber in sorted(set(frame_ids)):
+                frames_to_skip = aFrameNumber - next_frame_position
+                if 0 <= frames_to_skip <= VideoFrameExtractor.max_sequential_grab_gap:
+                    for _ in range(frames_to_skip):
+                        if not cap.grab():
+                            break
+                else:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, aFrameNumber)
+                next_frame_position = aFrameNumber + 1
+
+                success = cap.grab()
+                if success:
+                    (success, image) = cap.retrieve()
+                if success:
+                    if enable_debug_print:
+                        print("frame_number[{0}]: SUCCESS!".format(str(aFrameNumber)))
+                    frames.append((aFrameNumber, cv2.cvtColor(image, cv2.COLOR_BGR2RGB)))
+                else:
+                    if enable_debug_print:
+                        print("frame_number[{0}] failed".format(str(aFrameNumber)))
+                    # The decoder position is unknown after a failure, so seek to the next frame
+                    next_frame_position = -1
+
+            if frames:
+                video_info["frame_width"] = frames[0][1].shape[1]
+            return (video_info, frames)
+
+        finally:
+            cap.release()
+
+    # resize_to_thumbs(img, thumbnailSizes): returns a dict mapping str(size) to an RGB array resized to that width, for each of thumbnailSizes no wider than img
+    @staticmethod
+    def resize_to_thumbs(img, thumbnailSizes):
+        height, width = img.shape[0], img.shape[1]
+        thumbs = dict()
+        for size in thumbnailSizes:
+            if width >= size:
+                r = (size + 0.0) / width
+                max_size = (size, int(height * r))
+                thumbs[str(size)] = cv2.resize(img, max_size, interpolation=cv2.INTER_AREA)
+        return thumbs
+
+    @staticmethod
+    def extract_thumbnails(
+        video_filename,
+        desired_frame_indexes,
+        thumbnailSizes,
+        store_directory=None,
+        include_originals=False,
+        enable_debug_print=False,
+    ):
+        """Decodes and resizes the desired frames of one video file, writing the thumbnails to the VideoThumbnailStore at store_directory (if not None).
+        This is the function run in the worker processes, so its arguments and results are all picklable.
+        Returns a dict with:
+            "source_stats": the (size, mtime_ns) of the video file before it was decoded
+            "video_info": as returned by read_frames(...), or None if the video couldn't be opened
+            "frames": a list of (frame_index, thumbs) tuples, where thumbs maps size keys (and "original" if include_originals) to RGB arrays
+            "frame_size_keys": a dict mapping each frame index to the size keys written to the store
+        """
+        source_stats = VideoThumbnailStore.get_source_file_stats(video_filename)
+        (video_info, frames) = VideoFrameExtractor.read_frames(
+            video_filename, desired_frame_indexes, enable_debug_print
+        )
+        output_frames = []
+        frame_size_keys = dict()
+        for (aFrameNumber, anImage) in frames:
+            thumbs = VideoFrameExtractor.resize_to_thumbs(anImage, thumbnailSizes)
+            if store_directory is not None:
+                try:
+                    frame_size_keys[aFrameNumber] = VideoThumbnailStore.write_thumbnail_images(
+                        store_directory, video_filename, aFrameNumber, thumbs
+                    )
+                except OSError as e:
+                    print(
+                        "WARNING: failed to store the thumbnails of frame {} for {}: {}".format(
+                            aFrameNumber, str(video_filename), str(e)
+                        )
+                    )
+            if include_originals:
+                thumbs["original"] = anImage
+            output_frames.append((aFrameNumber, thumbs))
+
+        return {
+            "source_stats": source_stats,
+            "video_info": video_info,
+            "frames": output_frames,
+            "frame_size_keys": frame_size_keys,
+        }
@@ -0,0 +1,137 @@
+# VideoIntervalIndex.py
+# Contains VideoIntervalIndex, which finds the video (if any) that each of an array of event timestamps occurred within, used by the data file loaders to fill in each event's "videoIndex" and "video_relative_offset".
+# Deliberately has no Qt dependencies so that it can be used from worker processes/threads.
+
+from datetime import timedelta
+
+import numpy as np
+
+# from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
+
+
+class VideoIntervalIndex(object):
+    """VideoIntervalIndex: a start-sorted index over the [start, end] intervals of a list of videos, built once from the videoDates/videoEndDates arrays.
+
+    assign_videos(...) looks up every timestamp at once by binary search instead of looping over the videos for each timestamp, so it's O((events + videos) * log(videos)) rather than O(events * videos).
+    Times are compared as integer microseconds relative to the earliest video start, so the results exactly match comparing the datetimes themselves.
+
+    Overlapping videos: a timestamp within several videos is assigned the one that comes first in the original videoDates order, as the loaders' previous per-video loop did.
+    Only the videos whose start <= timestamp and that aren't excluded by a running maximum of the end times are checked, which for non-overlapping videos is at most one (or two when one ends exactly where the next starts).
+    """
+
+    one_microsecond = timedelta(microseconds=1)
+
+    def __init__(self, videoDates, videoEndDates):
+        super(VideoIntervalIndex, self).__init__()
+        if videoDates is None:
+            videoDates = []
+        if videoEndDates is None:
+            videoEndDates = []
+        self.num_videos = min(len(videoDates), len(videoEndDates))
+        if self.num_videos > 0:
+            self.reference_datetime = min(videoDates[0 : self.num_videos])
+        else:
+            self.reference_datetime = None
+
+        start_us = self.datetimes_to_microseconds(videoDates[0 : self.num_videos])
+        end_us = self.datetimes_to_microseconds(videoEndDates[0 : self.num_videos])
+        self.start_us = start_us
+        # The stable sort keeps videos with equal start times in their original order
+        self.sort_order = np.argsort(start_us, kind="stable")
+        self.sorted_start_us = start_us[self.sort_order]
+        self.sorted_end_us = end_us[self.sort_order]
+        # running_max_end_us[i]: the latest end of any of the first i + 1 videos (in start order). Non-decreasing, so it can be binary-searched.
+        self.running_max_end_us = np.maximum.accumulate(self.sorted_end_us)
+        if self.num_videos > 0:
+            self.earliest_start_us = self.sorted_start_us[0]
+            self.latest_end_us = self.running_max_end_us[-1]
+
+    def __len__(self):
+        return self.num_videos
+
+    # datetimes_to_microseconds(datetimes): converts an array of datetimes (objects or numpy datetime64) to int64 microseconds relative to the reference_datetime
+    def datetimes_to_microseconds(self, datetimes):
+        num_datetimes = len(datetimes)
+        if num_datetimes == 0:
+            return np.zeros((0,), dtype=np.int64)
+        if isinstance(datetimes, np.ndarray) and np.issubdtype(
+            datetimes.dtype, np.datetime64
+        ):
+            reference = np.datetime64(self.reference_datetime.replace(tzinfo=None), "us")
+            return (datetimes.astype("datetime64[us]") - reference).astype(np.int64)
+        return np.fromiter(
+            (
+                (aDatetime - self.reference_datetime) // VideoIntervalIndex.one_microsecond
+                for aDatetime in datetimes
+            ),
+            dtype=np.int64,
+            count=num_datetimes,
+        )
+
+    # find_video_indicies(timestamps_us): returns the index (into the original videoDates) of the video each timestamp (in relative microseconds) occurred within, or -1 if none
+    def find_video_indicies(self, timestamps_us):
+        num_timestamps = len(timestamps_us)
+        video_indicies = np.full((num_timestamps,), -1, dtype=np.int64)
+        if (self.num_videos == 0) or (num_timestamps == 0):
+            return video_indicies
+
+        # Candidates are the videos (in start order) from the first that hasn't ended by the timestamp to the last that has started
+        last_candidates = (
+            np.searchsorted(self.sorted_start_us, timestamps_us, side="right") - 1
+        )
+        first_candidates = np.searchsorted(
+            self.running_max_end_us, timestamps_us, side="left"
+        )
+        num_candidates = np.maximum(last_candidates - first_candidates + 1, 0)
+
+        best_video_indicies = np.full((num_timestamps,), self.num_videos, dtype=np.int64)
+        for candidate_offset in range(int(num_candidates.max())):
+            has_candidate = num_candidates > candidate_offset
+            candidate_positions = np.where(
+                has_candidate, first_candidates + candidate_offset, 0
+            )
+            # Every candidate has started by the timestamp, so only its end needs checking
+            is_containing = has_candidate & (
+                self.sorted_end_us[candidate_positions] >= timestamps_us
+            )
+            best_video_indicies = np.where(
+                is_containing,
+                np.minimum(best_video_indicies, self.sort_order[candidate_positions]),
+                best_video_indicies,
+            )
+
+        has_video = best_video_indicies < self.num_videos
+        video_indicies[has_video] = best_video_indicies[has_video]
+        return video_indicies
+
+    def assign_videos(self, timestamps):
+        """Finds the video each of the timestamps occurred within.
+        Returns (activeVideoIndicies, videoRelativeOffsets, isWithinVideoSpan):
+            activeVideoIndicies: an object array containing the int index of the video (into the original videoDates) or None for each timestamp
+            videoRelativeOffsets: an object array containing the timedelta from the start of that video, or None
+            isWithinVideoSpan: a bool array that's True for the timestamps between the earliest video start and the latest video end (all True if there are no videos)
+        """
+        num_timestamps = len(timestamps)
+        activeVideoIndicies = np.empty((num_timestamps,), dtype=object)
+        videoRelativeOffsets = np.empty((num_timestamps,), dtype=object)
+        if self.num_videos == 0:
+            return (
+                activeVideoIndicies,
+                videoRelativeOffsets,
+                np.ones((num_timestamps,), dtype=bool),
+            )
+
+        timestamps_us = self.datetimes_to_microseconds(timestamps)
+        isWithinVideoSpan = (timestamps_us >= self.earliest_start_us) & (
+            timestamps_us <= self.latest_end_us
+        )
+        video_indicies = self.find_video_indicies(timestamps_us)
+        has_video = video_indicies >= 0
+        found_video_indicies = video_indicies[has_video]
+        activeVideoIndicies[has_video] = found_video_indicies.tolist()
+        videoRelativeOffsets[has_video] = (
+            (timestamps_us[has_video] - self.start_us[found_video_indicies])
+            .astype("timedelta64[us]")
+            .tolist()
+        )
+        return (activeVideoIndicies, videoRelativeOffsets, isWithinVideoSpan)
@@ -0,0 +1,206 @@
+# VideoMetadataService.py
+# Caches the ffprobe metadata of video files in a sidecar store so that only new or changed files have to be probed, and probes those concurrently.
+# Deliberately has no Qt dependencies so that it can be used from worker threads.
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from phopyqttimelineplotter.app.filesystem.VideoUtils import video_probe
+
+# from phopyqttimelineplotter.app.filesystem.VideoMetadataService import VideoMetadataService
+
+
+class VideoMetadataService(object):
+    """VideoMetadataService: returns the ffprobe output (the parsed JSON dict) for video files, caching it in a single JSON sidecar store.
+
+    Entries are keyed by the file's resolved path and are only used if the file's size and mtime still match, so renamed, replaced or re-encoded files are probed again.
+    Files that need probing are probed concurrently, with at most max_concurrent_probes ffprobe processes running at once.
+    """
+
+    # Increment whenever the layout of the store changes
+    store_format_version = 1
+
+    store_file_name = "ffprobe_metadata.json"
+
+    default_max_concurrent_probes = min(8, os.cpu_count() or 1)
+
+    def __init__(self, cache_directory="data/cache/VideoMetadata", max_concurrent_probes=None):
+        super(VideoMetadataService, self).__init__()
+        self.cache_directory = Path(cache_directory)
+        if max_concurrent_probes is None:
+            max_concurrent_probes = VideoMetadataService.default_max_concurrent_probes
+        self.max_concurrent_probes = max_concurrent_probes
+        self.lock = threading.Lock()
+        self.entries = None  # Loaded lazily from the store
+        self.is_dirty = False
+
+    def get_store_path(self):
+        return self.cache_directory.joinpath(VideoMetadataService.store_file_name)
+
+    @staticmethod
+    def get_source_file_stats(filePath):
+        """Returns the (size, mtime_ns) of the video file used to validate its entry"""
+        file_stat = os.stat(filePath)
+        return (file_stat.st_size, file_stat.st_mtime_ns)
+
+    @staticmethod
+    def get_entry_key(filePath):
+        return str(Path(filePath).resolve())
+
+    def load_store(self):
+        with self.lock:
+            if self.entries is not None:
+                return
+            self.entries = dict()
+            store_path = self.get_store_path()
+            if not store_path.exists():
+                return
+            try:
+                with open(store_path, "r") as store_file:
+                    store = json.load(store_file)
+                if store.get("format_version", None) == VideoMetadataService.store_format_version:
+                    self.entries = store["entries"]
+                else:
+                    print(
+                        "VideoMetadataService: {} has an old format. Ignoring it...".format(
+                            str(store_path)
+                        )
+                    )
+            except (OSError, ValueError, KeyError) as e:
+                print(
+                    "WARNING: VideoMetadataService failed to load {}: {}".format(
+                        str(store_path), str(e)
+                    )
+                )
+
+    def save_store(self):
+        """Writes the store to disk if any entries have changed since it was loaded. Returns True on success."""
+        with self.lock:
+            if (self.entries is None) or (not self.is_dirty):
+                return True
+            store = {
+                "format_version": VideoMetadataService.store_format_version,
+                "entries": self.entries,
+            }
+            store_path = self.get_store_path()
+            # Write to a temporary file first so that a partially written store is never loaded
+            temp_store_path = store_path.with_name(
+                "{}.tmp{}".format(store_path.name, os.getpid())
+            )
+            try:
+                self.cache_directory.mkdir(parents=True, exist_ok=True)
+                with open(temp_store_path, "w") as store_file:
+                    json.dump(store, store_file)
+                os.replace(temp_store_path, store_path)
+                self.is_dirty = False
+                return True
+            except (OSError, ValueError) as e:
+                print(
+                    "WARNING: VideoMetadataService failed to save {}: {}".format(
+                        str(store_path), str(e)
+                    )
+                )
+                return False
+
+    def get_cached_probe(self, filePath):
+        """Returns the cached ffprobe output for filePath, or None if it isn't cached or the file has changed since it was probed."""
+        self.load_store()
+        key = VideoMetadataService.get_entry_key(filePath)
+        try:
+            (source_size, source_mtime_ns) = VideoMetadataService.get_source_file_stats(
+                filePath
+            )
+        except OSError:
+            return None
+        with self.lock:
+            entry = self.entries.get(key, None)
+            if entry is None:
+                return None
+            if (entry["source_size"] != source_size) or (
+                entry["source_mtime_ns"] != source_mtime_ns
+            ):
+                # Stale: the file has changed
+                del self.entries[key]
+                self.is_dirty = True
+                return None
+            return entry["probe"]
+
+    def set_cached_probe(self, filePath, probe, source_stats):
+        self.load_store()
+        (source_size, source_mtime_ns) = source_stats
+        with self.lock:
+            self.entries[VideoMetadataService.get_entry_key(filePath)] = {
+                "source_size": source_size,
+                "source_mtime_ns": source_mtime_ns,
+                "probe": probe,
+            }
+            self.is_dirty = True
+
+    @staticmethod
+    def probe_file(filePath):
+        """Runs ffprobe on filePath. Returns (probe, source_stats), where the stats are taken before probing so a file modified mid-probe is re-probed next time."""
+        source_stats = VideoMetadataService.get_source_file_stats(filePath)
+        return (video_probe(str(filePath)), source_stats)
+
+    def probe_files(self, filePaths, progress_callback=None):
+        """Returns a dict mapping each of filePaths to its ffprobe output (or None if it couldn't be probed).
+        Cached entries are returned without probing; the rest are probed concurrently and then saved to the store.
+        progress_callback(num_completed, num_total) is called after each file is resolved.
+        """
+        results = dict()
+        pending_file_paths = []
+        for aFilePath in filePaths:
+            cached_probe = self.get_cached_probe(aFilePath)
+            if cached_probe is None:
+                pending_file_paths.append(aFilePath)
+            else:
+                results[aFilePath] = cached_probe
+
+        num_total = len(filePaths)
+        num_completed = len(results)
+        print(
+            "VideoMetadataService: {} of {} video files cached. Probing {}...".format(
+                num_completed, num_total, len(pending_file_paths)
+            )
+        )
+        if progress_callback is not None and num_completed > 0:
+            progress_callback(num_completed, num_total)
+
+        if len(pending_file_paths) > 0:
+            # Each probe spends its time waiting on an ffprobe subprocess, so threads are enough to run several at once
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_probes) as executor:
+                future_file_paths = {
+                    executor.submit(VideoMetadataService.probe_file, aFilePath): aFilePath
+                    for aFilePath in pending_file_paths
+                }
+                for aFuture in as_completed(future_file_paths):
+                    aFilePath = future_file_paths[aFuture]
+                    try:
+                        (probe, source_stats) = aFuture.result()
+                        self.set_cached_probe(aFilePath, probe, source_stats)
+                        results[aFilePath] = probe
+                    except Exception as e:
+                        print(
+                            "WARNING: VideoMetadataService failed to probe {}: {}".format(
+                                str(aFilePath), str(e)
+                            )
+                        )
+                        results[aFilePath] = None
+                    num_completed = num_completed + 1
+                    if progress_callback is not None:
+                        progress_callback(num_completed, num_total)
+
+        self.save_store()
+        return results
+
+    def clear(self):
+        with self.lock:
+            self.entries = dict()
+            self.is_dirty = False
+        try:
+            os.remove(self.get_store_path())
+        except OSError:
+            pass
@@ -1,11 +1,13 @@
 # VideoFilesystemLoadingMixin.py
+import multiprocessing
+import os
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
-import cv2
 from phopyqttimelineplotter.app.database.entry_models.db_model import (
     FileParentFolder,
     StaticFileExtension,
@@ -15,10 +17,13 @@ from phopyqttimelineplotter.app.filesystem.FilesystemOperations import (
     OperationTypes,
     PendingFilesystemOperation,
 )
+from phopyqttimelineplotter.app.filesystem.ThumbnailLRUCache import ThumbnailLRUCache
 from phopyqttimelineplotter.app.filesystem.VideoConversionHelpers import (
     HandbrakeConversionQueue,
     save_handbrake_conversion_queue,
 )
+from phopyqttimelineplotter.app.filesystem.VideoFrameExtractor import VideoFrameExtractor
+from phopyqttimelineplotter.app.filesystem.VideoThumbnailStore import VideoThumbnailStore
 from phopyqttimelineplotter.app.filesystem.VideoUtils import (
     CachedFileSource,
     FoundVideoFileResult,
@@ -79,6 +84,10 @@ class VideoThumbnail(QObject):
         super().__init__(parent=parent)
         self.frameIndex = frameIndex
         self.thumbsDict = thumbsDict
+        # The thumbsDict isn't modified after construction, so its size only needs computing once
+        self.sizeBytes = sum(
+            aQImage.sizeInBytes() for aQImage in thumbsDict.values()
+        )
 
     def get_frame_index(self):
         return self.frameIndex
@@ -86,6 +95,10 @@ class VideoThumbnail(QObject):
     def get_thumbs_dict(self):
         return self.thumbsDict
 
+    # get_size_bytes(): the total number of bytes of image data held by all the thumbnail sizes
+    def get_size_bytes(self):
+        return self.sizeBytes
+
 
 class VideoSpecificThumbnailCache(QObject):
     """VideoSpecificThumbnailCache: A cache of all the resultant thumbnails for each frame for a given video file"""
@@ -100,10 +113,23 @@ class VideoSpecificThumbnailCache(QObject):
         self._frameResultsDict = (
             dict()
         )  # a dict(int:VideoThumbnail) for a given video file.
+        self._sizeBytes = 0
 
     def get_video_file_name(self):
         return self._videoFile
 
+    # get_size_bytes(): the total number of bytes of image data held by all of the loaded frames' thumbnails
+    def get_size_bytes(self):
+        return self._sizeBytes
+
+    # get_loaded_thumbnails(): returns the loaded VideoThumbnail objects (skipping reserved frames that are still loading), in increasing frame order
+    def get_loaded_thumbnails(self):
+        return [
+            self.get_frames_results_dict()[aFrame]
+            for aFrame in sorted(self.get_generated_frame_indicies())
+            if self.get_frames_results_dict()[aFrame] is not None
+        ]
+
     def get_generated_frame_indicies(self):
         return self.get_frames_results_dict().keys()
 
@@ -135,6 +161,14 @@ class VideoSpecificThumbnailCache(QObject):
         for aThumbnailResult in updatedThumbnailResultsList:
             curr_frame_index = aThumbnailResult.get_frame_index()
             # curr_frame_index_key = curr_frame_index
+            replacedThumbnailResult = self.get_frames_results_dict().get(
+                curr_frame_index, None
+            )
+            if replacedThumbnailResult is not None:
+                self._sizeBytes = (
+                    self._sizeBytes - replacedThumbnailResult.get_size_bytes()
+                )
+            self._sizeBytes = self._sizeBytes + aThumbnailResult.get_size_bytes()
             self.get_frames_results_dict()[curr_frame_index] = aThumbnailResult
             # Emit the signal
             self.frame_thumbnails_updated.emit(
@@ -160,13 +194,36 @@ class VideoPreviewThumbnailGenerator(QObject):
     # Singal Video, Signal Frame, Item:
     videoFrameThumbnailsUpdated = pyqtSignal(str, VideoThumbnail)
 
-    def __init__(self, videoFilePaths, thumbnailSizes=[160, 80, 40], parent=None):
+    # Single Video: emitted when a video's thumbnails are evicted from the cache. Anything displaying them should drop them and call request_video_thumbnails(...) when they're next needed.
+    videoThumbnailsEvicted = pyqtSignal(str)  # filename
+
+    # Videos are decoded in separate processes (one video per process), since OpenCV decoding and resizing are CPU bound
+    default_max_extraction_processes = min(4, os.cpu_count() or 1)
+
+    # If True, the full-resolution frame is kept under the "original" key of each newly generated VideoThumbnail (it's never persisted to the thumbnailStore)
+    default_shouldRetainOriginalFrames = True
+
+    # The byte budget of the in-memory cache. Least recently used videos' thumbnails are evicted beyond it (and reloaded from the thumbnailStore when next requested).
+    default_cache_max_size_bytes = 256 * 1024 * 1024
+
+    def __init__(
+        self,
+        videoFilePaths,
+        thumbnailSizes=[160, 80, 40],
+        cacheMaxSizeBytes=None,
+        shouldRetainOriginalFrames=None,
+        parent=None,
+    ):
         super(VideoPreviewThumbnailGenerator, self).__init__(
             parent=parent
         )  # Call the inherited classes __init__ method
-        self.cache = (
-            dict()
-        )  # a [str:VideoSpecificThumbnailCache] dict that holds the VideoSpecificThumbnailCache object for each video file
+        if cacheMaxSizeBytes is None:
+            cacheMaxSizeBytes = VideoPreviewThumbnailGenerator.default_cache_max_size_bytes
+        self.cache = ThumbnailLRUCache(
+            cacheMaxSizeBytes
+        )  # a [str:VideoSpecificThumbnailCache] LRU cache that holds the VideoSpecificThumbnailCache object for each recently used video file
+        self.cache.add_evicted_callback(self.on_cache_entry_evicted)
+        self.pendingThumbnailRequestPaths = set()  # The video files with a request_video_thumbnails(...) currently in progress
         self.pendingVideoFilePaths = videoFilePaths
         self.loadedVideoFiles = []
 
@@ -178,6 +235,16 @@ class VideoPreviewThumbnailGenerator(QObject):
 
         # self.reload_on_video_paths_changed()
 
+        self.thumbnailStore = VideoThumbnailStore()
+        self.max_extraction_processes = (
+            VideoPreviewThumbnailGenerator.default_max_extraction_processes
+        )
+        if shouldRetainOriginalFrames is None:
+            shouldRetainOriginalFrames = (
+                VideoPreviewThumbnailGenerator.default_shouldRetainOriginalFrames
+            )
+        self.shouldRetainOriginalFrames = shouldRetainOriginalFrames
+
         self.videoThumbnailGeneratorWorker = None
         self.threadpool = QThreadPool()
         print(
@@ -193,9 +260,73 @@ class VideoPreviewThumbnailGenerator(QObject):
         # Just re-emit the signal
         self.videoFrameThumbnailsUpdated.emit(videoFileName, videoThumbnailResultObj)
 
+    # Called by the cache (on whichever thread added to it) when a video's VideoSpecificThumbnailCache is evicted
+    def on_cache_entry_evicted(self, videoFileName, evictedVideoCache):
+        print(
+            "VideoPreviewThumbnailGenerator: evicted the thumbnails of {0} from the cache.".format(
+                str(videoFileName)
+            )
+        )
+        self.videoThumbnailsEvicted.emit(videoFileName)
+
     def get_cache(self):
         return self.cache
 
+    # get_cache_statistics(): returns a dict with the cache's "num_entries", "size_bytes", "max_size_bytes", "hits", "misses" and "evictions"
+    def get_cache_statistics(self):
+        return self.cache.get_statistics()
+
+    def set_cache_max_size_bytes(self, cacheMaxSizeBytes):
+        self.cache.set_max_size_bytes(cacheMaxSizeBytes)
+
+    # request_video_thumbnails(videoFilePath, desired_frame_indicies): lazily (re)loads the thumbnails of a video, e.g. when a video track repaints one that was evicted.
+    #   If they're all in the cache, videoThumbnailGenerationComplete is emitted right away and True is returned.
+    #   Otherwise they're loaded in the background (from the thumbnailStore if possible) and False is returned. Repeated requests while one is in progress are ignored.
+    def request_video_thumbnails(self, videoFilePath, desired_frame_indicies=None):
+        videoFilePath = str(videoFilePath)
+        videoCache = self.cache.get(videoFilePath)
+        if videoCache is not None:
+            loadedThumbnailObjsList = videoCache.get_loaded_thumbnails()
+            if desired_frame_indicies is None:
+                is_complete = len(loadedThumbnailObjsList) > 0
+            else:
+                loaded_frame_indicies = set(
+                    aThumbnailObj.get_frame_index()
+                    for aThumbnailObj in loadedThumbnailObjsList
+                )
+                is_complete = all(
+                    (aFrame in loaded_frame_indicies) for aFrame in desired_frame_indicies
+                )
+            if is_complete:
+                self.videoThumbnailGenerationComplete.emit(
+                    videoFilePath, loadedThumbnailObjsList
+                )
+                return True
+
+        if videoFilePath in self.pendingThumbnailRequestPaths:
+            return False
+        self.pendingThumbnailRequestPaths.add(videoFilePath)
+        if (videoFilePath not in self.loadedVideoFiles) and (
+            videoFilePath not in self.pendingVideoFilePaths
+        ):
+            self.pendingVideoFilePaths.append(videoFilePath)
+        self.generate_video_thumbnails(
+            [videoFilePath], desired_frame_indicies, self.desiredThumbnailSizes
+        )
+        return False
+
+    # get_video_cache(videoFilePath): returns the VideoSpecificThumbnailCache for the video (marking it as the most recently used), creating it if needed.
+    #   Doesn't count towards the cache's hits and misses, which only count requests for thumbnails.
+    def get_video_cache(self, videoFilePath):
+        videoCache = self.cache.peek(videoFilePath)
+        if videoCache is None:
+            videoCache = VideoSpecificThumbnailCache(videoFilePath, parent=self)
+            videoCache.frame_thumbnails_updated.connect(
+                self.on_cache_frame_thumbnails_updated
+            )
+        self.cache.put(videoFilePath, videoCache)
+        return videoCache
+
     ## DATABASE Functions:
     def reload_data(self, restricted_video_file_paths, desired_frame_indicies):
         print("VideoPreviewThumbnailGenerator.reload_data(...)")
@@ -312,31 +443,30 @@ class VideoPreviewThumbnailGenerator(QObject):
             numFilesToGenerateThumbnailsFor,
         )
 
+        # The frame indicies each video file still needs decoded, and the VideoThumbnail objects loaded from the thumbnailStore for each video file
+        pending_extraction_jobs = dict()
+        storedThumbnailObjs = dict()
+        # Held for the whole run, since other videos being added may evict them from self.cache in the meantime
+        videoCaches = dict()
+
         for (sub_index, aFoundVideoFile) in enumerate(active_video_paths):
 
             ## TODO: should the cache initialization be outside the execute thread function? like in self.generate_video_thumbnails(...)??
 
-            # Check to see if a given file already has a cache in the cache
-            if aFoundVideoFile not in self.cache.keys():
-                # Create the cache.
-                self.cache[aFoundVideoFile] = VideoSpecificThumbnailCache(
-                    aFoundVideoFile, parent=self
-                )
-                self.cache[aFoundVideoFile].frame_thumbnails_updated.connect(
-                    self.on_cache_frame_thumbnails_updated
-                )
+            # Get the video's cache in the cache (creating it if it was never loaded or has been evicted)
+            videoCaches[aFoundVideoFile] = self.get_video_cache(aFoundVideoFile)
 
             new_desired_frame_indicies = None
             if desired_frame_indicies is not None:
                 # Add the remaining desired_frame_indicies to the cache with None values to indicate that they are pending
                 # the function returns the actually unique indicies to load
-                result_tuple = self.cache[aFoundVideoFile].reserve_frame_results(
+                result_tuple = videoCaches[aFoundVideoFile].reserve_frame_results(
                     desired_frame_indicies
                 )
                 already_loaded_frames = result_tuple[0]
                 new_desired_frame_indicies = result_tuple[1]
 
-                curr_frames_result_dict = self.cache[
+                curr_frames_result_dict = videoCaches[
                     aFoundVideoFile
                 ].get_frames_results_dict()
                 # Emit the thumbnails updated signal for the data for the already loaded frames
@@ -349,33 +479,118 @@ class VideoPreviewThumbnailGenerator(QObject):
                             aFoundVideoFile, videoThumbnailResultObj
                         )
 
-            # Iterate through all found video-files in a given list (a list of VideoThumbnail objects: [VideoThumbnail])
-            generatedThumbnailObjsList = self.generate_thumbnails_for_video_file(
-                aFoundVideoFile,
-                new_desired_frame_indicies,
-                desired_thumbnail_sizes,
-                enable_debug_print=False,
+            if (new_desired_frame_indicies is not None) and (
+                len(new_desired_frame_indicies) == 0
+            ):
+                # Every desired frame is already loaded or being loaded
+                storedThumbnailObjs[aFoundVideoFile] = []
+                continue
+
+            # Load whatever thumbnails were persisted by a previous session, without opening the video file
+            (
+                stored_frames,
+                pending_frame_indicies,
+            ) = self.thumbnailStore.load_thumbnails(
+                aFoundVideoFile, new_desired_frame_indicies, desired_thumbnail_sizes
             )
-            self.cache[aFoundVideoFile].update_frame_thumbnail_results(
-                generatedThumbnailObjsList
+            storedThumbnailObjsList = [
+                self.build_video_thumbnail(aFrameIndex, thumbs)
+                for (aFrameIndex, thumbs) in stored_frames
+            ]
+            self.add_to_video_cache(
+                aFoundVideoFile, videoCaches[aFoundVideoFile], storedThumbnailObjsList
             )
-
+            storedThumbnailObjs[aFoundVideoFile] = storedThumbnailObjsList
+            if (pending_frame_indicies is None) or (len(pending_frame_indicies) > 0):
+                # pending_frame_indicies is None when the default frames are wanted and none are stored yet
+                pending_extraction_jobs[aFoundVideoFile] = pending_frame_indicies
+
+        def on_video_file_complete(aFoundVideoFile, generatedThumbnailObjsList):
+            self.add_to_video_cache(
+                aFoundVideoFile, videoCaches[aFoundVideoFile], generatedThumbnailObjsList
+            )
+            self.pendingThumbnailRequestPaths.discard(aFoundVideoFile)
             # Add the current video file path to the loaded files
             if aFoundVideoFile not in self.loadedVideoFiles:
                 self.loadedVideoFiles.append(aFoundVideoFile)
 
+            allThumbnailObjsList = sorted(
+                storedThumbnailObjs.get(aFoundVideoFile, []) + generatedThumbnailObjsList,
+                key=lambda aThumbnailObj: aThumbnailObj.get_frame_index(),
+            )
             self.videoThumbnailGenerationComplete.emit(
-                aFoundVideoFile, generatedThumbnailObjsList
+                aFoundVideoFile, allThumbnailObjsList
             )
 
+            nonlocal parsedFiles
             parsedFiles = parsedFiles + 1
             progress_callback.emit(
                 active_video_paths,
-                (parsedFiles * 100 / numFilesToGenerateThumbnailsFor),
+                int(parsedFiles * 100 / numFilesToGenerateThumbnailsFor),
             )
 
+        # Videos that needed no decoding are complete already
+        for aFoundVideoFile in storedThumbnailObjs.keys():
+            if aFoundVideoFile not in pending_extraction_jobs:
+                on_video_file_complete(aFoundVideoFile, [])
+
+        if len(pending_extraction_jobs) == 1:
+            # Not worth starting a worker process for
+            for (aFoundVideoFile, pending_frame_indicies) in pending_extraction_jobs.items():
+                on_video_file_complete(
+                    aFoundVideoFile,
+                    self.generate_thumbnails_for_video_file(
+                        aFoundVideoFile,
+                        pending_frame_indicies,
+                        desired_thumbnail_sizes,
+                        enable_debug_print=False,
+                    ),
+                )
+
+        elif len(pending_extraction_jobs) > 1:
+            # Spawn (rather than fork) the workers, since this process has Qt and other threads running
+            with ProcessPoolExecutor(
+                max_workers=min(len(pending_extraction_jobs), self.max_extraction_processes),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                future_video_files = {
+                    executor.submit(
+                        VideoFrameExtractor.extract_thumbnails,
+                        aFoundVideoFile,
+                        pending_frame_indicies,
+                        desired_thumbnail_sizes,
+                        str(self.thumbnailStore.cache_directory),
+                        self.shouldRetainOriginalFrames,
+                    ): aFoundVideoFile
+                    for (
+                        aFoundVideoFile,
+                        pending_frame_indicies,
+                    ) in pending_extraction_jobs.items()
+                }
+                for aFuture in as_completed(future_video_files):
+                    aFoundVideoFile = future_video_files[aFuture]
+                    try:
+                        generatedThumbnailObjsList = self.add_extracted_thumbnails(
+                            aFoundVideoFile, aFuture.result()
+                        )
+                    except Exception as e:
+                        print(
+                            "WARNING: failed to generate thumbnails for {}: {}".format(
+                                str(aFoundVideoFile), str(e)
+                            )
+                        )
+                        generatedThumbnailObjsList = []
+                    on_video_file_complete(aFoundVideoFile, generatedThumbnailObjsList)
+
         return "Done."
 
+    # add_to_video_cache(videoFilePath, videoCache, thumbnailObjsList): adds the thumbnails to the video's cache, re-adding it to self.cache if it was evicted, and re-measures it (which may evict other videos)
+    def add_to_video_cache(self, videoFilePath, videoCache, thumbnailObjsList):
+        if self.cache.peek(videoFilePath) is not videoCache:
+            self.cache.put(videoFilePath, videoCache)
+        videoCache.update_frame_thumbnail_results(thumbnailObjsList)
+        self.cache.update_size(videoFilePath)
+
     @pyqtSlot(list, object)
     def on_generate_video_thumbnails_print_output(self, active_video_paths, s):
         print(s)
@@ -388,13 +603,16 @@ class VideoPreviewThumbnailGenerator(QObject):
         for aFinishedVideoFilePath in finished_video_files:
             if aFinishedVideoFilePath in self.pendingVideoFilePaths:
                 self.pendingVideoFilePaths.remove(aFinishedVideoFilePath)
+            # Also allows new requests for videos whose generation failed
+            self.pendingThumbnailRequestPaths.discard(aFinishedVideoFilePath)
 
         # self.loadedVideoFiles.extend(finished_video_files)
         self.thumbnailGenerationComplete.emit()
 
     """ generate_thumbnails_for_video_file(...):
+    Decodes the desired frames of the video in this thread and saves their thumbnails to the thumbnailStore.
     Returns:
-        A list of "VideoThumbnail" objects, one for each frame index in desired_frame_indicies
+        A list of "VideoThumbnail" objects, one for each (clamped, unique) frame index in desired_frame_indicies, in increasing frame order
     """
 
     def generate_thumbnails_for_video_file(
@@ -412,30 +630,60 @@ class VideoPreviewThumbnailGenerator(QObject):
                     str(activeVideoFilePath)
                 )
             )
-
-        outputThumbnailObjsList = []
-        frames = VideoPreviewThumbnailGenerator.video_to_desired_frames(
-            activeVideoFilePath, desired_frame_indicies, enable_debug_print
-        )
-
-        # Generate and save thumbs
-        for i in range(len(frames)):
-            thumbs = VideoPreviewThumbnailGenerator.image_to_thumbs(
-                frames[i], thumbnailSizes, enable_debug_print
+        try:
+            extraction_result = VideoFrameExtractor.extract_thumbnails(
+                activeVideoFilePath,
+                desired_frame_indicies,
+                thumbnailSizes,
+                str(self.thumbnailStore.cache_directory),
+                self.shouldRetainOriginalFrames,
+                enable_debug_print,
             )
-            currThumbnailObj = VideoThumbnail(i, thumbs, parent=self)
-            outputThumbnailObjsList.append(currThumbnailObj)
-
-            # os.makedirs('frames/%d' % i)
-            # for k, v in thumb.items():
-            #     # cv2.imencode()
-            #     cv2.imwrite('frames/%d/%s.png' % (i, k), v)
-
-        return outputThumbnailObjsList
+        except OSError as e:
+            print(
+                "WARNING: failed to generate thumbnails for {}: {}".format(
+                    str(activeVideoFilePath), str(e)
+                )
+            )
+            return []
+        return self.add_extracted_thumbnails(activeVideoFilePath, extraction_result)
+
+    # add_extracted_thumbnails(activeVideoFilePath, extraction_result): records the thumbnails returned by VideoFrameExtractor.extract_thumbnails(...) in the thumbnailStore and returns them as a list of VideoThumbnail objects
+    def add_extracted_thumbnails(self, activeVideoFilePath, extraction_result):
+        if (extraction_result["video_info"] is not None) and (
+            len(extraction_result["frame_size_keys"]) > 0
+        ):
+            self.thumbnailStore.add_frames(
+                activeVideoFilePath,
+                extraction_result["source_stats"],
+                extraction_result["video_info"],
+                extraction_result["frame_size_keys"],
+            )
+        return [
+            self.build_video_thumbnail(aFrameIndex, thumbs)
+            for (aFrameIndex, thumbs) in extraction_result["frames"]
+        ]
+
+    # build_video_thumbnail(frame_index, thumbs): converts a dict of RGB thumbnail arrays to a VideoThumbnail with a QImage for each key
+    def build_video_thumbnail(self, frame_index, thumbs):
+        thumbImages = {
+            aKey: VideoPreviewThumbnailGenerator.rgb_array_to_qimage(anImage)
+            for (aKey, anImage) in thumbs.items()
+        }
+        return VideoThumbnail(frame_index, thumbImages, parent=self)
+
+    # rgb_array_to_qimage(img): returns a QImage holding its own copy of the RGB uint8 array's pixels
+    @staticmethod
+    def rgb_array_to_qimage(img):
+        height, width, channels = img.shape
+        bytesPerLine = channels * width
+        # A QImage constructed from a buffer doesn't own it, so it's copied before the array can be freed
+        return QtGui.QImage(
+            img.data, width, height, bytesPerLine, QtGui.QImage.Format_RGB888
+        ).copy()
 
     """ video_to_desired_frames(...):
-    TODO: currently hardcoded to return either 1 (the first) or 5 frames.
-
+    Returns the RGB images of the desired frames (or the first frame / 5 frames spread across the video if desired_frame_indexes is None), in increasing frame order.
     """
 
     @staticmethod
@@ -454,62 +702,11 @@ class VideoPreviewThumbnailGenerator(QObject):
         if use_OpenCV_method:
             if enable_debug_print:
                 print("    video_to_desired_frames(...): using OpenCV method...")
-            cap = cv2.VideoCapture(video_filename)
-            video_length = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - 1
-
-            if cap.isOpened() and video_length > 0:
-                frame_ids = [0]
-                # Check if desired_frame_indexes is None. If it is, use the default frames. Otherwise, use the user's specified frames
-                if desired_frame_indexes is None:
-                    frame_ids = [0]
-                    if video_length >= 4:
-                        frame_ids = [
-                            0,
-                            round(video_length * 0.25),
-                            round(video_length * 0.5),
-                            round(video_length * 0.75),
-                            video_length - 1,
-                        ]
-                else:
-                    # Non-None desired_frame_indicies:
-                    for aDesiredFrameID in desired_frame_indexes:
-                        if 0 <= aDesiredFrameID < video_length:
-                            frame_ids.append(aDesiredFrameID)
-                        elif aDesiredFrameID >= video_length:
-                            # desired index is too big
-                            frame_ids.append(video_length - 1)  # Get the last frame
-                        elif aDesiredFrameID < 0:
-                            frame_ids.append(0)  # Get the first frame
-                        else:
-                            print("WARNING: this shouldn't happen!")
-
-                count = 0
-                for aFrameNumber in frame_ids:
-                    # The first argument of cap.set(), number 2 defines that parameter for setting the frame selection.
-                    # Number 2 defines flag CV_CAP_PROP_POS_FRAMES which is a 0-based index of the frame to be decoded/captured next.
-                    # The second argument defines the frame number in range 0.0-1.0
-                    cap.set(1, aFrameNumber)
-                    success, image = cap.read()
-                    if success:
-                        if enable_debug_print:
-                            print(
-                                "frame_number[{0}]: SUCCESS!".format(str(aFrameNumber))
-                            )
-                        # Set grayscale colorspace for the frame.
-                        # gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                        # Cut the video extension to have the name of the video
-                        # my_video_name = video_filename.split(".")[0]
-                        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                        frames.append(image)
-                        count += 1
-                    else:
-                        if enable_debug_print:
-                            print("frame_number[{0}] failed".format(str(aFrameNumber)))
-                        continue
-
-            # When everything done, release the capture (from https://stackoverflow.com/questions/33650974/opencv-python-read-specific-frame-using-videocapture) not sure if I need to do this.
-            cap.release()
-            cv2.destroyAllWindows()
+            # Visits the frames in increasing order, decoding forward between nearby frames instead of seeking to each one
+            (video_info, extracted_frames) = VideoFrameExtractor.read_frames(
+                video_filename, desired_frame_indexes, enable_debug_print
+            )
+            frames = [anImage for (aFrameNumber, anImage) in extracted_frames]
 
         else:
             # Use FFMPEG method:
@@ -560,32 +757,16 @@ class VideoPreviewThumbnailGenerator(QObject):
         """Create thumbs from image"""
         if enable_debug_print:
             print("image_to_thumbs(...)...")
-        height, width, channels = img.shape
-        bytesPerLine = channels * width
-        qImg = QtGui.QImage(
-            img.data, width, height, bytesPerLine, QtGui.QImage.Format_RGB888
-        )
-
         # thumbs = {"original": img}
-        thumbs = {"original": qImg}
+        thumbs = {"original": VideoPreviewThumbnailGenerator.rgb_array_to_qimage(img)}
         # sizes = [640, 320, 160]
         # sizes = [160, 80, 40]
-        for size in thumbnailSizes:
-            if width >= size:
-                r = (size + 0.0) / width
-                max_size = (size, int(height * r))
-                # thumbs[str(size)] = cv2.resize(img, max_size, interpolation=cv2.INTER_AREA)
-                curr_raw_image = cv2.resize(img, max_size, interpolation=cv2.INTER_AREA)
-                curr_height, curr_width, curr_channels = curr_raw_image.shape
-                curr_bytesPerLine = curr_channels * curr_width
-                curr_q_img = QtGui.QImage(
-                    curr_raw_image.data,
-                    curr_width,
-                    curr_height,
-                    curr_bytesPerLine,
-                    QtGui.QImage.Format_RGB888,
-                )
-                thumbs[str(size)] = curr_q_img
+        for (aKey, curr_raw_image) in VideoFrameExtractor.resize_to_thumbs(
+            img, thumbnailSizes
+        ).items():
+            thumbs[aKey] = VideoPreviewThumbnailGenerator.rgb_array_to_qimage(
+                curr_raw_image
+            )
 
         if enable_debug_print:
             print("done.")
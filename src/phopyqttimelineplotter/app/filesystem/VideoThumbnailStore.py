@@ -0,0 +1,251 @@
+# VideoThumbnailStore.py
+# A persistent on-disk store of the resized thumbnails generated for video frames, so that reopening a timeline doesn't have to decode the video files again.
+# Deliberately has no Qt dependencies so that it can be used from worker processes.
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from phopyqttimelineplotter.app.LazyModule import LazyModule
+
+# from phopyqttimelineplotter.app.filesystem.VideoThumbnailStore import VideoThumbnailStore
+
+# Only needed to encode and decode the stored thumbnail images
+cv2 = LazyModule("cv2")
+
+
+class VideoThumbnailStore(object):
+    """VideoThumbnailStore: stores the resized thumbnails of video frames as compressed images, keyed by video file and frame index.
+
+    Each video file gets one entry directory (named by a hash of its resolved path) containing:
+        metadata.json: the video file's path, size and mtime, its frame count and width, its default frame indicies, and the thumbnail sizes stored for each frame
+        one .jpg file per (frame index, thumbnail size), named "<frame index>_<size>.jpg"
+
+    An entry is only used if the video file's size and mtime still match; otherwise it's deleted and the thumbnails are regenerated.
+    Only the resized thumbnails are stored, never the full-resolution frames.
+    Image files may be written from several worker processes at once (one per video file), but metadata.json is only ever updated from the owning process via add_frames(...).
+    """
+
+    # Increment whenever the layout of an entry changes
+    store_format_version = 1
+
+    metadata_file_name = "metadata.json"
+    image_file_extension = ".jpg"
+    jpeg_quality = 90
+
+    def __init__(self, cache_directory="data/cache/VideoThumbnails"):
+        super(VideoThumbnailStore, self).__init__()
+        self.cache_directory = Path(cache_directory)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_source_file_stats(filePath):
+        """Returns the (size, mtime_ns) of the video file used to validate its entry"""
+        file_stat = os.stat(filePath)
+        return (file_stat.st_size, file_stat.st_mtime_ns)
+
+    @staticmethod
+    def get_entry_path_in(cache_directory, filePath):
+        key_hash = hashlib.sha1(
+            str(Path(filePath).resolve()).encode("utf-8")
+        ).hexdigest()
+        return Path(cache_directory).joinpath(key_hash)
+
+    def get_entry_path(self, filePath):
+        return VideoThumbnailStore.get_entry_path_in(self.cache_directory, filePath)
+
+    @staticmethod
+    def get_image_file_name(frame_index, size_key):
+        return "{}_{}{}".format(
+            int(frame_index), size_key, VideoThumbnailStore.image_file_extension
+        )
+
+    @staticmethod
+    def get_expected_size_keys(thumbnailSizes, frame_width):
+        """Returns the keys of the thumbnailSizes that get generated for frames frame_width pixels wide (sizes wider than the frame are skipped, as in image_to_thumbs(...))"""
+        return [str(aSize) for aSize in thumbnailSizes if frame_width >= aSize]
+
+    @staticmethod
+    def clamp_frame_indicies(desired_frame_indicies, video_length):
+        """Clamps each of desired_frame_indicies to the valid frames of a video with video_length frames. Returns the sorted unique indicies."""
+        frame_ids = np.clip(
+            np.asarray(desired_frame_indicies, dtype=np.int64), 0, max(video_length - 1, 0)
+        )
+        return [int(aFrameId) for aFrameId in np.unique(frame_ids)]
+
+    def load_metadata(self, filePath):
+        """Returns the metadata dict of filePath's entry, or None if there's no valid entry for it."""
+        metadata_path = self.get_entry_path(filePath).joinpath(
+            VideoThumbnailStore.metadata_file_name
+        )
+        if not metadata_path.exists():
+            return None
+        try:
+            with open(metadata_path, "r") as metadata_file:
+                metadata = json.load(metadata_file)
+            (source_size, source_mtime_ns) = VideoThumbnailStore.get_source_file_stats(
+                filePath
+            )
+            is_entry_valid = (
+                (metadata["format_version"] == VideoThumbnailStore.store_format_version)
+                and (metadata["source_size"] == source_size)
+                and (metadata["source_mtime_ns"] == source_mtime_ns)
+            )
+            if not is_entry_valid:
+                print(
+                    "VideoThumbnailStore: {} has changed since its thumbnails were generated. Invalidating its entry...".format(
+                        str(filePath)
+                    )
+                )
+                self.invalidate(filePath)
+                return None
+            return metadata
+
+        except (OSError, ValueError, KeyError) as e:
+            print(
+                "WARNING: VideoThumbnailStore failed to load the entry for {}: {}".format(
+                    str(filePath), str(e)
+                )
+            )
+            self.invalidate(filePath)
+            return None
+
+    def load_thumbnails(self, filePath, desired_frame_indicies, thumbnailSizes):
+        """Loads the stored thumbnails of filePath's desired_frame_indicies (None for the video's default frames).
+        Returns (loaded_frames, pending_frame_indicies):
+            loaded_frames: a list of (frame_index, thumbs) tuples, where thumbs is a dict mapping each size key to an RGB uint8 array
+            pending_frame_indicies: the frames that still need to be generated. These are clamped if the video's frame count is known, otherwise they're desired_frame_indicies unchanged.
+        """
+        with self.lock:
+            metadata = self.load_metadata(filePath)
+        if metadata is None:
+            return ([], desired_frame_indicies)
+
+        if desired_frame_indicies is None:
+            frame_ids = metadata["default_frame_ids"]
+        else:
+            frame_ids = VideoThumbnailStore.clamp_frame_indicies(
+                desired_frame_indicies, metadata["video_length"]
+            )
+
+        expected_size_keys = VideoThumbnailStore.get_expected_size_keys(
+            thumbnailSizes, metadata["frame_width"]
+        )
+        entry_path = self.get_entry_path(filePath)
+        stored_frames = metadata["frames"]
+        loaded_frames = []
+        pending_frame_ids = []
+        for aFrameId in frame_ids:
+            stored_size_keys = stored_frames.get(str(aFrameId), [])
+            if not all((aKey in stored_size_keys) for aKey in expected_size_keys):
+                pending_frame_ids.append(aFrameId)
+                continue
+            thumbs = dict()
+            for aKey in expected_size_keys:
+                image = cv2.imread(
+                    str(entry_path.joinpath(VideoThumbnailStore.get_image_file_name(aFrameId, aKey))),
+                    cv2.IMREAD_COLOR,
+                )
+                if image is None:
+                    break
+                thumbs[aKey] = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            if len(thumbs) < len(expected_size_keys):
+                # An image file is missing or unreadable
+                pending_frame_ids.append(aFrameId)
+                continue
+            loaded_frames.append((aFrameId, thumbs))
+
+        return (loaded_frames, pending_frame_ids)
+
+    @staticmethod
+    def write_thumbnail_images(cache_directory, filePath, frame_index, thumbs):
+        """Writes the RGB thumbs (a dict mapping size keys to arrays) of one frame to filePath's entry directory. Returns the list of size keys written.
+        Called from the worker processes: only writes image files, never the entry's metadata.
+        """
+        entry_path = VideoThumbnailStore.get_entry_path_in(cache_directory, filePath)
+        entry_path.mkdir(parents=True, exist_ok=True)
+        written_size_keys = []
+        for (aKey, anImage) in thumbs.items():
+            (success, encoded_image) = cv2.imencode(
+                VideoThumbnailStore.image_file_extension,
+                cv2.cvtColor(anImage, cv2.COLOR_RGB2BGR),
+                [int(cv2.IMWRITE_JPEG_QUALITY), VideoThumbnailStore.jpeg_quality],
+            )
+            if not success:
+                print(
+                    "WARNING: VideoThumbnailStore failed to encode thumbnail {} of frame {} for {}".format(
+                        aKey, frame_index, str(filePath)
+                    )
+                )
+                continue
+            image_path = entry_path.joinpath(
+                VideoThumbnailStore.get_image_file_name(frame_index, aKey)
+            )
+            # Write to a temporary file first so that a partially written image is never loaded
+            temp_image_path = image_path.with_name(
+                "{}.tmp{}".format(image_path.name, os.getpid())
+            )
+            with open(temp_image_path, "wb") as image_file:
+                image_file.write(encoded_image.tobytes())
+            os.replace(temp_image_path, image_path)
+            written_size_keys.append(aKey)
+        return written_size_keys
+
+    def add_frames(self, filePath, source_stats, video_info, frame_size_keys):
+        """Records the thumbnails written by write_thumbnail_images(...) in filePath's entry metadata. Returns True on success.
+            source_stats: the (size, mtime_ns) of the video file taken before its frames were decoded
+            video_info: a dict with the video's "video_length", "frame_width" and "default_frame_ids"
+            frame_size_keys: a dict mapping each newly written frame index to its list of size keys
+        """
+        (source_size, source_mtime_ns) = source_stats
+        entry_path = self.get_entry_path(filePath)
+        metadata_path = entry_path.joinpath(VideoThumbnailStore.metadata_file_name)
+        with self.lock:
+            metadata = self.load_metadata(filePath)
+            if (
+                (metadata is None)
+                or (metadata["source_size"] != source_size)
+                or (metadata["source_mtime_ns"] != source_mtime_ns)
+            ):
+                metadata = {
+                    "format_version": VideoThumbnailStore.store_format_version,
+                    "source_path": str(Path(filePath).resolve()),
+                    "source_size": source_size,
+                    "source_mtime_ns": source_mtime_ns,
+                    "frames": dict(),
+                }
+            metadata.update(video_info)
+            for (aFrameId, size_keys) in frame_size_keys.items():
+                merged_size_keys = set(metadata["frames"].get(str(aFrameId), []))
+                merged_size_keys.update(size_keys)
+                metadata["frames"][str(aFrameId)] = sorted(merged_size_keys)
+
+            # Write to a temporary file first so that a partially written entry is never loaded
+            temp_metadata_path = metadata_path.with_name(
+                "{}.tmp{}".format(metadata_path.name, os.getpid())
+            )
+            try:
+                entry_path.mkdir(parents=True, exist_ok=True)
+                with open(temp_metadata_path, "w") as metadata_file:
+                    json.dump(metadata, metadata_file)
+                os.replace(temp_metadata_path, metadata_path)
+                return True
+            except (OSError, ValueError) as e:
+                print(
+                    "WARNING: VideoThumbnailStore failed to save the entry for {}: {}".format(
+                        str(filePath), str(e)
+                    )
+                )
+                return False
+
+    def invalidate(self, filePath):
+        shutil.rmtree(self.get_entry_path(filePath), ignore_errors=True)
+
+    def clear(self):
+        with self.lock:
+            shutil.rmtree(self.cache_directory, ignore_errors=True)
@@ -29,6 +29,10 @@ from phopyqttimelineplotter.app.Platform import PlatformOperatingSystem, Platfor
 # from phopyqttimelineplotter.app.filesystem.VideoUtils import findVideoFiles, VideoParsedResults, FoundVideoFileResult
 # from phopyqttimelineplotter.app.filesystem.VideoUtils import findDeeplabCutProducedOutputFiles, FoundDeeplabcutOutputFileResult
 
+# The file name patterns searched for by findVideoFiles(...) and findDeeplabCutProducedOutputFiles(...)
+videoFileNamePatterns = ['*.avi', '*.mp4', '*.mkv']
+deeplabcutOutputFileNamePatterns = ['*.csv', '*.h5', '*includingmetadata.pickle']
+
 # Basler emulation style:
 videoFileNameParsingRegex = re.compile(r'.*_(?P<date>\d{4}\d{2}\d{2})_(?P<time>\d{2}\d{2}\d{2}\d{3})')
 
@@ -78,7 +82,11 @@ def video_duration(vid_file_path):
     ''' Video's duration in seconds, return a float number
     '''
     _json = video_probe(vid_file_path)
+    return video_duration_from_probe(_json, vid_file_path)
 
+def video_duration_from_probe(_json, vid_file_path=None):
+    ''' Video's duration in seconds from the already parsed output of video_probe(...), return a float number
+    '''
     if 'format' in _json:
         if 'duration' in _json['format']:
             return float(_json['format']['duration'])
@@ -179,9 +187,13 @@ class FoundVideoFileResult(FoundFileResult):
         else:
             return None
 
-    def parse(self):
+    # probe_result: the output of video_probe(...) for this file if it's already known (such as from VideoMetadataService), otherwise ffprobe is run on it
+    def parse(self, probe_result=None):
         # parse the video to find at least the duration
-        duration = video_duration(self.path)
+        if probe_result is None:
+            duration = video_duration(self.path)
+        else:
+            duration = video_duration_from_probe(probe_result, self.path)
         # currProperties = get_media_properties(currPathString)
         self.video_parsed_results = VideoParsedResults(duration)
         pass
@@ -233,14 +245,20 @@ class FoundDeeplabcutOutputFileResult(FoundFileResult):
 
 
 ## Finds the video files in the provided dir_path
-def findVideoFiles(dir_path, shouldPrint=False):
+# shouldParseMetadata: if False, the found files aren't parsed (probed with ffprobe) here, and parse(...) must be called on them later
+# only_file_names: if not None, only these files within dir_path are considered instead of every file in it (used by incremental rescans)
+def findVideoFiles(dir_path, shouldPrint=False, shouldParseMetadata=True, only_file_names=None):
     outputVideoFileInfoList = []
     entries = Path(dir_path)
+    if only_file_names is None:
+        candidate_entries = entries.iterdir()
+    else:
+        candidate_entries = [entries.joinpath(aFileName) for aFileName in only_file_names]
     # Iterate through all directories in the path
-    for entry in entries.iterdir():
+    for entry in candidate_entries:
         behavioral_box_id = None
         # Match .avi, .mp4, or .mkv files
-        if fnmatch.fnmatch(entry.name, '*.avi') or fnmatch.fnmatch(entry.name, '*.mp4') or fnmatch.fnmatch(entry.name, '*.mkv'):
+        if any(fnmatch.fnmatch(entry.name, aPattern) for aPattern in videoFileNamePatterns):
             # print(entry.name)
             info = entry.stat()
             #print(f'{entry.name}\t Last Modified: {convert_date(info.st_mtime)}')
@@ -326,7 +344,8 @@ def findVideoFiles(dir_path, shouldPrint=False):
                 # outputVideoFileInfoList.append(currOutputDict)
 
                 currOutputObj = FoundVideoFileResult(currPathString, fileParentPath, fileBaseName, fileFullName, fileExtension, datetime_object, behavioral_box_id, is_deeplabcut_labeled_video)
-                currOutputObj.parse()
+                if shouldParseMetadata:
+                    currOutputObj.parse()
                 outputVideoFileInfoList.append(currOutputObj)
 
                 
@@ -337,14 +356,19 @@ def findVideoFiles(dir_path, shouldPrint=False):
 
 
 ## Finds the DeeplabCut (DLC) produced .csv, .h5, .pickle files in the provided dir_path
-def findDeeplabCutProducedOutputFiles(dir_path, shouldPrint=False):
+# only_file_names: if not None, only these files within dir_path are considered instead of every file in it (used by incremental rescans)
+def findDeeplabCutProducedOutputFiles(dir_path, shouldPrint=False, only_file_names=None):
     outputFileInfoList = []
     entries = Path(dir_path)
+    if only_file_names is None:
+        candidate_entries = entries.iterdir()
+    else:
+        candidate_entries = [entries.joinpath(aFileName) for aFileName in only_file_names]
     # Iterate through all directories in the path
-    for entry in entries.iterdir():
+    for entry in candidate_entries:
         behavioral_box_id = None
-        # Match .avi, .mp4, or .mkv files
-        if fnmatch.fnmatch(entry.name, '*.csv') or fnmatch.fnmatch(entry.name, '*.h5') or fnmatch.fnmatch(entry.name, '*includingmetadata.pickle'):
+        # Match .csv, .h5, or metadata .pickle files
+        if any(fnmatch.fnmatch(entry.name, aPattern) for aPattern in deeplabcutOutputFileNamePatterns):
             # print(entry.name)
             info = entry.stat()
             #print(f'{entry.name}\t Last Modified: {convert_date(info.st_mtime)}')
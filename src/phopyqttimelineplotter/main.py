@@ -1,9 +1,11 @@
+# Imported first, so that its clock includes the time taken by the imports below
+from phopyqttimelineplotter.app.StartupTimer import StartupTimer
+
 import datetime as dt
+import multiprocessing
 import pathlib
 import sqlite3
 
-import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
 import numpy as np
 import sqlalchemy as db
 from phopyqttimelineplotter.app.database.DatabaseConnectionRef import DatabaseConnectionRef
@@ -140,7 +142,9 @@ class TimelineApplication(QApplication):
             return new_user_dir
 
     def __init__(self, args):
+        StartupTimer.mark("imports")
         super(TimelineApplication, self).__init__(args)
+        StartupTimer.mark("QApplication")
         # self.database_file_path = '/Users/pho/repo/PhoPyQtTimelinePlotter/BehavioralBoxDatabase.db'
         # self.database_file_path = 'G:\Google Drive\Modern Behavior Box\Results - Data\BehavioralBoxDatabase.db'
         # self.database_file_path = "C:/Users/halechr/repo/PhoPyQtTimelinePlotter/BehavioralBoxDatabase.db"
@@ -213,9 +217,10 @@ class TimelineApplication(QApplication):
             self.exampleWindow = ExampleDatabaseTableWindow(self.database_connection)
 
         if TimelineApplication.shouldShowMainGUIWindow:
-            self.mainWindow = TimelineDrawingWindow(
-                self.database_connection, self.earliestTime, self.latestTime
-            )
+            with StartupTimer.measure("TimelineDrawingWindow"):
+                self.mainWindow = TimelineDrawingWindow(
+                    self.database_connection, self.earliestTime, self.latestTime
+                )
             self.windowFlags = self.mainWindow.windowFlags()
             # print(windowFlags)
             self.windowFlags |= (
@@ -240,7 +245,8 @@ class TimelineApplication(QApplication):
             self.sideListWindowGeometry = self.mainListWindow.frameGeometry()
 
         if TimelineApplication.shouldShowMainGUIWindow:
-            self.mainWindow.show()
+            with StartupTimer.measure("show main window"):
+                self.mainWindow.show()
             # hi
             self.mainWindowGeometry = self.mainWindow.frameGeometry()
 
@@ -255,6 +261,9 @@ class TimelineApplication(QApplication):
             self.sideListWindowGeometry.moveTopRight(self.mainWindowGeometry.topLeft())
             self.mainListWindow.move(self.sideListWindowGeometry.topLeft())
 
+        StartupTimer.mark("other windows")
+        StartupTimer.print_report()
+
     @pyqtSlot()
     def on_application_about_to_quit(self):
         print("aboutToQuit")
@@ -263,6 +272,8 @@ class TimelineApplication(QApplication):
 
 
 if __name__ == "__main__":
+    # Required for the thumbnail generator's worker processes when frozen with PyInstaller
+    multiprocessing.freeze_support()
 
     QResource.registerResource("data/PhoPyQtTimelinePlotterResourceFile.rcc")
 
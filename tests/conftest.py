@@ -1,10 +1,21 @@
 """
-    Dummy conftest.py for phopyqttimelineplotter.
+    conftest.py for phopyqttimelineplotter.
 
-    If you don't know what this is for, just leave it empty.
     Read more about conftest.py under:
     - https://docs.pytest.org/en/stable/fixture.html
     - https://docs.pytest.org/en/stable/writing_plugins.html
 """
 
-# import pytest
+import os
+import sys
+from pathlib import Path
+
+# The tests don't need a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+src_path = Path(__file__).resolve().parent.parent.joinpath("src")
+# The package imports its bundled 'lib' package (vlc, pg_time_axis) as a top-level package, relative to the package directory
+package_path = src_path.joinpath("phopyqttimelineplotter")
+for aPath in (str(package_path), str(src_path)):
+    if aPath not in sys.path:
+        sys.path.insert(0, aPath)
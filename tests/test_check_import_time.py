@@ -0,0 +1,63 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parent.parent
+script_path = repo_root.joinpath("scripts", "check_import_time.py")
+
+pytestmark = pytest.mark.slow
+
+
+def load_check_import_time():
+    spec = importlib.util.spec_from_file_location("check_import_time", str(script_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_check_import_time(*args):
+    return subprocess.run(
+        [sys.executable, str(script_path), "--repeat", "1"] + list(args),
+        cwd=str(repo_root),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_main_window_imports_no_deferred_modules_within_budget():
+    # The optional GUI modules that aren't installed are stubbed, so this never depends on the environment
+    check_import_time = load_check_import_time()
+    completed = run_check_import_time("--stub-missing", "--max-ms", str(check_import_time.default_max_ms))
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert completed.stdout.rstrip().endswith("OK")
+
+
+def test_module_without_deferred_imports_passes():
+    completed = run_check_import_time("--module", "phopyqttimelineplotter.app.filesystem.VideoFrameExtractor")
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert completed.stdout.rstrip().endswith("OK")
+
+
+def test_deferred_import_fails_the_check():
+    if importlib.util.find_spec("h5py") is None:
+        pytest.skip("h5py isn't installed")
+    completed = run_check_import_time("--module", "h5py")
+    assert completed.returncode == 1
+    assert "FAILED: imported modules that should be loaded lazily: h5py" in completed.stdout
+
+
+def test_stubbed_deferred_import_fails_the_check():
+    # Whether silx is installed or stubbed, importing it is reported
+    completed = run_check_import_time("--stub-missing", "--module", "silx")
+    assert completed.returncode == 1, completed.stdout + completed.stderr
+    assert "FAILED: imported modules that should be loaded lazily: silx" in completed.stdout
+
+
+def test_over_budget_import_fails_the_check():
+    completed = run_check_import_time("--module", "phopyqttimelineplotter.app.filesystem.VideoFrameExtractor", "--max-ms", "0.1")
+    assert completed.returncode == 1
+    assert "more than the 0.1 ms budget" in completed.stdout
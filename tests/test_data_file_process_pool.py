@@ -0,0 +1,25 @@
+import pytest
+
+from phopyqttimelineplotter.app.filesystem.DataFileProcessPool import DataFileProcessPool
+from phopyqttimelineplotter.app.filesystem.GeneralData.BaseDataFileFilesystemLoadingMixin import (
+    BaseDataFilesystemLoader,
+)
+
+
+def load_or_fail(filePath):
+    if filePath == "bad":
+        raise ValueError("can't parse {}".format(filePath))
+    return filePath.upper()
+
+
+def test_in_process_yields_results_and_errors_in_file_order():
+    results = list(DataFileProcessPool(max_processes=1).map_in_file_order(load_or_fail, ["a", "bad", "c"]))
+    assert [(aFilePath, result) for (aFilePath, result, _) in results] == [("a", "A"), ("bad", None), ("c", "C")]
+    assert [type(error) for (_, _, error) in results] == [type(None), ValueError, type(None)]
+
+
+@pytest.mark.parametrize("max_processes", [1, 2])
+def test_not_implemented_error_propagates(max_processes):
+    pool = DataFileProcessPool(max_processes=max_processes)
+    with pytest.raises(NotImplementedError):
+        list(pool.map_in_file_order(BaseDataFilesystemLoader.load_data_file_arrays, ["a", "b"]))
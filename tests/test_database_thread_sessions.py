@@ -0,0 +1,84 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from phopyqttimelineplotter.app.database.DatabaseConnectionRef import DatabaseConnectionRef
+from phopyqttimelineplotter.app.database.entry_models.db_model import TimestampedAnnotation
+from phopyqttimelineplotter.app.database.utility_functions import datetime_to_database
+
+base_date = datetime(2019, 8, 1)
+num_threads = 4
+num_writes_per_thread = 25
+
+
+@pytest.fixture
+def database_connection(tmp_path):
+    aDatabaseConnection = DatabaseConnectionRef(str(tmp_path.joinpath("test.db")))
+    aDatabaseConnection.enable_debug_printing = False
+    yield aDatabaseConnection
+    aDatabaseConnection.ScopedSession.remove()
+    aDatabaseConnection.session.close()
+    aDatabaseConnection.engine.dispose()
+
+
+def make_annotation(index):
+    return TimestampedAnnotation(
+        start_date=datetime_to_database(base_date + timedelta(minutes=index)),
+        end_date=None,
+        primary_text="thread test {0}".format(index),
+    )
+
+
+def test_connections_use_wal(database_connection):
+    assert database_connection.session.execute("PRAGMA journal_mode").scalar() == "wal"
+    journal_modes = []
+
+    def read_journal_mode():
+        with database_connection.thread_session() as session:
+            journal_modes.append(session.execute("PRAGMA journal_mode").scalar())
+
+    aThread = threading.Thread(target=read_journal_mode)
+    aThread.start()
+    aThread.join()
+    assert journal_modes == ["wal"]
+
+
+def test_threads_read_and_write_through_their_own_sessions(database_connection):
+    errors = []
+    # Kept alive so that a session's id can't be reused by another thread's
+    thread_sessions = {}
+    start_barrier = threading.Barrier(num_threads + 1)
+
+    def read_and_write(thread_index):
+        thread_sessions[thread_index] = []
+        try:
+            start_barrier.wait()
+            for write_index in range(num_writes_per_thread):
+                with database_connection.thread_session() as session:
+                    assert session is database_connection.get_session()
+                    thread_sessions[thread_index].append(session)
+                    session.add(make_annotation((thread_index * num_writes_per_thread) + write_index))
+                    session.commit()
+                    session.query(TimestampedAnnotation).count()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read_and_write, args=(thread_index,)) for thread_index in range(num_threads)]
+    for aThread in threads:
+        aThread.start()
+    # The owning thread reads through its own session at the same time
+    start_barrier.wait()
+    for _ in range(num_writes_per_thread):
+        database_connection.session.query(TimestampedAnnotation).count()
+        database_connection.session.commit()
+    for aThread in threads:
+        aThread.join()
+
+    assert errors == []
+    session_ids_by_thread = [set(id(aSession) for aSession in thread_sessions[thread_index]) for thread_index in range(num_threads)]
+    for (thread_index, session_ids) in enumerate(session_ids_by_thread):
+        assert id(database_connection.session) not in session_ids
+        for other_session_ids in session_ids_by_thread[(thread_index + 1):]:
+            assert session_ids.isdisjoint(other_session_ids)
+    assert database_connection.session.query(TimestampedAnnotation).count() == num_threads * num_writes_per_thread
@@ -0,0 +1,54 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from phopyqttimelineplotter.GUI.Model.Events.EventIntervalIndex import EventIntervalIndex
+
+base_date = datetime(2019, 8, 1)
+
+
+class SyntheticEvent(object):
+    def __init__(self, startTime, endTime):
+        self.startTime = startTime
+        self.endTime = endTime
+
+    def computeDuration(self):
+        if self.endTime is None:
+            return timedelta(seconds=2)
+        return self.endTime - self.startTime
+
+
+def make_events(rng, num_events):
+    events = []
+    for _ in range(num_events):
+        startTime = base_date + timedelta(seconds=rng.randrange(0, 3600))
+        endTime = None if rng.random() < 0.5 else startTime + timedelta(seconds=rng.randrange(0, 900))
+        events.append(SyntheticEvent(startTime, endTime))
+    return events
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_find_overlapping_matches_scan(seed):
+    rng = random.Random(seed)
+    events = make_events(rng, rng.randrange(0, 300))
+    index = EventIntervalIndex(events)
+    for _ in range(50):
+        range_start = base_date + timedelta(seconds=rng.randrange(-600, 4200))
+        range_end = range_start + timedelta(seconds=rng.randrange(0, 600))
+        expected = [
+            anIndex
+            for (anIndex, anEvent) in enumerate(events)
+            if (anEvent.startTime <= range_end) and (anEvent.startTime + anEvent.computeDuration() >= range_start)
+        ]
+        assert sorted(index.find_overlapping_indicies(range_start, range_end).tolist()) == expected
+
+
+def test_long_event_starting_before_the_range_is_found():
+    events = [
+        SyntheticEvent(base_date, base_date + timedelta(hours=2)),
+        SyntheticEvent(base_date + timedelta(minutes=10), None),
+    ]
+    index = EventIntervalIndex(events)
+    found = index.find_overlapping_indicies(base_date + timedelta(hours=1), base_date + timedelta(hours=1, minutes=5))
+    assert found.tolist() == [0]
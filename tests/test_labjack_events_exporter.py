@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+tables = pytest.importorskip("tables")
+
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsExporter import LabjackEventsExporter
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import LabjackEventsLoader
+
+base_date = datetime(2019, 8, 1)
+variable_names = ["Water1_BeamBreak", "Food1_Dispense"]
+
+
+class ExportRecord(object):
+    def __init__(self, start_date, variable_name, event_type, port):
+        self.start_date = start_date
+        self.variable_name = variable_name
+        self.extended_data = {"event_type": event_type, "port": port}
+
+    def get_extended_data(self):
+        return self.extended_data
+
+
+def make_export_columns():
+    variableColumns = [
+        LabjackEventsExporter.build_variable_columns(
+            [base_date + timedelta(seconds=(10 * index + variableIndex)) for index in range(5)],
+            np.arange(5, dtype=np.float64),
+            [None, 0, 0, 1, None],
+        )
+        for variableIndex in range(len(variable_names))
+    ]
+    records = [
+        ExportRecord(base_date + timedelta(seconds=index), variable_names[index % 2], ["BeamBreak", "Dispense"][index % 2], str(index % 2 + 1))
+        for index in range(10)
+    ]
+    return (variableColumns, LabjackEventsLoader.build_records_export_columns(records))
+
+
+def test_export_stores_no_pickled_columns(tmp_path):
+    (variableColumns, recordColumns) = make_export_columns()
+    (csvPath, hdfPath) = LabjackEventsExporter.write_export(tmp_path, "export_test", variable_names, variableColumns, recordColumns)
+    assert csvPath.exists()
+
+    with tables.open_file(str(hdfPath), mode="r") as h5file:
+        leaves = list(h5file.walk_nodes("/", classname="Leaf"))
+        assert len(leaves) > 0
+        pickled_leaves = [aLeaf._v_pathname for aLeaf in leaves if isinstance(getattr(aLeaf, "atom", None), tables.ObjectAtom)]
+        assert pickled_leaves == []
+
+    # And the frames read back unchanged
+    with pd.HDFStore(hdfPath, mode="r") as store:
+        pd.testing.assert_frame_equal(store["records_dataframe"], pd.DataFrame(recordColumns))
+        for (aVariableName, aVariableColumns) in zip(variable_names, variableColumns):
+            pd.testing.assert_frame_equal(store["variables/{}".format(aVariableName)], pd.DataFrame(aVariableColumns))
+        variables_dataframe = store["variables_dataframe"]
+        assert list(variables_dataframe.index.get_level_values(0).unique()) == variable_names
+        assert len(variables_dataframe) == sum(len(aVariableColumns["timestamp"]) for aVariableColumns in variableColumns)
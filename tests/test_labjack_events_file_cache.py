@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsFileCache import (
+    LabjackEventsFileCache,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
+
+options = {"usePhoServerFormat": True, "active_labjack_variable_names": ["Water1_BeamBreak"]}
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    filePath = tmp_path.joinpath("out_file_s470017560_1562601911545.csv")
+    filePath.write_text("1562601911545,1,0,0,0,0,0,0,0,0\n")
+    return filePath
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LabjackEventsFileCache(tmp_path.joinpath("cache"))
+
+
+def make_arrays():
+    return {
+        "dateTimes": np.array(["2019-07-08T12:05:11.545"], dtype="datetime64[us]"),
+        "onesEventFormatDataArray": np.ones((1, 9), dtype=np.int8),
+    }
+
+
+def test_round_trip(cache, source_file):
+    arrays = make_arrays()
+    assert cache.save(source_file, options, arrays)
+    loaded = cache.load(source_file, options)
+    assert set(loaded.keys()) == set(arrays.keys())
+    for aKey in arrays:
+        assert np.array_equal(loaded[aKey], arrays[aKey])
+
+
+def test_options_are_part_of_the_key(cache, source_file):
+    cache.save(source_file, options, make_arrays())
+    assert cache.load(source_file, dict(options, usePhoServerFormat=False)) is None
+
+
+def test_changed_source_file_invalidates_entry(cache, source_file):
+    cache.save(source_file, options, make_arrays())
+    source_file.write_text("1562601911545,1,0,0,0,0,0,0,0,0\n1562601911546,0,0,0,0,0,0,0,0,0\n")
+    assert cache.load(source_file, options) is None
+    assert not cache.get_entry_path(source_file, options).exists()
+
+
+@pytest.mark.parametrize(
+    "version_owner, version_name",
+    [
+        (LabjackEventsFileCache, "cache_format_version"),
+        (PhoServerFormatBulkParser, "parser_version"),
+    ],
+)
+def test_version_bump_invalidates_entry(cache, source_file, monkeypatch, version_owner, version_name):
+    cache.save(source_file, options, make_arrays())
+    monkeypatch.setattr(version_owner, version_name, getattr(version_owner, version_name) + 1)
+    assert cache.load(source_file, options) is None
@@ -0,0 +1,84 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsFileCache import (
+    LabjackEventsFileCache,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
+    LabjackEventsLoader,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackFilesystemLoadingMixin import (
+    LabjackEventFile,
+    LabjackFilesystemLoader,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.MatlabLabjackDataReader import (
+    MatlabLabjackDataReader,
+)
+from phopyqttimelineplotter.app.filesystem.LabjackData.PhoServerFormatBulkParser import (
+    PhoServerFormatBulkParser,
+)
+
+dateTimes = np.array(["2019-07-08T12:05:11.545", "2019-07-08T12:05:12.001"], dtype="datetime64[us]")
+
+
+def test_cache_hit_returns_memory_mapped_views(tmp_path, monkeypatch):
+    source_file = tmp_path.joinpath("out_file_s470017560_1562601911545.csv")
+    source_file.write_text("1562601911545,1,0,0,0,0,0,0,0,0\n1562601912001,0,0,0,0,1,0,0,0,0\n")
+    monkeypatch.setattr(LabjackFilesystemLoader, "events_file_cache", LabjackEventsFileCache(tmp_path.joinpath("cache")))
+    load_args = (source_file, LabjackEventsLoader.labjack_variable_names, True, False, True)
+    parsedArrays = LabjackFilesystemLoader.load_data_file_arrays(*load_args)
+    cachedArrays = LabjackFilesystemLoader.load_data_file_arrays(*load_args)
+
+    assert set(cachedArrays.keys()) == set(parsedArrays.keys())
+    for aKey in parsedArrays:
+        assert type(cachedArrays[aKey]) is np.ndarray
+        assert isinstance(cachedArrays[aKey].base, np.memmap)
+        assert np.array_equal(cachedArrays[aKey], parsedArrays[aKey])
+    # Returning them from a worker process copies them
+    unpickled_dateTimes = pickle.loads(pickle.dumps(cachedArrays["dateTimes"]))
+    assert unpickled_dateTimes.base is None
+    assert np.array_equal(unpickled_dateTimes, parsedArrays["dateTimes"])
+
+
+def test_event_file_converts_dateTimes_on_first_use():
+    eventFile = LabjackEventFile("out_file_s470017560_1562601911545.csv")
+    eventFile.set_loaded_values(dateTimes, [], [], None, [])
+    assert eventFile.dateTimes is dateTimes
+    converted_dateTimes = eventFile.get_dateTimes()
+    assert list(converted_dateTimes) == list(PhoServerFormatBulkParser.datetime64_to_datetimes(dateTimes))
+    assert eventFile.get_dateTimes() is converted_dateTimes
+
+
+def write_matlab_labjack_file(filePath, dataArray):
+    # The layout of a v7.3 .mat file's labjackDataOutput struct: MATLAB's column-major arrays stored transposed
+    h5py = pytest.importorskip("h5py")
+    dateNums = MatlabLabjackDataReader.datetimes_to_matlab_datenums(
+        np.datetime64("2019-07-08T12:00:00") + np.arange(dataArray.shape[0]) * np.timedelta64(1, "s")
+    )
+    with h5py.File(str(filePath), "w") as file:
+        group = file.create_group(MatlabLabjackDataReader.data_variable_name)
+        group.create_dataset("dateTime", data=dateNums.reshape(1, -1))
+        group.create_dataset("dataArray", data=np.asarray(dataArray, dtype=np.float64).T)
+
+
+def test_matlab_event_samples_are_cached_per_set_of_variables(tmp_path, monkeypatch):
+    (water_name, food_name) = ("Water1_BeamBreak", "Food1_Dispense")
+    dataArray = np.zeros((10, len(LabjackEventsLoader.labjack_variable_names)))
+    dataArray[[1, 4], LabjackEventsLoader.labjack_variable_indicies_dict[water_name]] = 1
+    dataArray[[2, 7], LabjackEventsLoader.labjack_variable_indicies_dict[food_name]] = 1
+    source_file = tmp_path.joinpath("labjack_data.mat")
+    write_matlab_labjack_file(source_file, dataArray)
+    monkeypatch.setattr(LabjackFilesystemLoader, "events_file_cache", LabjackEventsFileCache(tmp_path.joinpath("cache")))
+
+    def load_event_seconds(active_labjack_variable_names):
+        loadedArrays = LabjackFilesystemLoader.load_data_file_arrays(source_file, active_labjack_variable_names, False, False, False)
+        # Rounded, since the datenums are only accurate to about a microsecond
+        return list(np.round((loadedArrays["dateTimes"] - np.datetime64("2019-07-08T12:00:00")) / np.timedelta64(1, "s")))
+
+    # Only the samples with an event in one of the active variables are kept, so a different set of variables can't be served the same entry
+    assert load_event_seconds([water_name]) == [1, 4]
+    assert load_event_seconds([water_name, food_name]) == [1, 2, 4, 7]
+    assert load_event_seconds([water_name]) == [1, 4]
+    assert len(list(tmp_path.joinpath("cache").iterdir())) == 2
@@ -0,0 +1,83 @@
+import datetime as dt
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from phopyqttimelineplotter.app.filesystem.LabjackData.LabjackEventsLoader import (
+    LabjackEventsLoader,
+    LabjackEventType,
+)
+
+base_date = dt.datetime(2020, 1, 1)
+
+
+def make_event(seconds, variable_index):
+    return SimpleNamespace(
+        start_date=base_date + dt.timedelta(seconds=int(seconds)),
+        extended_data={
+            "event_type": LabjackEventsLoader.labjack_variable_event_type[variable_index],
+            "port": LabjackEventsLoader.labjack_variable_port_location[variable_index],
+        },
+    )
+
+
+def make_random_events(rng, num_events):
+    # Few distinct seconds, so that tied timestamps are common
+    seconds = np.sort(rng.integers(0, num_events // 3 + 2, num_events))
+    return [make_event(aSecond, int(rng.integers(0, 8))) for aSecond in seconds]
+
+
+def assert_columnar_matches_iterative(events):
+    (expected_timestamps, expected_mask) = LabjackEventsLoader.find_invalid_events_iterative(
+        events, LabjackEventType.phoDurationEvent
+    )
+    # Through the event objects
+    (found_timestamps, found_mask) = LabjackEventsLoader.find_invalid_events(
+        events, LabjackEventType.phoDurationEvent
+    )
+    assert np.array_equal(found_mask, expected_mask)
+    assert found_timestamps == expected_timestamps
+
+    # The columnar core directly, with datetime64 timestamps
+    (portCodes, eventTypeCodes, startDates) = LabjackEventsLoader.build_event_columns(
+        events, LabjackEventType.phoDurationEvent
+    )
+    columnar_mask = LabjackEventsLoader.find_invalid_events_columnar(
+        portCodes, eventTypeCodes, np.array(list(startDates), dtype="datetime64[us]")
+    )
+    assert np.array_equal(columnar_mask, expected_mask)
+    return expected_mask
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_events(seed):
+    rng = np.random.default_rng(seed)
+    assert_columnar_matches_iterative(make_random_events(rng, int(rng.integers(1, 400))))
+
+
+def test_no_events():
+    mask = assert_columnar_matches_iterative([])
+    assert len(mask) == 0
+
+
+@pytest.mark.parametrize("variable_index", range(8))
+def test_single_event(variable_index):
+    mask = assert_columnar_matches_iterative([make_event(0, variable_index)])
+    # A lone dispense has no preceding beambreak
+    is_dispense = LabjackEventsLoader.labjack_variable_event_type[variable_index] == "Dispense"
+    assert mask.tolist() == [not is_dispense]
+
+
+def test_all_events_invalid():
+    # Dispenses on every port without any beambreaks
+    events = [make_event(aSecond, 4 + (aSecond % 4)) for aSecond in range(40)]
+    mask = assert_columnar_matches_iterative(events)
+    assert not mask.any()
+
+
+def test_repeated_dispenses_after_one_beambreak():
+    # Water1: beambreak, dispense (valid), dispense (invalid), dispense at the same second (invalid)
+    events = [make_event(0, 0), make_event(1, 4), make_event(2, 4), make_event(2, 4)]
+    mask = assert_columnar_matches_iterative(events)
+    assert mask.tolist() == [True, True, False, False]
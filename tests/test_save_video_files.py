@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from PyQt5.QtCore import QCoreApplication
+
+from phopyqttimelineplotter.app.database.DatabaseConnectionRef import DatabaseConnectionRef
+from phopyqttimelineplotter.app.filesystem.VideoFilesystemLoadingMixin import VideoFilesystemLoader
+from phopyqttimelineplotter.app.filesystem.VideoUtils import (
+    CachedFileSource,
+    FoundVideoFileResult,
+    VideoParsedResults,
+)
+
+base_date = datetime(2019, 8, 1)
+
+
+def make_found_video_file(search_path, file_index, duration=1800.0):
+    base_name = "BB01_video_{0:04d}".format(file_index)
+    aFoundVideoFile = FoundVideoFileResult(
+        str(Path(search_path).joinpath(base_name + ".mp4")),
+        str(search_path),
+        base_name,
+        base_name + ".mp4",
+        ".mp4",
+        base_date + timedelta(hours=file_index),
+        0,
+        False,
+    )
+    if duration is not None:
+        aFoundVideoFile.video_parsed_results = VideoParsedResults(duration)
+    return aFoundVideoFile
+
+
+def get_cached_database_video_files(loader):
+    return sorted(
+        (aVideoFile.file_video_folder, aVideoFile.file_fullname, aVideoFile.end_date, aVideoFile.duration)
+        for aCacheValue in loader.get_cache().values()
+        for aVideoFile in aCacheValue.get_database_video_files()
+    )
+
+
+@pytest.fixture
+def loader(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    database_connection = DatabaseConnectionRef(str(tmp_path.joinpath("test.db")))
+    database_connection.enable_debug_printing = False
+    aLoader = VideoFilesystemLoader(database_connection, [])
+    aLoader.threadpool.waitForDone()
+    search_path = tmp_path.joinpath("videos")
+    search_path.mkdir()
+    aLoader.searchPaths = [str(search_path)]
+    aLoader.rebuildDatabaseRecordParentFolders()
+    yield aLoader
+    database_connection.engine.dispose()
+
+
+def test_saves_update_the_cache_like_a_full_reload(loader, monkeypatch):
+    (search_path, cache_value) = next(iter(loader.get_cache().items()))
+    found_video_files = [make_found_video_file(search_path, index) for index in range(5)]
+    cache_value.set_found_filesystem_video_files(found_video_files)
+
+    monkeypatch.setattr(loader, "reloadModelFromDatabase", lambda: pytest.fail("saving shouldn't reload every folder"))
+    loader.saveVideoFilesToDatabase()
+    found_video_files = found_video_files + [make_found_video_file(search_path, index) for index in range(5, 8)]
+    cache_value.set_found_filesystem_video_files(found_video_files)
+    loader.saveVideoFilesToDatabase()
+    incremental_video_files = get_cached_database_video_files(loader)
+    combined_sources = {anOutputFile.get_full_name(): anOutputFile.get_source() for anOutputFile in cache_value.get_combined_video_files()}
+    monkeypatch.undo()
+
+    assert len(incremental_video_files) == 8
+    assert set(combined_sources.values()) == {CachedFileSource.NewestFromFilesystem}
+    loader.reloadModelFromDatabase()
+    assert incremental_video_files == get_cached_database_video_files(loader)
+    assert combined_sources == {anOutputFile.get_full_name(): anOutputFile.get_source() for anOutputFile in cache_value.get_combined_video_files()}
+    # The relationship was kept in sync too
+    assert len(cache_value.get_database_parent_folder().videoFiles) == 8
+
+
+def test_upsert_updates_the_loaded_records_in_place(loader):
+    (search_path, cache_value) = next(iter(loader.get_cache().items()))
+    cache_value.set_found_filesystem_video_files([make_found_video_file(search_path, 0)])
+    loader.saveVideoFilesToDatabase()
+    (aVideoFile,) = cache_value.get_database_video_files()
+    new_end_date = aVideoFile.start_date + 60000
+
+    database_connection = loader.database_connection
+    assert database_connection.upsert_video_files_to_database(
+        [], [{"id": aVideoFile.id, "end_date": new_end_date, "duration": 60000}]
+    ) == (0, 1)
+    session = database_connection.get_session()
+    # Neither expired (so it isn't reloaded on its own) nor pending as a change
+    assert len(sa.inspect(aVideoFile).expired_attributes) == 0
+    assert aVideoFile not in session.dirty
+    assert (aVideoFile.end_date, aVideoFile.duration) == (new_end_date, 60000)
+    session.expire(aVideoFile)
+    assert (aVideoFile.end_date, aVideoFile.duration) == (new_end_date, 60000)
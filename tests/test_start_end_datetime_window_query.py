@@ -0,0 +1,130 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as db
+from sqlalchemy.orm import sessionmaker
+
+from phopyqttimelineplotter.app.database.entry_models.DatabaseBase import Base
+from phopyqttimelineplotter.app.database.entry_models.db_model import (
+    CategoricalDurationLabel,
+    TimestampedAnnotation,
+)
+from phopyqttimelineplotter.app.database.utility_functions import datetime_to_database
+from phopyqttimelineplotter.GUI.Model.Events.PhoDurationEvent import PhoDurationEvent
+
+base_date = datetime(2019, 8, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def DBSession(tmp_path):
+    engine = db.create_engine("sqlite:///" + str(tmp_path.joinpath("test.db")))
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def make_label(start_date, end_date):
+    return CategoricalDurationLabel(
+        start_date=start_date,
+        end_date=end_date,
+        label_created_date=base_date,
+        label_created_user="test",
+        last_updated_date=base_date,
+        last_updated_user="test",
+    )
+
+
+def make_annotation(start_date, end_date):
+    return TimestampedAnnotation(
+        start_date=datetime_to_database(start_date),
+        end_date=(None if end_date is None else datetime_to_database(end_date)),
+        primary_text="test",
+    )
+
+
+def overlaps_range(record, range_start, range_end):
+    # The views' implementation, on the record's dates
+    view = SimpleNamespace(startTime=record.get_start_date(), endTime=record.get_end_date())
+    return PhoDurationEvent.overlaps_range(view, range_start, range_end)
+
+
+def query_window_ids(session, recordClass, range_start, range_end):
+    query = recordClass.filter_overlapping_range(session.query(recordClass), session, range_start, range_end)
+    return sorted(aRecord.id for aRecord in query.all())
+
+
+@pytest.mark.parametrize(
+    "recordClass, make_record, can_be_instantaneous",
+    [
+        (CategoricalDurationLabel, make_label, False),
+        (TimestampedAnnotation, make_annotation, True),
+    ],
+)
+def test_window_query_matches_overlaps_range(DBSession, recordClass, make_record, can_be_instantaneous):
+    rng = random.Random(0)
+    session = DBSession()
+    for _ in range(300):
+        start_date = base_date + timedelta(seconds=rng.randrange(0, 86400))
+        if can_be_instantaneous and (rng.random() < 0.3):
+            end_date = None
+        else:
+            # Mostly short records, with a few very long ones
+            end_date = start_date + timedelta(seconds=rng.choice([rng.randrange(0, 600), rng.randrange(0, 40000)]))
+        session.add(make_record(start_date, end_date))
+    session.commit()
+
+    records = session.query(recordClass).all()
+    for _ in range(100):
+        range_start = base_date + timedelta(seconds=rng.randrange(-3600, 90000))
+        range_end = range_start + timedelta(seconds=rng.choice([0, 60, 3600, 20000]))
+        expected_ids = sorted(aRecord.id for aRecord in records if overlaps_range(aRecord, range_start, range_end))
+        assert query_window_ids(session, recordClass, range_start, range_end) == expected_ids
+    session.close()
+
+
+@pytest.mark.parametrize(
+    "recordClass, make_record",
+    [
+        (CategoricalDurationLabel, make_label),
+        (TimestampedAnnotation, make_annotation),
+    ],
+)
+def test_window_query_sees_writes_from_other_engines(tmp_path, recordClass, make_record):
+    # Two engines on the same file, as two processes sharing a database would have
+    database_path = "sqlite:///" + str(tmp_path.joinpath("shared.db"))
+    reader_engine = db.create_engine(database_path)
+    writer_engine = db.create_engine(database_path)
+    Base.metadata.create_all(reader_engine)
+    reader_session = sessionmaker(bind=reader_engine)()
+    writer_session = sessionmaker(bind=writer_engine)()
+
+    writer_session.add(make_record(base_date, base_date + timedelta(minutes=1)))
+    writer_session.commit()
+    range_start = base_date + timedelta(hours=5)
+    range_end = range_start + timedelta(minutes=1)
+    assert query_window_ids(reader_session, recordClass, range_start, range_end) == []
+    reader_session.commit()
+
+    # A record long enough to overlap the range, written after the reader's first query
+    writer_session.add(make_record(base_date, base_date + timedelta(hours=6)))
+    writer_session.commit()
+    assert len(query_window_ids(reader_session, recordClass, range_start, range_end)) == 1
+    reader_session.close()
+    writer_session.close()
+    reader_engine.dispose()
+    writer_engine.dispose()
+
+
+@pytest.mark.parametrize("recordClass", [CategoricalDurationLabel, TimestampedAnnotation])
+def test_window_query_searches_the_start_date_index(DBSession, recordClass):
+    session = DBSession()
+    query = recordClass.filter_overlapping_range(session.query(recordClass), session, base_date, base_date + timedelta(hours=1))
+    statement = query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    query_plan = [aRow[-1] for aRow in session.execute("EXPLAIN QUERY PLAN " + str(statement))]
+    index_name = "ix_{}_start_date_end_date".format(recordClass.__tablename__)
+    # start_date is bounded on both sides, and the longest duration comes from the same index
+    assert "SEARCH {} USING INDEX {} (start_date>? AND start_date<?)".format(recordClass.__tablename__, index_name) in query_plan
+    assert any(("COVERING INDEX " + index_name) in aDetail for aDetail in query_plan)
+    session.close()
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from phopyqttimelineplotter.GUI.Model.TimestampCountPyramid import TimestampCountPyramid
+
+origin = 1000.0
+# A span of max_base_level_bins half-seconds, so every level's bin width (and every bin edge) is exact
+total_span_seconds = TimestampCountPyramid.max_base_level_bins * 0.5
+
+
+def make_timestamps(seed, num_timestamps=5000):
+    rng = np.random.RandomState(seed)
+    timestamps = origin + rng.randint(0, int(total_span_seconds), size=num_timestamps).astype(np.float64)
+    return np.concatenate([[origin, origin + total_span_seconds], timestamps])
+
+
+def test_bins_are_half_open_with_the_level_widths():
+    pyramid = TimestampCountPyramid(make_timestamps(0))
+    assert pyramid.base_bin_seconds == 0.5
+    assert pyramid.level_bin_seconds == [0.5 * (2**level) for level in range(pyramid.num_levels)]
+    assert len(pyramid.levels[-1]) == 1
+    assert pyramid.levels[-1][0] == len(pyramid)
+
+    # A timestamp on an edge counts in the bin that starts there
+    pyramid = TimestampCountPyramid([origin, origin + 2.0, origin + total_span_seconds])
+    level = pyramid.get_level_for_resolution(2.0)
+    assert pyramid.level_bin_seconds[level] == 2.0
+    (x, counts) = pyramid.get_level_data(level, origin, origin + 3.0)
+    assert list(x) == [origin + 1.0, origin + 3.0]
+    assert list(counts) == [1, 1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_level_data_matches_a_histogram_of_the_range(seed):
+    timestamps = make_timestamps(seed)
+    pyramid = TimestampCountPyramid(timestamps)
+    rng = np.random.RandomState(seed)
+    for level in [0, 3, 10, pyramid.num_levels - 1]:
+        bin_seconds = pyramid.level_bin_seconds[level]
+        for _ in range(20):
+            x_min = origin + rng.uniform(-0.1, 1.1) * total_span_seconds
+            x_max = x_min + rng.uniform(0.0, 0.2) * total_span_seconds
+            (x, counts) = pyramid.get_level_data(level, x_min, x_max)
+
+            # Every bin overlapping the range, clipped to the data
+            first_edge = max(np.floor((x_min - origin) / bin_seconds), 0.0)
+            last_edge = min(np.floor((x_max - origin) / bin_seconds) + 1.0, len(pyramid.levels[level]))
+            edges = origin + np.arange(first_edge, last_edge + 1.0) * bin_seconds
+            if len(edges) < 2:
+                assert (len(x), len(counts)) == (0, 0)
+                continue
+            (expected_counts, _) = np.histogram(timestamps, bins=edges)
+            # histogram's last bin is closed, but the pyramid's only is at the very end of the data
+            if edges[-1] <= timestamps.max():
+                expected_counts[-1] -= np.count_nonzero(timestamps == edges[-1])
+            non_empty_bins = np.flatnonzero(expected_counts)
+            assert np.array_equal(x, edges[non_empty_bins] + (bin_seconds / 2.0))
+            assert np.array_equal(counts, expected_counts[non_empty_bins])
+
+
+def test_empty_ranges():
+    pyramid = TimestampCountPyramid(make_timestamps(0))
+    for level in [None, 0, 1]:
+        for (x_min, x_max) in [
+            (origin - 100.0, origin - 1.0),
+            (origin + total_span_seconds + 1.0, origin + total_span_seconds + 100.0),
+        ]:
+            (x, counts) = pyramid.get_level_data(level, x_min, x_max)
+            assert (len(x), len(counts)) == (0, 0)
+    # Reversed ranges are empty, even at the top level where the one bin spans both ends
+    for level in [None, 0, pyramid.num_levels - 1]:
+        (x, counts) = pyramid.get_level_data(level, origin + 10.0, origin + 5.0)
+        assert (len(x), len(counts)) == (0, 0)
+
+
+def test_raw_level_returns_the_timestamps_in_the_closed_range():
+    timestamps = make_timestamps(1)
+    pyramid = TimestampCountPyramid(timestamps)
+    sorted_timestamps = np.sort(timestamps)
+    (x_min, x_max) = (sorted_timestamps[100], sorted_timestamps[200])
+    (x, counts) = pyramid.get_level_data(None, x_min, x_max)
+    expected_x = sorted_timestamps[(sorted_timestamps >= x_min) & (sorted_timestamps <= x_max)]
+    assert np.array_equal(x, expected_x)
+    assert np.array_equal(counts, np.ones(len(expected_x)))
+    assert x[0] == x_min and x[-1] == x_max
+
+
+def test_choose_level():
+    timestamps = make_timestamps(2)
+    pyramid = TimestampCountPyramid(timestamps)
+    (x_min, x_max) = (origin, origin + total_span_seconds)
+    # Few enough events in view to draw them individually
+    assert pyramid.choose_level(x_min, x_max, 1000, len(timestamps)) is None
+    assert pyramid.choose_level(origin + 10.0, origin + 10.0 + 1e-6, 1000, 0) is None
+
+    for pixel_width in [1, 100, 1000, 4096]:
+        level = pyramid.choose_level(x_min, x_max, pixel_width, 100)
+        seconds_per_pixel = total_span_seconds / pixel_width
+        # The coarsest level whose bins are no wider than a pixel
+        assert pyramid.level_bin_seconds[level] <= seconds_per_pixel
+        assert (level == pyramid.num_levels - 1) or (pyramid.level_bin_seconds[level + 1] > seconds_per_pixel)
+    # Zoomed in past the finest level
+    assert pyramid.choose_level(x_min, x_max, 10**9, 100) == 0
+
+
+def test_empty_pyramid():
+    pyramid = TimestampCountPyramid([])
+    assert (len(pyramid), pyramid.num_levels) == (0, 0)
+    assert pyramid.get_level_for_resolution(1.0) is None
+    assert pyramid.choose_level(0.0, 100.0, 1000, 0) is None
+    (x, counts) = pyramid.get_level_data(None, 0.0, 100.0)
+    assert (len(x), len(counts)) == (0, 0)
+
+
+def test_count_stems():
+    (stem_x, stem_y) = TimestampCountPyramid.get_count_stems(np.array([1.0, 2.5]), np.array([3, 1]))
+    assert list(stem_x) == [1.0, 1.0, 2.5, 2.5]
+    assert list(stem_y) == [0.0, 3.0, 0.0, 1.0]
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from phopyqttimelineplotter.GUI.Model.TrackConfigs.TrackRecordPageCache import (
+    TrackRecordPageCache,
+)
+
+
+def make_record(record_id, start_date):
+    return SimpleNamespace(id=record_id, start_date=start_date)
+
+
+def get_start_date(aRecord):
+    return aRecord.start_date
+
+
+@pytest.mark.parametrize(
+    "viewport_duration, expected_page_duration",
+    [
+        (timedelta(seconds=1), timedelta(minutes=1)),
+        (timedelta(minutes=1), timedelta(minutes=1)),
+        (timedelta(minutes=1, seconds=1), timedelta(minutes=2)),
+        (timedelta(minutes=3), timedelta(minutes=4)),
+        (timedelta(hours=1), timedelta(minutes=64)),
+        (timedelta(days=1), timedelta(minutes=2048)),
+    ],
+)
+def test_page_duration_is_the_next_power_of_two_minutes(viewport_duration, expected_page_duration):
+    assert TrackRecordPageCache.get_page_duration(viewport_duration) == expected_page_duration
+
+
+def test_small_zoom_changes_keep_the_page_duration():
+    page_duration = TrackRecordPageCache.get_page_duration(timedelta(minutes=40))
+    for viewport_minutes in range(33, 65):
+        assert TrackRecordPageCache.get_page_duration(timedelta(minutes=viewport_minutes)) == page_duration
+
+
+def test_viewport_spans_at_most_two_pages():
+    for viewport_minutes in [1, 5, 33, 64, 100, 1000]:
+        viewport_duration = timedelta(minutes=viewport_minutes)
+        cache = TrackRecordPageCache(TrackRecordPageCache.get_page_duration(viewport_duration), margin_pages=0)
+        for offset_seconds in range(0, 7200, 97):
+            viewport_start = datetime(2019, 8, 1) + timedelta(seconds=offset_seconds)
+            required_page_indicies = cache.get_required_page_indicies(viewport_start, viewport_start + viewport_duration)
+            assert 1 <= len(required_page_indicies) <= 2
+
+
+def test_required_pages_include_margins_and_respect_limits():
+    cache = TrackRecordPageCache(timedelta(minutes=1), margin_pages=1)
+    viewport_start = TrackRecordPageCache.page_origin + timedelta(minutes=10, seconds=30)
+    assert cache.get_required_page_indicies(viewport_start, viewport_start + timedelta(seconds=40)) == [9, 10, 11, 12]
+    assert cache.get_required_page_indicies(
+        viewport_start,
+        viewport_start + timedelta(seconds=40),
+        limit_start=viewport_start,
+        limit_end=viewport_start + timedelta(seconds=20),
+    ) == [10]
+
+
+def test_eviction_never_drops_required_pages():
+    cache = TrackRecordPageCache(timedelta(minutes=1), margin_pages=1, max_loaded_pages=4)
+    for page_index in range(4):
+        cache.set_page(page_index, [])
+
+    required_page_indicies = [0, 1, 2, 3]
+    assert cache.set_required_page_indicies(required_page_indicies) == []
+    # Over the limit with every other loaded page required, so the new page is the only one that can go
+    assert cache.set_page(10, []) == [10]
+    assert all(cache.has_page(page_index) for page_index in required_page_indicies)
+
+    # Scrolling on: the least recently required pages go first, never the required ones
+    required_page_indicies = [2, 3, 4, 5]
+    assert cache.set_required_page_indicies(required_page_indicies) == [4, 5]
+    assert cache.set_page(4, []) == [0]
+    assert cache.set_page(5, []) == [1]
+    assert all(cache.has_page(page_index) for page_index in required_page_indicies)
+    assert len(cache) == 4
+
+    # A required page is kept even when it's the least recently used one
+    assert cache.set_required_page_indicies([3, 4, 5, 2]) == []
+    assert cache.set_page(6, []) == [6]
+    assert [page_index for page_index in range(7) if cache.has_page(page_index)] == [2, 3, 4, 5]
+
+
+def test_max_loaded_pages_fits_the_viewport_and_margins():
+    cache = TrackRecordPageCache(timedelta(minutes=1), margin_pages=2, max_loaded_pages=1)
+    assert cache.max_loaded_pages == 6
+
+
+def test_get_records_merges_records_overlapping_several_pages():
+    base_date = TrackRecordPageCache.page_origin
+    long_record = make_record(1, base_date + timedelta(seconds=30))
+    cache = TrackRecordPageCache(timedelta(minutes=1))
+    cache.set_page(0, [long_record, make_record(2, base_date + timedelta(seconds=50))])
+    # The same record, loaded again (as a different object) by the next page's query
+    cache.set_page(1, [make_record(3, base_date + timedelta(seconds=70)), make_record(1, base_date + timedelta(seconds=30))])
+    cache.set_page(2, [make_record(1, base_date + timedelta(seconds=30))])
+
+    records = cache.get_records(get_start_date)
+    assert [aRecord.id for aRecord in records] == [1, 2, 3]
+    # The first loaded copy is kept
+    assert records[0] is long_record
+
+
+def test_get_records_uses_record_key_fn():
+    cache = TrackRecordPageCache(timedelta(minutes=1), record_key_fn=lambda aRecord: aRecord.start_date)
+    start_date = TrackRecordPageCache.page_origin
+    cache.set_page(0, [make_record(1, start_date), make_record(2, start_date)])
+    assert [aRecord.id for aRecord in cache.get_records(get_start_date)] == [1]
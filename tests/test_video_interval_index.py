@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from phopyqttimelineplotter.app.filesystem.VideoIntervalIndex import VideoIntervalIndex
+
+base_date = datetime(2019, 8, 1)
+
+
+def assign_videos_with_loop(timestamps, videoDates, videoEndDates):
+    activeVideoIndicies = np.empty((len(timestamps),), dtype=object)
+    videoRelativeOffsets = np.empty((len(timestamps),), dtype=object)
+    for (index, aTimestamp) in enumerate(timestamps):
+        for (videoIndex, videoStartDate) in enumerate(videoDates):
+            if videoStartDate <= aTimestamp <= videoEndDates[videoIndex]:
+                activeVideoIndicies[index] = videoIndex
+                videoRelativeOffsets[index] = aTimestamp - videoStartDate
+                break
+    return (activeVideoIndicies, videoRelativeOffsets)
+
+
+def to_datetimes(seconds):
+    return np.array([base_date + timedelta(seconds=int(aSecond)) for aSecond in seconds])
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_loop_with_overlapping_and_touching_videos(seed):
+    rng = np.random.default_rng(seed)
+    num_videos = int(rng.integers(1, 12))
+    # Coarse seconds, so that videos often overlap, touch, or share a start
+    start_seconds = rng.integers(0, 100, num_videos)
+    videoDates = to_datetimes(start_seconds)
+    videoEndDates = to_datetimes(start_seconds + rng.integers(0, 30, num_videos))
+    timestamps = to_datetimes(rng.integers(-10, 140, 200))
+
+    (activeVideoIndicies, videoRelativeOffsets, isWithinVideoSpan) = VideoIntervalIndex(videoDates, videoEndDates).assign_videos(timestamps)
+    (expectedVideoIndicies, expectedRelativeOffsets) = assign_videos_with_loop(timestamps, videoDates, videoEndDates)
+    assert np.array_equal(activeVideoIndicies, expectedVideoIndicies)
+    assert np.array_equal(videoRelativeOffsets, expectedRelativeOffsets)
+    assert np.array_equal(isWithinVideoSpan, (timestamps >= videoDates.min()) & (timestamps <= videoEndDates.max()))
+
+
+def test_datetime64_timestamps_match_datetimes():
+    videoDates = to_datetimes([0, 50])
+    videoEndDates = to_datetimes([40, 90])
+    timestamps = to_datetimes([-5, 0, 40, 45, 50, 95])
+    index = VideoIntervalIndex(videoDates, videoEndDates)
+    (fromDatetimes, _, _) = index.assign_videos(timestamps)
+    (fromDatetime64, _, _) = index.assign_videos(timestamps.astype("datetime64[us]"))
+    assert fromDatetimes.tolist() == [None, 0, 0, None, 1, None]
+    assert np.array_equal(fromDatetimes, fromDatetime64)
+
+
+def test_no_videos():
+    timestamps = to_datetimes([0, 1])
+    (activeVideoIndicies, videoRelativeOffsets, isWithinVideoSpan) = VideoIntervalIndex(None, None).assign_videos(timestamps)
+    assert activeVideoIndicies.tolist() == [None, None]
+    assert videoRelativeOffsets.tolist() == [None, None]
+    assert isWithinVideoSpan.all()